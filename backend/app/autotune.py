@@ -0,0 +1,185 @@
+"""호스트 분리 구성 자동 튜닝.
+
+짧은 합성 분리를 파라미터 그리드(세그먼트 길이, overlap, 스레드 수, 동시 처리 수,
+작업 내 병렬 워커 수)에 대해 실행하고, 실시간 비율(RTF)과 최대 RSS를 측정한 뒤
+가장 좋은 구성을 호스트 프로파일로 기록합니다. SeparationService는 시작 시
+이 프로파일을 불러옵니다 (HOST_PROFILE_PATH).
+
+사용법:
+    python -m app.autotune --duration 15 --objective throughput
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import logging
+from pathlib import Path
+from typing import Any
+
+from app.benchmark import BenchmarkConfig, print_results, run_benchmark
+from app.config import get_settings
+from app.services.host_profile import HostProfile
+from app.utils.system_resources import effective_cpu_count, total_memory_bytes
+
+logger = logging.getLogger(__name__)
+
+# 최대 RSS가 호스트 메모리의 이 비율을 넘는 구성은 후보에서 제외
+DEFAULT_MEMORY_FRACTION = 0.7
+
+
+def default_concurrency_grid(cpu_count: int) -> list[int]:
+    """코어 수에 맞는 동시 처리 수 후보를 반환합니다 (1, 2, 4, ...)."""
+    grid = [1]
+    while grid[-1] * 2 <= max(1, cpu_count // 2):
+        grid.append(grid[-1] * 2)
+    return grid
+
+
+def build_grid(
+    concurrency: list[int],
+    overlaps: list[float],
+    segments: list[float],
+    threads: list[int],
+) -> list[BenchmarkConfig]:
+    """튜닝 그리드를 만듭니다.
+
+    동시 처리 수가 1일 때만 작업 내 병렬 워커 자동 모드(0)를 함께 측정합니다
+    (동시 작업이 많으면 코어가 이미 분배되어 있음).
+    """
+    configs: list[BenchmarkConfig] = []
+    for c, overlap, segment, t in itertools.product(concurrency, overlaps, segments, threads):
+        for workers in ([1, 0] if c == 1 else [1]):
+            configs.append(
+                BenchmarkConfig(
+                    intra_op_threads=t,
+                    concurrency=c,
+                    parallel_workers=workers,
+                    overlap=overlap,
+                    segment_seconds=segment,
+                )
+            )
+    return configs
+
+
+def select_best(
+    results: list[dict[str, Any]],
+    objective: str = "throughput",
+    memory_limit_mb: float | None = None,
+) -> dict[str, Any] | None:
+    """측정 결과에서 최적 구성을 고릅니다.
+
+    Args:
+        results: run_benchmark 결과.
+        objective: "throughput"(처리한 오디오 초/벽시계 초 최대) 또는
+            "latency"(작업당 RTF 최소).
+        memory_limit_mb: 최대 RSS 상한 (MB).
+
+    Returns:
+        최적 결과, 또는 조건을 만족하는 결과가 없으면 None.
+    """
+    candidates = [
+        r for r in results
+        if "error" not in r
+        and (memory_limit_mb is None or r["peak_rss_mb"] <= memory_limit_mb)
+    ]
+    if not candidates:
+        return None
+
+    if objective == "latency":
+        return min(candidates, key=lambda r: (r["real_time_factor"], -r["throughput"]))
+    return max(candidates, key=lambda r: (r["throughput"], -r["real_time_factor"]))
+
+
+def profile_from_result(result: dict[str, Any], results: list[dict[str, Any]]) -> HostProfile:
+    """최적 결과를 호스트 프로파일로 변환합니다."""
+    return HostProfile(
+        max_concurrent=result["concurrency"],
+        intra_op_threads=result["resolved_intra_op_threads"],
+        inter_op_threads=result["resolved_inter_op_threads"],
+        parallel_workers=result["parallel_workers"],
+        overlap=result["overlap"],
+        segment_seconds=result["segment_seconds"],
+        results=results,
+    )
+
+
+def _float_list(value: str) -> list[float]:
+    return [float(v) for v in value.split(",") if v.strip()]
+
+
+def _int_list(value: str) -> list[int]:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def main(argv: list[str] | None = None) -> int:
+    """autotune CLI 진입점."""
+    settings = get_settings()
+    cpu_count = effective_cpu_count()
+
+    parser = argparse.ArgumentParser(description="호스트 분리 구성 자동 튜닝")
+    parser.add_argument("--duration", type=float, default=15.0, help="합성 오디오 길이 (초)")
+    parser.add_argument(
+        "--concurrency", type=_int_list, default=default_concurrency_grid(cpu_count),
+        help="동시 처리 수 후보",
+    )
+    parser.add_argument("--overlap", type=_float_list, default=[0.1, 0.25], help="overlap 후보")
+    parser.add_argument(
+        "--segment", type=_float_list, default=[0.0, 5.0],
+        help="세그먼트 길이 후보 (초, 0 = 모델 기본값)",
+    )
+    parser.add_argument(
+        "--threads", type=_int_list, default=[0],
+        help="intra-op 스레드 수 후보 (0 = 코어/동시 처리 수 기준 자동)",
+    )
+    parser.add_argument(
+        "--objective", choices=["throughput", "latency"], default="throughput",
+        help="최적화 목표",
+    )
+    parser.add_argument(
+        "--memory-fraction", type=float, default=DEFAULT_MEMORY_FRACTION,
+        help="허용 최대 RSS (호스트 메모리 대비 비율)",
+    )
+    parser.add_argument(
+        "--output", type=Path, default=Path(settings.host_profile_path or "host_profile.json"),
+        help="호스트 프로파일 출력 경로",
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    configs = build_grid(args.concurrency, args.overlap, args.segment, args.threads)
+    logger.info("Autotuning %d configurations on %d CPUs", len(configs), cpu_count)
+    results = run_benchmark(configs, duration_seconds=args.duration)
+    print_results(results)
+
+    total_memory = total_memory_bytes()
+    memory_limit_mb = (
+        total_memory * args.memory_fraction / (1024 * 1024) if total_memory else None
+    )
+    best = select_best(results, args.objective, memory_limit_mb)
+    if best is None:
+        logger.error("No configuration succeeded within the memory limit")
+        return 1
+
+    profile = profile_from_result(best, results)
+    profile.save(args.output)
+    logger.info(
+        "Host profile written to %s: concurrency=%d threads=%d/%d workers=%d "
+        "overlap=%.2f segment=%.1fs (throughput=%.2fx, rtf=%.2f, rss=%.0fMB)",
+        args.output,
+        profile.max_concurrent,
+        profile.intra_op_threads,
+        profile.inter_op_threads,
+        profile.parallel_workers,
+        profile.overlap,
+        profile.segment_seconds,
+        best["throughput"],
+        best["real_time_factor"],
+        best["peak_rss_mb"],
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,226 @@
+"""분리 추론 스레드 구성 벤치마크.
+
+스레드 수(intra-op/inter-op), 동시 처리 수, 세그먼트 병렬 워커 수, CPU 고정 여부의
+조합마다 합성 오디오로 Demucs 추론을 실행하고 처리량을 기록합니다.
+
+torch inter-op 스레드 수는 프로세스당 한 번만 설정할 수 있으므로
+각 구성은 새 프로세스(spawn)에서 실행됩니다.
+
+사용법:
+    python -m app.benchmark --threads 2,4,8 --concurrency 1,2 --workers 1,0 \\
+        --affinity off,on --duration 20 --output benchmark.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import logging
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class BenchmarkConfig:
+    """벤치마크 구성 한 가지."""
+
+    intra_op_threads: int = 0  # 0 = 자동
+    inter_op_threads: int = 0  # 0 = 자동
+    concurrency: int = 1  # 동시 분리 작업 수
+    parallel_workers: int = 1  # 작업 내 세그먼트 병렬 워커 수 (0 = 자동)
+    affinity: bool = False  # 워커별 CPU 코어 고정
+    overlap: float = 0.25  # 세그먼트 겹침 비율
+    segment_seconds: float = 0.0  # 세그먼트 길이 (0 = 모델 기본값)
+
+    def to_env(self) -> dict[str, str]:
+        """자식 프로세스에 전달할 환경 변수로 변환합니다."""
+        return {
+            "TORCH_INTRA_OP_THREADS": str(self.intra_op_threads),
+            "TORCH_INTER_OP_THREADS": str(self.inter_op_threads),
+            "SEPARATION_MAX_CONCURRENT": str(self.concurrency),
+            "SEPARATION_PARALLEL_WORKERS": str(self.parallel_workers),
+            "SEPARATION_CPU_AFFINITY": "true" if self.affinity else "false",
+            "SEPARATION_OVERLAP": str(self.overlap),
+            "SEPARATION_SEGMENT_SECONDS": str(self.segment_seconds),
+            # 측정 중에는 기존 호스트 프로파일을 적용하지 않음
+            "HOST_PROFILE_PATH": "",
+        }
+
+
+def _peak_rss_mb() -> float:
+    """현재 프로세스의 최대 RSS(MB)를 반환합니다."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS는 바이트, Linux는 KB 단위
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _run_config(config: BenchmarkConfig, duration_seconds: float) -> dict[str, Any]:
+    """자식 프로세스에서 한 구성의 벤치마크를 실행합니다."""
+    import asyncio
+
+    # 설정은 서비스 모듈 import 전에 환경 변수로 주입
+    os.environ.update(config.to_env())
+
+    from app.services import separation_service as separation_module
+    from app.services.separation_service import SeparationService
+    from app.utils.system_resources import effective_cpu_count
+
+    if not separation_module._DEMUCS_AVAILABLE:
+        raise RuntimeError("Demucs/PyTorch가 설치되지 않아 벤치마크를 실행할 수 없습니다.")
+
+    import torch
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        service = SeparationService(cache_dir=cache_dir)
+        asyncio.run(service._ensure_model_loaded())
+        model = SeparationService._model
+
+        # 합성 입력: 저음량 스테레오 노이즈 (분리 비용은 내용과 거의 무관)
+        generator = torch.Generator().manual_seed(0)
+        wav = torch.randn(
+            2, int(duration_seconds * model.samplerate), generator=generator
+        ) * 0.1
+
+        task_ids = [service.create_task() for _ in range(config.concurrency)]
+        # 작업이 스케줄러를 거치지 않으므로 자동 워커 수는 코어를 동시 작업 수로 나눈 몫 기준
+        cpu_share = max(1, effective_cpu_count() // config.concurrency)
+
+        def _job(task_id: str) -> None:
+            service._update_progress(task_id, 30.0, "processing")
+            with service._pinned_worker() as cores:
+                service._infer_sources(
+                    model, wav, task_id, cpu_count=len(cores) if cores else cpu_share
+                )
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=config.concurrency) as executor:
+            list(executor.map(_job, task_ids))
+        elapsed = time.perf_counter() - start
+
+    audio_seconds = duration_seconds * config.concurrency
+    return {
+        **asdict(config),
+        "resolved_intra_op_threads": service.thread_plan.intra_op_threads,
+        "resolved_inter_op_threads": torch.get_num_interop_threads(),
+        "elapsed_seconds": round(elapsed, 3),
+        "audio_seconds": audio_seconds,
+        "throughput": round(audio_seconds / elapsed, 3),  # 처리한 오디오 초 / 벽시계 초
+        "real_time_factor": round(elapsed / duration_seconds, 3),  # 작업당 처리 시간 비율
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+    }
+
+
+def run_benchmark(
+    configs: list[BenchmarkConfig],
+    duration_seconds: float = 20.0,
+) -> list[dict[str, Any]]:
+    """구성 목록을 하나씩 새 프로세스에서 실행하고 결과를 반환합니다.
+
+    실패한 구성은 "error" 필드와 함께 기록됩니다.
+    """
+    context = multiprocessing.get_context("spawn")
+    results: list[dict[str, Any]] = []
+
+    for config in configs:
+        logger.info("Benchmarking %s", config)
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            try:
+                result = executor.submit(_run_config, config, duration_seconds).result()
+            except Exception as e:
+                logger.error("Benchmark failed for %s: %s", config, e)
+                result = {**asdict(config), "error": str(e)}
+        results.append(result)
+
+    return results
+
+
+def build_matrix(
+    threads: list[int],
+    inter_threads: list[int],
+    concurrency: list[int],
+    workers: list[int],
+    affinity: list[bool],
+) -> list[BenchmarkConfig]:
+    """파라미터 목록의 데카르트 곱으로 구성 행렬을 만듭니다."""
+    return [
+        BenchmarkConfig(
+            intra_op_threads=t,
+            inter_op_threads=i,
+            concurrency=c,
+            parallel_workers=w,
+            affinity=a,
+        )
+        for t, i, c, w, a in itertools.product(
+            threads, inter_threads, concurrency, workers, affinity
+        )
+    ]
+
+
+def _int_list(value: str) -> list[int]:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def _bool_list(value: str) -> list[bool]:
+    return [v.strip().lower() in ("on", "true", "1", "yes") for v in value.split(",") if v.strip()]
+
+
+def print_results(results: list[dict[str, Any]]) -> None:
+    """결과를 표 형태로 출력합니다."""
+    header = f"{'intra':>5} {'inter':>5} {'conc':>4} {'work':>4} {'aff':>4} " \
+             f"{'thru(x)':>8} {'rtf':>6} {'rss(MB)':>8}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        if "error" in r:
+            print(f"{r['intra_op_threads']:>5} {r['inter_op_threads']:>5} "
+                  f"{r['concurrency']:>4} {r['parallel_workers']:>4} "
+                  f"{'on' if r['affinity'] else 'off':>4}  ERROR: {r['error']}")
+            continue
+        print(f"{r['resolved_intra_op_threads']:>5} {r['resolved_inter_op_threads']:>5} "
+              f"{r['concurrency']:>4} {r['parallel_workers']:>4} "
+              f"{'on' if r['affinity'] else 'off':>4} {r['throughput']:>8.2f} "
+              f"{r['real_time_factor']:>6.2f} {r['peak_rss_mb']:>8.1f}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    """벤치마크 CLI 진입점."""
+    parser = argparse.ArgumentParser(description="Demucs 스레드 구성 벤치마크")
+    parser.add_argument("--threads", type=_int_list, default=[0], help="intra-op 스레드 수 목록")
+    parser.add_argument(
+        "--inter-threads", type=_int_list, default=[0], help="inter-op 스레드 수 목록"
+    )
+    parser.add_argument("--concurrency", type=_int_list, default=[1, 2], help="동시 작업 수 목록")
+    parser.add_argument("--workers", type=_int_list, default=[1], help="작업 내 병렬 워커 수 목록")
+    parser.add_argument("--affinity", type=_bool_list, default=[False], help="on/off 목록")
+    parser.add_argument("--duration", type=float, default=20.0, help="합성 오디오 길이 (초)")
+    parser.add_argument("--output", type=Path, default=None, help="결과 JSON 경로")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    configs = build_matrix(
+        args.threads, args.inter_threads, args.concurrency, args.workers, args.affinity
+    )
+    results = run_benchmark(configs, duration_seconds=args.duration)
+    print_results(results)
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+        logger.info("Benchmark results written to %s", args.output)
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
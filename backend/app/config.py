@@ -45,10 +45,99 @@ class Settings(BaseSettings):
     # 서버 포트
     port: int = 8000
 
-    @field_validator("cors_origins", mode="before")
+    # 음원 분리 최대 동시 처리 수
+    separation_max_concurrent: int = 2
+
+    # torch 스레드 수 (0 = CPU affinity, cgroup 할당량, 동시 처리 수 기준 자동)
+    torch_intra_op_threads: int = 0
+    torch_inter_op_threads: int = 0
+
+    # 분리 워커별 CPU 코어 고정 (os.sched_setaffinity)
+    separation_cpu_affinity: bool = False
+
+    # 음원 분리 작업 내 세그먼트 병렬 워커 수 (0 = 유휴 코어 기준 자동, 1 = 비활성)
+    separation_parallel_workers: int = 0
+
+    # Demucs 세그먼트 겹침 비율과 세그먼트 길이 (초, 0 = 모델 기본값)
+    separation_overlap: float = 0.25
+    separation_segment_seconds: float = 0.0
+
+    # autotune이 기록한 호스트 프로파일 경로 (빈 문자열 = 사용 안 함)
+    host_profile_path: str = "/tmp/host_profile.json"
+
+    # 공유 모델 가중치(mmap) 디렉터리 (빈 문자열 = 프로세스별 사본)
+    model_weights_dir: str = "/tmp/model_weights"
+
+    # 앱 import 시 모델 미리 로드 (fork 전 로드로 copy-on-write 공유)
+    separation_preload_model: bool = False
+
+    # 전체 분리 전 DSP 미리보기 스템 게시
+    separation_preview: bool = False
+
+    # 요청 간 배치 추론: 최대 배치 크기 (1 = 비활성)와 배치 대기 시간 (ms)
+    separation_batch_size: int = 1
+    separation_batch_wait_ms: float = 20.0
+
+    # 진입 제어: 허용할 최대 예상 대기 시간 (초, 0 = 제한 없음)과
+    # 최소 여유 메모리 (MB, 0 = 확인 안 함)
+    separation_max_queue_seconds: float = 3600.0
+    admission_min_free_memory_mb: int = 1024
+
+    # 분리할 오디오 최대 길이 (초, 0 = 제한 없음, 업로드 중 헤더로 확인)
+    separation_max_duration_seconds: float = 1800.0
+
+    # 동시 분리 작업 전체의 메모리 예산 (MB, 0 = cgroup/호스트 메모리 한도 - 최소 여유 메모리)
+    separation_memory_budget_mb: int = 0
+
+    # 분리 후 스템 분석: 무음 판정 기준 (100ms 블록 RMS, dBFS)과
+    # 무음 스템을 프레임 없는 WAV 마커로 저장할지 여부
+    # (기본 끔: 켜면 무음 스템 다운로드가 헤더만 있는 WAV가 되므로 클라이언트가 마커를 처리해야 함)
+    separation_silence_threshold_db: float = -60.0
+    separation_silent_stem_markers: bool = False
+
+    # 서버 측 템포/피치 렌더링 동시 실행 수
+    stretch_max_concurrent: int = 2
+
+    # 적응형 동시 실행 한도 (AIMD): 사용 여부, 조정 주기 (초),
+    # 분리 한도 상한 (0 = 코어 수와 메모리 예산 기준)과 다운로드 한도 상한
+    adaptive_concurrency: bool = True
+    adaptive_concurrency_interval: float = 15.0
+    separation_max_concurrent_limit: int = 0
+    max_concurrent_downloads_limit: int = 20
+
+    # 진행 상태 SSE 구독자가 모두 떠나면 유예 시간(초) 뒤 분리 작업 자동 취소
+    separation_cancel_on_disconnect: bool = True
+    separation_disconnect_grace_seconds: float = 10.0
+
+    # 영속 태스크 저장소(SQLite) 경로 (빈 문자열 = 인메모리만 사용)
+    task_store_path: str = "/tmp/music_trainer/tasks.db"
+
+    # 분리 대기 중인 업로드 보관 디렉터리 (재시작 후 재실행용)
+    separation_upload_dir: str = "/tmp/separation_uploads"
+
+    # 추론 실행 위치: local (API 프로세스) 또는 worker (python -m app.worker)
+    inference_mode: str = "local"
+
+    # 추론 워커 식별자 (빈 문자열 = 호스트 이름)와 대기열 폴링 간격 (초)
+    worker_id: str = ""
+    worker_poll_interval: float = 0.5
+
+    # 워커 모드에서 BPM 분석 결과 대기 시간 (초)
+    bpm_worker_timeout: float = 120.0
+
+    # 분리 작업을 배치할 원격 추론 노드 URL 목록 (비어 있으면 로컬 처리)
+    separation_nodes: list[str] = []
+
+    # 피어 캐시 연합: 피어 URL 목록, 이 인스턴스의 URL, 항목 복제 수, 피어 간 공유 토큰
+    cache_peers: list[str] = []
+    cache_self_url: str = ""
+    cache_peer_replicas: int = 1
+    cache_peer_token: str = ""
+
+    @field_validator("cors_origins", "separation_nodes", "cache_peers", mode="before")
     @classmethod
     def parse_cors_origins(cls, v: str | list[str]) -> list[str]:
-        """CORS 오리진을 JSON 문자열 또는 리스트로 파싱합니다."""
+        """CORS 오리진/노드 URL 목록을 JSON 문자열, 쉼표 구분 문자열 또는 리스트로 파싱합니다."""
         if isinstance(v, str):
             try:
                 parsed = json.loads(v)
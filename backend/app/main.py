@@ -15,9 +15,11 @@ from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import get_settings
-from app.routes import bpm, health, separation, youtube
+from app.routes import bpm, health, node, peer, separation, stems, youtube
 from app.services.cleanup_service import run_cleanup_loop
+from app.services.concurrency_controller import concurrency_controller
 from app.services.separation_service import separation_service
+from app.services.task_store import KIND_SEPARATION, get_task_store
 from app.services.youtube_service import youtube_service
 
 # 로깅 설정
@@ -42,7 +44,12 @@ async def _cleanup_expired_separation_tasks(download_path: Path) -> None:
             cleanup_expired_tasks(
                 separation_service.tasks,
                 expiry_seconds=FILE_EXPIRY_SECONDS,
+                on_remove=separation_service.remove_task,
             )
+            # 워커 모드의 태스크는 저장소에만 있으므로 저장소에서 직접 정리
+            store = get_task_store()
+            if separation_service.remote_inference and store is not None:
+                store.delete_expired(KIND_SEPARATION, time.time() - FILE_EXPIRY_SECONDS)
         except asyncio.CancelledError:
             logger.info("Separation task cleanup cancelled")
             break
@@ -65,9 +72,24 @@ async def lifespan(app: FastAPI):
     stems_cache_path.mkdir(parents=True, exist_ok=True)
     logger.info("Stems cache directory: %s", stems_cache_path)
 
+    # 영속 저장소에서 태스크 복원 (완료 태스크는 캐시로 해석, 중단된 작업은 재실행)
+    # 워커 모드에서는 분리 작업을 워커가 저장소에서 직접 가져감
+    resumed = 0
+    if not separation_service.remote_inference:
+        for task_id, file_path in separation_service.restore_tasks():
+            asyncio.create_task(separation_service.run_task(file_path, task_id))
+            resumed += 1
+    for task_id, url in youtube_service.restore_tasks():
+        asyncio.create_task(youtube_service.start_conversion(url, task_id))
+        resumed += 1
+    if resumed:
+        logger.info("Resumed %d interrupted tasks", resumed)
+
     # 백그라운드 정리 태스크 시작 (다운로드 + 스템 캐시 정리)
     cleanup_task = asyncio.create_task(
-        run_cleanup_loop(download_path, youtube_service.tasks)
+        run_cleanup_loop(
+            download_path, youtube_service.tasks, on_remove=youtube_service.remove_task
+        )
     )
     logger.info("Cleanup background task started")
 
@@ -77,9 +99,17 @@ async def lifespan(app: FastAPI):
     )
     logger.info("Separation task cleanup started")
 
+    # 부하에 따른 동시 실행 한도 조정
+    controller_task = asyncio.create_task(concurrency_controller.run())
+    if concurrency_controller.enabled:
+        logger.info(
+            "Adaptive concurrency started (interval=%.0fs)", concurrency_controller.interval
+        )
+
     yield
 
     # 종료: 정리 태스크 취소
+    controller_task.cancel()
     cleanup_task.cancel()
     try:
         await cleanup_task
@@ -106,6 +136,14 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        # 클라이언트가 읽는 응답 헤더 (스템 묶음 채널 순서, 품질, 무음, 구간)
+        expose_headers=[
+            "X-Stem-Channels",
+            "X-Stem-Quality",
+            "X-Stem-Silent",
+            "X-Slice-Start",
+            "X-Slice-End",
+        ],
     )
 
     # 요청/응답 로깅 미들웨어
@@ -131,9 +169,20 @@ def create_app() -> FastAPI:
     app.include_router(health.router, prefix="/api/v1")
     app.include_router(youtube.router, prefix="/api/v1")
     app.include_router(separation.router, prefix="/api/v1")
+    app.include_router(stems.router, prefix="/api/v1")
     app.include_router(bpm.router, prefix="/api/v1")
+    app.include_router(node.router, prefix="/api/v1")
+    # 피어 캐시 라우트는 피어가 설정되었을 때만 등록 (공유 토큰 필수)
+    if settings.cache_peers:
+        if not settings.cache_peer_token:
+            raise RuntimeError("CACHE_PEERS를 쓰려면 CACHE_PEER_TOKEN을 설정해야 합니다.")
+        app.include_router(peer.router, prefix="/api/v1")
 
     return app
 
 
+# fork 기반 서버의 마스터 프로세스에서 모델을 미리 로드하면 워커들이 가중치를 공유
+if get_settings().separation_preload_model:
+    separation_service.preload_model()
+
 app = create_app()
@@ -58,6 +58,45 @@ class HealthResponse(BaseModel):
     active_conversions: int
 
 
+class ConcurrencyLimitChange(BaseModel):
+    """동시 실행 한도 변경 기록 모델."""
+
+    at: float  # epoch 초
+    old: int
+    new: int
+    reason: str
+
+
+class ConcurrencyLimitStatus(BaseModel):
+    """동시 실행 한도 하나의 상태 모델."""
+
+    name: str  # separation, youtube
+    limit: int  # 현재 적용 중인 한도
+    min_limit: int
+    max_limit: int
+    running: int
+    waiting: int
+    last_reason: str  # 마지막 조정 판단 이유
+    changes: list[ConcurrencyLimitChange] = []  # 최근 변경 이력
+
+
+class ConcurrencySignals(BaseModel):
+    """한도 조정에 사용한 호스트 부하 신호 모델."""
+
+    memory_pressure: float | None = None  # PSI some avg10 (%)
+    load_per_cpu: float | None = None  # 1분 load average / 코어 수
+    memory_headroom_bytes: int | None = None  # MemAvailable 또는 cgroup 한도까지 남은 양
+
+
+class ConcurrencyResponse(BaseModel):
+    """적응형 동시 실행 한도 상태 응답 모델."""
+
+    enabled: bool
+    interval_seconds: float
+    signals: ConcurrencySignals
+    limits: list[ConcurrencyLimitStatus]
+
+
 class ErrorResponse(BaseModel):
     """에러 응답 모델."""
 
@@ -88,9 +127,17 @@ class SeparationProgress(BaseModel):
     """음원 분리 진행 상태 모델 (SSE 스트리밍용)."""
 
     progress: float  # 0-100, or -1 for error
-    status: str  # processing, completed, failed, queued
+    status: str  # processing, completed, failed, queued, cancelled
     stems: list[str] | None = None  # 완료 시 스템 이름 목록
     error: str | None = None  # 에러 메시지
+    quality: str | None = None  # preview (근사 스템 게시됨), full (전체 품질로 교체됨)
+    preview_stems: list[str] | None = None  # 미리보기 스템 이름 목록
+    queue_position: int | None = None  # 대기 중일 때 대기열 순번 (1부터)
+    estimated_start_seconds: float | None = None  # 대기 중일 때 예상 시작까지 남은 시간 (초)
+    stem_urls: dict[str, str] | None = None  # 완료 시 스템별 콘텐츠 주소 URL (태스크 만료와 무관)
+    packed_url: str | None = None  # 완료 시 모든 스템을 묶은 8채널 WAV URL
+    peaks_url: str | None = None  # 원본 오디오 파형 피크 URL (만들어진 뒤부터)
+    silent_stems: list[str] | None = None  # 완료 시 무음으로 판정된 스템 (다운로드 생략 가능)
 
 
 class StemInfo(BaseModel):
@@ -99,6 +146,65 @@ class StemInfo(BaseModel):
     name: str  # vocals, drums, bass, other
     url: str  # 다운로드 URL
     size_bytes: int | None = None  # 파일 크기 (선택사항)
+    peaks_url: str | None = None  # 파형 피크 URL
+    segments_url: str | None = None  # 분할 스트리밍 매니페스트 URL
+    silent: bool | None = None  # 무음 스템 여부 (분석 전이면 None)
+
+
+class StemSetResponse(BaseModel):
+    """입력 파일 해시로 조회한 캐시 스템 목록 모델."""
+
+    file_hash: str  # 입력 오디오 파일의 SHA-256
+    model: str  # 분리 모델 이름
+    stems: list[StemInfo]
+    packed_url: str | None = None  # 모든 스템을 묶은 8채널 WAV URL
+    peaks_url: str | None = None  # 원본 오디오 파형 피크 URL (있을 때)
+    analysis_url: str | None = None  # 스템 분석 결과 URL
+
+
+class StemAnalysis(BaseModel):
+    """스템 하나의 분석 결과 모델."""
+
+    frames: int  # 원래 프레임 수 (무음 마커로 바뀐 스템도 원래 길이)
+    sample_rate: int
+    silent: bool  # 모든 100ms 블록이 무음 기준보다 조용함
+    peak_db: float  # 샘플 최대값 (dBFS)
+    rms_db: float  # 전체 RMS (dBFS)
+    integrated_lufs: float | None  # 게이팅 적용 통합 라우드니스 (게이트 통과 블록이 없으면 None)
+    envelope_db: list[int]  # envelope_hop_seconds 간격 RMS (dBFS)
+    silent_spans: list[list[float]]  # [시작 초, 끝 초] 무음 구간
+
+
+class StemAnalysisResponse(BaseModel):
+    """입력 파일 해시의 스템 분석 결과 모델."""
+
+    file_hash: str
+    model: str
+    envelope_hop_seconds: float
+    threshold_db: float  # 무음 판정 기준 (dBFS)
+    stems: dict[str, StemAnalysis]
+
+
+class StemSegment(BaseModel):
+    """분할 스트리밍 세그먼트 하나의 정보 모델."""
+
+    url: str  # 세그먼트 다운로드 URL
+    start: float  # 스템 안에서의 시작 시각 (초)
+    duration: float  # 세그먼트 길이 (초)
+
+
+class StemSegmentManifest(BaseModel):
+    """스템 분할 스트리밍 매니페스트 모델."""
+
+    file_hash: str
+    model: str
+    stem: str
+    mime_type: str  # 세그먼트 MIME 타입 (세그먼트마다 독립적으로 디코딩 가능)
+    sample_rate: int
+    channels: int
+    duration: float  # 스템 전체 길이 (초)
+    segment_seconds: float  # 목표 세그먼트 길이 (실제 길이는 segments 참고)
+    segments: list[StemSegment]
 
 
 # ==============================================================================
@@ -113,3 +219,17 @@ class BpmAnalysisResponse(BaseModel):
     beats: list[float]
     confidence: float
     file_hash: str
+
+
+# ==============================================================================
+# Node Schemas
+# ==============================================================================
+
+
+class NodeStatusResponse(BaseModel):
+    """추론 노드 상태 모델 (디스패처 배치 기준)."""
+
+    queue_depth: int  # 대기 + 실행 중 분리 작업 수
+    max_concurrent: int  # 동시 분리 처리 수
+    free_memory_bytes: int | None = None  # 사용 가능한 메모리
+    has_cache: bool = False  # 요청한 해시의 스템 보유 여부
@@ -5,15 +5,20 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import tempfile
+import uuid
 from pathlib import Path
 
 import aiofiles
 from fastapi import APIRouter, HTTPException, Request, UploadFile, status
 
+from app.config import get_settings
 from app.models.schemas import BpmAnalysisResponse
-from app.services.bpm_service import bpm_service
+from app.services.bpm_service import BpmResult, bpm_service
+from app.services.task_store import KIND_BPM, TaskRecord, get_task_store, wait_for_task
+from app.utils.admission import admission_controller
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +31,29 @@ SUPPORTED_FORMATS = {"audio/mpeg", "audio/wav", "audio/x-wav", "audio/flac"}
 MAX_FILE_SIZE = 100 * 1024 * 1024
 
 
+async def _analyze_with_worker(file_path: Path) -> BpmResult:
+    """추론 워커에 BPM 분석을 맡기고 결과를 기다립니다.
+
+    Raises:
+        RuntimeError: 워커에서 분석이 실패했을 때.
+        TimeoutError: BPM_WORKER_TIMEOUT 안에 끝나지 않았을 때.
+    """
+    store = get_task_store()
+    task_id = str(uuid.uuid4())
+    await asyncio.to_thread(
+        store.save,
+        TaskRecord(task_id=task_id, kind=KIND_BPM, status="queued", source=str(file_path)),
+    )
+    try:
+        record = await wait_for_task(store, task_id, get_settings().bpm_worker_timeout)
+    finally:
+        await asyncio.to_thread(store.delete, task_id)
+
+    if record.status == "failed" or not record.result:
+        raise RuntimeError(record.error or "워커에서 분석에 실패했습니다.")
+    return BpmResult(**record.result)
+
+
 @router.post("/analyze", response_model=BpmAnalysisResponse, status_code=status.HTTP_200_OK)
 async def analyze_bpm(
     request: Request,
@@ -46,7 +74,8 @@ async def analyze_bpm(
     Raises:
         HTTPException: 파일 형식이 지원되지 않을 때(400),
                       파일 크기 초과 시(413),
-                      분석 실패 시(500).
+                      분석 실패 시(500),
+                      여유 메모리가 부족할 때(503, Retry-After 포함).
     """
     # 파일 형식 검증
     content_type = file.content_type or ""
@@ -64,8 +93,17 @@ async def analyze_bpm(
             detail=f"파일이 너무 큽니다. 최대 {MAX_FILE_SIZE // (1024 * 1024)}MB",
         )
 
-    # 임시 파일 저장
-    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=f"_{file.filename}")
+    # 진입 제어 (분석은 대기열 없이 바로 실행되므로 여유 메모리만 확인)
+    admission_controller.check(0.0)
+
+    # 임시 파일 저장 (워커 모드에서 워커가 읽을 수 있도록 업로드 디렉터리에 저장)
+    settings = get_settings()
+    remote = settings.inference_mode == "worker" and get_task_store() is not None
+    upload_dir = Path(settings.separation_upload_dir)
+    upload_dir.mkdir(parents=True, exist_ok=True)
+    temp_file = tempfile.NamedTemporaryFile(
+        delete=False, dir=upload_dir, suffix=f"_{file.filename}"
+    )
     temp_path = Path(temp_file.name)
 
     try:
@@ -82,10 +120,11 @@ async def analyze_bpm(
                 detail=f"파일이 너무 큽니다. 최대 {MAX_FILE_SIZE // (1024 * 1024)}MB",
             )
 
-        # BPM 분석 (동기 실행 - 충분히 빠름)
-        import asyncio
-
-        result = await asyncio.to_thread(bpm_service.analyze, str(temp_path))
+        # BPM 분석 (동기 실행 - 충분히 빠름, 워커 모드에서는 워커에 위임)
+        if remote:
+            result = await _analyze_with_worker(temp_path)
+        else:
+            result = await asyncio.to_thread(bpm_service.analyze, str(temp_path))
 
         return BpmAnalysisResponse(
             bpm=result.bpm,
@@ -104,6 +143,13 @@ async def analyze_bpm(
             detail=f"파일을 찾을 수 없습니다: {e}",
         ) from e
 
+    except TimeoutError as e:
+        logger.error("BPM analysis timed out: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="BPM 분석 시간이 초과되었습니다.",
+        ) from e
+
     except RuntimeError as e:
         logger.error("BPM analysis failed: %s", e)
         raise HTTPException(
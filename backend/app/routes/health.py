@@ -10,7 +10,8 @@ import subprocess
 
 from fastapi import APIRouter
 
-from app.models.schemas import HealthResponse
+from app.models.schemas import ConcurrencyResponse, HealthResponse
+from app.services.concurrency_controller import concurrency_controller
 from app.services.youtube_service import youtube_service
 
 router = APIRouter(tags=["health"])
@@ -55,3 +56,13 @@ async def health_check() -> HealthResponse:
         disk_space_mb=get_disk_space_mb(),
         active_conversions=youtube_service.active_count,
     )
+
+
+@router.get("/health/concurrency", response_model=ConcurrencyResponse)
+async def concurrency_status() -> ConcurrencyResponse:
+    """적응형 동시 실행 한도 상태를 반환합니다.
+
+    Returns:
+        한도별 현재 값, 실행/대기 수, 마지막 조정 이유와 변경 이력, 마지막 부하 측정값.
+    """
+    return ConcurrencyResponse(**concurrency_controller.snapshot())
@@ -0,0 +1,72 @@
+"""추론 노드 API 라우트.
+
+다른 인스턴스의 디스패처가 작업 배치에 사용하는 노드 상태와
+진행 상태 조회 엔드포인트를 제공합니다.
+"""
+
+from __future__ import annotations
+
+from fastapi import APIRouter, HTTPException, status
+
+from app.models.schemas import NodeStatusResponse, SeparationProgress
+from app.services.peer_cache import FILE_HASH_PATTERN
+from app.services.separation_service import separation_service
+from app.utils.system_resources import available_memory_bytes
+
+router = APIRouter(prefix="/node", tags=["node"])
+
+
+@router.get("/status", response_model=NodeStatusResponse)
+async def node_status(file_hash: str | None = None) -> NodeStatusResponse:
+    """노드의 대기열 깊이, 여유 메모리, 캐시 보유 여부를 반환합니다.
+
+    Args:
+        file_hash: 캐시 보유 여부를 확인할 입력 파일 해시 (선택).
+
+    Returns:
+        노드 상태.
+
+    Raises:
+        HTTPException: 해시 형식이 잘못되었을 때(400).
+    """
+    if file_hash is not None and not FILE_HASH_PATTERN.match(file_hash):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="잘못된 파일 해시입니다.",
+        )
+
+    return NodeStatusResponse(
+        queue_depth=separation_service.active_count,
+        max_concurrent=separation_service.scheduler.limit,
+        free_memory_bytes=available_memory_bytes(),
+        has_cache=bool(file_hash) and separation_service.has_cached_stems(file_hash),
+    )
+
+
+@router.get("/tasks/{task_id}", response_model=SeparationProgress)
+async def node_task(task_id: str) -> SeparationProgress:
+    """분리 태스크의 현재 진행 상태를 한 번 조회합니다 (SSE 대신 폴링용).
+
+    Args:
+        task_id: 태스크 ID.
+
+    Returns:
+        진행 상태.
+
+    Raises:
+        HTTPException: 태스크를 찾을 수 없을 때(404).
+    """
+    task = separation_service.get_task(task_id)
+    if task is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="태스크를 찾을 수 없습니다.",
+        )
+
+    return SeparationProgress(
+        progress=task.progress,
+        status=task.status,
+        stems=list(task.stems) if task.stems else None,
+        error=task.error,
+        quality=task.quality,
+    )
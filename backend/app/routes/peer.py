@@ -0,0 +1,167 @@
+"""피어 캐시 API 라우트.
+
+다른 인스턴스가 콘텐츠 해시로 이 인스턴스의 스템/BPM 캐시를 조회하고,
+일관 해싱 링에서 이 인스턴스가 맡은 항목을 복제해 넣는 엔드포인트를 제공합니다.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hmac
+import json
+import os
+import tempfile
+import wave
+from pathlib import Path
+from typing import Any
+
+import aiofiles
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import FileResponse
+
+from app.config import get_settings
+from app.services.bpm_service import BpmResult, bpm_service
+from app.services.peer_cache import FILE_HASH_PATTERN, PEER_TOKEN_HEADER
+from app.services.separation_service import STEM_NAMES, separation_service
+
+# 복제로 받는 스템 파일 최대 크기 (30분 스테레오 16-bit WAV 여유분)
+MAX_STEM_SIZE = 512 * 1024 * 1024
+
+
+def _verify_peer(request: Request) -> None:
+    """피어 토큰을 확인합니다 (CACHE_PEER_TOKEN이 비어 있으면 모든 요청 거절)."""
+    token = get_settings().cache_peer_token
+    if not token or not hmac.compare_digest(request.headers.get(PEER_TOKEN_HEADER, ""), token):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="피어 인증에 실패했습니다.",
+        )
+
+
+router = APIRouter(prefix="/peer", tags=["peer"], dependencies=[Depends(_verify_peer)])
+
+
+def _validate(file_hash: str, stem_name: str | None = None) -> None:
+    """해시와 스템 이름을 검증합니다 (경로 조작 방지)."""
+    if not FILE_HASH_PATTERN.match(file_hash):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="잘못된 파일 해시입니다.",
+        )
+    if stem_name is not None and stem_name not in STEM_NAMES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"잘못된 스템 이름입니다. 지원되는 스템: {', '.join(STEM_NAMES)}",
+        )
+
+
+def _is_stem_wav(path: Path) -> bool:
+    """받은 파일이 스템 형식 (16-bit 스테레오 PCM WAV)인지 확인합니다."""
+    try:
+        with wave.open(str(path), "rb") as wav_file:
+            return wav_file.getnchannels() == 2 and wav_file.getsampwidth() == 2
+    except (wave.Error, EOFError, OSError):
+        return False
+
+
+@router.get("/stems/{file_hash}/{stem_name}")
+async def get_peer_stem(file_hash: str, stem_name: str) -> FileResponse:
+    """캐시된 스템을 반환합니다 (네 스템이 모두 있을 때만).
+
+    Raises:
+        HTTPException: 잘못된 요청(400), 캐시에 없을 때(404).
+    """
+    _validate(file_hash, stem_name)
+    if not separation_service.has_cached_stems(file_hash):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="캐시에 없습니다.",
+        )
+    return FileResponse(
+        path=str(separation_service.cache_dir / file_hash / f"{stem_name}.wav"),
+        media_type="audio/wav",
+    )
+
+
+@router.put("/stems/{file_hash}/{stem_name}", status_code=status.HTTP_204_NO_CONTENT)
+async def put_peer_stem(file_hash: str, stem_name: str, request: Request) -> None:
+    """피어가 복제한 스템을 캐시에 저장합니다.
+
+    임시 파일에 받은 뒤 형식을 확인하고 rename하므로 반쯤 받았거나 스템이 아닌
+    파일은 캐시로 보이지 않습니다. 네 스템이 모두 모이면 완료 표시를 남기며,
+    이미 완료된 해시의 스템은 immutable로 제공 중이므로 바꾸지 않습니다.
+
+    Raises:
+        HTTPException: 잘못된 요청 또는 16-bit 스테레오 WAV가 아닐 때(400), 크기 초과(413).
+    """
+    _validate(file_hash, stem_name)
+    if separation_service.has_cached_stems(file_hash):
+        return
+    cache_path = separation_service.cache_dir / file_hash
+    await asyncio.to_thread(cache_path.mkdir, parents=True, exist_ok=True)
+
+    fd, tmp_name = await asyncio.to_thread(tempfile.mkstemp, dir=cache_path, suffix=".part")
+    os.close(fd)
+    tmp_path = Path(tmp_name)
+    received = 0
+    try:
+        async with aiofiles.open(tmp_path, "wb") as f:
+            async for chunk in request.stream():
+                received += len(chunk)
+                if received > MAX_STEM_SIZE:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail="스템 파일이 너무 큽니다.",
+                    )
+                await f.write(chunk)
+        if not await asyncio.to_thread(_is_stem_wav, tmp_path):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="스템은 16-bit 스테레오 WAV여야 합니다.",
+            )
+        await asyncio.to_thread(os.replace, tmp_path, cache_path / f"{stem_name}.wav")
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    await asyncio.to_thread(separation_service.complete_cached_stems, file_hash)
+
+
+@router.get("/bpm/{file_hash}")
+async def get_peer_bpm(file_hash: str) -> dict[str, Any]:
+    """캐시된 BPM 결과를 반환합니다.
+
+    Raises:
+        HTTPException: 잘못된 요청(400), 캐시에 없을 때(404).
+    """
+    _validate(file_hash)
+    result = bpm_service.cached_result(file_hash)
+    if result is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="캐시에 없습니다.",
+        )
+    return result.to_dict()
+
+
+@router.put("/bpm/{file_hash}", status_code=status.HTTP_204_NO_CONTENT)
+async def put_peer_bpm(file_hash: str, request: Request) -> None:
+    """피어가 복제한 BPM 결과를 캐시에 저장합니다.
+
+    Raises:
+        HTTPException: 잘못된 요청(400).
+    """
+    _validate(file_hash)
+    try:
+        data = json.loads(await request.body())
+        result = BpmResult(
+            bpm=float(data["bpm"]),
+            beats=[float(b) for b in data["beats"]],
+            confidence=float(data["confidence"]),
+            file_hash=file_hash,
+        )
+    except (ValueError, KeyError, TypeError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="잘못된 BPM 결과입니다.",
+        ) from e
+    await asyncio.to_thread(bpm_service.save_result, result)
@@ -7,20 +7,36 @@ from __future__ import annotations
 
 import asyncio
 import logging
+from collections import defaultdict
 from pathlib import Path
 
-import zipfile
-import io
-
-from fastapi import APIRouter, HTTPException, Request, status, UploadFile
-from fastapi.responses import FileResponse, StreamingResponse
+from fastapi import APIRouter, HTTPException, Query, Request, status, UploadFile
+from fastapi.responses import Response, StreamingResponse
 from sse_starlette.sse import EventSourceResponse
 
+from app.config import get_settings
 from app.models.schemas import (
     SeparationProgress,
     SeparationResponse,
 )
-from app.services.separation_service import separation_service, STEM_NAMES
+from app.routes.stems import (
+    packed_stem_headers,
+    packed_url,
+    peaks_url,
+    stem_headers,
+    stem_url,
+)
+from app.services.separation_service import (
+    STEM_NAMES,
+    SeparationTask,
+    separation_service,
+)
+from app.utils.admission import admission_controller
+from app.utils.audio_probe import HEADER_PROBE_BYTES, probe_duration, probe_duration_from_header
+from app.utils.audio_slice import slice_wav
+from app.utils.client import get_client_ip
+from app.utils.file_response import cached_file_response, sliced_file_response
+from app.utils.zip_stream import ZipEntry, iter_stored_zip, stored_zip_size
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +48,44 @@ SUPPORTED_FORMATS = {"audio/mpeg", "audio/wav", "audio/x-wav", "audio/flac"}
 # 최대 파일 크기 (500MB)
 MAX_FILE_SIZE = 500 * 1024 * 1024
 
+# 태스크별 진행 상태 SSE 구독자 수 (마지막 구독자가 떠나면 자동 취소)
+_subscribers: dict[str, int] = defaultdict(int)
+
+
+def _check_job_size(duration_seconds: float) -> None:
+    """오디오 길이와 예상 최대 메모리가 한도 안인지 확인합니다.
+
+    Raises:
+        HTTPException: 최대 길이를 넘거나 메모리 예산에 들어가지 않을 때(413).
+    """
+    max_duration = get_settings().separation_max_duration_seconds
+    if max_duration > 0 and duration_seconds > max_duration:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"오디오가 너무 깁니다. 최대 {max_duration / 60:.0f}분",
+        )
+
+    # 이 프로세스에서 분리할 때만 로컬 메모리 예산과 비교
+    if separation_service.remote_inference or separation_service.dispatcher is not None:
+        return
+    budget = separation_service.memory_budget_bytes()
+    estimate = separation_service.estimate_memory_bytes(duration_seconds)
+    if budget is not None and estimate > budget:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=(
+                f"오디오가 너무 길어 서버 메모리로 분리할 수 없습니다 "
+                f"(예상 {estimate // (1024 * 1024)}MB, 예산 {budget // (1024 * 1024)}MB)."
+            ),
+        )
+
+
+async def _cancel_if_abandoned(task_id: str, grace_seconds: float) -> None:
+    """유예 시간 동안 다시 구독하지 않으면 태스크를 취소합니다."""
+    await asyncio.sleep(grace_seconds)
+    if _subscribers.get(task_id, 0) == 0 and separation_service.cancel_task(task_id):
+        logger.info("Cancelled task %s after its last progress subscriber left", task_id)
+
 
 @router.post(
     "",
@@ -41,21 +95,29 @@ MAX_FILE_SIZE = 500 * 1024 * 1024
 async def separate_audio(
     request: Request,
     file: UploadFile,
+    max_wait: float | None = Query(
+        None, ge=0, description="허용할 최대 예상 대기 시간 (초). 넘으면 503으로 거절"
+    ),
 ) -> SeparationResponse:
     """오디오 파일을 4개 스템으로 분리합니다.
 
     1. 파일 형식 및 크기 검증
-    2. 백그라운드 분리 시작
+    2. 진입 제어 (예상 대기 시간, 여유 메모리)
+    3. 업로드 저장 중 헤더로 길이 확인 (최대 길이, 예상 메모리가 예산을 넘으면 거절)
+    4. 백그라운드 분리 시작
 
     Args:
         request: FastAPI 요청 객체.
         file: 업로드된 오디오 파일.
+        max_wait: 호출자가 허용하는 최대 예상 대기 시간 (초).
 
     Returns:
         202 응답과 태스크 ID.
 
     Raises:
-        HTTPException: 파일 형식이 지원되지 않거나 크기 제한 초과 시(400).
+        HTTPException: 파일 형식이 지원되지 않을 때(400),
+                      파일 크기, 오디오 길이, 예상 메모리가 한도를 넘을 때(413),
+                      대기열이 가득 찼거나 메모리가 부족할 때(503, Retry-After 포함).
     """
     # 파일 형식 검증
     content_type = file.content_type or ""
@@ -73,33 +135,65 @@ async def separate_audio(
             detail=f"파일이 너무 큽니다. 최대 {MAX_FILE_SIZE // (1024 * 1024)}MB",
         )
 
-    # 태스크 생성
-    task_id = separation_service.create_task()
+    # 진입 제어 (업로드를 저장하기 전에 거절하여 디스크/메모리를 쓰지 않음)
+    admission_controller.check(
+        await separation_service.estimated_wait_seconds(),
+        max_wait=max_wait,
+    )
 
-    # 임시 파일 저장
+    # 업로드 파일 저장 (재시작 후 재실행할 수 있도록 보관 디렉터리에 저장)
     import tempfile
     import aiofiles
 
-    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=f"_{file.filename}")
+    upload_dir = Path(get_settings().separation_upload_dir)
+    upload_dir.mkdir(parents=True, exist_ok=True)
+    temp_file = tempfile.NamedTemporaryFile(
+        delete=False, dir=upload_dir, suffix=f"_{file.filename}"
+    )
     temp_path = Path(temp_file.name)
 
     try:
-        # 파일 저장
+        # 파일 저장 (앞부분이 모이는 대로 헤더로 길이를 확인해 긴 파일은 저장 중에 거절)
+        head = bytearray()
+        duration: float | None = None
         async with aiofiles.open(temp_path, "wb") as f:
             while content := await file.read(8192):
                 await f.write(content)
+                if duration is None and len(head) < HEADER_PROBE_BYTES:
+                    head += content
+                    duration = probe_duration_from_header(bytes(head), file.size)
+                    if duration is not None:
+                        _check_job_size(duration)
 
         # 파일 크기 확인
         file_size = temp_path.stat().st_size
         if file_size > MAX_FILE_SIZE:
-            temp_path.unlink()
             raise HTTPException(
                 status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
                 detail=f"파일이 너무 큽니다. 최대 {MAX_FILE_SIZE // (1024 * 1024)}MB",
             )
 
-        # 백그라운드 분리 시작
-        asyncio.create_task(_run_separation(str(temp_path), task_id))
+        # 헤더로 알 수 없는 형식은 디코딩 없이 ffprobe로 조회
+        if duration is None:
+            duration = await asyncio.to_thread(probe_duration, temp_path)
+            if duration is not None:
+                _check_job_size(duration)
+
+        # 태스크 생성 (클라이언트별 공정 큐잉 기준은 IP)
+        task_id = separation_service.create_task(
+            client_id=get_client_ip(request),
+            duration_seconds=duration,
+        )
+
+        # 백그라운드 분리 시작 (워커 모드에서는 저장소 대기열에 넣음)
+        if separation_service.remote_inference:
+            separation_service.enqueue(temp_path, task_id)
+        else:
+            asyncio.create_task(separation_service.run_task(str(temp_path), task_id))
+
+    except HTTPException:
+        temp_path.unlink(missing_ok=True)
+        raise
 
     except Exception as e:
         temp_path.unlink(missing_ok=True)
@@ -115,36 +209,13 @@ async def separate_audio(
     )
 
 
-async def _run_separation(file_path: str, task_id: str) -> None:
-    """백그라운드에서 분리를 실행합니다.
-
-    Args:
-        file_path: 입력 파일 경로.
-        task_id: 태스크 ID.
-    """
-    import tempfile
-
-    try:
-        await separation_service.separate(file_path, task_id)
-    except FileNotFoundError as e:
-        logger.error("File not found for task %s: %s", task_id, e)
-        separation_service._update_progress(
-            task_id, -1.0, "failed", str(e)
-        )
-    except Exception as e:
-        logger.exception("Separation failed for task %s: %s", task_id, e)
-        separation_service._update_progress(
-            task_id, -1.0, "failed", str(e)
-        )
-    finally:
-        # 임시 파일 삭제
-        Path(file_path).unlink(missing_ok=True)
-
-
 @router.get("/{task_id}/progress")
 async def get_progress(task_id: str) -> EventSourceResponse:
     """분리 진행 상태를 SSE 스트리밍으로 전송합니다.
 
+    SEPARATION_CANCEL_ON_DISCONNECT가 켜져 있으면 마지막 구독자가 연결을 끊고
+    유예 시간 안에 다시 구독하지 않을 때 작업을 취소합니다.
+
     Args:
         task_id: 태스크 ID.
 
@@ -154,67 +225,215 @@ async def get_progress(task_id: str) -> EventSourceResponse:
 
     async def event_generator():
         """SSE 이벤트를 생성합니다."""
-        while True:
-            task = separation_service.get_task(task_id)
-
-            if task is None:
-                event = SeparationProgress(
-                    progress=-1.0,
-                    status="failed",
-                    error="태스크를 찾을 수 없습니다.",
-                )
-                yield {"data": event.model_dump_json()}
-                return
-
-            task_status = task.status
-
-            if task_status == "completed":
-                stems_list = list(task.stems.keys()) if task.stems else []
-                event = SeparationProgress(
-                    progress=100.0,
-                    status="completed",
-                    stems=stems_list,
-                )
-                yield {"data": event.model_dump_json()}
-                return
-
-            if task_status == "failed":
-                event = SeparationProgress(
-                    progress=-1.0,
-                    status="failed",
-                    error=task.error or "분리에 실패했습니다.",
-                )
-                yield {"data": event.model_dump_json()}
-                return
-
-            # 진행 중
+        _subscribers[task_id] += 1
+        try:
+            async for event in _progress_events(task_id):
+                yield event
+        finally:
+            _subscribers[task_id] -= 1
+            if _subscribers[task_id] <= 0:
+                _subscribers.pop(task_id, None)
+                settings = get_settings()
+                if settings.separation_cancel_on_disconnect:
+                    asyncio.create_task(
+                        _cancel_if_abandoned(task_id, settings.separation_disconnect_grace_seconds)
+                    )
+
+    return EventSourceResponse(event_generator())
+
+
+def _original_peaks_url(file_hash: str | None) -> str | None:
+    """원본 파형 피크가 만들어졌으면 URL을 반환합니다."""
+    if file_hash and separation_service.original_peaks(file_hash):
+        return peaks_url(file_hash)
+    return None
+
+
+async def _progress_events(task_id: str):
+    """태스크가 끝날 때까지 1초마다 진행 상태 이벤트를 생성합니다."""
+    while True:
+        task = separation_service.get_task(task_id)
+
+        if task is None:
+            event = SeparationProgress(
+                progress=-1.0,
+                status="failed",
+                error="태스크를 찾을 수 없습니다.",
+            )
+            yield {"data": event.model_dump_json()}
+            return
+
+        task_status = task.status
+
+        if task_status == "completed":
+            stems_list = list(task.stems.keys()) if task.stems else []
+            event = SeparationProgress(
+                progress=100.0,
+                status="completed",
+                stems=stems_list,
+                quality="full",
+                stem_urls=(
+                    {stem_name: stem_url(task.file_hash, stem_name) for stem_name in stems_list}
+                    if task.file_hash
+                    else None
+                ),
+                packed_url=packed_url(task.file_hash) if task.file_hash else None,
+                peaks_url=_original_peaks_url(task.file_hash),
+                silent_stems=(
+                    separation_service.silent_stems(task.file_hash) if task.file_hash else None
+                ),
+            )
+            yield {"data": event.model_dump_json()}
+            return
+
+        if task_status == "failed":
+            event = SeparationProgress(
+                progress=-1.0,
+                status="failed",
+                error=task.error or "분리에 실패했습니다.",
+            )
+            yield {"data": event.model_dump_json()}
+            return
+
+        if task_status == "cancelled":
             event = SeparationProgress(
                 progress=task.progress,
-                status=task_status,
+                status="cancelled",
+                error=task.error or "작업이 취소되었습니다.",
             )
             yield {"data": event.model_dump_json()}
+            return
 
-            await asyncio.sleep(1)
+        # 진행 중 (미리보기 스템이 게시되었으면 함께 알림, 대기 중이면 순번/예상 시작 시간)
+        queue_info = (
+            separation_service.queue_info(task_id) if task_status == "queued" else None
+        )
+        event = SeparationProgress(
+            progress=task.progress,
+            status=task_status,
+            quality=task.quality,
+            preview_stems=(
+                list(task.preview_stems.keys()) if task.preview_stems else None
+            ),
+            queue_position=queue_info.position if queue_info else None,
+            estimated_start_seconds=(
+                queue_info.estimated_start_seconds if queue_info else None
+            ),
+            peaks_url=_original_peaks_url(task.file_hash),
+        )
+        yield {"data": event.model_dump_json()}
 
-    return EventSourceResponse(event_generator())
+        await asyncio.sleep(1)
+
+
+@router.delete("/{task_id}", response_model=SeparationResponse)
+async def cancel_separation(task_id: str) -> SeparationResponse:
+    """분리 작업을 취소합니다.
+
+    대기 중인 작업은 대기열에서 빠지고, 실행 중인 작업은 슬롯을 즉시 반납한 뒤
+    다음 세그먼트 경계에서 추론을 멈춥니다.
+
+    Args:
+        task_id: 태스크 ID.
+
+    Returns:
+        취소된 태스크 정보.
+
+    Raises:
+        HTTPException: 태스크를 찾을 수 없을 때(404), 이미 끝난 태스크일 때(409).
+    """
+    task = separation_service.get_task(task_id)
+    if task is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="태스크를 찾을 수 없습니다.",
+        )
+
+    if not separation_service.cancel_task(task_id):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"이미 끝난 태스크입니다 (상태: {task.status}).",
+        )
+
+    return SeparationResponse(
+        task_id=task_id,
+        status="cancelled",
+        message="분리를 취소했습니다",
+    )
+
+
+def _current_stems(task: SeparationTask) -> tuple[dict[str, Path] | None, str]:
+    """태스크에서 현재 제공 가능한 스템과 품질을 반환합니다."""
+    if task.stems:
+        return task.stems, "full"
+    if task.preview_stems:
+        return task.preview_stems, "preview"
+    return None, "full"
+
+
+@router.get("/{task_id}/stems/packed")
+async def download_packed_stems(request: Request, task_id: str) -> Response:
+    """분리된 모든 스템을 8채널 WAV 하나로 다운로드합니다.
+
+    채널 쌍 순서는 X-Stem-Channels 헤더와 같습니다 (스템마다 L, R).
+
+    Args:
+        request: FastAPI 요청 객체.
+        task_id: 태스크 ID.
+
+    Returns:
+        멀티채널 WAV 응답 (200, 206, 304 또는 416).
+
+    Raises:
+        HTTPException: 태스크가 없거나 전체 품질 스템이 아직 없을 때(404).
+    """
+    task = separation_service.get_task(task_id)
+    packed = (
+        await separation_service.packed_stems(task.file_hash)
+        if task is not None and task.status == "completed" and task.file_hash
+        else None
+    )
+    if packed is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="스템 파일을 찾을 수 없습니다.",
+        )
+    return await cached_file_response(
+        request,
+        packed,
+        media_type="audio/wav",
+        headers=packed_stem_headers(),
+        immutable=True,
+    )
 
 
 @router.get("/{task_id}/stems/{stem_name}")
 async def download_stem(
+    request: Request,
     task_id: str,
     stem_name: str,
-) -> FileResponse:
+    start: float | None = Query(None, ge=0, description="구간 시작 (초)"),
+    end: float | None = Query(None, gt=0, description="구간 끝 (초)"),
+) -> Response:
     """분리된 스템 파일을 다운로드합니다.
 
+    전체 분리가 끝나기 전에는 미리보기 스템을 제공하며,
+    X-Stem-Quality 헤더(preview/full)로 품질을 알립니다.
+    내용 해시 ETag(If-None-Match -> 304)와 Range(탐색, 여러 구간)를 지원합니다.
+    start나 end를 주면 그 구간만 담은 WAV를 보냅니다.
+
     Args:
+        request: FastAPI 요청 객체.
         task_id: 태스크 ID.
         stem_name: 스템 이름 (vocals, drums, bass, other).
+        start: 구간 시작 (초).
+        end: 구간 끝 (초).
 
     Returns:
-        WAV 파일 응답.
+        WAV 파일 응답 (200, 206, 304 또는 416).
 
     Raises:
-        HTTPException: 스템 이름이 유효하지 않을 때(400), 파일을 찾을 수 없을 때(404).
+        HTTPException: 스템 이름이나 구간이 유효하지 않을 때(400), 파일을 찾을 수 없을 때(404).
     """
     # 스템 이름 검증
     if stem_name not in STEM_NAMES:
@@ -231,27 +450,40 @@ async def download_stem(
             detail="태스크를 찾을 수 없습니다.",
         )
 
-    # 스템 파일 경로 조회
-    if task.stems is None or stem_name not in task.stems:
+    # 스템 파일 경로 조회 (전체 품질 우선, 없으면 미리보기)
+    stems, quality = _current_stems(task)
+    if stems is None or stem_name not in stems:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="스템 파일을 찾을 수 없습니다.",
         )
 
-    stem_path = task.stems[stem_name]
+    stem_path = stems[stem_name]
     if not stem_path.exists():
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="스템 파일이 존재하지 않습니다.",
         )
 
-    return FileResponse(
-        path=str(stem_path),
+    # 전체 품질 스템은 이 태스크에서 더 바뀌지 않으므로 장기 캐싱,
+    # 미리보기는 전체 품질로 교체되므로 ETag로 재검증
+    if start is not None or end is not None:
+        return await sliced_file_response(
+            request,
+            stem_path,
+            slice_wav,
+            start,
+            end,
+            media_type="audio/wav",
+            headers=stem_headers(stem_name, quality, task.file_hash),
+            immutable=quality == "full",
+        )
+    return await cached_file_response(
+        request,
+        stem_path,
         media_type="audio/wav",
-        filename=f"{stem_name}.wav",
-        headers={
-            "Content-Disposition": f'attachment; filename="{stem_name}.wav"',
-        },
+        headers=stem_headers(stem_name, quality, task.file_hash),
+        immutable=quality == "full",
     )
 
 
@@ -262,6 +494,9 @@ async def download_all_stems(task_id: str) -> StreamingResponse:
     Args:
         task_id: 태스크 ID.
 
+    파일을 압축하지 않고(WAV는 거의 압축되지 않음) 읽는 대로 보내며,
+    전체 크기는 미리 계산하여 Content-Length로 알립니다.
+
     Returns:
         ZIP 파일 응답 (4개 스템 WAV 파일 포함).
 
@@ -283,20 +518,18 @@ async def download_all_stems(task_id: str) -> StreamingResponse:
             detail="스템 파일을 찾을 수 없습니다.",
         )
 
-    # ZIP 파일 생성
-    zip_buffer = io.BytesIO()
-
-    with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
-        for stem_name, stem_path in task.stems.items():
-            if stem_path.exists():
-                zip_file.write(stem_path, f"{stem_name}.wav")
-
-    zip_buffer.seek(0)
+    # 스트리밍 ZIP (압축 없이 청크 단위로 읽어 보내므로 요청당 메모리는 청크 하나)
+    entries = [
+        ZipEntry.from_path(f"{stem_name}.wav", stem_path)
+        for stem_name, stem_path in task.stems.items()
+        if stem_path.exists()
+    ]
 
     return StreamingResponse(
-        iter([zip_buffer.getvalue()]),
+        iter_stored_zip(entries),
         media_type="application/zip",
         headers={
             "Content-Disposition": f'attachment; filename="stems_{task_id}.zip"',
+            "Content-Length": str(stored_zip_size(entries)),
         },
     )
@@ -0,0 +1,614 @@
+"""콘텐츠 주소 스템 API 라우트.
+
+태스크 ID 기반 URL(/separate/{task_id}/stems/{stem})은 인메모리 태스크가 만료되거나
+재시작되면 사라지지만, 스템 파일은 입력 파일 해시 아래 캐시에 남아 있습니다.
+이 라우트는 (입력 해시, 모델, 스템)으로 캐시에서 바로 스템을 제공합니다.
+같은 URL의 내용은 바뀌지 않으므로 CDN과 프록시가 장기 캐싱할 수 있고,
+클라이언트는 파일 SHA-256으로 캐시를 먼저 조회해 태스크 생성을 건너뛸 수 있습니다.
+"""
+
+from __future__ import annotations
+
+import shutil
+from pathlib import Path
+
+from fastapi import APIRouter, HTTPException, Query, Request, status
+from fastapi.responses import Response, StreamingResponse
+
+from app.models.schemas import (
+    StemAnalysisResponse,
+    StemInfo,
+    StemSegment,
+    StemSegmentManifest,
+    StemSetResponse,
+)
+from app.services.peer_cache import FILE_HASH_PATTERN
+from app.services.separation_service import MODEL_NAME, STEM_NAMES, separation_service
+from app.services.stem_mixdown import (
+    MAX_GAIN,
+    MIX_FORMATS,
+    MIX_PRESETS,
+    iter_mixdown_opus,
+    iter_mixdown_wav,
+    mixdown_wav_size,
+    opus_available,
+    preset_for_gains,
+    resolve_gains,
+)
+from app.services.stem_segments import SEGMENT_MEDIA_TYPE
+from app.services.stem_stretch import MAX_SEMITONES, MAX_TEMPO_RATIO, MIN_TEMPO_RATIO
+from app.utils.audio_slice import slice_wav
+from app.utils.file_response import (
+    IMMUTABLE_CACHE_CONTROL,
+    cached_file_response,
+    sliced_file_response,
+)
+
+router = APIRouter(prefix="/stems", tags=["stems"])
+
+# 콘텐츠 주소 스템 URL 접두사
+STEMS_URL_PREFIX = "/api/v1/stems"
+
+# 파형 피크 파일 MIME 타입
+PEAKS_MEDIA_TYPE = "application/octet-stream"
+
+
+def stem_url(file_hash: str, stem_name: str, model: str = MODEL_NAME) -> str:
+    """스템의 콘텐츠 주소 URL을 반환합니다."""
+    return f"{STEMS_URL_PREFIX}/{file_hash}/{model}/{stem_name}"
+
+
+def packed_url(file_hash: str, model: str = MODEL_NAME) -> str:
+    """스템 묶음(8채널 WAV)의 콘텐츠 주소 URL을 반환합니다."""
+    return f"{STEMS_URL_PREFIX}/{file_hash}/{model}/packed"
+
+
+def analysis_url(file_hash: str, model: str = MODEL_NAME) -> str:
+    """스템 분석 결과의 콘텐츠 주소 URL을 반환합니다."""
+    return f"{STEMS_URL_PREFIX}/{file_hash}/{model}/analysis"
+
+
+def peaks_url(file_hash: str, stem_name: str | None = None, model: str = MODEL_NAME) -> str:
+    """파형 피크의 콘텐츠 주소 URL을 반환합니다 (stem_name이 없으면 원본 오디오)."""
+    if stem_name is None:
+        return f"{STEMS_URL_PREFIX}/{file_hash}/peaks"
+    return f"{stem_url(file_hash, stem_name, model)}/peaks"
+
+
+def segments_url(file_hash: str, stem_name: str, model: str = MODEL_NAME) -> str:
+    """스템 분할 스트리밍 매니페스트의 콘텐츠 주소 URL을 반환합니다."""
+    return f"{stem_url(file_hash, stem_name, model)}/segments"
+
+
+def packed_stem_headers() -> dict[str, str]:
+    """스템 묶음 응답 헤더 (파일 이름, 채널 쌍 순서)."""
+    return {
+        "Content-Disposition": 'attachment; filename="stems.wav"',
+        "X-Stem-Channels": ",".join(STEM_NAMES),
+        "X-Stem-Quality": "full",
+    }
+
+
+def stem_headers(stem_name: str, quality: str, file_hash: str | None) -> dict[str, str]:
+    """스템 다운로드 응답 헤더 (파일 이름, 품질, 무음 스템이면 X-Stem-Silent)."""
+    headers = {
+        "Content-Disposition": f'attachment; filename="{stem_name}.wav"',
+        "X-Stem-Quality": quality,
+    }
+    if quality == "full" and file_hash and stem_name in separation_service.silent_stems(file_hash):
+        headers["X-Stem-Silent"] = "true"
+    return headers
+
+
+def _check_stem_name(stem_name: str) -> None:
+    """스템 이름을 확인합니다.
+
+    Raises:
+        HTTPException: 지원하지 않는 스템 이름일 때(400).
+    """
+    if stem_name not in STEM_NAMES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"잘못된 스템 이름입니다. 지원되는 스템: {', '.join(STEM_NAMES)}",
+        )
+
+
+def _cached_stems(file_hash: str, model: str = MODEL_NAME) -> dict[str, Path]:
+    """해시와 모델로 캐시된 전체 품질 스템을 찾습니다.
+
+    Raises:
+        HTTPException: 해시 형식이 잘못되었을 때(400), 모델이 다르거나 캐시에 없을 때(404).
+    """
+    if not FILE_HASH_PATTERN.match(file_hash):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="잘못된 파일 해시입니다.",
+        )
+    stems = separation_service.cached_stems(file_hash) if model == MODEL_NAME else None
+    if stems is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="캐시된 스템이 없습니다.",
+        )
+    return stems
+
+
+@router.get("/{file_hash}", response_model=StemSetResponse)
+async def get_stem_set(file_hash: str) -> StemSetResponse:
+    """입력 파일 해시로 캐시된 스템 목록과 URL을 조회합니다.
+
+    Args:
+        file_hash: 입력 오디오 파일의 SHA-256 (16진수).
+
+    Returns:
+        모델 이름과 스템별 콘텐츠 주소 URL.
+
+    Raises:
+        HTTPException: 해시 형식이 잘못되었을 때(400), 캐시에 없을 때(404).
+    """
+    stems = _cached_stems(file_hash)
+    analysis = await separation_service.stem_analysis(file_hash)
+    return StemSetResponse(
+        file_hash=file_hash,
+        model=MODEL_NAME,
+        packed_url=packed_url(file_hash),
+        peaks_url=(
+            peaks_url(file_hash) if separation_service.original_peaks(file_hash) else None
+        ),
+        analysis_url=analysis_url(file_hash),
+        stems=[
+            StemInfo(
+                name=stem_name,
+                url=stem_url(file_hash, stem_name),
+                size_bytes=path.stat().st_size,
+                peaks_url=peaks_url(file_hash, stem_name),
+                segments_url=segments_url(file_hash, stem_name),
+                silent=analysis["stems"][stem_name]["silent"] if analysis else None,
+            )
+            for stem_name, path in stems.items()
+        ],
+    )
+
+
+@router.get("/{file_hash}/peaks")
+async def download_original_peaks(request: Request, file_hash: str) -> Response:
+    """원본 오디오의 다중 해상도 파형 피크를 다운로드합니다.
+
+    피크는 분리 작업 중 입력 파일에서 만들어지므로 스템보다 먼저 준비됩니다.
+
+    Args:
+        request: FastAPI 요청 객체.
+        file_hash: 입력 오디오 파일의 SHA-256 (16진수).
+
+    Returns:
+        피크 바이너리 응답 (200, 206, 304 또는 416).
+
+    Raises:
+        HTTPException: 해시 형식이 잘못되었을 때(400), 피크가 없을 때(404).
+    """
+    if not FILE_HASH_PATTERN.match(file_hash):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="잘못된 파일 해시입니다.",
+        )
+    peaks = separation_service.original_peaks(file_hash)
+    if peaks is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="파형 피크가 없습니다.",
+        )
+    return await cached_file_response(
+        request, peaks, media_type=PEAKS_MEDIA_TYPE, immutable=True
+    )
+
+
+@router.get("/{file_hash}/{model}/analysis", response_model=StemAnalysisResponse)
+async def get_stem_analysis(file_hash: str, model: str) -> StemAnalysisResponse:
+    """스템별 음량 엔벨로프, 라우드니스, 무음 판정 결과를 조회합니다.
+
+    무음 스템은 다운로드를 건너뛰고 frames 길이의 무음 버퍼로 대체할 수 있습니다.
+
+    Args:
+        file_hash: 입력 오디오 파일의 SHA-256 (16진수).
+        model: 분리 모델 이름.
+
+    Returns:
+        스템별 분석 결과.
+
+    Raises:
+        HTTPException: 해시 형식이 잘못되었을 때(400), 캐시에 없을 때(404).
+    """
+    _cached_stems(file_hash, model)
+    analysis = await separation_service.stem_analysis(file_hash)
+    if analysis is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="캐시된 스템이 없습니다.",
+        )
+    return StemAnalysisResponse(file_hash=file_hash, model=model, **analysis)
+
+
+@router.get("/{file_hash}/{model}/mix")
+async def download_mixdown(
+    request: Request,
+    file_hash: str,
+    model: str,
+    preset: str | None = Query(None, description=f"믹스 프리셋 ({', '.join(MIX_PRESETS)})"),
+    vocals: float | None = Query(None, ge=0, le=MAX_GAIN, description="보컬 게인"),
+    drums: float | None = Query(None, ge=0, le=MAX_GAIN, description="드럼 게인"),
+    bass: float | None = Query(None, ge=0, le=MAX_GAIN, description="베이스 게인"),
+    other: float | None = Query(None, ge=0, le=MAX_GAIN, description="기타 악기 게인"),
+    fmt: str = Query("wav", alias="format", pattern="^(wav|opus)$", description="출력 형식"),
+) -> Response:
+    """스템별 게인을 적용한 믹스 하나를 다운로드합니다.
+
+    프리셋 위에 스템별 게인(선형, 지정하지 않으면 1.0)을 덮어쓸 수 있습니다.
+    결과가 프리셋과 같으면 캐시된 믹스 파일을 제공하고 (ETag, Range 지원),
+    그 밖의 게인 조합은 요청마다 청크 단위로 계산하여 스트리밍합니다.
+
+    Args:
+        request: FastAPI 요청 객체.
+        file_hash: 입력 오디오 파일의 SHA-256 (16진수).
+        model: 분리 모델 이름.
+        preset: 믹스 프리셋 이름.
+        vocals: 보컬 게인.
+        drums: 드럼 게인.
+        bass: 베이스 게인.
+        other: 기타 악기 게인.
+        fmt: 출력 형식 (wav 또는 opus).
+
+    Returns:
+        믹스 오디오 응답.
+
+    Raises:
+        HTTPException: 프리셋이나 해시가 잘못되었을 때(400), 캐시에 없을 때(404),
+                       Opus 인코딩에 필요한 ffmpeg가 없을 때(503).
+    """
+    if preset is not None and preset not in MIX_PRESETS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"잘못된 프리셋입니다. 지원되는 프리셋: {', '.join(MIX_PRESETS)}",
+        )
+    stems = _cached_stems(file_hash, model)
+    if fmt == "opus" and not opus_available():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Opus 인코딩을 사용할 수 없습니다.",
+        )
+
+    overrides = {
+        name: gain
+        for name, gain in zip(STEM_NAMES, (vocals, drums, bass, other))
+        if gain is not None
+    }
+    gains = resolve_gains(STEM_NAMES, {**MIX_PRESETS.get(preset or "", {}), **overrides})
+    matched = preset_for_gains(gains)
+    filename = f"mix_{matched or 'custom'}.{fmt}"
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+
+    if matched is not None:
+        mix = await separation_service.mixdown(file_hash, matched, fmt)
+        if mix is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="캐시된 스템이 없습니다.",
+            )
+        return await cached_file_response(
+            request, mix, media_type=MIX_FORMATS[fmt], headers=headers, immutable=True
+        )
+
+    # 같은 URL (해시, 모델, 게인)의 믹스는 바뀌지 않음
+    headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+    if fmt == "opus":
+        return StreamingResponse(
+            iter_mixdown_opus(stems, gains), media_type=MIX_FORMATS[fmt], headers=headers
+        )
+    headers["Content-Length"] = str(mixdown_wav_size(stems))
+    return StreamingResponse(
+        iter_mixdown_wav(stems, gains), media_type=MIX_FORMATS[fmt], headers=headers
+    )
+
+
+@router.get("/{file_hash}/{model}/stretch")
+async def download_stretched(
+    request: Request,
+    file_hash: str,
+    model: str,
+    stem: str | None = Query(None, description=f"스템 이름 ({', '.join(STEM_NAMES)})"),
+    preset: str | None = Query(None, description=f"믹스 프리셋 ({', '.join(MIX_PRESETS)})"),
+    tempo: float = Query(
+        1.0, ge=MIN_TEMPO_RATIO, le=MAX_TEMPO_RATIO, description="템포 배율 (1.0 = 원래 속도)"
+    ),
+    semitones: float = Query(
+        0.0, ge=-MAX_SEMITONES, le=MAX_SEMITONES, description="반음 단위 피치 변환"
+    ),
+    start: float | None = Query(None, ge=0, description="구간 시작 (초)"),
+    end: float | None = Query(None, gt=0, description="구간 끝 (초)"),
+) -> Response:
+    """스템이나 프리셋 믹스 (또는 그 A-B 구간)를 템포/피치 변환하여 다운로드합니다.
+
+    결과는 (해시, 원본, 템포, 반음, 구간)별로 캐시되어 같은 요청은 파일을 그대로
+    제공합니다 (ETag, Range 지원).
+
+    Args:
+        request: FastAPI 요청 객체.
+        file_hash: 입력 오디오 파일의 SHA-256 (16진수).
+        model: 분리 모델 이름.
+        stem: 스템 이름 (preset과 둘 중 하나).
+        preset: 믹스 프리셋 이름 (stem과 둘 중 하나).
+        tempo: 템포 배율.
+        semitones: 반음 단위 피치 변환.
+        start: 구간 시작 (초).
+        end: 구간 끝 (초).
+
+    Returns:
+        16-bit WAV 응답.
+
+    Raises:
+        HTTPException: 요청이 잘못되었을 때(400), 캐시에 없을 때(404),
+                       렌더링에 실패했을 때(500), ffmpeg가 없을 때(503).
+    """
+    if (stem is None) == (preset is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="stem과 preset 중 하나만 지정해야 합니다.",
+        )
+    if stem is not None:
+        _check_stem_name(stem)
+    elif preset not in MIX_PRESETS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"잘못된 프리셋입니다. 지원되는 프리셋: {', '.join(MIX_PRESETS)}",
+        )
+    if start is not None and end is not None and start >= end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="구간 시작은 끝보다 앞이어야 합니다.",
+        )
+    _cached_stems(file_hash, model)
+    if shutil.which("ffmpeg") is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="템포/피치 렌더링을 사용할 수 없습니다.",
+        )
+
+    source = stem if stem is not None else f"mix_{preset}"
+    try:
+        path = await separation_service.stretch(
+            file_hash, source, tempo, semitones, start, end
+        )
+    except RuntimeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e),
+        ) from e
+    if path is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="캐시된 스템이 없습니다.",
+        )
+    headers = {"Content-Disposition": f'attachment; filename="{path.name}"'}
+    return await cached_file_response(
+        request, path, media_type="audio/wav", headers=headers, immutable=True
+    )
+
+
+@router.get("/{file_hash}/{model}/packed")
+async def download_packed_stems(
+    request: Request,
+    file_hash: str,
+    model: str,
+) -> Response:
+    """모든 스템을 채널 쌍으로 묶은 8채널 WAV 하나를 다운로드합니다.
+
+    한 번의 요청과 디코딩으로 모든 스템을 얻을 수 있으며, 채널 순서는
+    X-Stem-Channels 헤더의 스템 순서와 같습니다 (스템마다 L, R).
+
+    Args:
+        request: FastAPI 요청 객체.
+        file_hash: 입력 오디오 파일의 SHA-256 (16진수).
+        model: 분리 모델 이름.
+
+    Returns:
+        멀티채널 WAV 응답 (200, 206, 304 또는 416).
+
+    Raises:
+        HTTPException: 해시 형식이 잘못되었을 때(400), 캐시에 없을 때(404).
+    """
+    _cached_stems(file_hash, model)
+    packed = await separation_service.packed_stems(file_hash)
+    if packed is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="캐시된 스템이 없습니다.",
+        )
+    return await cached_file_response(
+        request,
+        packed,
+        media_type="audio/wav",
+        headers=packed_stem_headers(),
+        immutable=True,
+    )
+
+
+@router.get("/{file_hash}/{model}/{stem_name}/peaks")
+async def download_stem_peaks(
+    request: Request,
+    file_hash: str,
+    model: str,
+    stem_name: str,
+) -> Response:
+    """캐시된 스템의 다중 해상도 파형 피크를 다운로드합니다.
+
+    처음 요청될 때 스템에서 한 번 만들어 캐시에 둡니다.
+
+    Args:
+        request: FastAPI 요청 객체.
+        file_hash: 입력 오디오 파일의 SHA-256 (16진수).
+        model: 분리 모델 이름.
+        stem_name: 스템 이름 (vocals, drums, bass, other).
+
+    Returns:
+        피크 바이너리 응답 (200, 206, 304 또는 416).
+
+    Raises:
+        HTTPException: 해시나 스템 이름이 잘못되었을 때(400), 캐시에 없을 때(404).
+    """
+    _check_stem_name(stem_name)
+    _cached_stems(file_hash, model)
+    peaks = await separation_service.stem_peaks(file_hash, stem_name)
+    if peaks is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="캐시된 스템이 없습니다.",
+        )
+    return await cached_file_response(
+        request, peaks, media_type=PEAKS_MEDIA_TYPE, immutable=True
+    )
+
+
+@router.get("/{file_hash}/{model}/{stem_name}/segments", response_model=StemSegmentManifest)
+async def get_stem_segments(file_hash: str, model: str, stem_name: str) -> StemSegmentManifest:
+    """캐시된 스템의 분할 스트리밍 매니페스트를 조회합니다.
+
+    처음 요청될 때 스템을 고정 길이 FLAC 세그먼트로 한 번 인코딩합니다.
+    클라이언트는 재생 위치에 해당하는 세그먼트만 받아 디코딩하면 됩니다.
+
+    Args:
+        file_hash: 입력 오디오 파일의 SHA-256 (16진수).
+        model: 분리 모델 이름.
+        stem_name: 스템 이름 (vocals, drums, bass, other).
+
+    Returns:
+        세그먼트별 URL, 시작 시각, 길이.
+
+    Raises:
+        HTTPException: 해시나 스템 이름이 잘못되었을 때(400), 캐시에 없을 때(404),
+                       인코딩에 실패했을 때(500), ffmpeg가 없을 때(503).
+    """
+    _check_stem_name(stem_name)
+    _cached_stems(file_hash, model)
+    if shutil.which("ffmpeg") is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="분할 스트리밍을 사용할 수 없습니다.",
+        )
+    try:
+        manifest = await separation_service.stem_segments(file_hash, stem_name)
+    except RuntimeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e),
+        ) from e
+    if manifest is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="캐시된 스템이 없습니다.",
+        )
+    base_url = segments_url(file_hash, stem_name, model)
+    return StemSegmentManifest(
+        file_hash=file_hash,
+        model=model,
+        stem=stem_name,
+        mime_type=manifest["mime_type"],
+        sample_rate=manifest["sample_rate"],
+        channels=manifest["channels"],
+        duration=manifest["duration"],
+        segment_seconds=manifest["segment_seconds"],
+        segments=[
+            StemSegment(
+                url=f"{base_url}/{segment['file']}",
+                start=segment["start"],
+                duration=segment["duration"],
+            )
+            for segment in manifest["segments"]
+        ],
+    )
+
+
+@router.get("/{file_hash}/{model}/{stem_name}/segments/{segment}")
+async def download_stem_segment(
+    request: Request,
+    file_hash: str,
+    model: str,
+    stem_name: str,
+    segment: str,
+) -> Response:
+    """분할 스트리밍 세그먼트 하나를 다운로드합니다 (장기 immutable 캐싱).
+
+    세그먼트는 매니페스트를 조회할 때 만들어지므로 그 전에는 404를 반환합니다.
+
+    Args:
+        request: FastAPI 요청 객체.
+        file_hash: 입력 오디오 파일의 SHA-256 (16진수).
+        model: 분리 모델 이름.
+        stem_name: 스템 이름 (vocals, drums, bass, other).
+        segment: 세그먼트 파일 이름 (매니페스트의 URL).
+
+    Returns:
+        FLAC 세그먼트 응답 (200, 206, 304 또는 416).
+
+    Raises:
+        HTTPException: 해시나 스템 이름이 잘못되었을 때(400), 세그먼트가 없을 때(404).
+    """
+    _check_stem_name(stem_name)
+    _cached_stems(file_hash, model)
+    path = separation_service.stem_segment(file_hash, stem_name, segment)
+    if path is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="세그먼트가 없습니다.",
+        )
+    return await cached_file_response(
+        request, path, media_type=SEGMENT_MEDIA_TYPE, immutable=True
+    )
+
+
+@router.get("/{file_hash}/{model}/{stem_name}")
+async def download_cached_stem(
+    request: Request,
+    file_hash: str,
+    model: str,
+    stem_name: str,
+    start: float | None = Query(None, ge=0, description="구간 시작 (초)"),
+    end: float | None = Query(None, gt=0, description="구간 끝 (초)"),
+) -> Response:
+    """캐시된 스템을 콘텐츠 주소로 다운로드합니다 (장기 immutable 캐싱).
+
+    start나 end를 주면 그 구간만 담은 WAV를 보냅니다 (디코딩 없이 바이트 범위 계산).
+
+    Args:
+        request: FastAPI 요청 객체.
+        file_hash: 입력 오디오 파일의 SHA-256 (16진수).
+        model: 분리 모델 이름.
+        stem_name: 스템 이름 (vocals, drums, bass, other).
+        start: 구간 시작 (초).
+        end: 구간 끝 (초).
+
+    Returns:
+        WAV 파일 응답 (200, 206, 304 또는 416).
+
+    Raises:
+        HTTPException: 해시, 스템 이름이나 구간이 잘못되었을 때(400), 캐시에 없을 때(404).
+    """
+    _check_stem_name(stem_name)
+    stems = _cached_stems(file_hash, model)
+
+    if start is not None or end is not None:
+        return await sliced_file_response(
+            request,
+            stems[stem_name],
+            slice_wav,
+            start,
+            end,
+            media_type="audio/wav",
+            headers=stem_headers(stem_name, "full", file_hash),
+            immutable=True,
+        )
+    return await cached_file_response(
+        request,
+        stems[stem_name],
+        media_type="audio/wav",
+        headers=stem_headers(stem_name, "full", file_hash),
+        immutable=True,
+    )
@@ -9,13 +9,16 @@ import asyncio
 import json
 import logging
 
-from fastapi import APIRouter, HTTPException, Request, status
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, HTTPException, Query, Request, status
+from fastapi.responses import Response
 from sse_starlette.sse import EventSourceResponse
 
 from app.config import get_settings
 from app.models.schemas import ConvertRequest, ConvertResponse, ProgressEvent
 from app.services.youtube_service import youtube_service
+from app.utils.audio_slice import slice_mp3
+from app.utils.client import get_client_ip
+from app.utils.file_response import cached_file_response, sliced_file_response
 from app.utils.rate_limiter import rate_limiter
 
 logger = logging.getLogger(__name__)
@@ -23,18 +26,6 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/youtube", tags=["youtube"])
 
 
-def _get_client_ip(request: Request) -> str:
-    """클라이언트 IP 주소를 가져옵니다."""
-    # X-Forwarded-For 헤더 확인 (프록시 뒤에 있을 경우)
-    forwarded = request.headers.get("X-Forwarded-For")
-    if forwarded:
-        return forwarded.split(",")[0].strip()
-    # 직접 연결인 경우
-    if request.client:
-        return request.client.host
-    return "unknown"
-
-
 @router.post(
     "/convert",
     response_model=ConvertResponse,
@@ -63,7 +54,7 @@ async def convert_youtube(
     settings = get_settings()
 
     # 요율 제한 확인
-    client_ip = _get_client_ip(request)
+    client_ip = get_client_ip(request)
     rate_limiter.check_rate_limit(client_ip)
 
     # 동영상 메타데이터 검증
@@ -81,7 +72,7 @@ async def convert_youtube(
     task = youtube_service.get_task(task_id)
     if task is not None:
         task["title"] = video_info.get("title", "audio")
-    asyncio.create_task(youtube_service.start_conversion(body.url, task_id))
+    asyncio.create_task(youtube_service.start_conversion(body.url, task_id, client_ip))
 
     return ConvertResponse(
         task_id=task_id,
@@ -157,17 +148,29 @@ async def get_progress(task_id: str) -> EventSourceResponse:
 
 
 @router.get("/download/{task_id}")
-async def download_file(task_id: str) -> FileResponse:
+async def download_file(
+    request: Request,
+    task_id: str,
+    start: float | None = Query(None, ge=0, description="구간 시작 (초)"),
+    end: float | None = Query(None, gt=0, description="구간 끝 (초)"),
+) -> Response:
     """변환된 MP3 파일을 다운로드합니다.
 
+    태스크의 MP3는 변환 뒤 바뀌지 않으므로 내용 해시 ETag와 함께
+    장기 immutable 캐싱하며, Range(탐색, 여러 구간)를 지원합니다.
+    start나 end를 주면 프레임 색인으로 그 구간을 덮는 프레임만 보냅니다.
+
     Args:
+        request: FastAPI 요청 객체.
         task_id: 태스크 ID.
+        start: 구간 시작 (초).
+        end: 구간 끝 (초).
 
     Returns:
-        MP3 파일 응답.
+        MP3 파일 응답 (200, 206, 304 또는 416).
 
     Raises:
-        HTTPException: 파일을 찾을 수 없을 때(404).
+        HTTPException: 구간이 잘못되었을 때(400), 파일을 찾을 수 없을 때(404).
     """
     filepath = youtube_service.get_download_path(task_id)
     if filepath is None:
@@ -182,13 +185,24 @@ async def download_file(task_id: str) -> FileResponse:
     if not safe_title:
         safe_title = "audio"
 
-    return FileResponse(
-        path=str(filepath),
+    headers = {"Content-Disposition": f'attachment; filename="{safe_title}.mp3"'}
+    if start is not None or end is not None:
+        return await sliced_file_response(
+            request,
+            filepath,
+            slice_mp3,
+            start,
+            end,
+            media_type="audio/mpeg",
+            headers=headers,
+            immutable=True,
+        )
+    return await cached_file_response(
+        request,
+        filepath,
         media_type="audio/mpeg",
-        filename=f"{safe_title}.mp3",
-        headers={
-            "Content-Disposition": f'attachment; filename="{safe_title}.mp3"',
-        },
+        headers=headers,
+        immutable=True,
     )
 
 
@@ -0,0 +1,162 @@
+"""요청 간 배치 추론 모듈.
+
+여러 분리 작업이 동시에 진행될 때 각 작업의 세그먼트를 모아
+하나의 모델 forward 호출로 처리하고, 결과를 원래 작업으로 돌려줍니다.
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from collections.abc import Callable, Sequence
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# 배치 forward 함수 타입: 세그먼트 리스트 -> 같은 순서의 결과 시퀀스
+BatchForwardFn = Callable[[list[Any]], Sequence[Any]]
+
+
+@dataclass
+class _PendingSegment:
+    """배치 대기 중인 세그먼트."""
+
+    segment: Any
+    future: Future = field(default_factory=Future)
+
+
+class SegmentBatcher:
+    """세그먼트 배치 스케줄러.
+
+    특징:
+    - 최대 배치 크기 또는 대기 시간(window)에 도달하면 forward 실행
+    - 작업별 Future로 결과 라우팅
+    - 취소된 세그먼트는 forward 전에 제외
+    - 단일 백그라운드 스레드에서 모델 호출 (모델 동시 접근 없음)
+    """
+
+    def __init__(
+        self,
+        forward: BatchForwardFn,
+        max_batch_size: int = 4,
+        max_wait_ms: float = 20.0,
+    ) -> None:
+        """SegmentBatcher를 초기화합니다.
+
+        Args:
+            forward: 세그먼트 리스트를 받아 결과 시퀀스를 반환하는 함수.
+            max_batch_size: 한 번의 forward에 넣을 최대 세그먼트 수.
+            max_wait_ms: 첫 세그먼트 도착 후 배치를 채우기 위해 기다리는 최대 시간.
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be >= 1")
+
+        self._forward = forward
+        self.max_batch_size = max_batch_size
+        self.max_wait_seconds = max(0.0, max_wait_ms) / 1000.0
+
+        self._queue: queue.Queue[_PendingSegment | None] = queue.Queue()
+        self._closed = False
+        self._batches = 0
+        self._segments = 0
+
+        self._thread = threading.Thread(
+            target=self._loop,
+            name="segment-batcher",
+            daemon=True,
+        )
+        self._thread.start()
+
+    @property
+    def stats(self) -> dict[str, float]:
+        """배치 처리 통계를 반환합니다."""
+        return {
+            "batches": self._batches,
+            "segments": self._segments,
+            "mean_batch_size": (self._segments / self._batches) if self._batches else 0.0,
+        }
+
+    def submit(self, segment: Any) -> Future:
+        """세그먼트를 배치 큐에 넣고 결과 Future를 반환합니다.
+
+        Raises:
+            RuntimeError: 이미 종료된 배처에 제출할 때.
+        """
+        if self._closed:
+            raise RuntimeError("SegmentBatcher is closed")
+        pending = _PendingSegment(segment)
+        self._queue.put(pending)
+        return pending.future
+
+    def infer(self, segment: Any) -> Any:
+        """세그먼트를 제출하고 결과가 나올 때까지 대기합니다."""
+        return self.submit(segment).result()
+
+    def close(self, timeout: float | None = 5.0) -> None:
+        """배처를 종료합니다. 이미 큐에 있는 세그먼트는 처리 후 종료합니다."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _collect(self, first: _PendingSegment) -> tuple[list[_PendingSegment], bool]:
+        """첫 세그먼트 이후 배치 크기/대기 시간 한도까지 세그먼트를 모읍니다.
+
+        Returns:
+            (배치, 종료 신호 수신 여부) 튜플.
+        """
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait_seconds
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = (
+                    self._queue.get(timeout=remaining)
+                    if remaining > 0
+                    else self._queue.get_nowait()
+                )
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+
+        return batch, False
+
+    def _loop(self) -> None:
+        """배치 수집 및 forward 실행 루프."""
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+
+            batch, stop = self._collect(first)
+            # 취소된 세그먼트 제외 (작업 취소 시 불필요한 연산 방지)
+            batch = [p for p in batch if p.future.set_running_or_notify_cancel()]
+
+            if batch:
+                self._run_batch(batch)
+
+            if stop:
+                return
+
+    def _run_batch(self, batch: list[_PendingSegment]) -> None:
+        """배치 forward를 실행하고 결과를 각 Future에 전달합니다."""
+        try:
+            outputs = self._forward([p.segment for p in batch])
+        except Exception as e:
+            logger.exception("Batched forward failed (size=%d)", len(batch))
+            for pending in batch:
+                pending.future.set_exception(e)
+            return
+
+        self._batches += 1
+        self._segments += len(batch)
+        for i, pending in enumerate(batch):
+            pending.future.set_result(outputs[i])
@@ -18,6 +18,8 @@ import collections.abc
 
 import numpy as np
 
+from app.services.peer_cache import get_peer_cache
+
 logger = logging.getLogger(__name__)
 
 # madmom 0.16.1 호환성 패치 (Python 3.13 + NumPy 2.x)
@@ -228,6 +230,9 @@ class BpmService:
         self.cache_dir = Path(cache_dir or "/tmp/bpm_cache")
         self.cache_dir.mkdir(parents=True, exist_ok=True)
 
+        # 피어 캐시 (CACHE_PEERS가 설정된 경우)
+        self.peer_cache = get_peer_cache()
+
         logger.info("BpmService initialized with cache_dir=%s", self.cache_dir)
 
     def _get_file_hash(self, file_path: Path) -> str:
@@ -245,6 +250,14 @@ class BpmService:
                 sha256.update(chunk)
         return sha256.hexdigest()
 
+    def cached_result(self, file_hash: str) -> BpmResult | None:
+        """해시에 대한 캐시된 BPM 결과를 반환합니다 (피어 제공용, 없으면 None)."""
+        return self._get_cached_result(file_hash)
+
+    def save_result(self, result: BpmResult) -> None:
+        """BPM 결과를 캐시에 저장합니다 (피어 복제 수신용)."""
+        self._save_cached_result(result)
+
     def _get_cached_result(self, file_hash: str) -> BpmResult | None:
         """캐시된 BPM 결과를 조회합니다.
 
@@ -315,6 +328,23 @@ class BpmService:
             logger.info("Using cached BPM result for hash=%s", file_hash[:16])
             return cached
 
+        # 피어 캐시 확인
+        if self.peer_cache is not None:
+            peer_result = self.peer_cache.fetch_bpm(file_hash)
+            if peer_result is not None:
+                try:
+                    result = BpmResult(
+                        bpm=peer_result["bpm"],
+                        beats=peer_result["beats"],
+                        confidence=peer_result["confidence"],
+                        file_hash=file_hash,
+                    )
+                except (KeyError, TypeError) as e:
+                    logger.warning("Ignoring malformed peer BPM result: %s", e)
+                else:
+                    self._save_cached_result(result)
+                    return result
+
         # 분석 실행
         try:
             if _MADMOM_AVAILABLE:
@@ -337,8 +367,10 @@ class BpmService:
                 file_hash=file_hash,
             )
 
-            # 캐시 저장
+            # 캐시 저장 (소유 피어에도 복제)
             self._save_cached_result(result)
+            if self.peer_cache is not None:
+                self.peer_cache.replicate_bpm(file_hash, result.to_dict())
 
             logger.info(
                 "BPM analysis completed: bpm=%.1f, beats=%d, confidence=%.2f, algorithm=%s",
@@ -9,6 +9,7 @@ import asyncio
 import logging
 import shutil
 import time
+from collections.abc import Callable
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
@@ -107,7 +108,11 @@ def check_disk_usage(download_dir: Path) -> int:
     return deleted_count
 
 
-def cleanup_expired_tasks(tasks: dict, expiry_seconds: int = FILE_EXPIRY_SECONDS) -> int:
+def cleanup_expired_tasks(
+    tasks: dict,
+    expiry_seconds: int = FILE_EXPIRY_SECONDS,
+    on_remove: Callable[[str], None] | None = None,
+) -> int:
     """완료/실패한 태스크를 인메모리 딕셔너리에서 제거합니다.
 
     Note:
@@ -117,6 +122,7 @@ def cleanup_expired_tasks(tasks: dict, expiry_seconds: int = FILE_EXPIRY_SECONDS
     Args:
         tasks: 태스크 딕셔너리.
         expiry_seconds: 만료 시간 (초).
+        on_remove: 제거된 태스크 ID마다 호출할 콜백 (예: 영속 저장소에서 삭제).
 
     Returns:
         제거된 태스크 수.
@@ -143,6 +149,8 @@ def cleanup_expired_tasks(tasks: dict, expiry_seconds: int = FILE_EXPIRY_SECONDS
 
     for task_id in expired_ids:
         tasks.pop(task_id, None)
+        if on_remove is not None:
+            on_remove(task_id)
 
     if expired_ids:
         logger.info("Removed %d expired tasks from memory", len(expired_ids))
@@ -150,7 +158,11 @@ def cleanup_expired_tasks(tasks: dict, expiry_seconds: int = FILE_EXPIRY_SECONDS
     return len(expired_ids)
 
 
-async def run_cleanup_loop(download_dir: Path, tasks: dict | None = None) -> None:
+async def run_cleanup_loop(
+    download_dir: Path,
+    tasks: dict | None = None,
+    on_remove: Callable[[str], None] | None = None,
+) -> None:
     """백그라운드 정리 루프를 실행합니다.
 
     10분마다 만료된 파일과 태스크를 정리합니다.
@@ -158,6 +170,7 @@ async def run_cleanup_loop(download_dir: Path, tasks: dict | None = None) -> Non
     Args:
         download_dir: 다운로드 디렉터리 경로.
         tasks: 태스크 딕셔너리 (선택사항).
+        on_remove: 만료된 태스크 ID마다 호출할 콜백 (선택사항).
     """
     while True:
         try:
@@ -165,7 +178,7 @@ async def run_cleanup_loop(download_dir: Path, tasks: dict | None = None) -> Non
             cleanup_old_files(download_dir)
             check_disk_usage(download_dir)
             if tasks is not None:
-                cleanup_expired_tasks(tasks)
+                cleanup_expired_tasks(tasks, on_remove=on_remove)
         except asyncio.CancelledError:
             logger.info("Cleanup loop cancelled")
             break
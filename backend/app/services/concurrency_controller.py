@@ -0,0 +1,329 @@
+"""적응형 동시 실행 한도 조정 모듈.
+
+분리(SEPARATION_MAX_CONCURRENT)와 YouTube 다운로드(MAX_CONCURRENT_DOWNLOADS)의
+고정 한도는 큰 서버에서는 너무 낮고 작은 서버에서는 너무 높습니다.
+이 모듈은 설정값을 시작점으로 삼아 AIMD(additive increase, multiplicative decrease)
+방식으로 실제 한도를 주기적으로 조정합니다.
+
+- 감소 (한도 x 0.5): 메모리 PSI가 높거나, 메모리 여유분이 부족하거나,
+  코어당 load average가 과부하 기준을 넘을 때
+- 되돌림 (한도 - 1): 직전 증가 뒤 관측한 처리량(실행 수 / 실시간 비율)이
+  늘지 않았을 때 (작업당 속도가 떨어져 병렬화 이득이 없음)
+- 증가 (한도 + 1): 대기 중인 작업이 있고 CPU/메모리에 여유가 있을 때
+- 그 외에는 유지
+
+현재 한도와 변경 이유는 GET /api/v1/health/concurrency로 확인합니다.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any, Protocol
+
+from app.config import get_settings
+from app.services.separation_service import separation_service
+from app.services.youtube_service import youtube_service
+from app.utils.system_resources import (
+    effective_cpu_count,
+    load_per_cpu,
+    memory_headroom_bytes,
+    memory_pressure,
+)
+
+logger = logging.getLogger(__name__)
+
+# 감소 기준: 메모리 PSI some avg10 (%)과 코어당 load average
+PSI_DECREASE_THRESHOLD = 10.0
+LOAD_DECREASE_THRESHOLD = 1.5
+
+# 증가 기준: 코어당 load average가 이보다 낮아야 증가
+LOAD_INCREASE_THRESHOLD = 0.8
+
+# 증가 뒤 처리량이 이 비율 이상 늘지 않으면 되돌림
+MIN_THROUGHPUT_GAIN = 1.05
+
+# 한도별로 보관할 변경 이력 수
+HISTORY_SIZE = 20
+
+# 분리 한도 상한 계산: 작업 하나가 쓸모 있게 돌기 위한 최소 코어 수
+MIN_CORES_PER_SEPARATION = 2
+
+
+class _Resizable(Protocol):
+    limit: int
+
+    @property
+    def running(self) -> int: ...
+
+    @property
+    def waiting(self) -> int: ...
+
+
+@dataclass
+class PressureSample:
+    """한 번 측정한 호스트 부하 신호."""
+
+    memory_pressure: float | None  # PSI some avg10 (%)
+    load_per_cpu: float | None
+    memory_headroom_bytes: int | None
+
+    @classmethod
+    def read(cls) -> PressureSample:
+        """현재 호스트 상태를 측정합니다."""
+        return cls(
+            memory_pressure=memory_pressure(),
+            load_per_cpu=load_per_cpu(),
+            memory_headroom_bytes=memory_headroom_bytes(),
+        )
+
+
+@dataclass
+class LimitChange:
+    """한도 변경 기록."""
+
+    at: float  # epoch 초
+    old: int
+    new: int
+    reason: str
+
+
+@dataclass
+class AdaptiveLimit:
+    """AIMD로 조정되는 동시 실행 한도 하나."""
+
+    name: str
+    target: _Resizable
+    min_limit: int
+    max_limit: int
+    min_headroom_bytes: int = 0  # 작업 하나를 더 받기 위한 메모리 여유분
+    throughput: Callable[[], tuple[float, int] | None] | None = None  # (처리량, 완료 수)
+    last_reason: str = "initial"
+    history: deque[LimitChange] = field(default_factory=lambda: deque(maxlen=HISTORY_SIZE))
+    _baseline: tuple[float, int] | None = None  # 직전 증가 시점의 (처리량, 완료 수)
+
+    def _set(self, new: int, reason: str) -> None:
+        new = max(self.min_limit, min(self.max_limit, new))
+        self.last_reason = reason
+        old = self.target.limit
+        if new == old:
+            return
+        self.target.limit = new
+        self.history.append(LimitChange(at=time.time(), old=old, new=new, reason=reason))
+        logger.info("Concurrency limit %s: %d -> %d (%s)", self.name, old, new, reason)
+
+    def adjust(self, sample: PressureSample) -> None:
+        """측정값으로 한도를 한 단계 조정합니다."""
+        limit = self.target.limit
+
+        # 곱셈 감소: 과부하 신호
+        overload = self._overload_reason(sample)
+        if overload is not None:
+            self._baseline = None
+            self._set(math.floor(limit * 0.5), overload)
+            return
+
+        # 직전 증가의 효과 확인 (충분한 작업이 끝난 뒤)
+        if self._baseline is not None and self.throughput is not None:
+            current = self.throughput()
+            before, completed_at = self._baseline
+            if current is not None and current[1] >= completed_at + limit:
+                self._baseline = None
+                if current[0] < before * MIN_THROUGHPUT_GAIN:
+                    self._set(
+                        limit - 1,
+                        f"throughput did not improve ({before:.2f} -> {current[0]:.2f})",
+                    )
+                    return
+
+        # 덧셈 증가: 대기 작업이 있고 자원에 여유가 있을 때
+        if self.target.waiting == 0:
+            self.last_reason = "no queued work"
+            return
+        if self.target.running < limit:
+            self.last_reason = "limit not reached"
+            return
+        if sample.load_per_cpu is not None and sample.load_per_cpu >= LOAD_INCREASE_THRESHOLD:
+            self.last_reason = f"load {sample.load_per_cpu:.2f}/cpu too high to grow"
+            return
+        if limit >= self.max_limit:
+            self.last_reason = "at max limit"
+            return
+
+        if self._baseline is None and self.throughput is not None:
+            self._baseline = self.throughput()
+        load = "n/a" if sample.load_per_cpu is None else f"{sample.load_per_cpu:.2f}/cpu"
+        self._set(limit + 1, f"{self.target.waiting} queued, load {load}")
+
+    def _overload_reason(self, sample: PressureSample) -> str | None:
+        if sample.memory_pressure is not None and sample.memory_pressure >= PSI_DECREASE_THRESHOLD:
+            return f"memory pressure {sample.memory_pressure:.1f}%"
+        if (
+            self.min_headroom_bytes > 0
+            and sample.memory_headroom_bytes is not None
+            and sample.memory_headroom_bytes < self.min_headroom_bytes
+        ):
+            return f"memory headroom {sample.memory_headroom_bytes // (1024 * 1024)}MB"
+        if sample.load_per_cpu is not None and sample.load_per_cpu >= LOAD_DECREASE_THRESHOLD:
+            return f"load {sample.load_per_cpu:.2f}/cpu"
+        return None
+
+    def snapshot(self) -> dict[str, Any]:
+        """현재 상태를 딕셔너리로 반환합니다."""
+        return {
+            "name": self.name,
+            "limit": self.target.limit,
+            "min_limit": self.min_limit,
+            "max_limit": self.max_limit,
+            "running": self.target.running,
+            "waiting": self.target.waiting,
+            "last_reason": self.last_reason,
+            "changes": [
+                {"at": c.at, "old": c.old, "new": c.new, "reason": c.reason}
+                for c in self.history
+            ],
+        }
+
+
+class ConcurrencyController:
+    """주기적으로 호스트 부하를 측정해 한도들을 조정합니다."""
+
+    def __init__(
+        self,
+        limits: list[AdaptiveLimit],
+        interval: float = 15.0,
+        enabled: bool = True,
+        sampler: Callable[[], PressureSample] = PressureSample.read,
+    ) -> None:
+        """ConcurrencyController를 초기화합니다.
+
+        Args:
+            limits: 조정할 한도 목록.
+            interval: 조정 주기 (초).
+            enabled: False면 측정만 하고 한도는 바꾸지 않습니다.
+            sampler: 부하 측정 함수 (테스트에서 교체용).
+        """
+        self.limits = {limit.name: limit for limit in limits}
+        self.interval = interval
+        self.enabled = enabled
+        self._sampler = sampler
+        self.last_sample: PressureSample | None = None
+
+    def step(self, sample: PressureSample | None = None) -> None:
+        """한 번 측정하고 한도를 조정합니다.
+
+        Args:
+            sample: 미리 측정한 값 (None이면 여기서 측정).
+        """
+        self.last_sample = sample or self._sampler()
+        if not self.enabled:
+            return
+        for limit in self.limits.values():
+            limit.adjust(self.last_sample)
+
+    async def run(self) -> None:
+        """취소될 때까지 주기적으로 한도를 조정합니다."""
+        while True:
+            try:
+                await asyncio.sleep(self.interval)
+                # /proc 읽기는 이벤트 루프 밖에서 수행
+                self.step(await asyncio.to_thread(self._sampler))
+            except asyncio.CancelledError:
+                logger.info("Concurrency controller stopped")
+                break
+            except Exception:
+                logger.exception("Error in concurrency controller")
+
+    def snapshot(self) -> dict[str, Any]:
+        """현재 한도, 변경 이유, 마지막 측정값을 반환합니다."""
+        sample = self.last_sample
+        return {
+            "enabled": self.enabled,
+            "interval_seconds": self.interval,
+            "signals": {
+                "memory_pressure": sample.memory_pressure if sample else None,
+                "load_per_cpu": sample.load_per_cpu if sample else None,
+                "memory_headroom_bytes": sample.memory_headroom_bytes if sample else None,
+            },
+            "limits": [limit.snapshot() for limit in self.limits.values()],
+        }
+
+
+def separation_ceiling(
+    start_limit: int,
+    cpu_count: int,
+    memory_budget_bytes: int | None,
+    job_memory_bytes: int,
+    core_slots: int | None = None,
+) -> int:
+    """분리 한도의 상한을 호스트 자원으로 계산합니다.
+
+    시작 시 스레드 계획(코어 수 / 시작 한도)이 아니라 코어 수와 메모리 예산을 기준으로
+    삼아, 큰 서버에서 한도가 시작값보다 올라갈 수 있게 합니다.
+
+    Args:
+        start_limit: 설정된 시작 한도 (상한은 이보다 작아지지 않음).
+        cpu_count: 사용 가능한 코어 수.
+        memory_budget_bytes: 분리 작업 전체의 메모리 예산 (None이면 확인 안 함).
+        job_memory_bytes: 작업 하나의 예상 최대 메모리.
+        core_slots: 코어 고정 슬롯 수 (코어 고정을 쓰면 슬롯보다 많이 실행할 수 없음).
+    """
+    ceiling = max(1, cpu_count // MIN_CORES_PER_SEPARATION)
+    if memory_budget_bytes is not None and job_memory_bytes > 0:
+        ceiling = min(ceiling, max(1, memory_budget_bytes // job_memory_bytes))
+    ceiling = max(start_limit, ceiling)
+    if core_slots is not None:
+        ceiling = min(ceiling, core_slots)
+    return ceiling
+
+
+def _build_controller() -> ConcurrencyController:
+    """설정과 전역 서비스로 컨트롤러를 만듭니다."""
+    settings = get_settings()
+    scheduler = separation_service.scheduler
+    separation_max = settings.separation_max_concurrent_limit or separation_ceiling(
+        scheduler.limit,
+        effective_cpu_count(),
+        separation_service.memory_budget_bytes(),
+        separation_service.estimate_memory_bytes(None),
+        core_slots=(
+            len(separation_service.thread_plan.worker_core_sets)
+            if separation_service.cpu_affinity
+            else None
+        ),
+    )
+    return ConcurrencyController(
+        [
+            AdaptiveLimit(
+                "separation",
+                scheduler,
+                min_limit=1,
+                max_limit=separation_max,
+                min_headroom_bytes=settings.admission_min_free_memory_mb * 1024 * 1024,
+                throughput=lambda: (
+                    scheduler.running / max(scheduler.real_time_factor, 1e-6),
+                    scheduler.completed,
+                ),
+            ),
+            AdaptiveLimit(
+                "youtube",
+                youtube_service.scheduler,
+                min_limit=1,
+                max_limit=max(
+                    settings.max_concurrent_downloads,
+                    settings.max_concurrent_downloads_limit,
+                ),
+            ),
+        ],
+        interval=settings.adaptive_concurrency_interval,
+        enabled=settings.adaptive_concurrency,
+    )
+
+
+# 전역 컨트롤러 인스턴스
+concurrency_controller = _build_controller()
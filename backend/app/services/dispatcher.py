@@ -0,0 +1,367 @@
+"""다중 노드 분리 작업 디스패처.
+
+여러 추론 노드(같은 백엔드를 로컬 추론 모드로 실행한 인스턴스)를 하나의 API 뒤에 두고,
+각 노드가 보고하는 대기열 깊이, 여유 메모리, 캐시 보유 여부를 기준으로
+분리 작업을 HTTP로 배치합니다. 노드와 통신이 끊기면 다음 노드로 넘어갑니다.
+노드가 진입 제어로 거절하면 (503 + Retry-After) 노드를 정상으로 둔 채 다른 노드를
+시도하고, 모든 노드가 바쁘면 Retry-After만큼 기다렸다가 다시 배치합니다.
+
+노드 API:
+- GET  /api/v1/node/status?file_hash=...  대기열/메모리/캐시 상태
+- POST /api/v1/separate                   작업 제출
+- GET  /api/v1/node/tasks/{task_id}       진행 상태
+- GET  /api/v1/separate/{task_id}/stems/{stem}  결과 스템
+- DELETE /api/v1/separate/{task_id}             작업 취소
+
+한 머신에서 시험하려면 포트별로 인스턴스를 띄우고 (태스크 저장소는 인스턴스마다 분리)
+API 인스턴스에 노드 목록을 지정합니다:
+    TASK_STORE_PATH=/tmp/node1.db uvicorn app.main:app --port 8001
+    TASK_STORE_PATH=/tmp/node2.db uvicorn app.main:app --port 8002
+    SEPARATION_NODES='["http://127.0.0.1:8001","http://127.0.0.1:8002"]' \\
+        uvicorn app.main:app --port 8000
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import mimetypes
+import os
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# 노드 API 경로 접두사
+API_PREFIX = "/api/v1"
+
+# 노드 상태 캐시 유지 시간 (초) - 동시에 들어온 요청마다 상태를 다시 묻지 않도록
+STATUS_TTL_SECONDS = 2.0
+
+# 작업 하나를 안전하게 받을 수 있는 최소 여유 메모리 (htdemucs 추론 + 디코딩 여유분)
+MIN_FREE_MEMORY_BYTES = 1536 * 1024 * 1024
+
+# 바쁜 노드가 Retry-After를 보내지 않았을 때 다시 시도할 간격 (초)
+DEFAULT_BUSY_RETRY_SECONDS = 5.0
+
+
+class NodeLostError(Exception):
+    """노드와 통신할 수 없거나 노드가 작업을 잃어버렸을 때 발생합니다."""
+
+
+class NodeBusyError(Exception):
+    """노드가 진입 제어로 작업을 거절했을 때 발생합니다 (503, 노드는 정상)."""
+
+    def __init__(self, retry_after: float) -> None:
+        super().__init__(f"busy, retry after {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+class RemoteSeparationError(RuntimeError):
+    """노드가 분리 작업 자체를 실패로 보고했을 때 발생합니다 (다른 노드로 재시도하지 않음)."""
+
+
+@dataclass
+class NodeState:
+    """노드가 마지막으로 보고한 상태."""
+
+    url: str
+    healthy: bool = False
+    queue_depth: int = 0  # 대기 + 실행 중 작업 수
+    max_concurrent: int = 1
+    free_memory_bytes: int | None = None
+    has_cache: bool = False  # 요청한 해시의 결과를 이미 보유
+    checked_at: float = 0.0
+    busy_until: float = 0.0  # 진입 제어로 거절한 노드에 다시 제출할 수 있는 시각
+
+    @property
+    def busy(self) -> bool:
+        """노드가 보낸 Retry-After가 아직 지나지 않았는지 여부."""
+        return self.busy_until > time.monotonic()
+
+    @property
+    def load(self) -> float:
+        """동시 처리 수 대비 대기열 깊이."""
+        return self.queue_depth / max(1, self.max_concurrent)
+
+    @property
+    def memory_ok(self) -> bool:
+        """작업 하나를 더 받을 여유 메모리가 있는지 여부 (보고하지 않으면 True)."""
+        return self.free_memory_bytes is None or self.free_memory_bytes >= MIN_FREE_MEMORY_BYTES
+
+
+def _retry_after(response: httpx.Response) -> float:
+    """503 응답의 Retry-After(초)를 읽습니다 (없거나 날짜 형식이면 기본값)."""
+    try:
+        return max(1.0, float(response.headers["Retry-After"]))
+    except (KeyError, ValueError):
+        return DEFAULT_BUSY_RETRY_SECONDS
+
+
+def rank_nodes(nodes: list[NodeState], exclude: set[str] | None = None) -> list[NodeState]:
+    """배치 우선순위대로 정상 노드를 정렬합니다.
+
+    1. 결과를 이미 가진 노드 (캐시 친화도: 다시 계산하지 않고 바로 받음)
+    2. 여유 메모리가 충분한 노드
+    3. 대기열 부하가 낮은 노드, 같으면 여유 메모리가 많은 노드
+    """
+    exclude = exclude or set()
+    candidates = [n for n in nodes if n.healthy and n.url not in exclude]
+    return sorted(
+        candidates,
+        key=lambda n: (
+            not n.has_cache,
+            not n.memory_ok,
+            n.load,
+            -(n.free_memory_bytes or 0),
+        ),
+    )
+
+
+class Dispatcher:
+    """노드 상태를 수집하고 분리 작업을 원격 노드에 배치합니다."""
+
+    def __init__(
+        self,
+        nodes: list[str],
+        client: httpx.AsyncClient | None = None,
+        poll_interval: float = 1.0,
+        timeout: float = 10.0,
+    ) -> None:
+        """Dispatcher를 초기화합니다.
+
+        Args:
+            nodes: 노드 기본 URL 목록 (예: http://10.0.0.2:8000).
+            client: HTTP 클라이언트 (테스트에서 전송 계층 교체용).
+            poll_interval: 원격 진행 상태 폴링 간격 (초).
+            timeout: 요청별 타임아웃 (초). 업로드/다운로드는 본문 전송 시간이 추가됩니다.
+        """
+        self.nodes = {url.rstrip("/"): NodeState(url=url.rstrip("/")) for url in nodes}
+        self._client = client or httpx.AsyncClient(timeout=timeout)
+        self.poll_interval = poll_interval
+
+    async def _fetch_status(self, node: NodeState, file_hash: str | None) -> NodeState:
+        """노드 상태를 조회합니다. 실패하면 비정상으로 표시합니다."""
+        params = {"file_hash": file_hash} if file_hash else None
+        try:
+            response = await self._client.get(f"{node.url}{API_PREFIX}/node/status", params=params)
+            response.raise_for_status()
+            data = response.json()
+        except (httpx.HTTPError, ValueError) as e:
+            if node.healthy:
+                logger.warning("Node %s unavailable: %s", node.url, e)
+            node.healthy = False
+        else:
+            node.healthy = True
+            node.queue_depth = int(data.get("queue_depth", 0))
+            node.max_concurrent = int(data.get("max_concurrent", 1))
+            node.free_memory_bytes = data.get("free_memory_bytes")
+            node.has_cache = bool(data.get("has_cache", False))
+        node.checked_at = time.monotonic()
+        return node
+
+    async def refresh(self, file_hash: str | None = None) -> list[NodeState]:
+        """모든 노드 상태를 병렬로 갱신합니다.
+
+        캐시 친화도는 해시마다 다르므로 file_hash가 주어지면 항상 새로 조회합니다.
+        """
+        now = time.monotonic()
+        stale = [
+            node for node in self.nodes.values()
+            if file_hash or now - node.checked_at > STATUS_TTL_SECONDS
+        ]
+        await asyncio.gather(*(self._fetch_status(node, file_hash) for node in stale))
+        return list(self.nodes.values())
+
+    async def estimated_wait(self, job_seconds: float) -> float | None:
+        """가장 빨리 시작할 수 있는 노드의 예상 대기 시간(초)을 반환합니다.
+
+        노드가 보고한 대기열 깊이 중 동시 처리 수를 넘는 작업을 job_seconds 길이로
+        환산하고, 바쁜 노드는 Retry-After까지 남은 시간을 더 기다린다고 봅니다.
+
+        Returns:
+            예상 대기 시간, 또는 정상 노드가 없으면 None (작업이 로컬에서 처리됨).
+        """
+        nodes = [node for node in await self.refresh() if node.healthy]
+        if not nodes:
+            return None
+        now = time.monotonic()
+        return min(
+            max(
+                max(0, node.queue_depth - node.max_concurrent + 1)
+                * job_seconds / max(1, node.max_concurrent),
+                node.busy_until - now,
+            )
+            for node in nodes
+        )
+
+    async def run(
+        self,
+        file_path: Path,
+        file_hash: str,
+        cache_path: Path,
+        stem_names: list[str],
+        on_progress: Callable[[float], None] | None = None,
+        client_id: str | None = None,
+    ) -> dict[str, Path] | None:
+        """작업을 가장 적합한 노드에서 실행하고 스템을 cache_path로 받아옵니다.
+
+        client_id는 X-Forwarded-For로 노드에 전달되어, 모든 작업이 API 호스트에서
+        오더라도 노드의 클라이언트별 공정 큐잉이 원래 요청자를 기준으로 동작합니다.
+
+        노드를 잃으면 남은 노드로 넘어가며, 쓸 수 있는 노드가 없으면
+        None을 반환하여 호출자가 로컬에서 처리하게 합니다. 바쁜 노드는 잃은 것으로
+        보지 않으며, 남은 노드가 모두 바쁘면 로컬로 넘기지 않고 Retry-After가 가장
+        먼저 끝나는 노드를 기다립니다.
+
+        Raises:
+            RemoteSeparationError: 노드가 분리 자체를 실패로 보고했을 때.
+        """
+        lost: set[str] = set()
+        while True:
+            states = await self.refresh(file_hash)
+            busy = {node.url for node in states if node.busy}
+            nodes = rank_nodes(states, exclude=lost | busy)
+            if not nodes:
+                waiting = [
+                    node.busy_until for node in states
+                    if node.url in busy and node.healthy and node.url not in lost
+                ]
+                if waiting:
+                    await asyncio.sleep(max(0.0, min(waiting) - time.monotonic()))
+                    continue
+                if lost:
+                    logger.warning("All separation nodes failed for hash=%s", file_hash[:16])
+                return None
+
+            node = nodes[0]
+            logger.info(
+                "Dispatching hash=%s to %s (load=%.2f, cache=%s)",
+                file_hash[:16],
+                node.url,
+                node.load,
+                node.has_cache,
+            )
+            # 결과를 받기 전까지 이 노드의 부하를 미리 반영 (동시 배치 분산)
+            node.queue_depth += 1
+            try:
+                return await self._run_on(
+                    node, file_path, cache_path, stem_names, on_progress, client_id
+                )
+            except NodeBusyError as e:
+                logger.info("Node %s busy; retrying after %.0fs", node.url, e.retry_after)
+                node.busy_until = time.monotonic() + e.retry_after
+            except NodeLostError as e:
+                logger.warning("Lost node %s during job: %s; failing over", node.url, e)
+                node.healthy = False
+                lost.add(node.url)
+            finally:
+                node.queue_depth = max(0, node.queue_depth - 1)
+
+    async def _request(
+        self, method: str, url: str, allow_busy: bool = False, **kwargs: Any
+    ) -> httpx.Response:
+        """요청을 보내고 통신 실패와 5xx 응답을 NodeLostError로 변환합니다.
+
+        allow_busy이면 503 (진입 제어 거절)은 NodeBusyError로 변환합니다.
+        """
+        try:
+            response = await self._client.request(method, url, **kwargs)
+        except httpx.HTTPError as e:
+            raise NodeLostError(str(e) or type(e).__name__) from e
+        if allow_busy and response.status_code == 503:
+            raise NodeBusyError(_retry_after(response))
+        if response.status_code >= 500:
+            raise NodeLostError(f"{method} {url} -> {response.status_code}")
+        return response
+
+    async def _run_on(
+        self,
+        node: NodeState,
+        file_path: Path,
+        cache_path: Path,
+        stem_names: list[str],
+        on_progress: Callable[[float], None] | None,
+        client_id: str | None = None,
+    ) -> dict[str, Path]:
+        """한 노드에서 제출 → 진행 폴링 → 스템 다운로드를 수행합니다."""
+        content_type = mimetypes.guess_type(file_path.name)[0] or "audio/mpeg"
+        headers = {"X-Forwarded-For": client_id} if client_id else None
+        with file_path.open("rb") as f:
+            response = await self._request(
+                "POST",
+                f"{node.url}{API_PREFIX}/separate",
+                allow_busy=True,
+                files={"file": (file_path.name, f, content_type)},
+                headers=headers,
+            )
+        if response.status_code != 202:
+            raise RemoteSeparationError(
+                f"Node {node.url} rejected job: {response.status_code} {response.text}"
+            )
+        remote_id = response.json()["task_id"]
+        try:
+            return await self._collect(node, remote_id, cache_path, stem_names, on_progress)
+        except asyncio.CancelledError:
+            # 로컬 태스크가 취소되면 노드에서도 계산을 멈추게 함
+            await self._cancel_remote(node, remote_id)
+            raise
+
+    async def _cancel_remote(self, node: NodeState, remote_id: str) -> None:
+        """노드의 작업을 취소합니다 (실패는 무시)."""
+        try:
+            await self._client.delete(f"{node.url}{API_PREFIX}/separate/{remote_id}")
+        except httpx.HTTPError as e:
+            logger.warning("Failed to cancel task %s on %s: %s", remote_id, node.url, e)
+
+    async def _collect(
+        self,
+        node: NodeState,
+        remote_id: str,
+        cache_path: Path,
+        stem_names: list[str],
+        on_progress: Callable[[float], None] | None,
+    ) -> dict[str, Path]:
+        """원격 작업의 진행 상태를 폴링하고 끝나면 스템을 받아옵니다."""
+        # 진행 상태 폴링
+        while True:
+            response = await self._request("GET", f"{node.url}{API_PREFIX}/node/tasks/{remote_id}")
+            if response.status_code == 404:
+                raise NodeLostError(f"Node {node.url} lost task {remote_id}")
+            data = response.json()
+            if data["status"] == "completed":
+                break
+            if data["status"] in ("failed", "cancelled"):
+                raise RemoteSeparationError(data.get("error") or "원격 분리에 실패했습니다.")
+            if on_progress is not None and data.get("progress", 0) >= 0:
+                on_progress(float(data["progress"]))
+            await asyncio.sleep(self.poll_interval)
+
+        # 스템 다운로드 (임시 파일에 받은 뒤 rename하여 반쯤 받은 파일이 캐시로 보이지 않게 함)
+        stems: dict[str, Path] = {}
+        for stem_name in stem_names:
+            target = cache_path / f"{stem_name}.wav"
+            partial = target.with_suffix(".wav.part")
+            url = f"{node.url}{API_PREFIX}/separate/{remote_id}/stems/{stem_name}"
+            try:
+                async with self._client.stream("GET", url) as response:
+                    if response.status_code != 200:
+                        raise NodeLostError(f"GET {url} -> {response.status_code}")
+                    with partial.open("wb") as out:
+                        async for chunk in response.aiter_bytes():
+                            out.write(chunk)
+            except httpx.HTTPError as e:
+                partial.unlink(missing_ok=True)
+                raise NodeLostError(str(e) or type(e).__name__) from e
+            os.replace(partial, target)
+            stems[stem_name] = target
+        return stems
+
+    async def aclose(self) -> None:
+        """HTTP 클라이언트를 닫습니다."""
+        await self._client.aclose()
@@ -0,0 +1,128 @@
+"""호스트 튜닝 프로파일 모듈.
+
+`python -m app.autotune`이 측정한 호스트별 최적 분리 구성(세그먼트 길이, overlap,
+스레드 수, 동시 처리 수)을 JSON 파일로 저장하고, 서비스 시작 시 불러와
+설정에 적용합니다.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import platform
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from app.config import Settings
+from app.utils.system_resources import available_cpus, effective_cpu_count, total_memory_bytes
+
+logger = logging.getLogger(__name__)
+
+PROFILE_VERSION = 1
+
+# 프로파일 필드 -> Settings 필드 매핑
+_SETTINGS_FIELDS = {
+    "max_concurrent": "separation_max_concurrent",
+    "intra_op_threads": "torch_intra_op_threads",
+    "inter_op_threads": "torch_inter_op_threads",
+    "parallel_workers": "separation_parallel_workers",
+    "overlap": "separation_overlap",
+    "segment_seconds": "separation_segment_seconds",
+}
+
+
+def host_fingerprint() -> dict[str, Any]:
+    """프로파일이 유효한 호스트인지 판별하기 위한 하드웨어 정보를 반환합니다."""
+    memory = total_memory_bytes()
+    return {
+        "machine": platform.machine(),
+        "cpu_count": len(available_cpus()),
+        "effective_cpus": effective_cpu_count(),
+        # 메모리는 커널 예약분 차이를 흡수하도록 GB 단위로 반올림
+        "memory_gb": round(memory / (1024 ** 3)) if memory else None,
+    }
+
+
+@dataclass
+class HostProfile:
+    """호스트별 최적 분리 구성."""
+
+    max_concurrent: int
+    intra_op_threads: int
+    inter_op_threads: int
+    parallel_workers: int
+    overlap: float
+    segment_seconds: float  # 0 = 모델 기본값
+    host: dict[str, Any] = field(default_factory=host_fingerprint)
+    created_at: float = field(default_factory=time.time)
+    results: list[dict[str, Any]] = field(default_factory=list)  # 측정 결과 전체
+
+    def matches_host(self) -> bool:
+        """현재 호스트와 하드웨어 구성이 같은지 확인합니다."""
+        return self.host == host_fingerprint()
+
+    def save(self, path: Path) -> None:
+        """프로파일을 JSON 파일로 저장합니다."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = {"version": PROFILE_VERSION, **asdict(self)}
+        path.write_text(json.dumps(data, indent=2))
+
+    @classmethod
+    def load(cls, path: Path) -> HostProfile | None:
+        """JSON 파일에서 프로파일을 불러옵니다.
+
+        Returns:
+            HostProfile, 또는 파일이 없거나 형식이 맞지 않으면 None.
+        """
+        if not path.exists():
+            return None
+        try:
+            data = json.loads(path.read_text())
+            if data.pop("version", None) != PROFILE_VERSION:
+                logger.warning("Unsupported host profile version in %s", path)
+                return None
+            return cls(**data)
+        except (json.JSONDecodeError, TypeError) as e:
+            logger.warning("Failed to read host profile %s: %s", path, e)
+            return None
+
+    def apply_to(self, settings: Settings) -> Settings:
+        """프로파일 값을 설정에 적용한 새 Settings를 반환합니다.
+
+        환경 변수 등으로 명시된 설정은 프로파일보다 우선합니다.
+        """
+        explicit = settings.model_fields_set
+        update = {
+            settings_field: getattr(self, profile_field)
+            for profile_field, settings_field in _SETTINGS_FIELDS.items()
+            if settings_field not in explicit
+        }
+        return settings.model_copy(update=update)
+
+
+def load_host_settings(settings: Settings) -> Settings:
+    """설정된 경로의 호스트 프로파일을 불러와 설정에 적용합니다.
+
+    프로파일이 없거나 다른 하드웨어에서 측정된 경우 원래 설정을 반환합니다.
+    """
+    if not settings.host_profile_path:
+        return settings
+
+    path = Path(settings.host_profile_path)
+    profile = HostProfile.load(path)
+    if profile is None:
+        return settings
+
+    if not profile.matches_host():
+        logger.warning(
+            "Host profile %s was tuned on different hardware (%s != %s); ignoring",
+            path,
+            profile.host,
+            host_fingerprint(),
+        )
+        return settings
+
+    logger.info("Applying host profile from %s", path)
+    return profile.apply_to(settings)
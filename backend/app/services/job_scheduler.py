@@ -0,0 +1,342 @@
+"""공정 분리 작업 스케줄러.
+
+asyncio.Semaphore는 깨어나는 순서대로 작업을 들여보내므로, 한 사용자가 긴 곡을
+여러 개 올리면 다른 사용자가 모두 뒤에서 기다리게 됩니다. 이 스케줄러는
+
+- 클라이언트별 공정 큐잉: 클라이언트마다 누적 처리량(가상 시간)을 추적하여
+  적게 처리받은 클라이언트의 작업을 먼저 들여보내고 (start-time fair queuing),
+- 최단 작업 우선: 비용(조회한 오디오 길이)이 작은 작업일수록 태그가 작아지며
+  같은 클라이언트 안에서는 짧은 곡부터 처리합니다.
+
+대기 중인 작업의 순번과 예상 시작 시간은 실행 중 작업의 남은 시간과
+관측한 실시간 비율(RTF: 처리 시간 / 오디오 길이)로 추정합니다.
+
+메모리 예산이 주어지면 실행 중 작업의 예상 최대 메모리 합계에 다음 작업의
+추정치를 더해 예산을 넘는 동안에는 슬롯이 비어 있어도 들여보내지 않습니다.
+
+클라이언트 큐는 대기 또는 실행 중인 작업이 있는 동안만 유지합니다. 작업이 모두 끝난
+클라이언트가 다시 제출하면 현재 가상 시간에서 시작하므로 (SFQ의 max(F, V)와 같음)
+큐를 지워도 공정성은 유지되고, 클라이언트 수만큼 상태가 쌓이지 않습니다.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+
+logger = logging.getLogger(__name__)
+
+# 길이를 알 수 없는 작업의 기본 오디오 길이 (초)
+DEFAULT_DURATION_SECONDS = 240.0
+
+# 관측 전 초기 실시간 비율 (CPU htdemucs 기준)
+DEFAULT_REAL_TIME_FACTOR = 1.0
+
+# RTF 지수 이동 평균 가중치
+RTF_SMOOTHING = 0.2
+
+
+@dataclass
+class _Job:
+    job_id: str
+    client_id: str
+    duration: float  # 오디오 길이 (초)
+    seq: int
+    memory_bytes: int  # 예상 최대 메모리 사용량
+    enqueued_at: float
+    future: asyncio.Future[None] | None = None
+    started_at: float = 0.0
+
+
+@dataclass
+class _ClientQueue:
+    pending: list[tuple[float, int, _Job]] = field(default_factory=list)  # (비용, 순서, 작업)
+    finish: float = 0.0  # 이 클라이언트가 받은 처리의 가상 종료 시간
+    running: int = 0  # 실행 중인 작업 수
+
+
+@dataclass
+class QueueInfo:
+    """대기 중인 작업의 순번과 예상 시작 시간."""
+
+    position: int  # 1부터 시작
+    estimated_start_seconds: float
+
+
+class FairScheduler:
+    """클라이언트별 공정 큐잉 + 최단 작업 우선 스케줄러."""
+
+    def __init__(
+        self,
+        limit: int,
+        real_time_factor: float = DEFAULT_REAL_TIME_FACTOR,
+        memory_budget: Callable[[], int | None] | None = None,
+    ) -> None:
+        """FairScheduler를 초기화합니다.
+
+        Args:
+            limit: 동시에 실행할 작업 수.
+            real_time_factor: 초기 실시간 비율 추정치 (완료된 작업으로 갱신).
+            memory_budget: 동시 실행 작업 전체가 쓸 수 있는 메모리(바이트)를 반환하는
+                함수 (None 또는 None 반환 = 메모리 확인 안 함).
+        """
+        self._limit = max(1, limit)
+        self.real_time_factor = real_time_factor
+        self._memory_budget = memory_budget
+        self._clients: dict[str, _ClientQueue] = {}
+        self._jobs: dict[str, _Job] = {}  # 대기 중인 작업
+        self._running: dict[str, _Job] = {}
+        self._virtual_time = 0.0
+        self._seq = itertools.count()
+        self.completed = 0  # 처리 시간을 관측한 완료 작업 수
+
+    @property
+    def limit(self) -> int:
+        """동시 실행 한도."""
+        return self._limit
+
+    @limit.setter
+    def limit(self, value: int) -> None:
+        """동시 실행 한도를 바꿉니다. 늘리면 대기 작업을 바로 들여보냅니다."""
+        self._limit = max(1, value)
+        self._dispatch()
+
+    @property
+    def running(self) -> int:
+        """실행 중인 작업 수."""
+        return len(self._running)
+
+    @property
+    def waiting(self) -> int:
+        """대기 중인 작업 수."""
+        return len(self._jobs)
+
+    @property
+    def reserved_memory(self) -> int:
+        """실행 중 작업의 예상 최대 메모리 합계 (바이트)."""
+        return sum(job.memory_bytes for job in self._running.values())
+
+    def _cost(self, job: _Job) -> float:
+        return job.duration
+
+    def _next(self) -> tuple[_ClientQueue, float] | None:
+        """다음에 들여보낼 클라이언트와 그 작업의 시작 태그를 고릅니다."""
+        best: tuple[float, int, _ClientQueue, float] | None = None
+        for queue in self._clients.values():
+            if not queue.pending:
+                continue
+            cost, seq, _ = queue.pending[0]
+            start = max(queue.finish, self._virtual_time)
+            key = (start + cost, seq)
+            if best is None or key < best[:2]:
+                best = (*key, queue, start)
+        if best is None:
+            return None
+        return best[2], best[3]
+
+    def _fits_memory(self, job: _Job) -> bool:
+        """작업을 시작해도 메모리 예산을 넘지 않는지 확인합니다.
+
+        실행 중인 작업이 없으면 예산보다 큰 작업도 들여보냅니다 (영원히 대기 방지).
+        """
+        if self._memory_budget is None or not self._running or not job.memory_bytes:
+            return True
+        budget = self._memory_budget()
+        return budget is None or self.reserved_memory + job.memory_bytes <= budget
+
+    def _dispatch(self) -> None:
+        """여유 슬롯만큼 대기 작업을 들여보냅니다."""
+        while len(self._running) < self._limit:
+            picked = self._next()
+            if picked is None:
+                return
+            queue, start = picked
+            if not self._fits_memory(queue.pending[0][2]):
+                # 공정 순서를 지키기 위해 뒤 작업으로 건너뛰지 않고 반납을 기다림
+                return
+            cost, _, job = heapq.heappop(queue.pending)
+            queue.finish = start + cost
+            self._virtual_time = start
+            del self._jobs[job.job_id]
+            queue.running += 1
+
+            job.started_at = time.monotonic()
+            self._running[job.job_id] = job
+            if job.future is not None and not job.future.done():
+                job.future.set_result(None)
+
+    async def acquire(
+        self,
+        job_id: str,
+        client_id: str,
+        duration_seconds: float | None = None,
+        memory_bytes: int = 0,
+    ) -> None:
+        """실행 슬롯을 얻을 때까지 기다립니다.
+
+        Args:
+            job_id: 작업 ID.
+            client_id: 공정성 기준이 되는 클라이언트 식별자 (예: IP).
+            duration_seconds: 조회한 오디오 길이 (None이면 기본값).
+            memory_bytes: 작업의 예상 최대 메모리 사용량 (0 = 메모리 확인 안 함).
+        """
+        job = _Job(
+            job_id=job_id,
+            client_id=client_id,
+            duration=duration_seconds or DEFAULT_DURATION_SECONDS,
+            seq=next(self._seq),
+            memory_bytes=memory_bytes,
+            enqueued_at=time.monotonic(),
+            future=asyncio.get_running_loop().create_future(),
+        )
+        queue = self._clients.setdefault(client_id, _ClientQueue())
+        heapq.heappush(queue.pending, (self._cost(job), job.seq, job))
+        self._jobs[job_id] = job
+        self._dispatch()
+
+        try:
+            await job.future
+        except asyncio.CancelledError:
+            if job_id in self._running:
+                self.release(job_id, observe=False)
+            else:
+                self._remove_waiting(job)
+            raise
+
+    def release(self, job_id: str, observe: bool = True) -> None:
+        """실행 슬롯을 반납하고 다음 작업을 들여보냅니다.
+
+        Args:
+            job_id: 작업 ID.
+            observe: 처리 시간을 실시간 비율 추정에 반영할지 여부.
+        """
+        job = self._running.pop(job_id, None)
+        if job is None:
+            return
+        queue = self._clients.get(job.client_id)
+        if queue is not None:
+            queue.running -= 1
+            self._drop_if_idle(job.client_id, queue)
+        if observe and job.duration > 0:
+            rtf = (time.monotonic() - job.started_at) / job.duration
+            self.real_time_factor += RTF_SMOOTHING * (rtf - self.real_time_factor)
+            self.completed += 1
+        self._dispatch()
+
+    def _remove_waiting(self, job: _Job) -> None:
+        self._jobs.pop(job.job_id, None)
+        queue = self._clients.get(job.client_id)
+        if queue is not None:
+            queue.pending = [entry for entry in queue.pending if entry[2] is not job]
+            heapq.heapify(queue.pending)
+            self._drop_if_idle(job.client_id, queue)
+        self._dispatch()
+
+    def _drop_if_idle(self, client_id: str, queue: _ClientQueue) -> None:
+        """대기/실행 중 작업이 없는 클라이언트 큐를 지웁니다 (가상 종료 시간도 함께)."""
+        if not queue.pending and queue.running <= 0:
+            del self._clients[client_id]
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        job_id: str,
+        client_id: str,
+        duration_seconds: float | None = None,
+        memory_bytes: int = 0,
+    ) -> AsyncIterator[None]:
+        """실행 슬롯을 얻고 블록이 끝나면 반납합니다."""
+        await self.acquire(job_id, client_id, duration_seconds, memory_bytes)
+        try:
+            yield
+        except BaseException:
+            self.release(job_id, observe=False)
+            raise
+        else:
+            self.release(job_id)
+
+    def _slot_free_times(self) -> list[float]:
+        """슬롯별 예상 반납 시각(현재 기준 초)을 최소 힙으로 반환합니다."""
+        now = time.monotonic()
+        free_at = [
+            max(0.0, job.started_at + job.duration * self.real_time_factor - now)
+            for job in self._running.values()
+        ]
+        free_at += [0.0] * max(0, self._limit - len(free_at))
+        heapq.heapify(free_at)
+        return free_at
+
+    def estimated_wait(self) -> float:
+        """지금 들어오는 작업이 시작되기까지의 예상 대기 시간(초)을 반환합니다.
+
+        대기 중인 작업이 모두 먼저 들어간다고 가정합니다 (공정 큐잉으로
+        새 클라이언트는 이보다 빨리 시작할 수 있으므로 보수적인 추정).
+        """
+        free_at = self._slot_free_times()
+        for job in self._jobs.values():
+            slot_free = heapq.heappop(free_at)
+            heapq.heappush(free_at, slot_free + job.duration * self.real_time_factor)
+        return free_at[0]
+
+    def queue_info(self) -> dict[str, QueueInfo]:
+        """대기 중인 모든 작업의 순번과 예상 시작 시간을 계산합니다.
+
+        스케줄러 상태를 복사해 들여보내기 순서를 모의 실행하고,
+        슬롯이 비는 시점은 실행 중 작업의 예상 남은 시간으로 계산합니다.
+        """
+        if not self._jobs:
+            return {}
+
+        rtf = self.real_time_factor
+        free_at = self._slot_free_times()
+
+        queues = {
+            client_id: _ClientQueue(pending=list(queue.pending), finish=queue.finish)
+            for client_id, queue in self._clients.items()
+        }
+        virtual_time = self._virtual_time
+        info: dict[str, QueueInfo] = {}
+        for position in range(1, len(self._jobs) + 1):
+            best = None
+            for queue in queues.values():
+                if not queue.pending:
+                    continue
+                cost, seq, _ = queue.pending[0]
+                start = max(queue.finish, virtual_time)
+                key = (start + cost, seq)
+                if best is None or key < best[0]:
+                    best = (key, queue, start)
+            _, queue, start = best
+            cost, _, job = heapq.heappop(queue.pending)
+            queue.finish = start + cost
+            virtual_time = start
+
+            slot_free = heapq.heappop(free_at)
+            heapq.heappush(free_at, slot_free + job.duration * rtf)
+            info[job.job_id] = QueueInfo(
+                position=position,
+                estimated_start_seconds=round(slot_free, 1),
+            )
+        return info
+
+    def position(self, job_id: str) -> QueueInfo | None:
+        """대기 중인 작업 하나의 순번과 예상 시작 시간을 반환합니다."""
+        if job_id not in self._jobs:
+            return None
+        return self.queue_info().get(job_id)
+
+    def backlog_seconds(self) -> float:
+        """대기 + 실행 중 작업을 모두 처리하는 데 필요한 예상 처리 시간(초, 슬롯 합계)."""
+        now = time.monotonic()
+        rtf = self.real_time_factor
+        remaining = sum(
+            max(0.0, job.started_at + job.duration * rtf - now)
+            for job in self._running.values()
+        )
+        return remaining + sum(job.duration * rtf for job in self._jobs.values())
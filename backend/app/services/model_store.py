@@ -0,0 +1,148 @@
+"""공유 모델 가중치 저장소.
+
+모델 가중치를 한 번만 디스크에 내보내고, 각 프로세스는 이를 메모리 매핑(mmap)으로
+읽어 들입니다. 매핑된 페이지는 페이지 캐시를 통해 프로세스 간에 공유되므로
+uvicorn 워커나 추론 프로세스를 N개 띄워도 가중치 메모리가 N배로 늘지 않습니다.
+
+추론 중에는 가중치를 쓰지 않으므로 MAP_PRIVATE 매핑도 사실상 읽기 전용으로 유지됩니다.
+
+공유 파일이 이미 있으면 모델 구조를 meta 장치에 (파라미터 저장 공간 없이) 만든 뒤
+매핑된 텐서를 그대로 할당하므로, 프로세스마다 가중치 사본을 한 번도 만들지 않습니다.
+파일 이름에는 체크포인트 서명이 들어가 체크포인트가 바뀌면 예전 파일을 매핑하지 않습니다.
+"""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import os
+import tempfile
+import warnings
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# 파일 이름에 넣을 체크포인트 서명 길이 (16진수 문자 수)
+SIGNATURE_LENGTH = 16
+
+
+def weights_path(weights_dir: str | Path, model_name: str, signature: str = "") -> Path:
+    """모델 이름과 체크포인트 서명에 대한 공유 가중치 파일 경로를 반환합니다."""
+    suffix = f"-{signature[:SIGNATURE_LENGTH]}" if signature else ""
+    return Path(weights_dir) / f"{model_name}{suffix}.pt"
+
+
+def export_weights(model: Any, path: Path) -> None:
+    """모델 state_dict를 mmap 가능한 파일로 원자적으로 저장합니다.
+
+    여러 프로세스가 동시에 내보내더라도 임시 파일 + rename으로
+    항상 완전한 파일만 보이게 합니다.
+
+    Args:
+        model: torch.nn.Module.
+        path: 저장 경로.
+    """
+    import torch
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            torch.save(model.state_dict(), f)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    logger.info("Exported shared model weights to %s", path)
+
+
+def map_weights(model: Any, path: Path) -> Any:
+    """공유 가중치 파일을 mmap으로 불러와 모델 파라미터를 교체합니다.
+
+    `assign=True`로 모델이 매핑된 텐서를 직접 참조하게 하여,
+    프로세스별 private 사본은 해제됩니다.
+
+    Args:
+        model: 같은 구조의 torch.nn.Module.
+        path: export_weights로 저장한 파일 경로.
+
+    Returns:
+        가중치가 매핑된 모델 (eval 모드).
+    """
+    import torch
+
+    state = torch.load(path, mmap=True, weights_only=True, map_location="cpu")
+    model.load_state_dict(state, assign=True)
+    # state_dict에 없는 텐서 (비영속 버퍼)는 meta로 남아 추론할 수 없음
+    unmapped = [
+        name
+        for name, tensor in itertools.chain(model.named_parameters(), model.named_buffers())
+        if tensor.is_meta
+    ]
+    if unmapped:
+        raise RuntimeError(f"공유 가중치에 없는 텐서가 있습니다: {', '.join(unmapped[:3])}")
+    model.eval()
+    return model
+
+
+def build_on_meta(build_model: Callable[[], Any]) -> Any:
+    """모델 구조만 meta 장치에 만듭니다 (파라미터 저장 공간 없음).
+
+    빌더가 체크포인트를 읽더라도 meta 파라미터로의 복사는 일어나지 않으므로,
+    읽은 state는 생성 직후 해제되고 프로세스별 가중치 사본이 남지 않습니다.
+    """
+    import torch
+
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", message=".*copying from a non-meta parameter.*")
+        with torch.device("meta"):
+            return build_model()
+
+
+def _remove_stale_exports(path: Path, model_name: str) -> None:
+    """같은 모델의 다른 서명으로 내보낸 가중치 파일을 지웁니다.
+
+    이미 매핑한 프로세스는 파일을 지워도 매핑이 유지됩니다.
+    """
+    for stale in itertools.chain(
+        path.parent.glob(f"{model_name}-*.pt"), path.parent.glob(f"{model_name}.pt")
+    ):
+        if stale != path:
+            stale.unlink(missing_ok=True)
+            logger.info("Removed stale shared weights %s", stale)
+
+
+def load_shared_model(
+    model_name: str,
+    weights_dir: str | Path,
+    build_model: Callable[[], Any],
+    signature: str = "",
+) -> Any:
+    """모델을 생성하고 공유 가중치 파일에 매핑합니다.
+
+    공유 가중치 파일이 있으면 모델을 meta 장치에 만들어 매핑하고, 없으면 처음
+    생성한 모델에서 내보낸 뒤 그 모델을 매핑합니다 (내보내는 프로세스만 한 번 사본을 만듦).
+
+    Args:
+        model_name: 모델 이름 (파일명으로 사용).
+        weights_dir: 공유 가중치 디렉터리.
+        build_model: 모델을 생성하는 함수 (예: lambda: get_model("htdemucs")).
+        signature: 체크포인트 서명 (파일명에 포함, 바뀌면 다시 내보냄).
+
+    Returns:
+        가중치가 매핑된 모델.
+    """
+    path = weights_path(weights_dir, model_name, signature)
+    if path.exists():
+        model = build_on_meta(build_model)
+    else:
+        model = build_model()
+        model.cpu()
+        export_weights(model, path)
+        _remove_stale_exports(path, model_name)
+
+    model = map_weights(model, path)
+    logger.info("Model %s mapped from shared weights %s", model_name, path)
+    return model
@@ -0,0 +1,247 @@
+"""피어 캐시 연합 모듈.
+
+인스턴스마다 따로 있는 스템 캐시(/tmp/stems_cache)와 BPM 캐시(/tmp/bpm_cache)를
+콘텐츠 해시로 서로 조회합니다. 각 항목은 일관 해싱(consistent hashing) 링에서
+해시가 가리키는 소유 노드에 배치됩니다.
+
+- 조회: 로컬 캐시에 없으면 링에서 해시의 소유 피어(복제 수만큼)에 차례로 묻고,
+  가진 피어에게서 받아 로컬 캐시에 저장한 뒤 사용합니다.
+- 배치: 로컬에서 계산한 결과는 소유 피어에 백그라운드로 복제하여,
+  이후 어느 인스턴스에서 요청이 와도 한 번의 조회로 찾게 합니다.
+
+피어 API (CACHE_PEER_TOKEN이 설정되면 X-Peer-Token 헤더 필요):
+- GET/PUT /api/v1/peer/stems/{file_hash}/{stem}
+- GET/PUT /api/v1/peer/bpm/{file_hash}
+
+한 머신에서 시험하려면 포트별 인스턴스에 서로 다른 캐시 디렉터리를 주고
+CACHE_SELF_URL과 CACHE_PEERS를 지정합니다.
+"""
+
+from __future__ import annotations
+
+import bisect
+import hashlib
+import logging
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# 피어 API 경로 접두사
+API_PREFIX = "/api/v1/peer"
+
+# 인증 헤더
+PEER_TOKEN_HEADER = "X-Peer-Token"
+
+# 노드당 가상 노드 수 (링 위 분포를 고르게)
+VIRTUAL_NODES = 64
+
+# SHA256 16진수 해시
+FILE_HASH_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+
+def _ring_position(key: str) -> int:
+    return int.from_bytes(hashlib.md5(key.encode()).digest()[:8], "big")
+
+
+class HashRing:
+    """가상 노드를 사용하는 일관 해싱 링.
+
+    노드를 추가/제거해도 그 노드가 맡던 구간의 키만 다른 노드로 옮겨갑니다.
+    """
+
+    def __init__(self, nodes: list[str], virtual_nodes: int = VIRTUAL_NODES) -> None:
+        self.nodes = sorted(set(nodes))
+        self._ring: list[tuple[int, str]] = sorted(
+            (_ring_position(f"{node}#{i}"), node)
+            for node in self.nodes
+            for i in range(virtual_nodes)
+        )
+        self._positions = [position for position, _ in self._ring]
+
+    def owners(self, key: str, count: int | None = None) -> list[str]:
+        """키를 맡는 노드를 링 시계 방향 순서로 반환합니다 (중복 없음).
+
+        Args:
+            key: 콘텐츠 해시.
+            count: 반환할 노드 수 (None = 전체).
+        """
+        if not self._ring:
+            return []
+        count = len(self.nodes) if count is None else min(count, len(self.nodes))
+        start = bisect.bisect(self._positions, _ring_position(key))
+        owners: list[str] = []
+        for offset in range(len(self._ring)):
+            node = self._ring[(start + offset) % len(self._ring)][1]
+            if node not in owners:
+                owners.append(node)
+                if len(owners) == count:
+                    break
+        return owners
+
+
+class PeerCache:
+    """피어 인스턴스의 스템/BPM 캐시 조회와 복제."""
+
+    def __init__(
+        self,
+        peers: list[str],
+        self_url: str = "",
+        replicas: int = 1,
+        token: str = "",
+        client: httpx.Client | None = None,
+        timeout: float = 5.0,
+    ) -> None:
+        """PeerCache를 초기화합니다.
+
+        Args:
+            peers: 피어 기본 URL 목록 (예: http://10.0.0.3:8000).
+            self_url: 이 인스턴스의 URL (링에서 자신을 식별; 비어 있으면 복제하지 않음).
+            replicas: 항목을 보관할 소유 노드 수.
+            token: 피어 간 공유 토큰 (X-Peer-Token).
+            client: HTTP 클라이언트 (테스트에서 전송 계층 교체용).
+            timeout: 요청별 타임아웃 (초).
+        """
+        self.self_url = self_url.rstrip("/")
+        self.peers = [p.rstrip("/") for p in peers if p.rstrip("/") != self.self_url]
+        self.replicas = max(1, replicas)
+        self.ring = HashRing(self.peers + ([self.self_url] if self.self_url else []))
+        headers = {PEER_TOKEN_HEADER: token} if token else None
+        self._client = client or httpx.Client(timeout=timeout, headers=headers)
+        if client is not None and headers:
+            self._client.headers.update(headers)
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="peer-cache")
+
+    def lookup_peers(self, file_hash: str) -> list[str]:
+        """해시를 조회할 피어를 우선순위대로 반환합니다 (자신 제외)."""
+        return [
+            node for node in self.ring.owners(file_hash, self.replicas + 1)
+            if node != self.self_url
+        ][: self.replicas]
+
+    def replica_peers(self, file_hash: str) -> list[str]:
+        """해시를 복제해 둘 소유 피어를 반환합니다 (자신이 소유자면 제외)."""
+        if not self.self_url:
+            return []
+        return [
+            node for node in self.ring.owners(file_hash, self.replicas)
+            if node != self.self_url
+        ]
+
+    # ------------------------------------------------------------------
+    # 스템
+    # ------------------------------------------------------------------
+
+    def fetch_stems(
+        self,
+        file_hash: str,
+        dest_dir: Path,
+        stem_names: list[str],
+    ) -> dict[str, Path] | None:
+        """피어에서 스템을 받아 dest_dir에 저장합니다.
+
+        한 피어가 모든 스템을 가졌을 때만 성공으로 봅니다.
+
+        Returns:
+            스템 이름에서 파일 경로로의 매핑, 또는 어느 피어도 갖고 있지 않으면 None.
+        """
+        for peer in self.lookup_peers(file_hash):
+            stems: dict[str, Path] = {}
+            for stem_name in stem_names:
+                target = dest_dir / f"{stem_name}.wav"
+                url = f"{peer}{API_PREFIX}/stems/{file_hash}/{stem_name}"
+                if not self._download(url, target):
+                    break
+                stems[stem_name] = target
+            else:
+                logger.info("Fetched stems for hash=%s from peer %s", file_hash[:16], peer)
+                return stems
+            # 일부만 받은 스템은 지워 캐시가 불완전한 상태로 남지 않게 함
+            for path in stems.values():
+                path.unlink(missing_ok=True)
+        return None
+
+    def replicate_stems(self, file_hash: str, stems: dict[str, Path]) -> None:
+        """로컬에서 계산한 스템을 소유 피어에 백그라운드로 복제합니다."""
+        for peer in self.replica_peers(file_hash):
+            self._executor.submit(self._upload_stems, peer, file_hash, dict(stems))
+
+    def _upload_stems(self, peer: str, file_hash: str, stems: dict[str, Path]) -> None:
+        for stem_name, path in stems.items():
+            url = f"{peer}{API_PREFIX}/stems/{file_hash}/{stem_name}"
+            try:
+                with path.open("rb") as f:
+                    response = self._client.put(url, content=f)
+                response.raise_for_status()
+            except (httpx.HTTPError, OSError) as e:
+                logger.warning("Failed to replicate %s to %s: %s", path.name, peer, e)
+                return
+        logger.info("Replicated stems for hash=%s to %s", file_hash[:16], peer)
+
+    def _download(self, url: str, target: Path) -> bool:
+        """파일을 임시 파일로 받은 뒤 rename합니다. 없거나 실패하면 False."""
+        partial = target.with_name(target.name + ".part")
+        try:
+            with self._client.stream("GET", url) as response:
+                if response.status_code != 200:
+                    return False
+                with partial.open("wb") as out:
+                    for chunk in response.iter_bytes():
+                        out.write(chunk)
+        except (httpx.HTTPError, OSError) as e:
+            logger.warning("Peer lookup failed for %s: %s", url, e)
+            partial.unlink(missing_ok=True)
+            return False
+        os.replace(partial, target)
+        return True
+
+    # ------------------------------------------------------------------
+    # BPM
+    # ------------------------------------------------------------------
+
+    def fetch_bpm(self, file_hash: str) -> dict[str, Any] | None:
+        """피어에서 BPM 결과(JSON)를 조회합니다."""
+        for peer in self.lookup_peers(file_hash):
+            try:
+                response = self._client.get(f"{peer}{API_PREFIX}/bpm/{file_hash}")
+            except httpx.HTTPError as e:
+                logger.warning("Peer BPM lookup failed at %s: %s", peer, e)
+                continue
+            if response.status_code == 200:
+                logger.info("Fetched BPM for hash=%s from peer %s", file_hash[:16], peer)
+                return response.json()
+        return None
+
+    def replicate_bpm(self, file_hash: str, result: dict[str, Any]) -> None:
+        """BPM 결과를 소유 피어에 백그라운드로 복제합니다."""
+        for peer in self.replica_peers(file_hash):
+            self._executor.submit(self._upload_bpm, peer, file_hash, result)
+
+    def _upload_bpm(self, peer: str, file_hash: str, result: dict[str, Any]) -> None:
+        try:
+            response = self._client.put(f"{peer}{API_PREFIX}/bpm/{file_hash}", json=result)
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            logger.warning("Failed to replicate BPM result to %s: %s", peer, e)
+
+
+@lru_cache(maxsize=1)
+def get_peer_cache() -> PeerCache | None:
+    """설정된 전역 피어 캐시를 반환합니다 (CACHE_PEERS가 비어 있으면 None)."""
+    settings = get_settings()
+    if not settings.cache_peers:
+        return None
+    return PeerCache(
+        settings.cache_peers,
+        self_url=settings.cache_self_url,
+        replicas=settings.cache_peer_replicas,
+        token=settings.cache_peer_token,
+    )
@@ -0,0 +1,61 @@
+"""저비용 미리보기 분리 모듈.
+
+Demucs 전체 분리가 끝나기 전에 수 초 안에 들을 수 있는 근사 스템을 만듭니다.
+다운샘플된 오디오에 mid/side 분해와 FFT 대역 마스크를 적용하며,
+네 스템의 합은 원본 믹스와 같습니다.
+
+- bass: 중앙(mid) 성분의 저역
+- vocals: 중앙(mid) 성분의 중역 (보컬은 대부분 중앙에 위치)
+- drums: 중앙(mid) 성분의 고역 (하이햇/심벌 등)
+- other: 좌우 차이(side) 성분 (스테레오로 퍼진 악기)
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+# 대역 경계 (Hz)
+BASS_CUTOFF_HZ = 150.0
+DRUMS_CUTOFF_HZ = 5000.0
+
+# 미리보기 샘플 레이트 (연산량을 줄이기 위해 다운샘플)
+PREVIEW_SAMPLE_RATE = 22050
+
+
+def dsp_preview_stems(audio: np.ndarray, sample_rate: int) -> dict[str, np.ndarray]:
+    """mid/side + 대역 분할로 근사 스템을 계산합니다.
+
+    Args:
+        audio: shape (channels, frames) float 오디오. 모노는 스테레오로 복제합니다.
+        sample_rate: 샘플 레이트 (Hz).
+
+    Returns:
+        스템 이름에서 스테레오 오디오 (2, frames)로의 매핑.
+    """
+    if audio.shape[0] == 1:
+        audio = np.repeat(audio, 2, axis=0)
+    left, right = audio[0], audio[1]
+
+    mid = (left + right) * 0.5
+    side = (left - right) * 0.5
+
+    # mid 스펙트럼을 한 번만 계산하고 대역 마스크로 분할
+    frames = mid.shape[-1]
+    spectrum = np.fft.rfft(mid)
+    freqs = np.fft.rfftfreq(frames, d=1.0 / sample_rate)
+
+    def _band(mask: np.ndarray) -> np.ndarray:
+        band = np.fft.irfft(spectrum * mask, n=frames).astype(np.float32)
+        return np.stack([band, band])
+
+    bass = _band(freqs < BASS_CUTOFF_HZ)
+    vocals = _band((freqs >= BASS_CUTOFF_HZ) & (freqs < DRUMS_CUTOFF_HZ))
+    drums = _band(freqs >= DRUMS_CUTOFF_HZ)
+    other = np.stack([side, -side]).astype(np.float32)
+
+    return {
+        "vocals": vocals,
+        "drums": drums,
+        "bass": bass,
+        "other": other,
+    }
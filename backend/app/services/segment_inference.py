@@ -0,0 +1,194 @@
+"""세그먼트 단위 병렬 추론 모듈.
+
+Demucs의 `apply_model(split=True)`는 겹치는(overlap) 세그먼트를 순차적으로 처리합니다.
+이 모듈은 같은 overlap-add 방식을 재현하되, 각 세그먼트(및 shift 패스)를
+독립 작업 단위로 나누어 스레드 그룹에 분산한 뒤 결과를 다시 이어 붙입니다.
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# 세그먼트 추론 함수 타입: (channels, samples) -> (sources, channels, samples)
+SegmentInferFn = Callable[[Any], Any]
+
+
+@dataclass(frozen=True)
+class SegmentWork:
+    """하나의 세그먼트 추론 작업 단위."""
+
+    pass_index: int  # shift 패스 인덱스
+    start: int  # 패스 입력 기준 시작 샘플
+    end: int  # 패스 입력 기준 끝 샘플 (exclusive)
+
+
+def plan_segments(
+    length: int,
+    segment_length: int,
+    overlap: float,
+) -> list[tuple[int, int]]:
+    """overlap-add용 세그먼트 구간을 계획합니다.
+
+    Demucs `apply_model`과 동일한 stride 규칙을 사용합니다.
+
+    Args:
+        length: 전체 샘플 수.
+        segment_length: 세그먼트 길이 (샘플).
+        overlap: 세그먼트 간 겹침 비율 (0.0-1.0 미만).
+
+    Returns:
+        (start, end) 구간 리스트. 마지막 구간은 length에서 잘립니다.
+
+    Raises:
+        ValueError: 인자가 유효하지 않을 때.
+    """
+    if segment_length <= 0:
+        raise ValueError("segment_length must be positive")
+    if not 0.0 <= overlap < 1.0:
+        raise ValueError("overlap must be in [0, 1)")
+    if length <= 0:
+        return []
+
+    stride = max(1, int((1 - overlap) * segment_length))
+    return [
+        (offset, min(offset + segment_length, length))
+        for offset in range(0, length, stride)
+    ]
+
+
+def plan_shift_offsets(shifts: int, max_shift: int, seed: int | None = None) -> list[int]:
+    """shift 패스별 오프셋을 계획합니다.
+
+    Demucs의 shift trick과 같이 shifts=0이면 이동 없는 단일 패스,
+    shifts=N이면 [0, max_shift] 범위의 무작위 오프셋 N개를 사용합니다.
+
+    Args:
+        shifts: shift 패스 수.
+        max_shift: 최대 이동 샘플 수.
+        seed: 난수 시드 (재현성 테스트용).
+
+    Returns:
+        패스별 오프셋 리스트.
+    """
+    if shifts <= 0 or max_shift <= 0:
+        return [0]
+    rng = random.Random(seed)
+    return [rng.randint(0, max_shift) for _ in range(shifts)]
+
+
+def _triangle_weight(segment_length: int, transition_power: float) -> Any:
+    """overlap-add 가중치(삼각 창)를 생성합니다."""
+    import torch
+
+    half = segment_length // 2
+    weight = torch.cat([
+        torch.arange(1, half + 1),
+        torch.arange(segment_length - half, 0, -1),
+    ]).float()
+    return (weight / weight.max()) ** transition_power
+
+
+def run_segmented(
+    infer: SegmentInferFn,
+    mix: Any,
+    segment_length: int,
+    overlap: float = 0.25,
+    shifts: int = 0,
+    max_shift: int = 0,
+    workers: int = 1,
+    on_segment_done: Callable[[int, int], None] | None = None,
+    transition_power: float = 1.0,
+    seed: int | None = None,
+) -> Any:
+    """세그먼트/shift 패스를 병렬로 추론하고 overlap-add로 합칩니다.
+
+    Args:
+        infer: 단일 세그먼트 추론 함수. (channels, segment_length) 텐서를 받아
+            (sources, channels, segment_length) 텐서를 반환해야 합니다.
+        mix: 입력 오디오 텐서 (channels, samples).
+        segment_length: 세그먼트 길이 (샘플).
+        overlap: 세그먼트 겹침 비율.
+        shifts: shift 패스 수 (Demucs `shifts`와 동일한 의미).
+        max_shift: shift 패스의 최대 이동 샘플 수.
+        workers: 동시에 실행할 세그먼트 작업 수.
+        on_segment_done: (완료 수, 전체 수) 진행률 콜백.
+        transition_power: 삼각 가중치 지수.
+        seed: shift 오프셋 난수 시드.
+
+    Returns:
+        분리 결과 텐서 (sources, channels, samples).
+    """
+    import torch
+    import torch.nn.functional as F
+
+    channels, length = mix.shape
+    offsets = plan_shift_offsets(shifts, max_shift, seed)
+    use_shift = shifts > 0 and max_shift > 0
+
+    # shift 패스 입력: 양쪽을 max_shift만큼 0으로 패딩한 뒤 오프셋부터 자른 뷰
+    if use_shift:
+        padded_mix = F.pad(mix, (max_shift, max_shift))
+        pass_inputs = [padded_mix[..., offset:length + max_shift] for offset in offsets]
+    else:
+        pass_inputs = [mix]
+
+    work: list[SegmentWork] = []
+    for pass_index, pass_input in enumerate(pass_inputs):
+        for start, end in plan_segments(pass_input.shape[-1], segment_length, overlap):
+            work.append(SegmentWork(pass_index, start, end))
+
+    weight = _triangle_weight(segment_length, transition_power)
+    pass_outputs: list[Any] = [None] * len(pass_inputs)
+    pass_weights = [
+        torch.zeros(pass_input.shape[-1]) for pass_input in pass_inputs
+    ]
+
+    def _run(item: SegmentWork) -> Any:
+        chunk = pass_inputs[item.pass_index][..., item.start:item.end]
+        chunk_length = chunk.shape[-1]
+        if chunk_length < segment_length:
+            chunk = F.pad(chunk, (0, segment_length - chunk_length))
+        return infer(chunk)[..., :chunk_length]
+
+    total = len(work)
+    done = 0
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = {executor.submit(_run, item): item for item in work}
+        try:
+            for future in as_completed(futures):
+                item = futures[future]
+                out = future.result()
+                chunk_length = item.end - item.start
+                if pass_outputs[item.pass_index] is None:
+                    pass_length = pass_inputs[item.pass_index].shape[-1]
+                    pass_outputs[item.pass_index] = torch.zeros(
+                        out.shape[0], channels, pass_length, dtype=out.dtype
+                    )
+                pass_outputs[item.pass_index][..., item.start:item.end] += (
+                    weight[:chunk_length] * out
+                )
+                pass_weights[item.pass_index][item.start:item.end] += weight[:chunk_length]
+
+                done += 1
+                if on_segment_done is not None:
+                    on_segment_done(done, total)
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
+    result = None
+    for pass_index, pass_output in enumerate(pass_outputs):
+        pass_output = pass_output / pass_weights[pass_index]
+        if use_shift:
+            pass_output = pass_output[..., max_shift - offsets[pass_index]:][..., :length]
+        result = pass_output if result is None else result + pass_output
+
+    return result / len(pass_outputs)
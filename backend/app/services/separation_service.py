@@ -9,14 +9,69 @@ from __future__ import annotations
 import asyncio
 import hashlib
 import logging
+import os
+import queue
+import shutil
 import subprocess
 import tempfile
+import threading
 import uuid
 import wave
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager, nullcontext
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
+from app.config import get_settings
+from app.services.batch_inference import SegmentBatcher
+from app.services.dispatcher import Dispatcher
+from app.services.host_profile import load_host_settings
+from app.services.job_scheduler import DEFAULT_DURATION_SECONDS, FairScheduler, QueueInfo
+from app.services.model_store import load_shared_model
+from app.services.peer_cache import get_peer_cache
+from app.services.preview_separation import PREVIEW_SAMPLE_RATE, dsp_preview_stems
+from app.services.segment_inference import run_segmented
+from app.services.stem_analysis import ANALYSIS_NAME, analyze_stems, load_analysis
+from app.services.stem_mixdown import (
+    MIX_PRESETS,
+    mix_cache_name,
+    render_mixdown,
+    resolve_gains,
+)
+from app.services.stem_pack import PACKED_STEMS_NAME, build_stem_pack
+from app.services.stem_segments import (
+    SEGMENT_MANIFEST_NAME,
+    SEGMENT_NAME_PATTERN,
+    SEGMENTS_DIR_NAME,
+    build_segments,
+    load_manifest,
+)
+from app.services.stem_stretch import STRETCH_DIR_NAME, render_stretch, stretch_cache_name
+from app.services.task_store import (
+    KIND_SEPARATION,
+    TERMINAL_STATUSES,
+    TaskRecord,
+    TaskStore,
+    get_task_store,
+)
+from app.services.waveform_peaks import (
+    ORIGINAL_PEAKS_NAME,
+    PEAKS_SUFFIX,
+    build_decoded_peaks,
+    build_wav_peaks,
+)
+from app.utils.audio_probe import probe_duration
+from app.utils.system_resources import (
+    ThreadPlan,
+    effective_cpu_count,
+    get_thread_affinity,
+    memory_limit_bytes,
+    pin_current_thread,
+    plan_threads,
+)
+from app.utils.wav import read_wav, write_wav
+
 logger = logging.getLogger(__name__)
 
 # Demucs/PyTorch 가용성 확인
@@ -28,8 +83,7 @@ try:
     from demucs.pretrained import get_model
     from demucs.audio import save_audio
 
-    # CPU 전용 최적화
-    torch.set_num_threads(4)
+    # CPU 전용 최적화 (스레드 수는 SeparationService 초기화 시 호스트 기준으로 설정)
     torch.set_grad_enabled(False)
 
     _DEMUCS_AVAILABLE = True
@@ -46,18 +100,138 @@ except ImportError as _import_err:
 # 지원되는 스템 이름
 STEM_NAMES = ["vocals", "drums", "bass", "other"]
 
+# 사용 모델 이름
+MODEL_NAME = "htdemucs"
+
+# 미리보기 스템 하위 디렉터리 이름
+PREVIEW_DIR_NAME = "preview"
+
+# 게시 전 스템을 쓰는 태스크별 작업 디렉터리 접두사
+STAGING_DIR_PREFIX = ".staging-"
+
+# 전체 품질 스템 게시 완료 표시 (스템과 분석 결과를 옮긴 뒤 마지막에 씀)
+STEMS_COMPLETE_NAME = ".complete"
+
+# Demucs shift trick 패스 수
+SEPARATION_SHIFTS = 1
+# shift trick 최대 이동 길이 (초, Demucs 기본값)
+SEPARATION_MAX_SHIFT_SECONDS = 0.5
+
+# 최대 메모리 추정: 44.1kHz 스테레오 float32 버퍼 크기 (바이트/초)와
+# 작업 중 동시에 존재하는 전체 길이 버퍼 수
+# (로드, 리샘플, 정규화, 스템 4개 출력, 겹침 합산 누적/가중치)
+AUDIO_BYTES_PER_SECOND = 44100 * 2 * 4
+PEAK_AUDIO_BUFFERS = 10
+# 세그먼트 워커 하나의 추론 작업 메모리 (활성값, STFT 버퍼)
+SEGMENT_WORKSPACE_BYTES = 512 * 1024 * 1024
+
+
+def estimate_peak_memory_bytes(duration_seconds: float | None, workers: int = 1) -> int:
+    """분리 작업 하나의 예상 최대 메모리 사용량(바이트)을 반환합니다.
+
+    Args:
+        duration_seconds: 오디오 길이 (초, None이면 기본값).
+        workers: 세그먼트 병렬 워커 수.
+    """
+    duration = duration_seconds or DEFAULT_DURATION_SECONDS
+    audio = int(duration * AUDIO_BYTES_PER_SECOND * PEAK_AUDIO_BUFFERS)
+    return audio + max(1, workers) * SEGMENT_WORKSPACE_BYTES
+
+
+def _checkpoint_signature(model_name: str) -> str:
+    """사전 학습 체크포인트 서명을 반환합니다.
+
+    Demucs 패키지에 들어 있는 원격 체크포인트 목록 (파일 이름에 체크섬 포함)과
+    모델 구성 파일의 해시이므로, 체크포인트가 바뀌면 서명도 바뀝니다.
+    """
+    import demucs
+
+    sha256 = hashlib.sha256(f"{model_name}:{demucs.__version__}".encode())
+    remote = Path(demucs.__file__).parent / "remote"
+    for name in ("files.txt", f"{model_name}.yaml"):
+        if (remote / name).exists():
+            sha256.update((remote / name).read_bytes())
+    return sha256.hexdigest()
+
+
+def _configure_torch_threads(plan: ThreadPlan) -> None:
+    """스레드 분배 계획을 torch에 적용합니다.
+
+    inter-op 스레드 수는 프로세스에서 병렬 작업이 시작되기 전에 한 번만
+    설정할 수 있으므로, 이미 설정된 경우 경고 없이 건너뜁니다.
+    """
+    if not _DEMUCS_AVAILABLE:
+        return
+
+    torch.set_num_threads(plan.intra_op_threads)
+    try:
+        if torch.get_num_interop_threads() != plan.inter_op_threads:
+            torch.set_num_interop_threads(plan.inter_op_threads)
+    except RuntimeError:
+        logger.debug("torch inter-op threads already fixed; keeping current value")
+
+
+def _model_segment_seconds(model: Any) -> float:
+    """모델(또는 BagOfModels)의 학습 세그먼트 길이(초)를 반환합니다."""
+    models = getattr(model, "models", None) or [model]
+    return float(min(m.segment for m in models))
+
+
+class SeparationCancelled(Exception):
+    """태스크가 취소되어 분리를 중단할 때 발생합니다."""
+
 
 @dataclass
 class SeparationTask:
     """분리 태스크 상태 데이터 모델."""
 
-    status: str  # pending, processing, completed, failed, queued
+    status: str  # pending, processing, completed, failed, queued, cancelled
     progress: float  # 0.0-100.0
     file_hash: str | None = None
     stems: dict[str, Path] | None = None  # 스템 파일 경로
     error: str | None = None
+    preview_stems: dict[str, Path] | None = None  # 미리보기(근사) 스템 파일 경로
+    quality: str | None = None  # preview, full
+    input_path: str | None = None  # 입력 파일 경로 (재시작 시 재실행용)
+    client_id: str = "unknown"  # 공정 큐잉 기준 클라이언트 (IP)
+    duration_seconds: float | None = None  # 조회한 오디오 길이 (초)
+    memory_estimate_bytes: int | None = None  # 예상 최대 메모리 사용량
     _created_at: float = field(default_factory=lambda: __import__("time").time())
 
+    def to_result(self) -> dict[str, Any] | None:
+        """영속 저장소에 기록할 결과(스템 경로, 품질)를 반환합니다."""
+        if not self.stems and not self.preview_stems:
+            return None
+        return {
+            "stems": _paths_to_json(self.stems),
+            "preview_stems": _paths_to_json(self.preview_stems),
+            "quality": self.quality,
+        }
+
+    @classmethod
+    def from_record(cls, record: TaskRecord) -> SeparationTask:
+        """영속 저장소 레코드에서 태스크를 만듭니다."""
+        result = record.result or {}
+        return cls(
+            status=record.status,
+            progress=record.progress,
+            file_hash=record.file_hash,
+            stems=_paths_from_json(result.get("stems")),
+            error=record.error,
+            preview_stems=_paths_from_json(result.get("preview_stems")),
+            quality=result.get("quality"),
+            input_path=record.source,
+            _created_at=record.created_at,
+        )
+
+
+def _paths_to_json(paths: dict[str, Path] | None) -> dict[str, str] | None:
+    return {name: str(path) for name, path in paths.items()} if paths else None
+
+
+def _paths_from_json(paths: dict[str, str] | None) -> dict[str, Path] | None:
+    return {name: Path(path) for name, path in paths.items()} if paths else None
+
 
 class SeparationService:
     """Demucs 음원 분리 서비스.
@@ -65,31 +239,127 @@ class SeparationService:
     특징:
     - Demucs htdemucs 모델 사용 (지연 로딩, 싱글톤)
     - 파일 해시 기반 캐싱
-    - asyncio.Semaphore로 동시 처리 제한
+    - 클라이언트별 공정 큐잉 + 최단 작업 우선 스케줄링 (FairScheduler)
+    - 작업별 예상 최대 메모리 기반 시작 제어 (메모리 예산)
     - 진행률 콜백 지원
     - 임시 파일 자동 정리
+    - 작업 내 세그먼트 병렬 추론 (유휴 코어 활용)
+    - 요청 간 세그먼트 배치 추론 (선택)
+    - 전체 분리 전 저비용 미리보기 스템 게시 (선택)
+    - 스템 묶음 (8채널 WAV 하나로 모든 스템 제공, 캐시에 한 번 생성)
+    - 다중 해상도 파형 피크 (원본과 스템, 오디오 디코딩 전에 파형 표시)
+    - 분리 후 스템 분석 (음량 엔벨로프, LUFS, 무음 스템은 빈 WAV 마커로 저장)
+    - 서버 측 믹스다운 (스템별 게인, 자주 쓰는 프리셋 믹스는 캐시에 한 번 생성)
+    - 서버 측 템포/피치 변환 (스템, 믹스, 구간별로 캐시, 동시 렌더링 수 제한)
+    - 분할 스트리밍 (스템별 고정 길이 FLAC 세그먼트와 JSON 매니페스트)
+    - 작업 취소 (대기열에서 제거, 실행 중이면 세그먼트 경계에서 중단)
+    - 영속 태스크 저장소 write-through 및 재시작 복구 (선택)
+    - 별도 추론 워커로 작업 위임 (INFERENCE_MODE=worker)
+    - 원격 추론 노드로 부하/캐시 기반 배치 및 장애 조치 (SEPARATION_NODES)
+    - 피어 인스턴스 캐시 조회 및 일관 해싱 배치 (CACHE_PEERS)
     """
 
     _model: Any = None  # 클래스 레벨 싱글톤 모델
+    _batcher: SegmentBatcher | None = None  # 모델과 함께 공유되는 배치 스케줄러
 
     def __init__(
         self,
         cache_dir: str | None = None,
-        max_concurrent: int = 2,
+        max_concurrent: int | None = None,
+        parallel_workers: int | None = None,
+        batch_size: int | None = None,
+        task_store: TaskStore | None = None,
+        inference_mode: str | None = None,
     ) -> None:
         """SeparationService를 초기화합니다.
 
         Args:
             cache_dir: 스템 캐시 디렉터리 경로.
             max_concurrent: 최대 동시 처리 수.
+            parallel_workers: 작업 내 세그먼트 병렬 워커 수 (0 = 자동, 1 = 비활성).
+            batch_size: 요청 간 배치 추론 최대 크기 (1 = 비활성).
+            task_store: 영속 태스크 저장소 (None = 인메모리만 사용).
+            inference_mode: "local"(이 프로세스에서 추론) 또는 "worker"
+                (저장소 대기열에 넣고 `python -m app.worker`가 처리).
         """
+        # 호스트 프로파일(autotune 결과)이 있으면 기본값 대신 적용
+        settings = load_host_settings(get_settings())
         self.cache_dir = Path(cache_dir or "/tmp/stems_cache")
         self.cache_dir.mkdir(parents=True, exist_ok=True)
 
-        self._semaphore = asyncio.Semaphore(max_concurrent)
+        if max_concurrent is None:
+            max_concurrent = settings.separation_max_concurrent
+        self.max_concurrent = max_concurrent
+
+        # 동시 처리 수와 호스트 CPU(affinity, cgroup 할당량)로 스레드 분배
+        self.thread_plan = plan_threads(
+            max_concurrent,
+            intra_op_threads=settings.torch_intra_op_threads,
+            inter_op_threads=settings.torch_inter_op_threads,
+        )
+        _configure_torch_threads(self.thread_plan)
+
+        # 워커별 코어 고정 (선택): 사용 가능한 코어 집합 슬롯
+        self.cpu_affinity = settings.separation_cpu_affinity and bool(
+            self.thread_plan.worker_core_sets
+        )
+        self._core_slots: queue.Queue[int] = queue.Queue()
+        for slot in range(len(self.thread_plan.worker_core_sets)):
+            self._core_slots.put(slot)
+
+        self.parallel_workers = (
+            settings.separation_parallel_workers
+            if parallel_workers is None
+            else parallel_workers
+        )
+        self.batch_size = settings.separation_batch_size if batch_size is None else batch_size
+        self.batch_wait_ms = settings.separation_batch_wait_ms
+        self.overlap = settings.separation_overlap
+        self.model_weights_dir = settings.model_weights_dir
+        self.preview_enabled = settings.separation_preview
+        self.segment_seconds = settings.separation_segment_seconds
+        self.memory_budget_mb = settings.separation_memory_budget_mb
+        self.memory_reserve_bytes = settings.admission_min_free_memory_mb * 1024 * 1024
+        self.silence_threshold_db = settings.separation_silence_threshold_db
+        self.silent_stem_markers = settings.separation_silent_stem_markers
+
+        self.scheduler = FairScheduler(max_concurrent, memory_budget=self.memory_budget_bytes)
         self._tasks: dict[str, SeparationTask] = {}
+        self._store = task_store
+
+        # 실행 중 작업의 asyncio 태스크와 추론 스레드용 취소 신호
+        self._runners: dict[str, asyncio.Task[None]] = {}
+        self._cancel_events: dict[str, threading.Event] = {}
+
+        # 캐시 파생 파일(스템 묶음, 파형 피크, 믹스, 템포 변환)별 생성 잠금
+        self._build_locks: dict[Path, asyncio.Lock] = {}
+        # 템포/피치 렌더링 동시 실행 수 제한 (CPU를 오래 씀)
+        self._stretch_slots = asyncio.Semaphore(max(1, settings.stretch_max_concurrent))
+
+        if inference_mode is None:
+            inference_mode = settings.inference_mode
+        self.remote_inference = inference_mode == "worker"
+        if self.remote_inference and task_store is None:
+            logger.warning("INFERENCE_MODE=worker requires TASK_STORE_PATH; running locally")
+            self.remote_inference = False
+
+        # 원격 추론 노드 디스패처 (노드가 없거나 모두 실패하면 로컬 처리)
+        self.dispatcher = (
+            Dispatcher(settings.separation_nodes) if settings.separation_nodes else None
+        )
 
-        logger.info("SeparationService initialized with cache_dir=%s", self.cache_dir)
+        # 피어 캐시 (로컬 캐시에 없을 때 계산 전에 조회)
+        self.peer_cache = get_peer_cache()
+
+        logger.info(
+            "SeparationService initialized with cache_dir=%s, max_concurrent=%d, "
+            "threads=%d/%d, affinity=%s",
+            self.cache_dir,
+            max_concurrent,
+            self.thread_plan.intra_op_threads,
+            self.thread_plan.inter_op_threads,
+            self.cpu_affinity,
+        )
 
     @property
     def tasks(self) -> dict[str, SeparationTask]:
@@ -103,22 +373,245 @@ class SeparationService:
             1 for t in self._tasks.values() if t.status in ("processing", "queued")
         )
 
-    def create_task(self) -> str:
-        """새 태스크를 생성하고 task_id를 반환합니다."""
+    def create_task(
+        self,
+        client_id: str = "unknown",
+        duration_seconds: float | None = None,
+    ) -> str:
+        """새 태스크를 생성하고 task_id를 반환합니다.
+
+        Args:
+            client_id: 공정 큐잉 기준 클라이언트 식별자 (예: IP).
+            duration_seconds: 업로드 중 조회한 오디오 길이 (None이면 분리 전에 조회).
+        """
         task_id = str(uuid.uuid4())
         self._tasks[task_id] = SeparationTask(
             status="pending",
             progress=0.0,
+            client_id=client_id,
+            duration_seconds=duration_seconds,
         )
+        self._persist(task_id)
         return task_id
 
     def get_task(self, task_id: str) -> SeparationTask | None:
-        """태스크 상태를 반환합니다."""
-        return self._tasks.get(task_id)
+        """태스크 상태를 반환합니다.
+
+        워커 모드에서는 워커가 저장소에 기록한 최신 상태를 읽습니다.
+        """
+        task = self._tasks.get(task_id)
+        if task is None and self.remote_inference:
+            record = self._store.get(task_id)
+            if record is not None and record.kind == KIND_SEPARATION:
+                return SeparationTask.from_record(record)
+        return task
+
+    def queue_info(self, task_id: str) -> QueueInfo | None:
+        """대기 중인 태스크의 순번과 예상 시작 시간을 반환합니다 (대기 중이 아니면 None)."""
+        return self.scheduler.position(task_id)
+
+    async def estimated_wait_seconds(self) -> float:
+        """지금 제출된 작업이 시작되기까지의 예상 대기 시간(초)을 반환합니다.
+
+        노드 디스패처가 있으면 작업은 노드에서 실행되므로 노드가 보고한 대기열 깊이로
+        추정하고 (정상 노드가 없으면 로컬 기준), 워커 모드에서는 저장소 대기열의
+        작업 수를 기본 길이로 환산합니다. 작업 길이는 이 호스트의 실시간 비율로 환산합니다.
+        """
+        job_seconds = DEFAULT_DURATION_SECONDS * self.scheduler.real_time_factor
+        if self.dispatcher is not None:
+            node_wait = await self.dispatcher.estimated_wait(job_seconds)
+            if node_wait is not None:
+                return node_wait
+        if not self.remote_inference:
+            return self.scheduler.estimated_wait()
+        pending = await asyncio.to_thread(
+            self._store.list_tasks, KIND_SEPARATION, ("queued", "processing")
+        )
+        excess = max(0, len(pending) - self.scheduler.limit + 1)
+        return excess * job_seconds / self.scheduler.limit
+
+    def memory_budget_bytes(self) -> int | None:
+        """로컬 분리 작업 전체가 동시에 쓸 수 있는 메모리 예산(바이트)을 반환합니다.
+
+        SEPARATION_MEMORY_BUDGET_MB가 0이면 cgroup/호스트 메모리 한도에서
+        ADMISSION_MIN_FREE_MEMORY_MB만큼 남겨 둔 값입니다 (확인할 수 없으면 None).
+        """
+        if self.memory_budget_mb > 0:
+            return self.memory_budget_mb * 1024 * 1024
+        limit = memory_limit_bytes()
+        if limit is None:
+            return None
+        return max(0, limit - self.memory_reserve_bytes)
+
+    def estimate_memory_bytes(self, duration_seconds: float | None) -> int:
+        """이 서비스 설정으로 분리할 때의 예상 최대 메모리 사용량(바이트)을 반환합니다."""
+        return estimate_peak_memory_bytes(duration_seconds, self._resolve_parallel_workers())
+
+    def enqueue(self, file_path: str | Path, task_id: str) -> None:
+        """작업을 저장소 대기열에 넣어 추론 워커가 처리하게 합니다.
+
+        이후 상태는 워커가 저장소에 기록하므로 로컬 딕셔너리에서는 제거합니다.
+        """
+        task = self._tasks[task_id]
+        task.status = "queued"
+        task.input_path = str(file_path)
+        self._persist(task_id)
+        self._tasks.pop(task_id, None)
+
+    async def run_task(self, file_path: str | Path, task_id: str) -> None:
+        """분리를 실행하고 실패를 태스크 상태로 기록합니다.
+
+        작업이 끝났을 때만 입력 파일을 삭제합니다. 종료로 취소된 경우에는
+        재시작 후 이어서 처리할 수 있도록 입력 파일을 남깁니다.
+
+        Args:
+            file_path: 입력 파일 경로.
+            task_id: 태스크 ID.
+        """
+        runner = asyncio.current_task()
+        if runner is not None:
+            self._runners[task_id] = runner
+        cancel_event = self._cancel_events.setdefault(task_id, threading.Event())
+        try:
+            await self.separate(file_path, task_id)
+        except SeparationCancelled:
+            logger.info("Separation cancelled for task %s", task_id)
+        except asyncio.CancelledError:
+            # 종료에 의한 취소는 전파하여 재시작 후 이어서 처리
+            if not cancel_event.is_set():
+                raise
+            logger.info("Separation cancelled for task %s", task_id)
+            self._cleanup_partial(task_id)
+        except FileNotFoundError as e:
+            logger.error("File not found for task %s: %s", task_id, e)
+            self._update_progress(task_id, -1.0, "failed", str(e))
+        except Exception as e:
+            logger.exception("Separation failed for task %s: %s", task_id, e)
+            self._update_progress(task_id, -1.0, "failed", str(e))
+        finally:
+            self._runners.pop(task_id, None)
+            self._cancel_events.pop(task_id, None)
+            task = self._tasks.get(task_id)
+            if task is None or task.status in ("completed", "failed", "cancelled"):
+                Path(file_path).unlink(missing_ok=True)
+
+    def cancel_task(self, task_id: str) -> bool:
+        """진행 중인 태스크를 취소합니다.
+
+        대기 중이면 스케줄러 대기열에서 빠지고, 실행 중이면 슬롯을 즉시 반납한 뒤
+        추론 스레드가 다음 세그먼트 경계에서 중단합니다. 워커 모드에서는
+        저장소 레코드를 "cancelled"로 바꾸어 워커가 중단하게 합니다.
+
+        Args:
+            task_id: 태스크 ID.
+
+        Returns:
+            취소했으면 True, 없거나 이미 끝난 태스크면 False.
+        """
+        task = self._tasks.get(task_id)
+        if task is None and self.remote_inference:
+            record = self._store.get(task_id)
+            if record is None or record.status in TERMINAL_STATUSES:
+                return False
+            record.status = "cancelled"
+            self._store.save(record)
+            return True
+
+        if task is None or task.status in ("completed", "failed", "cancelled"):
+            return False
+
+        self._update_progress(task_id, task.progress, "cancelled")
+        self._cancel_events.setdefault(task_id, threading.Event()).set()
+        runner = self._runners.get(task_id)
+        if runner is not None and runner is not asyncio.current_task():
+            runner.cancel()
+        logger.info("Cancel requested for task %s", task_id)
+        return True
+
+    def _check_cancelled(self, task_id: str) -> None:
+        """태스크가 취소되었으면 SeparationCancelled를 발생시킵니다 (추론 스레드에서 호출)."""
+        event = self._cancel_events.get(task_id)
+        if event is not None and event.is_set():
+            raise SeparationCancelled(task_id)
 
     def remove_task(self, task_id: str) -> None:
         """태스크를 제거합니다."""
         self._tasks.pop(task_id, None)
+        if self._store is not None:
+            self._store.delete(task_id)
+
+    def _persist(self, task_id: str) -> None:
+        """태스크 상태를 영속 저장소에 기록합니다 (저장소가 없으면 무시)."""
+        task = self._tasks.get(task_id)
+        if self._store is None or task is None:
+            return
+        try:
+            self._store.save(
+                TaskRecord(
+                    task_id=task_id,
+                    kind=KIND_SEPARATION,
+                    status=task.status,
+                    progress=task.progress,
+                    file_hash=task.file_hash,
+                    source=task.input_path,
+                    result=task.to_result(),
+                    error=task.error,
+                    created_at=task._created_at,
+                )
+            )
+        except Exception:
+            # 저장소 장애가 분리 작업 자체를 실패시키지 않도록 함
+            logger.exception("Failed to persist task %s", task_id)
+
+    def restore_tasks(self) -> list[tuple[str, str]]:
+        """영속 저장소에서 태스크를 복원합니다.
+
+        - 완료된 태스크: 캐시에 스템이 남아 있으면 복원, 없으면 레코드 삭제
+        - 실패/취소된 태스크: 그 상태로 복원 (클라이언트가 404 대신 결과 상태를 받음)
+        - 중단된 태스크: 캐시에 결과가 있으면 완료로, 입력 파일이 남아 있으면
+          대기열 재등록 대상으로, 둘 다 없으면 실패로 복원
+
+        Returns:
+            다시 실행할 (task_id, 입력 파일 경로) 목록 (생성 순서).
+        """
+        if self._store is None:
+            return []
+
+        resumable: list[tuple[str, str]] = []
+        for record in self._store.list_tasks(KIND_SEPARATION):
+            if record.task_id in self._tasks:
+                continue
+
+            task = SeparationTask.from_record(record)
+            task.preview_stems = None
+            cached = self._get_cached_stems(record.file_hash) if record.file_hash else None
+
+            if record.status in ("failed", "cancelled"):
+                pass
+            elif cached:
+                task.status, task.progress = "completed", 100.0
+                task.stems, task.quality = cached, "full"
+            elif record.status == "completed":
+                # 결과가 캐시 정리로 사라짐
+                self._store.delete(record.task_id)
+                continue
+            elif record.source and Path(record.source).exists():
+                task.status, task.progress = "queued", 0.0
+                resumable.append((record.task_id, record.source))
+            else:
+                task.status, task.progress = "failed", -1.0
+                task.error = "서버 재시작으로 작업이 중단되었습니다. 다시 업로드해 주세요."
+
+            self._tasks[record.task_id] = task
+            self._persist(record.task_id)
+
+        if self._tasks:
+            logger.info(
+                "Restored %d separation tasks (%d to resume)",
+                len(self._tasks),
+                len(resumable),
+            )
+        return resumable
 
     def _get_file_hash(self, file_path: Path) -> str:
         """파일의 SHA256 해시를 계산합니다.
@@ -140,9 +633,254 @@ class SeparationService:
         """해시에 대한 캐시 디렉터리 경로를 반환합니다."""
         return self.cache_dir / file_hash
 
+    def cached_stems(self, file_hash: str) -> dict[str, Path] | None:
+        """해시에 대한 전체 품질 스템 경로를 반환합니다 (태스크와 무관, 없으면 None)."""
+        return self._get_cached_stems(file_hash)
+
+    def complete_cached_stems(self, file_hash: str) -> bool:
+        """모든 스템 파일이 캐시에 있으면 완료 표시를 남깁니다 (피어 복제 수신용).
+
+        Returns:
+            완료 표시가 있으면 True.
+        """
+        cache_path = self._get_cache_path(file_hash)
+        if not all((cache_path / f"{stem_name}.wav").exists() for stem_name in STEM_NAMES):
+            return False
+        (cache_path / STEMS_COMPLETE_NAME).touch()
+        return True
+
+    async def packed_stems(self, file_hash: str) -> Path | None:
+        """해시의 전체 품질 스템을 묶은 멀티채널 WAV를 반환합니다 (없으면 None).
+
+        묶음은 처음 요청될 때 캐시 디렉터리에 한 번 만들고, 같은 해시의 동시 요청은
+        하나의 생성을 기다립니다. 채널 쌍 순서는 STEM_NAMES와 같습니다.
+        """
+        stems = self._get_cached_stems(file_hash)
+        if stems is None:
+            return None
+        packed = self._get_cache_path(file_hash) / PACKED_STEMS_NAME
+        if packed.exists():
+            return packed
+
+        await self._build_once(
+            packed,
+            build_stem_pack,
+            [stems[stem_name] for stem_name in STEM_NAMES],
+            packed,
+        )
+        logger.info("Packed stems for hash=%s", file_hash[:16])
+        return packed
+
+    async def mixdown(self, file_hash: str, preset: str, fmt: str = "wav") -> Path | None:
+        """프리셋 믹스 파일을 반환합니다 (스템이 없으면 None).
+
+        처음 요청될 때 캐시 디렉터리에 한 번 만들고 이후 요청은 파일을 그대로 제공합니다.
+
+        Raises:
+            KeyError: 알 수 없는 프리셋일 때.
+            RuntimeError: Opus 인코딩에 실패했을 때.
+        """
+        gains = resolve_gains(STEM_NAMES, MIX_PRESETS[preset])
+        stems = self._get_cached_stems(file_hash)
+        if stems is None:
+            return None
+        mix = self._get_cache_path(file_hash) / mix_cache_name(preset, fmt)
+        if not mix.exists():
+            await self._build_once(mix, render_mixdown, stems, gains, mix, fmt)
+        return mix
+
+    async def stretch(
+        self,
+        file_hash: str,
+        source: str,
+        tempo: float,
+        semitones: float,
+        start: float | None = None,
+        end: float | None = None,
+    ) -> Path | None:
+        """스템이나 프리셋 믹스를 템포/피치 변환한 파일을 반환합니다 (스템이 없으면 None).
+
+        결과는 (원본, 템포, 반음, 구간)별로 캐시 디렉터리에 한 번 만듭니다.
+
+        Args:
+            file_hash: 입력 파일 해시.
+            source: 스템 이름 또는 "mix_<프리셋>".
+            tempo: 템포 배율 (1.0 = 원래 속도).
+            semitones: 반음 단위 피치 변환.
+            start: 구간 시작 (초).
+            end: 구간 끝 (초).
+
+        Raises:
+            KeyError: 알 수 없는 스템이나 프리셋일 때.
+            RuntimeError: 렌더링에 실패했을 때.
+        """
+        stems = self._get_cached_stems(file_hash)
+        if stems is None:
+            return None
+        if source.startswith("mix_"):
+            source_path = await self.mixdown(file_hash, source.removeprefix("mix_"))
+        else:
+            source_path = stems[source]
+        if source_path is None:
+            return None
+
+        output_dir = self._get_cache_path(file_hash) / STRETCH_DIR_NAME
+        output = output_dir / stretch_cache_name(source, tempo, semitones, start, end)
+        if not output.exists():
+            output_dir.mkdir(exist_ok=True)
+            await self._build_once(
+                output,
+                render_stretch,
+                source_path,
+                output,
+                tempo,
+                semitones,
+                start,
+                end,
+                limit=self._stretch_slots,
+            )
+        return output
+
+    def original_peaks(self, file_hash: str) -> Path | None:
+        """해시의 원본 오디오 파형 피크 파일을 반환합니다 (없으면 None).
+
+        원본 입력은 작업이 끝나면 삭제되므로 피크는 분리 중에 만들어 둔 것만 있습니다.
+        """
+        peaks = self._get_cache_path(file_hash) / ORIGINAL_PEAKS_NAME
+        return peaks if peaks.exists() else None
+
+    async def stem_peaks(self, file_hash: str, stem_name: str) -> Path | None:
+        """전체 품질 스템의 파형 피크 파일을 반환합니다 (스템이 없으면 None).
+
+        처음 요청될 때 스템 옆에 한 번 만듭니다.
+        """
+        stems = self._get_cached_stems(file_hash)
+        if stems is None or stem_name not in stems:
+            return None
+        stem_file = stems[stem_name]
+        peaks = stem_file.with_suffix(PEAKS_SUFFIX)
+        if not peaks.exists():
+            await self._build_once(peaks, build_wav_peaks, stem_file, peaks)
+        return peaks
+
+    async def stem_segments(self, file_hash: str, stem_name: str) -> dict[str, Any] | None:
+        """스템의 세그먼트 매니페스트를 반환합니다 (스템이 없으면 None).
+
+        처음 요청될 때 스템을 세그먼트로 한 번 인코딩합니다.
+
+        Raises:
+            RuntimeError: 인코딩에 실패했을 때.
+        """
+        stems = self._get_cached_stems(file_hash)
+        if stems is None or stem_name not in stems:
+            return None
+        segments_dir = self._get_cache_path(file_hash) / SEGMENTS_DIR_NAME / stem_name
+        manifest = segments_dir / SEGMENT_MANIFEST_NAME
+        if not manifest.exists():
+            segments_dir.parent.mkdir(exist_ok=True)
+            await self._build_once(manifest, build_segments, stems[stem_name], segments_dir)
+        return load_manifest(manifest)
+
+    def stem_segment(self, file_hash: str, stem_name: str, segment: str) -> Path | None:
+        """이미 만든 세그먼트 파일을 반환합니다 (없거나 이름이 잘못되었으면 None)."""
+        if stem_name not in STEM_NAMES or not SEGMENT_NAME_PATTERN.match(segment):
+            return None
+        path = self._get_cache_path(file_hash) / SEGMENTS_DIR_NAME / stem_name / segment
+        return path if path.exists() else None
+
+    async def _build_once(
+        self,
+        target: Path,
+        build: Callable[..., Any],
+        *args: Any,
+        limit: asyncio.Semaphore | None = None,
+    ) -> None:
+        """캐시 파생 파일을 스레드에서 한 번만 만듭니다.
+
+        같은 파일의 동시 요청은 하나의 생성을 기다립니다. build는 임시 파일에
+        쓴 뒤 rename하여, 파일이 보이면 완성된 것이어야 합니다.
+        limit이 있으면 실제로 만드는 동안만 그 슬롯을 차지합니다.
+        """
+        lock = self._build_locks.setdefault(target, asyncio.Lock())
+        try:
+            async with lock:
+                if not target.exists():
+                    async with limit or nullcontext():
+                        await asyncio.to_thread(build, *args)
+        finally:
+            if not lock.locked():
+                self._build_locks.pop(target, None)
+
+    async def stem_analysis(self, file_hash: str) -> dict[str, Any] | None:
+        """해시의 스템 분석 결과를 반환합니다 (스템이 없거나 분석할 수 없으면 None).
+
+        분리 후 분석이 없으면 (피어에서 받은 스템 등) 처음 요청될 때 만들며,
+        이때는 이미 공유된 스템일 수 있으므로 마커로 바꾸지 않습니다.
+        """
+        stems = self._get_cached_stems(file_hash)
+        if stems is None:
+            return None
+        path = self._get_cache_path(file_hash) / ANALYSIS_NAME
+        analysis = load_analysis(path)
+        if analysis is None:
+            path.unlink(missing_ok=True)
+            try:
+                await self._build_once(
+                    path, analyze_stems, stems, path, self.silence_threshold_db
+                )
+            except (OSError, EOFError, ValueError, wave.Error) as e:
+                logger.warning("Stem analysis failed for hash=%s: %s", file_hash[:16], e)
+                return None
+            analysis = load_analysis(path)
+        return analysis
+
+    def silent_stems(self, file_hash: str) -> list[str]:
+        """분석 결과에서 무음으로 판정된 스템 이름을 반환합니다 (분석 전이면 빈 목록)."""
+        analysis = load_analysis(self._get_cache_path(file_hash) / ANALYSIS_NAME)
+        if analysis is None:
+            return []
+        return [name for name, result in analysis["stems"].items() if result["silent"]]
+
+    async def _analyze_stems(
+        self, cache_path: Path, stems: dict[str, Path], task_id: str
+    ) -> None:
+        """분리 직후 스템을 분석합니다 (실패해도 분리 결과는 유지)."""
+        try:
+            analysis = await asyncio.to_thread(
+                analyze_stems,
+                stems,
+                cache_path / ANALYSIS_NAME,
+                self.silence_threshold_db,
+                self.silent_stem_markers,
+            )
+        except Exception as e:
+            logger.warning("Stem analysis failed for task=%s: %s", task_id, e)
+            return
+        silent = [name for name, result in analysis["stems"].items() if result["silent"]]
+        if silent:
+            logger.info("Silent stems for task=%s: %s", task_id, ", ".join(silent))
+
+    async def _build_original_peaks(self, file_path: Path, file_hash: str) -> None:
+        """원본 오디오의 파형 피크를 만듭니다 (실패해도 분리는 계속)."""
+        cache_path = self._get_cache_path(file_hash)
+        peaks = cache_path / ORIGINAL_PEAKS_NAME
+        if peaks.exists():
+            return
+        cache_path.mkdir(parents=True, exist_ok=True)
+        try:
+            await self._build_once(peaks, build_decoded_peaks, file_path, peaks)
+        except Exception as e:
+            logger.warning("Waveform peaks failed for hash=%s: %s", file_hash[:16], e)
+
+    def has_cached_stems(self, file_hash: str) -> bool:
+        """해시에 대한 전체 품질 스템이 캐시에 있는지 반환합니다."""
+        return self._get_cached_stems(file_hash) is not None
+
     def _get_cached_stems(self, file_hash: str) -> dict[str, Path] | None:
         """캐시된 스템 파일 경로를 반환합니다.
 
+        스템 URL은 immutable로 캐시되므로 게시 완료 표시가 있을 때만 반환합니다.
+
         Args:
             file_hash: 파일 해시.
 
@@ -151,7 +889,7 @@ class SeparationService:
         """
         cache_path = self._get_cache_path(file_hash)
 
-        if not cache_path.exists():
+        if not (cache_path / STEMS_COMPLETE_NAME).exists():
             return None
 
         stems: dict[str, Path] = {}
@@ -218,12 +956,192 @@ class SeparationService:
         status: str,
         error: str | None = None,
     ) -> None:
-        """태스크 진행률을 업데이트합니다."""
+        """태스크 진행률을 업데이트합니다.
+
+        취소된 태스크는 아직 멈추지 않은 추론 스레드가 보고하는 진행률로 되살리지 않습니다.
+        """
         if task_id in self._tasks:
+            if self._tasks[task_id].status == "cancelled" and status != "cancelled":
+                return
             self._tasks[task_id].progress = progress
             self._tasks[task_id].status = status
             if error:
                 self._tasks[task_id].error = error
+            self._persist(task_id)
+
+    def _resolve_parallel_workers(self, cpu_count: int | None = None) -> int:
+        """이번 작업에 사용할 세그먼트 병렬 워커 수를 결정합니다.
+
+        자동 모드(0)에서는 사용 가능한 코어를 torch 스레드 수와
+        현재 처리 중인 작업 수로 나누어, 유휴 서버에서는 모든 코어를 쓰고
+        부하가 있을 때는 과다 구독을 피합니다.
+
+        Args:
+            cpu_count: 이 작업이 쓸 수 있는 코어 수 (None이면 호스트 전체).
+        """
+        if self.parallel_workers > 0:
+            return self.parallel_workers
+
+        if cpu_count is None:
+            running = max(1, self.scheduler.running)
+            cpu_count = effective_cpu_count() // running
+        return max(1, cpu_count // self.thread_plan.intra_op_threads)
+
+    @contextmanager
+    def _pinned_worker(self) -> Iterator[list[int] | None]:
+        """추론 스레드를 워커 슬롯의 코어 집합에 고정합니다.
+
+        affinity가 비활성이면 아무것도 하지 않고 None을 반환합니다.
+        스레드풀 스레드는 재사용되므로 종료 시 원래 affinity를 복원합니다.
+        """
+        if not self.cpu_affinity:
+            yield None
+            return
+
+        slot = self._core_slots.get()
+        cores = self.thread_plan.worker_core_sets[slot]
+        previous = get_thread_affinity()
+        pin_current_thread(cores)
+        try:
+            yield cores
+        finally:
+            if previous:
+                pin_current_thread(previous)
+            self._core_slots.put(slot)
+
+    def _segment_seconds_for(self, model: Any) -> float:
+        """이 서비스 설정으로 사용할 세그먼트 길이(초)를 반환합니다.
+
+        HTDemucs는 학습 세그먼트보다 긴 입력을 받을 수 없으므로 그 값으로 제한합니다.
+        """
+        model_segment = _model_segment_seconds(model)
+        if self.segment_seconds <= 0:
+            return model_segment
+        return min(self.segment_seconds, model_segment)
+
+    def _get_batcher(self, model: Any) -> SegmentBatcher | None:
+        """요청 간 배치 스케줄러를 반환합니다 (비활성 시 None).
+
+        배처는 모델과 같이 클래스 레벨에서 공유되어,
+        서로 다른 작업의 세그먼트가 하나의 forward로 묶입니다.
+        """
+        if self.batch_size <= 1:
+            return None
+
+        if SeparationService._batcher is None:
+
+            def _forward(segments: list[Any]) -> Any:
+                with torch.no_grad():
+                    return apply_model(
+                        model,
+                        torch.stack(segments),
+                        device="cpu",
+                        shifts=0,
+                        split=False,
+                        progress=False,
+                    )
+
+            SeparationService._batcher = SegmentBatcher(
+                _forward,
+                max_batch_size=self.batch_size,
+                max_wait_ms=self.batch_wait_ms,
+            )
+            logger.info(
+                "Segment batcher started (batch_size=%d, wait=%.1fms)",
+                self.batch_size,
+                self.batch_wait_ms,
+            )
+        return SeparationService._batcher
+
+    def _apply_model_parallel(
+        self,
+        model: Any,
+        mix: Any,
+        task_id: str,
+        workers: int,
+        batcher: SegmentBatcher | None = None,
+    ) -> Any:
+        """세그먼트를 여러 워커로 나누어 Demucs를 실행합니다.
+
+        Args:
+            model: Demucs 모델.
+            mix: 입력 텐서 (channels, samples).
+            task_id: 태스크 ID (진행률 업데이트용).
+            workers: 동시 세그먼트 작업 수.
+            batcher: 요청 간 배치 스케줄러 (None이면 세그먼트별 직접 추론).
+
+        Returns:
+            분리 결과 텐서 (sources, channels, samples).
+        """
+
+        def _infer(chunk: Any) -> Any:
+            # 취소되었으면 남은 세그먼트를 시작하지 않음
+            self._check_cancelled(task_id)
+            if batcher is not None:
+                return batcher.infer(chunk)
+
+            # grad 모드는 스레드 로컬이므로 워커 스레드에서 다시 비활성화
+            with torch.no_grad():
+                return apply_model(
+                    model,
+                    chunk.unsqueeze(0),
+                    device="cpu",
+                    shifts=0,
+                    split=False,
+                    progress=False,
+                )[0]
+
+        def _on_segment_done(done: int, total: int) -> None:
+            self._check_cancelled(task_id)
+            # 30-90% 구간을 세그먼트 완료 비율로 매핑
+            self._update_progress(task_id, 30.0 + 60.0 * done / total, "processing")
+
+        return run_segmented(
+            _infer,
+            mix,
+            segment_length=int(self._segment_seconds_for(model) * model.samplerate),
+            overlap=self.overlap,
+            shifts=SEPARATION_SHIFTS,
+            max_shift=int(SEPARATION_MAX_SHIFT_SECONDS * model.samplerate),
+            workers=workers,
+            on_segment_done=_on_segment_done,
+        )
+
+    def _load_model(self) -> Any:
+        """Demucs 모델을 동기적으로 로드합니다.
+
+        model_weights_dir가 설정되어 있으면 공유 가중치 파일을 mmap으로 매핑하여
+        여러 프로세스가 같은 물리 페이지를 사용하게 합니다. 매핑에 실패하면
+        (예: mmap 로딩을 지원하지 않는 torch 버전) 프로세스 전용 사본으로 폴백합니다.
+        """
+        if self.model_weights_dir:
+            try:
+                return load_shared_model(
+                    MODEL_NAME,
+                    self.model_weights_dir,
+                    lambda: get_model(MODEL_NAME),
+                    signature=_checkpoint_signature(MODEL_NAME),
+                )
+            except Exception as e:
+                logger.warning(
+                    "Shared model weights unavailable, using private copy: %s", e
+                )
+
+        model = get_model(MODEL_NAME)
+        model.cpu()
+        model.eval()
+        return model
+
+    def preload_model(self) -> None:
+        """모델을 동기적으로 미리 로드합니다.
+
+        fork 기반 서버(예: gunicorn --preload)의 마스터 프로세스에서 호출하면
+        워커들이 가중치 페이지를 copy-on-write로 공유합니다.
+        """
+        if SeparationService._model is not None or not _DEMUCS_AVAILABLE:
+            return
+        logger.info("Preloading Demucs %s model before worker fork...", MODEL_NAME)
+        SeparationService._model = self._load_model()
 
     async def _ensure_model_loaded(self) -> None:
         """Demucs 모델이 로드되었는지 확인합니다.
@@ -242,16 +1160,10 @@ class SeparationService:
             SeparationService._model = {"name": "htdemucs_mock", "loaded": True}
             return
 
-        logger.info("Loading Demucs htdemucs model (CPU)...")
-
-        def _load_model():
-            model = get_model("htdemucs")
-            model.cpu()
-            model.eval()
-            return model
+        logger.info("Loading Demucs %s model (CPU)...", MODEL_NAME)
 
         try:
-            SeparationService._model = await asyncio.to_thread(_load_model)
+            SeparationService._model = await asyncio.to_thread(self._load_model)
             logger.info(
                 "Demucs model loaded successfully. sources=%s",
                 SeparationService._model.sources,
@@ -371,7 +1283,7 @@ class SeparationService:
 
         Args:
             file_path: 입력 오디오 파일 경로.
-            cache_path: 스템 캐시 디렉터리.
+            cache_path: 스템을 쓸 디렉터리 (게시 전 작업 디렉터리).
             task_id: 태스크 ID.
 
         Returns:
@@ -402,26 +1314,15 @@ class SeparationService:
             )
             wav = torchaudio.transforms.Resample(sr, model.samplerate)(wav)
 
-        # 배치 차원 추가: (channels, samples) -> (1, channels, samples)
-        wav = wav.unsqueeze(0)
-
         # 분리 실행
+        self._check_cancelled(task_id)
         self._update_progress(task_id, 30.0, "processing")
-        logger.info(
-            "Running Demucs separation (task=%s, duration=%.1fs)...",
-            task_id,
-            wav.shape[-1] / model.samplerate,
-        )
-
-        with torch.no_grad():
-            sources = apply_model(
+        with self._pinned_worker() as cores:
+            sources = self._infer_sources(
                 model,
                 wav,
-                device="cpu",
-                shifts=1,
-                overlap=0.25,
-                split=True,  # 메모리 효율 최적화 (SPEC-BACKEND-001)
-                progress=False,
+                task_id,
+                cpu_count=len(cores) if cores else None,
             )
         # sources shape: (1, num_sources, channels, samples)
 
@@ -431,6 +1332,7 @@ class SeparationService:
 
         stems: dict[str, Path] = {}
         for i, source_name in enumerate(model.sources):
+            self._check_cancelled(task_id)
             stem_file = cache_path / f"{source_name}.wav"
             save_audio(
                 sources[0, i],
@@ -452,12 +1354,53 @@ class SeparationService:
         self._update_progress(task_id, 95.0, "processing")
         return stems
 
-    def _convert_to_wav(self, input_path: Path, output_path: Path) -> bool:
+    def _infer_sources(
+        self,
+        model: Any,
+        wav: Any,
+        task_id: str,
+        cpu_count: int | None = None,
+    ) -> Any:
+        """스테레오 입력 텐서에 Demucs 추론을 실행합니다.
+
+        Args:
+            model: Demucs 모델.
+            wav: 모델 샘플 레이트의 스테레오 텐서 (channels, samples).
+            task_id: 태스크 ID.
+            cpu_count: 이 작업이 쓸 수 있는 코어 수 (None이면 호스트 기준 자동).
+
+        Returns:
+            분리 결과 텐서 (1, sources, channels, samples).
+        """
+        workers = self._resolve_parallel_workers(cpu_count)
+        batcher = self._get_batcher(model)
+        if batcher is not None:
+            # 배치가 채워지도록 작업당 최소 batch_size개의 세그먼트를 동시에 제출
+            workers = max(workers, batcher.max_batch_size)
+        logger.info(
+            "Running Demucs separation (task=%s, duration=%.1fs, workers=%d)...",
+            task_id,
+            wav.shape[-1] / model.samplerate,
+            workers,
+        )
+
+        # 워커가 하나여도 세그먼트 단위로 실행하여 세그먼트 경계에서 취소를 확인
+        return self._apply_model_parallel(
+            model, wav, task_id, workers, batcher
+        ).unsqueeze(0)
+
+    def _convert_to_wav(
+        self,
+        input_path: Path,
+        output_path: Path,
+        sample_rate: int = 44100,
+    ) -> bool:
         """ffmpeg를 사용하여 오디오 파일을 WAV로 변환합니다.
 
         Args:
             input_path: 입력 오디오 파일 경로.
             output_path: 출력 WAV 파일 경로.
+            sample_rate: 출력 샘플 레이트 (Hz).
 
         Returns:
             변환 성공 여부.
@@ -468,7 +1411,7 @@ class SeparationService:
             result = subprocess.run(
                 [
                     "ffmpeg", "-y", "-i", str(input_path),
-                    "-ar", "44100", "-ac", "2", "-sample_fmt", "s16",
+                    "-ar", str(sample_rate), "-ac", "2", "-sample_fmt", "s16",
                     str(output_path),
                 ],
                 capture_output=True,
@@ -478,6 +1421,58 @@ class SeparationService:
         except (FileNotFoundError, subprocess.TimeoutExpired):
             return False
 
+    def _run_preview_separation(
+        self,
+        file_path: Path,
+        cache_path: Path,
+        task_id: str,
+    ) -> dict[str, Path] | None:
+        """저비용 DSP 미리보기 스템을 생성합니다.
+
+        다운샘플된 오디오에 mid/side + 대역 분할을 적용하여 수 초 안에
+        근사 스템을 만듭니다. 실패해도 전체 분리는 계속되므로 None을 반환합니다.
+
+        Args:
+            file_path: 입력 오디오 파일 경로.
+            cache_path: 스템 캐시 디렉터리.
+            task_id: 태스크 ID.
+
+        Returns:
+            스템 이름에서 미리보기 파일 경로로의 매핑, 또는 None.
+        """
+        preview_dir = cache_path / PREVIEW_DIR_NAME
+        preview_dir.mkdir(parents=True, exist_ok=True)
+        decoded = preview_dir / "_input.wav"
+
+        try:
+            if not self._convert_to_wav(file_path, decoded, sample_rate=PREVIEW_SAMPLE_RATE):
+                logger.warning("Preview decode failed for task=%s", task_id)
+                return None
+
+            audio, sample_rate = read_wav(decoded)
+            preview = dsp_preview_stems(audio, sample_rate)
+
+            stems: dict[str, Path] = {}
+            for stem_name in STEM_NAMES:
+                stem_file = preview_dir / f"{stem_name}.wav"
+                write_wav(stem_file, preview[stem_name], sample_rate)
+                stems[stem_name] = stem_file
+
+            logger.info("Preview stems published for task=%s", task_id)
+            return stems
+        except Exception as e:
+            logger.warning("Preview separation failed for task=%s: %s", task_id, e)
+            return None
+        finally:
+            decoded.unlink(missing_ok=True)
+
+    def _discard_preview(self, cache_path: Path, task_id: str) -> None:
+        """전체 품질 스템으로 교체된 미리보기 스템을 삭제합니다."""
+        if task_id in self._tasks:
+            self._tasks[task_id].preview_stems = None
+            self._persist(task_id)
+        shutil.rmtree(cache_path / PREVIEW_DIR_NAME, ignore_errors=True)
+
     def _run_mock_separation(
         self,
         file_path: Path,
@@ -491,14 +1486,12 @@ class SeparationService:
 
         Args:
             file_path: 입력 오디오 파일 경로.
-            cache_path: 스템 캐시 디렉터리.
+            cache_path: 스템을 쓸 디렉터리 (게시 전 작업 디렉터리).
             task_id: 태스크 ID.
 
         Returns:
             스템 이름에서 파일 경로로의 매핑.
         """
-        import shutil
-
         logger.warning(
             "Demucs가 설치되지 않아 원본 오디오를 각 stem으로 복사합니다 (task=%s). "
             "실제 음원 분리를 위해 demucs를 설치하세요.",
@@ -516,6 +1509,7 @@ class SeparationService:
             # 첫 번째 stem은 이미 생성됨, 나머지는 복사
             stems[STEM_NAMES[0]] = first_stem_file
             for i, stem_name in enumerate(STEM_NAMES[1:], start=1):
+                self._check_cancelled(task_id)
                 progress = 30 + (i + 1) * 15
                 self._update_progress(task_id, float(progress), "processing")
                 stem_file = cache_path / f"{stem_name}.wav"
@@ -526,6 +1520,7 @@ class SeparationService:
             # ffmpeg 미설치 시 무음 WAV 폴백
             logger.warning("ffmpeg 미설치 - 무음 WAV 생성 폴백 사용")
             for i, stem_name in enumerate(STEM_NAMES):
+                self._check_cancelled(task_id)
                 progress = 30 + (i + 1) * 15
                 self._update_progress(task_id, float(progress), "processing")
                 stem_file = cache_path / f"{stem_name}.wav"
@@ -535,6 +1530,50 @@ class SeparationService:
         self._update_progress(task_id, 95.0, "processing")
         return stems
 
+    async def _separate_locally(
+        self,
+        file_path: Path,
+        cache_path: Path,
+        task_id: str,
+    ) -> dict[str, Path]:
+        """스케줄러 슬롯 안에서 이 프로세스의 모델로 분리합니다.
+
+        슬롯을 기다리는 동안 태스크는 "queued" 상태이며,
+        순번과 예상 시작 시간은 queue_info로 조회합니다. 실행 중 작업과 이 작업의
+        예상 최대 메모리 합계가 메모리 예산을 넘으면 슬롯이 비어도 기다립니다.
+        """
+        task = self._tasks[task_id]
+        if task.duration_seconds is None:
+            # 최단 작업 우선 가중치와 대기 시간 추정용 길이 (디코딩 없이 조회)
+            task.duration_seconds = await asyncio.to_thread(probe_duration, file_path)
+        # 메모리 예산 확인용 추정치 (세그먼트 워커 수는 대기열 진입 시점 기준)
+        task.memory_estimate_bytes = self.estimate_memory_bytes(task.duration_seconds)
+        self._update_progress(task_id, task.progress, "queued")
+        async with self.scheduler.slot(
+            task_id,
+            task.client_id,
+            task.duration_seconds,
+            task.memory_estimate_bytes,
+        ):
+            # 10% - 모델 로드
+            self._update_progress(task_id, 10.0, "processing")
+            await self._ensure_model_loaded()
+
+            # 20-95% - 분리 실행
+            if _DEMUCS_AVAILABLE and not isinstance(SeparationService._model, dict):
+                return await asyncio.to_thread(
+                    self._run_demucs_separation,
+                    file_path,
+                    cache_path,
+                    task_id,
+                )
+            return await asyncio.to_thread(
+                self._run_mock_separation,
+                file_path,
+                cache_path,
+                task_id,
+            )
+
     async def separate(
         self,
         file_path: str | Path,
@@ -560,76 +1599,156 @@ class SeparationService:
         if not file_path.exists():
             raise FileNotFoundError(f"파일을 찾을 수 없습니다: {file_path}")
 
-        async with self._semaphore:
-            try:
-                # 5% - 파일 해시 계산
-                self._update_progress(task_id, 5.0, "processing")
-                file_hash = await asyncio.to_thread(self._get_file_hash, file_path)
-                self._tasks[task_id].file_hash = file_hash
-
-                # 캐시 확인
-                cached_stems = self._get_cached_stems(file_hash)
-                if cached_stems:
-                    logger.info("Using cached stems for hash=%s", file_hash[:16])
-                    self._update_progress(task_id, 100.0, "completed")
-                    self._tasks[task_id].stems = cached_stems
-                    return cached_stems
-
-                # 10% - 모델 로드
-                self._update_progress(task_id, 10.0, "processing")
-                await self._ensure_model_loaded()
-
-                # 캐시 디렉터리 생성
-                cache_path = self._get_cache_path(file_hash)
-                cache_path.mkdir(parents=True, exist_ok=True)
-
-                # 20-95% - 분리 실행
-                if _DEMUCS_AVAILABLE and not isinstance(
-                    SeparationService._model, dict
-                ):
-                    stems = await asyncio.to_thread(
-                        self._run_demucs_separation,
-                        file_path,
-                        cache_path,
-                        task_id,
-                    )
-                else:
-                    stems = await asyncio.to_thread(
-                        self._run_mock_separation,
-                        file_path,
-                        cache_path,
-                        task_id,
-                    )
-
-                # 100% - 완료
+        staging: Path | None = None
+        try:
+            # 5% - 파일 해시 계산
+            self._update_progress(task_id, 5.0, "processing")
+            self._tasks[task_id].input_path = str(file_path)
+            file_hash = await asyncio.to_thread(self._get_file_hash, file_path)
+            self._tasks[task_id].file_hash = file_hash
+            self._persist(task_id)
+
+            # 원본 파형 피크 (입력 파일은 작업 후 삭제되므로 분리 전에 만듦)
+            await self._build_original_peaks(file_path, file_hash)
+
+            # 캐시 확인 (대기열을 기다리지 않고 즉시 반환)
+            cached_stems = self._get_cached_stems(file_hash)
+            if cached_stems:
+                logger.info("Using cached stems for hash=%s", file_hash[:16])
+                self._tasks[task_id].stems = cached_stems
+                self._tasks[task_id].quality = "full"
                 self._update_progress(task_id, 100.0, "completed")
-                self._tasks[task_id].stems = stems
+                return cached_stems
 
-                logger.info(
-                    "Separation completed for task=%s, hash=%s, demucs=%s",
+            # 캐시 디렉터리와 작업 디렉터리 생성 (스템은 작업 디렉터리에 만든 뒤 게시)
+            cache_path = self._get_cache_path(file_hash)
+            staging = cache_path / f"{STAGING_DIR_PREFIX}{task_id}"
+            staging.mkdir(parents=True, exist_ok=True)
+
+            # 피어 캐시 확인 (다른 인스턴스가 이미 분리한 결과를 받아옴)
+            if self.peer_cache is not None:
+                peer_stems = await asyncio.to_thread(
+                    self.peer_cache.fetch_stems, file_hash, staging, STEM_NAMES
+                )
+                if peer_stems:
+                    peer_stems = await asyncio.to_thread(
+                        self._publish_stems, file_hash, staging, peer_stems
+                    )
+                    self._tasks[task_id].stems = peer_stems
+                    self._tasks[task_id].quality = "full"
+                    self._update_progress(task_id, 100.0, "completed")
+                    return peer_stems
+
+            # 미리보기 스템: 대기열을 기다리기 전에 근사 결과를 먼저 게시
+            if self.preview_enabled:
+                preview_stems = await asyncio.to_thread(
+                    self._run_preview_separation,
+                    file_path,
+                    cache_path,
                     task_id,
-                    file_hash[:16],
-                    _DEMUCS_AVAILABLE,
+                )
+                if preview_stems:
+                    self._tasks[task_id].preview_stems = preview_stems
+                    self._tasks[task_id].quality = "preview"
+                    self._persist(task_id)
+
+            # 원격 노드가 있으면 먼저 배치 (노드를 모두 잃으면 로컬로 처리)
+            stems = None
+            if self.dispatcher is not None:
+                stems = await self.dispatcher.run(
+                    file_path,
+                    file_hash,
+                    staging,
+                    STEM_NAMES,
+                    on_progress=lambda p: self._update_progress(task_id, p, "processing"),
+                    client_id=self._tasks[task_id].client_id,
                 )
 
-                return stems
+            if stems is None:
+                stems = await self._separate_locally(file_path, staging, task_id)
 
-            except Exception as e:
-                # 실패 시 부분 출력 정리
-                if task_id in self._tasks and self._tasks[task_id].file_hash:
-                    partial_cache = self._get_cache_path(
-                        self._tasks[task_id].file_hash
-                    )
-                    if partial_cache.exists():
-                        import shutil
+            # 스템 분석 (무음 스템은 게시 전에 마커로 교체)
+            await self._analyze_stems(staging, stems, task_id)
+            stems = await asyncio.to_thread(self._publish_stems, file_hash, staging, stems)
 
-                        shutil.rmtree(partial_cache, ignore_errors=True)
-                        logger.info(
-                            "Cleaned up partial output for task=%s", task_id
-                        )
+            # 100% - 완료 (미리보기 스템을 전체 품질 스템으로 교체)
+            self._tasks[task_id].stems = stems
+            self._tasks[task_id].quality = "full"
+            self._update_progress(task_id, 100.0, "completed")
+            self._discard_preview(cache_path, task_id)
 
-                raise
+            # 일관 해싱 링에서 이 해시를 맡는 피어에 복제
+            if self.peer_cache is not None:
+                self.peer_cache.replicate_stems(file_hash, stems)
+
+            logger.info(
+                "Separation completed for task=%s, hash=%s, demucs=%s",
+                task_id,
+                file_hash[:16],
+                _DEMUCS_AVAILABLE,
+            )
+
+            return stems
+
+        except Exception:
+            self._cleanup_partial(task_id)
+            raise
+        finally:
+            if staging is not None:
+                shutil.rmtree(staging, ignore_errors=True)
+
+    def _publish_stems(
+        self, file_hash: str, staging: Path, staged: dict[str, Path]
+    ) -> dict[str, Path]:
+        """작업 디렉터리의 스템과 분석 결과를 캐시로 옮기고 완료 표시를 남깁니다.
+
+        각 파일을 rename으로 옮긴 뒤 완료 표시를 마지막에 쓰므로, 완료 표시가 보이면
+        모든 스템이 최종 내용입니다. 같은 해시가 이미 게시되었으면 immutable로 제공 중인
+        파일을 바꾸지 않고 기존 스템을 반환합니다 (스레드풀에서 호출).
+        """
+        published = self._get_cached_stems(file_hash)
+        if published is not None:
+            return published
+
+        cache_path = self._get_cache_path(file_hash)
+        stems: dict[str, Path] = {}
+        for stem_name, path in staged.items():
+            target = cache_path / f"{stem_name}.wav"
+            os.replace(path, target)
+            stems[stem_name] = target
+        analysis = staging / ANALYSIS_NAME
+        if analysis.exists():
+            os.replace(analysis, cache_path / ANALYSIS_NAME)
+        (cache_path / STEMS_COMPLETE_NAME).touch()
+        return stems
+
+    def _cleanup_partial(self, task_id: str) -> None:
+        """실패/취소 시 부분 출력을 정리합니다.
+
+        캐시 디렉터리는 같은 입력 해시의 태스크가 함께 쓰므로, 같은 해시로 진행 중인
+        다른 태스크가 있거나 전체 품질 스템이 이미 있으면 지우지 않습니다.
+        """
+        task = self._tasks.get(task_id)
+        if task is None or not task.file_hash:
+            return
+        task.preview_stems = None
+        if self.has_cached_stems(task.file_hash) or self._hash_in_use(task.file_hash, task_id):
+            logger.info("Kept shared cache for task=%s (hash in use)", task_id)
+            return
+        partial_cache = self._get_cache_path(task.file_hash)
+        if partial_cache.exists():
+            shutil.rmtree(partial_cache, ignore_errors=True)
+            logger.info("Cleaned up partial output for task=%s", task_id)
+
+    def _hash_in_use(self, file_hash: str, exclude_task_id: str) -> bool:
+        """같은 입력 해시로 진행 중인 다른 태스크가 있는지 반환합니다."""
+        return any(
+            other_id != exclude_task_id
+            and other.file_hash == file_hash
+            and other.status not in ("completed", "failed", "cancelled")
+            for other_id, other in self._tasks.items()
+        )
 
 
 # 전역 서비스 인스턴스
-separation_service = SeparationService()
+separation_service = SeparationService(task_store=get_task_store())
@@ -0,0 +1,281 @@
+"""분리 후 스템 분석 모듈.
+
+연주곡의 보컬이나 어쿠스틱 곡의 베이스처럼 사실상 비어 있는 스템도 전체 길이의
+무음 WAV로 저장되고 전송됩니다. 이 모듈은 스템을 청크 단위로 읽어
+
+- 작은 RMS 음량 엔벨로프 (dBFS)
+- 통합 라우드니스 (ITU-R BS.1770 K-가중, 게이팅 적용 LUFS)
+- 무음 스템 여부와 무음 구간
+
+을 계산하여 JSON 메타데이터로 캐시에 저장합니다. 무음 스템은 프레임 없는 WAV
+(헤더만 있는 마커)로 바꿔 저장할 수 있으며, 원래 길이는 메타데이터에 남깁니다.
+
+K-가중 필터는 100ms 블록마다 FFT 스펙트럼에 필터 크기 응답을 곱해 적용합니다
+(블록 경계의 필터 상태는 무시하는 근사).
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import wave
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+# 캐시 디렉터리 안의 분석 결과 파일 이름
+ANALYSIS_NAME = "analysis.json"
+
+# 분석 블록 길이 (BS.1770 게이팅 블록 400ms의 1/4)와 엔벨로프 간격 (초)
+BLOCK_SECONDS = 0.1
+ENVELOPE_HOP_SECONDS = 0.5
+
+# 무음 판정 기준 (100ms 블록 RMS, dBFS)과 보고할 최소 무음 구간 길이 (초)
+SILENCE_THRESHOLD_DB = -60.0
+MIN_SILENT_SPAN_SECONDS = 1.0
+
+# 엔벨로프/레벨 하한 (dBFS, 16-bit 양자화 잡음 근처)
+FLOOR_DB = -96.0
+
+# 한 번에 읽을 블록 수
+ANALYSIS_CHUNK_BLOCKS = 600
+
+# BS.1770 게이팅: 절대 게이트 (LUFS), 상대 게이트 (LU)
+_ABSOLUTE_GATE_LUFS = -70.0
+_RELATIVE_GATE_LU = -10.0
+_GATE_BLOCKS = 4  # 400ms 블록 = 100ms 블록 4개 (75% 겹침)
+
+_VERSION = 1
+
+
+def _biquad_power(
+    b: tuple[float, float, float],
+    a: tuple[float, float, float],
+    freqs: np.ndarray,
+    sample_rate: int,
+) -> np.ndarray:
+    """바이쿼드 필터의 주파수별 파워 응답 |H|^2을 계산합니다."""
+    z = np.exp(-1j * 2 * np.pi * freqs / sample_rate)
+    numerator = b[0] + b[1] * z + b[2] * z**2
+    denominator = a[0] + a[1] * z + a[2] * z**2
+    return np.abs(numerator / denominator) ** 2
+
+
+def k_weighting_power(block: int, sample_rate: int) -> np.ndarray:
+    """블록 길이 rfft 주파수 빈별 K-가중 파워 응답을 반환합니다.
+
+    고역 셸빙 (+4dB, 1.5kHz)과 고역 통과 (38Hz) 두 단계를 샘플 레이트에 맞게 설계합니다.
+    """
+    freqs = np.fft.rfftfreq(block, 1 / sample_rate)
+
+    # 1단계: 고역 셸빙
+    gain = 10 ** (4.0 / 40)
+    w0 = 2 * math.pi * 1500.0 / sample_rate
+    alpha = math.sin(w0) / (2 * (1 / math.sqrt(2)))
+    cos_w0 = math.cos(w0)
+    shelf = _biquad_power(
+        (
+            gain * ((gain + 1) + (gain - 1) * cos_w0 + 2 * math.sqrt(gain) * alpha),
+            -2 * gain * ((gain - 1) + (gain + 1) * cos_w0),
+            gain * ((gain + 1) + (gain - 1) * cos_w0 - 2 * math.sqrt(gain) * alpha),
+        ),
+        (
+            (gain + 1) - (gain - 1) * cos_w0 + 2 * math.sqrt(gain) * alpha,
+            2 * ((gain - 1) - (gain + 1) * cos_w0),
+            (gain + 1) - (gain - 1) * cos_w0 - 2 * math.sqrt(gain) * alpha,
+        ),
+        freqs,
+        sample_rate,
+    )
+
+    # 2단계: 고역 통과
+    w0 = 2 * math.pi * 38.0 / sample_rate
+    alpha = math.sin(w0) / (2 * 0.5)
+    cos_w0 = math.cos(w0)
+    highpass = _biquad_power(
+        ((1 + cos_w0) / 2, -(1 + cos_w0), (1 + cos_w0) / 2),
+        (1 + alpha, -2 * cos_w0, 1 - alpha),
+        freqs,
+        sample_rate,
+    )
+    return shelf * highpass
+
+
+def _to_db(power: np.ndarray) -> np.ndarray:
+    """평균 제곱을 dBFS로 변환합니다 (하한 FLOOR_DB)."""
+    return np.maximum(10 * np.log10(np.maximum(power, 1e-20)), FLOOR_DB)
+
+
+def integrated_loudness(block_power: np.ndarray) -> float | None:
+    """100ms 블록별 K-가중 파워(채널 합)로 게이팅 적용 통합 라우드니스를 계산합니다.
+
+    Returns:
+        LUFS, 또는 게이트를 통과한 블록이 없을 때 None.
+    """
+    if len(block_power) < _GATE_BLOCKS:
+        return None
+    # 400ms 블록 (100ms 간격)의 평균 파워
+    windows = np.convolve(block_power, np.ones(_GATE_BLOCKS) / _GATE_BLOCKS, mode="valid")
+    loudness = -0.691 + 10 * np.log10(np.maximum(windows, 1e-20))
+
+    gated = windows[loudness > _ABSOLUTE_GATE_LUFS]
+    if len(gated) == 0:
+        return None
+    relative_gate = -0.691 + 10 * math.log10(gated.mean()) + _RELATIVE_GATE_LU
+    gated = windows[(loudness > _ABSOLUTE_GATE_LUFS) & (loudness > relative_gate)]
+    return round(-0.691 + 10 * math.log10(gated.mean()), 2)
+
+
+def silent_spans(
+    block_db: np.ndarray,
+    threshold_db: float = SILENCE_THRESHOLD_DB,
+    min_seconds: float = MIN_SILENT_SPAN_SECONDS,
+) -> list[list[float]]:
+    """기준보다 조용한 블록이 min_seconds 이상 이어지는 구간을 찾습니다.
+
+    Returns:
+        [시작 초, 끝 초] 목록.
+    """
+    quiet = np.concatenate(([False], block_db < threshold_db, [False]))
+    edges = np.flatnonzero(np.diff(quiet.astype(np.int8)))
+    starts, ends = edges[0::2], edges[1::2]
+    min_blocks = math.ceil(min_seconds / BLOCK_SECONDS)
+    return [
+        [round(int(start) * BLOCK_SECONDS, 3), round(int(end) * BLOCK_SECONDS, 3)]
+        for start, end in zip(starts, ends)
+        if end - start >= min_blocks
+    ]
+
+
+def _iter_blocks(wav_file: wave.Wave_read, block: int) -> Iterator[np.ndarray]:
+    """WAV를 (블록 수, 블록 길이, 채널) float 배열 청크로 읽습니다 (마지막 블록은 0으로 채움)."""
+    channels = wav_file.getnchannels()
+    while data := wav_file.readframes(block * ANALYSIS_CHUNK_BLOCKS):
+        samples = np.frombuffer(data, dtype="<i2").reshape(-1, channels)
+        pad = -len(samples) % block
+        if pad:
+            samples = np.pad(samples, ((0, pad), (0, 0)))
+        yield samples.reshape(-1, block, channels).astype(np.float32) / 32768.0
+
+
+def analyze_stem(path: Path, threshold_db: float = SILENCE_THRESHOLD_DB) -> dict[str, Any]:
+    """16-bit PCM 스템 WAV 하나를 분석합니다.
+
+    Returns:
+        frames, sample_rate, silent, peak_db, rms_db, integrated_lufs,
+        envelope_db (ENVELOPE_HOP_SECONDS 간격 RMS), silent_spans를 담은 딕셔너리.
+
+    Raises:
+        ValueError: 16-bit PCM이 아닐 때.
+    """
+    with wave.open(str(path), "rb") as wav_file:
+        if wav_file.getsampwidth() != 2:
+            raise ValueError(f"Unsupported sample width: {wav_file.getsampwidth() * 8}-bit")
+        sample_rate = wav_file.getframerate()
+        frames = wav_file.getnframes()
+        block = round(sample_rate * BLOCK_SECONDS)
+        weighting = k_weighting_power(block, sample_rate)
+
+        mean_square: list[np.ndarray] = []
+        k_power: list[np.ndarray] = []
+        peak = 0.0
+        for blocks in _iter_blocks(wav_file, block):
+            peak = max(peak, float(np.abs(blocks).max()))
+            # 채널 평균 제곱 (RMS 엔벨로프)
+            mean_square.append(np.mean(blocks**2, axis=(1, 2)))
+            # Parseval: rfft 파워에 K-가중을 곱해 블록별 필터 출력 평균 제곱 계산 (채널 합)
+            spectrum = np.abs(np.fft.rfft(blocks, axis=1)) ** 2
+            scale = np.full(spectrum.shape[1], 2.0)
+            scale[0] = 1.0
+            if block % 2 == 0:
+                scale[-1] = 1.0
+            weighted = np.einsum("bfc,f->b", spectrum, weighting * scale) / block**2
+            k_power.append(weighted)
+
+    block_ms = np.concatenate(mean_square) if mean_square else np.empty(0)
+    block_k = np.concatenate(k_power) if k_power else np.empty(0)
+    block_db = _to_db(block_ms)
+
+    hop = round(ENVELOPE_HOP_SECONDS / BLOCK_SECONDS)
+    pad = -len(block_ms) % hop
+    envelope = _to_db(np.pad(block_ms, (0, pad)).reshape(-1, hop).mean(axis=1))
+
+    return {
+        "frames": frames,
+        "sample_rate": sample_rate,
+        "silent": bool(len(block_db) == 0 or block_db.max() < threshold_db),
+        "peak_db": round(float(_to_db(np.array(peak**2))), 2),
+        "rms_db": round(float(_to_db(np.array(block_ms.mean() if len(block_ms) else 0.0))), 2),
+        "integrated_lufs": integrated_loudness(block_k),
+        "envelope_db": np.round(envelope).astype(int).tolist(),
+        "silent_spans": silent_spans(block_db, threshold_db),
+    }
+
+
+def write_silent_marker(path: Path, channels: int, sample_rate: int) -> None:
+    """스템 WAV를 같은 형식의 프레임 없는 WAV로 바꿉니다 (임시 파일에 쓴 뒤 rename)."""
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with wave.open(str(tmp), "wb") as wav_file:
+            wav_file.setnchannels(channels)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(sample_rate)
+        tmp.replace(path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def analyze_stems(
+    stems: dict[str, Path],
+    output: Path,
+    threshold_db: float = SILENCE_THRESHOLD_DB,
+    silent_markers: bool = False,
+) -> dict[str, Any]:
+    """스템들을 분석해 JSON으로 저장하고, 원하면 무음 스템을 마커로 바꿉니다.
+
+    모든 스템이 무음이면 길이를 알 수 있는 스템이 남도록 마커로 바꾸지 않습니다.
+    분석은 마커로 바꾸기 전에 저장하므로 원래 프레임 수가 남습니다.
+
+    Args:
+        stems: 스템 이름에서 WAV 경로로의 매핑.
+        output: 분석 결과 JSON 경로.
+        threshold_db: 무음 판정 기준 (dBFS).
+        silent_markers: 무음 스템을 프레임 없는 WAV로 바꿀지 여부.
+
+    Returns:
+        분석 결과 (version, envelope_hop_seconds, threshold_db, stems).
+    """
+    results = {name: analyze_stem(path, threshold_db) for name, path in stems.items()}
+    analysis = {
+        "version": _VERSION,
+        "envelope_hop_seconds": ENVELOPE_HOP_SECONDS,
+        "threshold_db": threshold_db,
+        "stems": results,
+    }
+
+    tmp = output.with_name(f".{output.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_text(json.dumps(analysis, separators=(",", ":")))
+        tmp.replace(output)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+    if silent_markers and not all(result["silent"] for result in results.values()):
+        for name, result in results.items():
+            if result["silent"] and result["frames"] > 0:
+                with wave.open(str(stems[name]), "rb") as wav_file:
+                    channels = wav_file.getnchannels()
+                write_silent_marker(stems[name], channels, result["sample_rate"])
+    return analysis
+
+
+def load_analysis(path: Path) -> dict[str, Any] | None:
+    """저장된 분석 결과를 읽습니다 (없거나 형식이 다르면 None)."""
+    try:
+        analysis = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+    return analysis if analysis.get("version") == _VERSION else None
@@ -0,0 +1,222 @@
+"""서버 측 스템 믹스다운 모듈.
+
+"기타 빼고 전부", "드럼 + 베이스만"을 들으려면 클라이언트가 스템 네 개를 모두 받아
+직접 섞어야 하며, 저사양 기기에서는 대역폭과 CPU 부담이 큽니다. 이 모듈은 스템별
+게인을 적용한 믹스를 청크 단위로 계산하여 (벡터화된 NumPy) 하나의 16-bit WAV 또는
+Opus(Ogg) 스트림으로 내보냅니다. 자주 쓰는 믹스는 프리셋으로 정의해 캐시에 저장합니다.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import struct
+import subprocess
+import threading
+import wave
+from collections.abc import Iterator
+from contextlib import ExitStack
+from pathlib import Path
+
+import numpy as np
+
+# 자주 쓰는 믹스 프리셋 (지정하지 않은 스템의 게인은 1.0)
+MIX_PRESETS: dict[str, dict[str, float]] = {
+    "instrumental": {"vocals": 0.0},
+    "a_cappella": {"drums": 0.0, "bass": 0.0, "other": 0.0},
+    "no_drums": {"drums": 0.0},
+    "no_bass": {"bass": 0.0},
+    "no_other": {"other": 0.0},
+    "rhythm": {"vocals": 0.0, "other": 0.0},
+}
+
+# 스템별 최대 게인 (약 +12dB)
+MAX_GAIN = 4.0
+
+# 출력 형식과 MIME 타입
+MIX_FORMATS = {"wav": "audio/wav", "opus": "audio/ogg"}
+
+# 한 번에 섞을 프레임 수
+MIX_CHUNK_FRAMES = 65536
+
+# Opus 인코딩 비트레이트와 출력 읽기 크기
+OPUS_BITRATE = "128k"
+_OPUS_READ_SIZE = 64 * 1024
+
+
+def resolve_gains(stem_names: list[str], overrides: dict[str, float]) -> dict[str, float]:
+    """스템별 게인을 정합니다 (지정하지 않은 스템은 1.0)."""
+    return {name: float(overrides.get(name, 1.0)) for name in stem_names}
+
+
+def preset_for_gains(gains: dict[str, float]) -> str | None:
+    """게인이 프리셋과 같으면 프리셋 이름을 반환합니다 (캐시 재사용)."""
+    for name, preset in MIX_PRESETS.items():
+        if resolve_gains(list(gains), preset) == gains:
+            return name
+    return None
+
+
+def mix_cache_name(preset: str, fmt: str) -> str:
+    """캐시 디렉터리 안의 프리셋 믹스 파일 이름을 반환합니다."""
+    return f"mix_{preset}.{fmt}"
+
+
+def opus_available() -> bool:
+    """Opus 인코딩에 필요한 ffmpeg가 있는지 반환합니다."""
+    return shutil.which("ffmpeg") is not None
+
+
+def mix_format(stems: dict[str, Path]) -> tuple[int, int, int]:
+    """스템들의 (채널 수, 샘플 레이트, 가장 긴 프레임 수)를 반환합니다.
+
+    Raises:
+        ValueError: 16-bit PCM이 아니거나 채널 수, 샘플 레이트가 서로 다를 때.
+    """
+    formats = set()
+    frames = 0
+    for path in stems.values():
+        with wave.open(str(path), "rb") as wav_file:
+            if wav_file.getsampwidth() != 2:
+                raise ValueError("16-bit PCM 스템만 섞을 수 있습니다.")
+            formats.add((wav_file.getnchannels(), wav_file.getframerate()))
+            frames = max(frames, wav_file.getnframes())
+    if len(formats) != 1:
+        raise ValueError(f"스템 형식이 다릅니다: {sorted(formats)}")
+    channels, sample_rate = formats.pop()
+    return channels, sample_rate, frames
+
+
+def wav_header(channels: int, sample_rate: int, frames: int) -> bytes:
+    """16-bit PCM WAV 헤더를 만듭니다."""
+    block_align = channels * 2
+    data_size = frames * block_align
+    return (
+        b"RIFF" + struct.pack("<I", 36 + data_size) + b"WAVE"
+        + b"fmt " + struct.pack(
+            "<IHHIIHH", 16, 1, channels, sample_rate, sample_rate * block_align, block_align, 16
+        )
+        + b"data" + struct.pack("<I", data_size)
+    )
+
+
+def iter_mixdown_pcm(
+    stems: dict[str, Path],
+    gains: dict[str, float],
+    chunk_frames: int = MIX_CHUNK_FRAMES,
+) -> Iterator[bytes]:
+    """게인을 적용해 섞은 인터리브 16-bit PCM을 청크 단위로 생성합니다.
+
+    게인이 0인 스템은 읽지 않으며, 짧은 스템 (무음 마커 등)은 뒤를 무음으로 봅니다.
+    한 번에 청크 하나만 메모리에 올리므로 메모리 사용량은 곡 길이와 무관합니다.
+    """
+    channels, _, frames = mix_format(stems)
+    with ExitStack() as stack:
+        active = [
+            (stack.enter_context(wave.open(str(stems[name]), "rb")), gain)
+            for name, gain in gains.items()
+            if gain != 0.0
+        ]
+        written = 0
+        while written < frames:
+            n = min(chunk_frames, frames - written)
+            mix = np.zeros(n * channels, dtype=np.float32)
+            for reader, gain in active:
+                samples = np.frombuffer(reader.readframes(n), dtype="<i2")
+                mix[: len(samples)] += samples * np.float32(gain)
+            yield np.clip(mix, -32768, 32767).astype("<i2").tobytes()
+            written += n
+
+
+def iter_mixdown_wav(stems: dict[str, Path], gains: dict[str, float]) -> Iterator[bytes]:
+    """섞은 오디오를 WAV 스트림으로 생성합니다 (크기는 mixdown_wav_size와 같음)."""
+    channels, sample_rate, frames = mix_format(stems)
+    yield wav_header(channels, sample_rate, frames)
+    yield from iter_mixdown_pcm(stems, gains)
+
+
+def mixdown_wav_size(stems: dict[str, Path]) -> int:
+    """믹스 WAV의 전체 크기(바이트)를 데이터를 읽지 않고 계산합니다."""
+    channels, sample_rate, frames = mix_format(stems)
+    return len(wav_header(channels, sample_rate, frames)) + frames * channels * 2
+
+
+def iter_mixdown_opus(
+    stems: dict[str, Path],
+    gains: dict[str, float],
+    bitrate: str = OPUS_BITRATE,
+) -> Iterator[bytes]:
+    """섞은 오디오를 ffmpeg로 인코딩한 Opus(Ogg) 스트림으로 생성합니다.
+
+    PCM은 별도 스레드가 ffmpeg 표준 입력으로 넣고, 인코딩된 출력은 나오는 대로 내보냅니다.
+
+    Raises:
+        RuntimeError: ffmpeg가 없거나 인코딩에 실패했을 때.
+    """
+    channels, sample_rate, _ = mix_format(stems)
+    try:
+        process = subprocess.Popen(
+            [
+                "ffmpeg", "-v", "error",
+                "-f", "s16le", "-ar", str(sample_rate), "-ac", str(channels), "-i", "-",
+                "-c:a", "libopus", "-b:a", bitrate, "-f", "ogg", "-",
+            ],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+    except FileNotFoundError as e:
+        raise RuntimeError("ffmpeg를 찾을 수 없습니다.") from e
+    assert process.stdin is not None and process.stdout is not None
+
+    def feed() -> None:
+        try:
+            for chunk in iter_mixdown_pcm(stems, gains):
+                process.stdin.write(chunk)
+        except OSError:
+            pass  # ffmpeg가 먼저 종료됨 (클라이언트 연결 끊김 등)
+        finally:
+            process.stdin.close()
+
+    writer = threading.Thread(target=feed, name="mixdown-opus", daemon=True)
+    writer.start()
+    try:
+        while data := process.stdout.read(_OPUS_READ_SIZE):
+            yield data
+        if process.wait() != 0:
+            raise RuntimeError("Opus 인코딩에 실패했습니다.")
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        writer.join()
+
+
+def render_mixdown(
+    stems: dict[str, Path],
+    gains: dict[str, float],
+    output: Path,
+    fmt: str = "wav",
+) -> Path:
+    """믹스를 파일로 저장합니다 (임시 파일에 쓴 뒤 rename).
+
+    Raises:
+        ValueError: 지원하지 않는 형식이거나 스템 형식이 다를 때.
+        RuntimeError: Opus 인코딩에 실패했을 때.
+    """
+    if fmt == "wav":
+        chunks = iter_mixdown_wav(stems, gains)
+    elif fmt == "opus":
+        chunks = iter_mixdown_opus(stems, gains)
+    else:
+        raise ValueError(f"지원하지 않는 형식입니다: {fmt}")
+
+    tmp = output.with_name(f".{output.name}.{os.getpid()}.tmp")
+    try:
+        with tmp.open("wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+        tmp.replace(output)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return output
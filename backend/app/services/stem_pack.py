@@ -0,0 +1,92 @@
+"""멀티트랙 스템 묶음 생성 모듈.
+
+StemMixer는 스템 네 개를 따로 받아 따로 디코딩합니다. 이 모듈은 스테레오 스템들을
+채널 쌍으로 이어 붙인 8채널 16-bit WAV 하나로 묶어, 클라이언트가 한 번의 요청과
+한 번의 디코딩으로 모든 스템을 얻게 합니다 (채널 2k, 2k+1 = k번째 스템의 L, R).
+
+묶음은 스템 캐시 디렉터리에 한 번 만들어 두고 재사용합니다.
+"""
+
+from __future__ import annotations
+
+import os
+import struct
+import wave
+from array import array
+from contextlib import ExitStack
+from pathlib import Path
+
+# 캐시 디렉터리 안의 묶음 파일 이름
+PACKED_STEMS_NAME = "stems_packed.wav"
+
+# 한 번에 처리할 프레임 수
+PACK_CHUNK_FRAMES = 65536
+
+# WAVE_FORMAT_EXTENSIBLE PCM 서브포맷 GUID (2채널 초과 WAV 표준 형식)
+_KSDATAFORMAT_SUBTYPE_PCM = b"\x01\x00\x00\x00\x00\x00\x10\x00\x80\x00\x00\xaa\x00\x38\x9b\x71"
+
+
+def _extensible_header(channels: int, sample_rate: int, frames: int) -> bytes:
+    """16-bit PCM WAVE_FORMAT_EXTENSIBLE 헤더를 만듭니다 (채널 위치 지정 없음)."""
+    block_align = channels * 2
+    data_size = frames * block_align
+    fmt = struct.pack(
+        "<HHIIHHHHI",
+        0xFFFE, channels, sample_rate, sample_rate * block_align, block_align, 16,
+        22, 16, 0,
+    ) + _KSDATAFORMAT_SUBTYPE_PCM
+    return (
+        b"RIFF" + struct.pack("<I", 4 + 8 + len(fmt) + 8 + data_size) + b"WAVE"
+        + b"fmt " + struct.pack("<I", len(fmt)) + fmt
+        + b"data" + struct.pack("<I", data_size)
+    )
+
+
+def build_stem_pack(stems: list[Path], output: Path) -> Path:
+    """스테레오 16-bit 스템들을 하나의 멀티채널 WAV로 묶습니다.
+
+    청크 단위로 읽고 쓰므로 메모리 사용량은 스템 길이와 무관합니다.
+    길이가 다른 스템은 뒤를 무음으로 채웁니다. 임시 파일에 쓴 뒤 rename하므로
+    만드는 도중의 묶음이 캐시로 보이지 않습니다.
+
+    Args:
+        stems: 묶을 스템 WAV 경로 (순서대로 채널 쌍 배치).
+        output: 묶음 WAV 경로.
+
+    Returns:
+        output 경로.
+
+    Raises:
+        ValueError: 스템이 스테레오 16-bit가 아니거나 샘플 레이트가 다를 때.
+    """
+    with ExitStack() as stack:
+        readers = [stack.enter_context(wave.open(str(path), "rb")) for path in stems]
+        sample_rates = {reader.getframerate() for reader in readers}
+        if any(r.getnchannels() != 2 or r.getsampwidth() != 2 for r in readers):
+            raise ValueError("스테레오 16-bit PCM 스템만 묶을 수 있습니다.")
+        if len(sample_rates) != 1:
+            raise ValueError(f"스템 샘플 레이트가 다릅니다: {sorted(sample_rates)}")
+
+        count = len(readers)
+        frames = max(reader.getnframes() for reader in readers)
+        tmp = output.with_name(f".{output.name}.{os.getpid()}.tmp")
+        try:
+            with tmp.open("wb") as out:
+                out.write(_extensible_header(count * 2, sample_rates.pop(), frames))
+                written = 0
+                while written < frames:
+                    n = min(PACK_CHUNK_FRAMES, frames - written)
+                    # 스테레오 16-bit 프레임 하나 = 4바이트 = uint32 하나로 보고 인터리브
+                    packed = array("I", bytes(n * 4 * count))
+                    for index, reader in enumerate(readers):
+                        data = reader.readframes(n)
+                        stem_frames = array("I", data)
+                        if len(stem_frames) < n:
+                            stem_frames.extend([0] * (n - len(stem_frames)))
+                        packed[index::count] = stem_frames
+                    out.write(packed.tobytes())
+                    written += n
+            tmp.replace(output)
+        finally:
+            tmp.unlink(missing_ok=True)
+    return output
@@ -0,0 +1,143 @@
+"""스템 분할 스트리밍 모듈.
+
+Range 요청을 지원해도 AudioEngine은 WAV 전체를 받아야 AudioBuffer로 디코딩할 수 있습니다.
+이 모듈은 스템을 고정 길이 (기본 6초) 세그먼트로 나눠 인코딩하고, 세그먼트별 시작 시각과
+길이를 담은 JSON 매니페스트를 만듭니다. 클라이언트는 재생 위치에 필요한 세그먼트만 받아
+바로 재생하고 탐색할 수 있습니다.
+
+세그먼트는 ffmpeg segment 먹서가 스템 WAV를 한 번 읽으며 스트리밍으로 인코딩합니다.
+코덱은 FLAC입니다: 무손실이라 스템끼리 샘플 단위로 맞고, 인코더 지연(priming)이 없어
+세그먼트를 이어 붙여도 틈이 생기지 않으며, 모든 주요 브라우저의 decodeAudioData가 지원합니다.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import shutil
+import subprocess
+import wave
+from pathlib import Path
+from typing import Any
+
+# 캐시 디렉터리 안의 세그먼트 디렉터리 (스템별 하위 디렉터리)
+SEGMENTS_DIR_NAME = "segments"
+SEGMENT_MANIFEST_NAME = "manifest.json"
+SEGMENT_MANIFEST_VERSION = 1
+
+# 세그먼트 길이 (초), 형식
+SEGMENT_SECONDS = 6.0
+SEGMENT_FORMAT = "flac"
+SEGMENT_MEDIA_TYPE = "audio/flac"
+
+# 세그먼트 파일 이름 (경로 조작 방지용 검사에도 사용)
+SEGMENT_NAME_PATTERN = re.compile(r"^\d{5}\.flac$")
+
+# ffmpeg 인코딩 제한 시간 (초)
+SEGMENT_TIMEOUT_SECONDS = 600
+
+
+def parse_segment_list(text: str) -> list[dict[str, Any]]:
+    """ffmpeg segment 먹서의 CSV 목록을 세그먼트 목록으로 변환합니다.
+
+    각 줄은 "파일 이름,시작 초,끝 초"입니다. 세그먼트 경계는 인코더 프레임 단위라
+    SEGMENT_SECONDS와 조금 다를 수 있어, 실제 시각을 그대로 기록합니다.
+    """
+    segments = []
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        name, start, end = line.rsplit(",", 2)
+        segments.append(
+            {
+                "file": name,
+                "start": round(float(start), 6),
+                "duration": round(float(end) - float(start), 6),
+            }
+        )
+    return segments
+
+
+def build_segments(
+    source: Path,
+    output_dir: Path,
+    segment_seconds: float = SEGMENT_SECONDS,
+) -> Path:
+    """스템 WAV를 세그먼트로 인코딩하고 매니페스트를 씁니다.
+
+    임시 디렉터리에 만든 뒤 rename하므로 매니페스트가 보이면 모든 세그먼트가 완성된
+    것입니다.
+
+    Args:
+        source: 스템 WAV 경로.
+        output_dir: 세그먼트 디렉터리 (매니페스트와 세그먼트 파일이 들어감).
+        segment_seconds: 세그먼트 길이 (초).
+
+    Returns:
+        매니페스트 경로.
+
+    Raises:
+        RuntimeError: ffmpeg가 없거나 인코딩에 실패했을 때.
+    """
+    with wave.open(str(source), "rb") as wav_file:
+        sample_rate = wav_file.getframerate()
+        channels = wav_file.getnchannels()
+        frames = wav_file.getnframes()
+
+    tmp = output_dir.with_name(f".{output_dir.name}.{os.getpid()}.tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+    segment_list = tmp / "segments.csv"
+    try:
+        result = subprocess.run(
+            [
+                "ffmpeg", "-v", "error", "-y", "-i", str(source),
+                "-c:a", SEGMENT_FORMAT,
+                "-f", "segment", "-segment_time", f"{segment_seconds:g}",
+                "-reset_timestamps", "1",
+                "-segment_list", str(segment_list), "-segment_list_type", "csv",
+                str(tmp / f"%05d.{SEGMENT_FORMAT}"),
+            ],
+            capture_output=True,
+            timeout=SEGMENT_TIMEOUT_SECONDS,
+            check=False,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(
+                f"세그먼트 인코딩에 실패했습니다: {result.stderr.decode(errors='replace')[-200:]}"
+            )
+
+        manifest = {
+            "version": SEGMENT_MANIFEST_VERSION,
+            "format": SEGMENT_FORMAT,
+            "mime_type": SEGMENT_MEDIA_TYPE,
+            "sample_rate": sample_rate,
+            "channels": channels,
+            "duration": frames / sample_rate if sample_rate else 0.0,
+            "segment_seconds": segment_seconds,
+            "segments": parse_segment_list(segment_list.read_text()),
+        }
+        segment_list.unlink()
+        (tmp / SEGMENT_MANIFEST_NAME).write_text(json.dumps(manifest))
+
+        shutil.rmtree(output_dir, ignore_errors=True)
+        tmp.replace(output_dir)
+    except FileNotFoundError as e:
+        raise RuntimeError("ffmpeg를 찾을 수 없습니다.") from e
+    except subprocess.TimeoutExpired as e:
+        raise RuntimeError("세그먼트 인코딩 시간이 초과되었습니다.") from e
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return output_dir / SEGMENT_MANIFEST_NAME
+
+
+def load_manifest(path: Path) -> dict[str, Any] | None:
+    """세그먼트 매니페스트를 읽습니다 (없거나 버전이 다르면 None)."""
+    try:
+        manifest = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+    if manifest.get("version") != SEGMENT_MANIFEST_VERSION:
+        return None
+    return manifest
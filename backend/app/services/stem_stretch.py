@@ -0,0 +1,170 @@
+"""서버 측 템포/피치 변환 렌더링 모듈.
+
+속도와 피치 변경은 클라이언트에서 soundtouchjs로 처리하는데, 긴 곡에서는 Worker를
+써도 변경할 때마다 수 초가 걸립니다. 이 모듈은 스템이나 믹스 (또는 A-B 구간)를
+ffmpeg의 오프라인 스트레처로 렌더링합니다. ffmpeg가 librubberband로 빌드되어 있으면
+rubberband 필터 (고품질, 포먼트 보존 옵션)를, 없으면 atempo + asetrate 조합을 씁니다.
+
+결과는 (원본, 템포 배율, 반음, 구간)별 파일로 캐시되어, 연습에 흔히 쓰는
+50/75/90% 템포는 두 번째 요청부터 바로 내려받을 수 있습니다.
+"""
+
+from __future__ import annotations
+
+import functools
+import os
+import subprocess
+import wave
+from pathlib import Path
+
+# 템포 배율 (1.0 = 원래 속도)과 반음 변환 범위
+MIN_TEMPO_RATIO = 0.25
+MAX_TEMPO_RATIO = 4.0
+MAX_SEMITONES = 12.0
+
+# 캐시 디렉터리 안의 렌더링 결과 디렉터리
+STRETCH_DIR_NAME = "stretch"
+
+# ffmpeg 렌더링 제한 시간 (초)
+STRETCH_TIMEOUT_SECONDS = 600
+
+# atempo 필터 한 단계가 받는 배율 범위 (벗어나면 여러 단계로 나눔)
+_ATEMPO_MIN = 0.5
+_ATEMPO_MAX = 2.0
+
+
+@functools.lru_cache(maxsize=1)
+def rubberband_available() -> bool:
+    """ffmpeg에 rubberband 필터가 있는지 반환합니다 (프로세스당 한 번 확인)."""
+    try:
+        result = subprocess.run(
+            ["ffmpeg", "-hide_banner", "-filters"],
+            capture_output=True,
+            timeout=5,
+            check=False,
+        )
+    except (FileNotFoundError, subprocess.TimeoutExpired, OSError):
+        return False
+    return b"rubberband" in result.stdout
+
+
+def stretch_cache_name(
+    source: str,
+    tempo: float,
+    semitones: float,
+    start: float | None = None,
+    end: float | None = None,
+) -> str:
+    """렌더링 결과 파일 이름을 만듭니다 (같은 요청은 같은 이름).
+
+    배율은 소수 셋째 자리, 반음은 둘째 자리, 구간은 밀리초 단위로 정규화합니다.
+    """
+    name = f"{source}_t{tempo:.3f}_p{semitones:+.2f}"
+    if start is not None or end is not None:
+        start_ms = round((start or 0.0) * 1000)
+        end_ms = "end" if end is None else round(end * 1000)
+        name += f"_r{start_ms}-{end_ms}"
+    return f"{name}.wav"
+
+
+def _atempo_chain(ratio: float) -> list[str]:
+    """atempo 한 단계 범위를 넘는 배율을 여러 단계로 나눕니다."""
+    filters = []
+    while ratio < _ATEMPO_MIN:
+        filters.append(f"atempo={_ATEMPO_MIN}")
+        ratio /= _ATEMPO_MIN
+    while ratio > _ATEMPO_MAX:
+        filters.append(f"atempo={_ATEMPO_MAX}")
+        ratio /= _ATEMPO_MAX
+    filters.append(f"atempo={ratio:.6f}")
+    return filters
+
+
+def stretch_filter(
+    tempo: float,
+    semitones: float,
+    sample_rate: int,
+    rubberband: bool,
+) -> str:
+    """템포 배율과 반음 변환에 해당하는 ffmpeg 오디오 필터를 만듭니다.
+
+    Args:
+        tempo: 템포 배율 (0.75 = 75% 속도).
+        semitones: 반음 단위 피치 변환.
+        sample_rate: 입력 샘플 레이트.
+        rubberband: rubberband 필터 사용 여부.
+    """
+    pitch = 2 ** (semitones / 12)
+    if rubberband:
+        return f"rubberband=tempo={tempo:.6f}:pitch={pitch:.6f}:pitchq=quality:transients=mixed"
+
+    # 샘플 레이트를 바꿔 피치와 속도를 함께 올린 뒤, 속도만 atempo로 되돌림
+    filters = []
+    if semitones:
+        filters += [f"asetrate={sample_rate * pitch:.3f}", f"aresample={sample_rate}"]
+        tempo /= pitch
+    if abs(tempo - 1.0) > 1e-6:
+        filters += _atempo_chain(tempo)
+    return ",".join(filters) or "anull"
+
+
+def render_stretch(
+    source: Path,
+    output: Path,
+    tempo: float,
+    semitones: float,
+    start: float | None = None,
+    end: float | None = None,
+) -> Path:
+    """WAV 파일 (또는 그 구간)을 템포/피치 변환하여 16-bit WAV로 저장합니다.
+
+    임시 파일에 쓴 뒤 rename하므로 렌더링 중인 결과가 캐시로 보이지 않습니다.
+
+    Args:
+        source: 원본 WAV 경로.
+        output: 결과 WAV 경로.
+        tempo: 템포 배율.
+        semitones: 반음 단위 피치 변환.
+        start: 구간 시작 (초, 원본 기준).
+        end: 구간 끝 (초, 원본 기준).
+
+    Returns:
+        output 경로.
+
+    Raises:
+        RuntimeError: ffmpeg가 없거나 렌더링에 실패했을 때.
+    """
+    with wave.open(str(source), "rb") as wav_file:
+        sample_rate = wav_file.getframerate()
+
+    command = ["ffmpeg", "-v", "error", "-y"]
+    if start:
+        command += ["-ss", f"{start:.3f}"]
+    if end is not None:
+        command += ["-to", f"{end:.3f}"]
+    command += [
+        "-i", str(source),
+        "-af", stretch_filter(tempo, semitones, sample_rate, rubberband_available()),
+        "-ar", str(sample_rate), "-c:a", "pcm_s16le", "-f", "wav",
+    ]
+
+    tmp = output.with_name(f".{output.name}.{os.getpid()}.tmp")
+    try:
+        result = subprocess.run(
+            [*command, str(tmp)],
+            capture_output=True,
+            timeout=STRETCH_TIMEOUT_SECONDS,
+            check=False,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(
+                f"템포/피치 렌더링에 실패했습니다: {result.stderr.decode(errors='replace')[-200:]}"
+            )
+        tmp.replace(output)
+    except FileNotFoundError as e:
+        raise RuntimeError("ffmpeg를 찾을 수 없습니다.") from e
+    except subprocess.TimeoutExpired as e:
+        raise RuntimeError("템포/피치 렌더링 시간이 초과되었습니다.") from e
+    finally:
+        tmp.unlink(missing_ok=True)
+    return output
@@ -0,0 +1,291 @@
+"""영속 태스크 저장소 모듈.
+
+분리/변환 태스크 상태를 SQLite에 기록하여 프로세스가 재시작되어도
+task_id로 상태와 결과를 다시 찾을 수 있게 합니다.
+
+서비스는 인메모리 딕셔너리를 그대로 사용하고, 상태가 바뀔 때마다
+이 저장소에 write-through로 기록합니다. 시작 시에는 저장된 레코드로
+완료된 태스크를 복원하고 중단된 태스크를 다시 대기열에 넣습니다.
+
+추론 워커 모드(INFERENCE_MODE=worker)에서는 이 저장소가 API 프로세스와
+워커 프로세스 사이의 작업 대기열 역할도 합니다. API는 "queued" 레코드를
+넣고, 워커는 claim_next로 작업을 가져가 진행 상태를 다시 기록합니다.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# 태스크 종류
+KIND_SEPARATION = "separation"
+KIND_YOUTUBE = "youtube"
+KIND_BPM = "bpm"
+
+# 종료 상태 (서비스별 표기 포함)
+TERMINAL_STATUSES = ("complete", "completed", "error", "failed", "cancelled")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    task_id    TEXT PRIMARY KEY,
+    kind       TEXT NOT NULL,
+    status     TEXT NOT NULL,
+    progress   REAL NOT NULL DEFAULT 0,
+    file_hash  TEXT,
+    source     TEXT,
+    result     TEXT,
+    error      TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    worker_id  TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_kind_status ON tasks (kind, status);
+"""
+
+_COLUMNS = (
+    "task_id", "kind", "status", "progress", "file_hash",
+    "source", "result", "error", "created_at", "updated_at", "worker_id",
+)
+
+# 덮어쓰지 않고 처음 값을 유지하는 컬럼 (worker_id는 값이 주어질 때만 갱신).
+# 취소된 상태는 아직 멈추지 않은 워커의 진행률 기록으로 되돌리지 않음.
+_UPSERT_SET = ", ".join(
+    f"{col} = excluded.{col}"
+    for col in _COLUMNS
+    if col not in ("task_id", "created_at", "worker_id", "status")
+) + (
+    ", worker_id = COALESCE(excluded.worker_id, tasks.worker_id)"
+    ", status = CASE WHEN tasks.status = 'cancelled' THEN tasks.status"
+    " ELSE excluded.status END"
+)
+
+
+
+@dataclass
+class TaskRecord:
+    """저장된 태스크 레코드."""
+
+    task_id: str
+    kind: str  # separation, youtube
+    status: str
+    progress: float = 0.0
+    file_hash: str | None = None
+    source: str | None = None  # 입력 파일 경로 또는 URL (재시작 시 재실행용)
+    result: dict[str, Any] | None = None  # 결과 경로 등 (JSON)
+    error: str | None = None
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
+    worker_id: str | None = None  # 작업을 가져간 워커
+
+
+class TaskStore:
+    """SQLite 기반 태스크 저장소.
+
+    WAL 모드를 사용하므로 같은 파일을 여러 프로세스가 동시에 읽고 쓸 수 있습니다.
+    연결은 스레드 간에 공유하며 잠금으로 직렬화합니다.
+    """
+
+    def __init__(self, db_path: str | Path) -> None:
+        """TaskStore를 초기화합니다.
+
+        Args:
+            db_path: SQLite 파일 경로 (":memory:" 가능).
+        """
+        self.db_path = str(db_path)
+        if self.db_path != ":memory:":
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            isolation_level=None,  # autocommit
+            timeout=30.0,
+        )
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+            # 이전 스키마 마이그레이션
+            columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(tasks)")}
+            if "worker_id" not in columns:
+                self._conn.execute("ALTER TABLE tasks ADD COLUMN worker_id TEXT")
+
+    def save(self, record: TaskRecord) -> None:
+        """레코드를 저장합니다.
+
+        이미 있으면 갱신하되 created_at과 (값이 없을 때) worker_id는 유지합니다.
+        """
+        record.updated_at = time.time()
+        values = (
+            record.task_id,
+            record.kind,
+            record.status,
+            record.progress,
+            record.file_hash,
+            record.source,
+            json.dumps(record.result) if record.result is not None else None,
+            record.error,
+            record.created_at,
+            record.updated_at,
+            record.worker_id,
+        )
+        placeholders = ", ".join("?" for _ in _COLUMNS)
+        with self._lock:
+            self._conn.execute(
+                f"INSERT INTO tasks ({', '.join(_COLUMNS)}) VALUES ({placeholders}) "
+                f"ON CONFLICT(task_id) DO UPDATE SET {_UPSERT_SET}",
+                values,
+            )
+
+    def get(self, task_id: str) -> TaskRecord | None:
+        """task_id로 레코드를 조회합니다."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM tasks WHERE task_id = ?", (task_id,)
+            ).fetchone()
+        return self._to_record(row) if row else None
+
+    def list_tasks(self, kind: str, statuses: tuple[str, ...] | None = None) -> list[TaskRecord]:
+        """종류(와 상태)별 레코드를 생성 순서대로 반환합니다."""
+        query = "SELECT * FROM tasks WHERE kind = ?"
+        params: list[Any] = [kind]
+        if statuses:
+            query += f" AND status IN ({', '.join('?' for _ in statuses)})"
+            params.extend(statuses)
+        query += " ORDER BY created_at"
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [self._to_record(row) for row in rows]
+
+    def claim_next(self, kinds: tuple[str, ...], worker_id: str) -> TaskRecord | None:
+        """가장 오래된 대기 작업 하나를 원자적으로 가져갑니다.
+
+        BEGIN IMMEDIATE로 쓰기 잠금을 먼저 잡으므로 여러 워커 프로세스가
+        같은 작업을 동시에 가져가지 않습니다.
+
+        Args:
+            kinds: 가져갈 작업 종류.
+            worker_id: 워커 식별자 (재시작 시 requeue_claimed에 사용).
+
+        Returns:
+            "processing"으로 표시된 레코드, 또는 대기 작업이 없으면 None.
+        """
+        if not kinds:
+            return None
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    f"SELECT * FROM tasks WHERE status = 'queued' "
+                    f"AND kind IN ({', '.join('?' for _ in kinds)}) "
+                    f"ORDER BY created_at LIMIT 1",
+                    kinds,
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE tasks SET status = 'processing', worker_id = ?, "
+                        "updated_at = ? WHERE task_id = ?",
+                        (worker_id, time.time(), row["task_id"]),
+                    )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        if row is None:
+            return None
+        record = self._to_record(row)
+        record.status, record.worker_id = "processing", worker_id
+        return record
+
+    def requeue_claimed(self, worker_id: str) -> int:
+        """워커가 가져갔지만 끝내지 못한 작업을 대기열로 되돌립니다."""
+        placeholders = ", ".join("?" for _ in TERMINAL_STATUSES)
+        with self._lock:
+            cursor = self._conn.execute(
+                f"UPDATE tasks SET status = 'queued', progress = 0, worker_id = NULL, "
+                f"updated_at = ? WHERE worker_id = ? AND status NOT IN ({placeholders})",
+                (time.time(), worker_id, *TERMINAL_STATUSES),
+            )
+        return cursor.rowcount
+
+    def delete_expired(self, kind: str, older_than: float) -> int:
+        """older_than(epoch 초) 이전에 생성된 종료 상태 레코드를 삭제합니다."""
+        placeholders = ", ".join("?" for _ in TERMINAL_STATUSES)
+        with self._lock:
+            cursor = self._conn.execute(
+                f"DELETE FROM tasks WHERE kind = ? AND created_at < ? "
+                f"AND status IN ({placeholders})",
+                (kind, older_than, *TERMINAL_STATUSES),
+            )
+        return cursor.rowcount
+
+    def delete(self, task_id: str) -> None:
+        """레코드를 삭제합니다."""
+        with self._lock:
+            self._conn.execute("DELETE FROM tasks WHERE task_id = ?", (task_id,))
+
+    def close(self) -> None:
+        """연결을 닫습니다."""
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def _to_record(row: sqlite3.Row) -> TaskRecord:
+        data = dict(row)
+        if data["result"] is not None:
+            data["result"] = json.loads(data["result"])
+        return TaskRecord(**data)
+
+
+async def wait_for_task(
+    store: TaskStore,
+    task_id: str,
+    timeout: float,
+    poll_interval: float = 0.2,
+) -> TaskRecord:
+    """레코드가 종료 상태가 될 때까지 기다립니다.
+
+    Raises:
+        TimeoutError: timeout 안에 끝나지 않았을 때.
+        KeyError: 레코드가 사라졌을 때.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while True:
+        record = await asyncio.to_thread(store.get, task_id)
+        if record is None:
+            raise KeyError(task_id)
+        if record.status in TERMINAL_STATUSES:
+            return record
+        if loop.time() >= deadline:
+            raise TimeoutError(f"Task {task_id} did not finish within {timeout:.0f}s")
+        await asyncio.sleep(poll_interval)
+
+
+@lru_cache(maxsize=1)
+def get_task_store() -> TaskStore | None:
+    """설정된 전역 태스크 저장소를 반환합니다 (TASK_STORE_PATH가 비어 있으면 None)."""
+    path = get_settings().task_store_path
+    if not path:
+        return None
+    try:
+        store = TaskStore(path)
+    except sqlite3.Error as e:
+        logger.warning("Task store unavailable (%s): %s; using memory only", path, e)
+        return None
+    logger.info("Task store: %s", path)
+    return store
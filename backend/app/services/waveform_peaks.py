@@ -0,0 +1,211 @@
+"""다중 해상도 파형 피크 생성 모듈.
+
+파형을 그리려면 클라이언트가 오디오 전체를 받아 디코딩해야 하고, 30분 곡이나
+스템마다 이를 반복하면 첫 화면이 늦습니다. 이 모듈은 오디오를 청크 단위로 읽어
+피크 하나당 샘플 수가 4배씩 커지는 (최소, 최대) 피라미드를 만들고, 작은 바이너리
+파일로 캐시에 저장합니다. 클라이언트는 확대 수준에 맞는 단계만 골라 바로 그립니다.
+
+파일 형식 (리틀 엔디언):
+
+- 헤더: magic "PEAK", 버전 (u16), 단계 수 (u16), 샘플 레이트 (u32), 프레임 수 (u64)
+- 단계 표: 단계마다 피크당 샘플 수 (u32), 피크 수 (u32)
+- 데이터: 단계 순서대로 피크마다 (최소, 최대) int8 쌍 (16-bit 샘플의 상위 8비트)
+"""
+
+from __future__ import annotations
+
+import os
+import struct
+import subprocess
+import wave
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+import numpy as np
+
+# 원본 오디오 피크 파일 이름과 스템 피크 파일 확장자
+ORIGINAL_PEAKS_NAME = "original.peaks"
+PEAKS_SUFFIX = ".peaks"
+
+# 가장 세밀한 단계의 피크당 샘플 수, 단계 간 배율, 단계 수 (256 ~ 65536 샘플)
+PEAKS_BASE_SAMPLES = 256
+PEAKS_LEVEL_FACTOR = 4
+PEAKS_LEVELS = 5
+
+# 한 번에 읽을 프레임 수 (PEAKS_BASE_SAMPLES의 배수)
+PEAKS_CHUNK_FRAMES = 1024 * PEAKS_BASE_SAMPLES
+
+# 원본 디코딩 형식 (스템과 같은 스테레오 44.1kHz)
+DECODE_SAMPLE_RATE = 44100
+DECODE_CHANNELS = 2
+
+_MAGIC = b"PEAK"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHHIQ")
+_LEVEL = struct.Struct("<II")
+
+
+def base_peaks(
+    chunks: Iterable[np.ndarray],
+    channels: int,
+    samples_per_peak: int = PEAKS_BASE_SAMPLES,
+) -> tuple[np.ndarray, np.ndarray, int]:
+    """인터리브된 16-bit 샘플 청크에서 가장 세밀한 단계의 피크를 계산합니다.
+
+    모든 채널의 샘플을 함께 보아 (최소, 최대)를 구하므로 위상이 반대인
+    채널이 서로 상쇄되지 않습니다. 청크 경계에 걸친 샘플은 다음 청크로 넘깁니다.
+
+    Args:
+        chunks: int16 샘플 배열 (채널 인터리브).
+        channels: 채널 수.
+        samples_per_peak: 피크 하나당 프레임 수.
+
+    Returns:
+        (최소 배열, 최대 배열, 전체 프레임 수) 튜플. 배열은 int16.
+    """
+    block = samples_per_peak * channels
+    mins: list[np.ndarray] = []
+    maxs: list[np.ndarray] = []
+    carry = np.empty(0, dtype=np.int16)
+    total = 0
+
+    for chunk in chunks:
+        total += len(chunk)
+        data = np.concatenate((carry, chunk)) if len(carry) else chunk
+        usable = len(data) - len(data) % block
+        if usable:
+            blocks = data[:usable].reshape(-1, block)
+            mins.append(blocks.min(axis=1))
+            maxs.append(blocks.max(axis=1))
+        carry = data[usable:]
+
+    # 마지막 부분 피크
+    if len(carry):
+        mins.append(carry.min(keepdims=True))
+        maxs.append(carry.max(keepdims=True))
+
+    if not mins:
+        empty = np.empty(0, dtype=np.int16)
+        return empty, empty, 0
+    return np.concatenate(mins), np.concatenate(maxs), total // channels
+
+
+def build_pyramid(
+    mins: np.ndarray,
+    maxs: np.ndarray,
+    levels: int = PEAKS_LEVELS,
+    factor: int = PEAKS_LEVEL_FACTOR,
+) -> list[tuple[np.ndarray, np.ndarray]]:
+    """가장 세밀한 피크에서 배율씩 거친 단계들을 만듭니다.
+
+    Returns:
+        단계별 (최소, 최대) 배열 목록 (세밀한 단계부터).
+    """
+    pyramid = [(mins, maxs)]
+    for _ in range(levels - 1):
+        lo, hi = pyramid[-1]
+        pad = -len(lo) % factor
+        # 패딩은 최소/최대 결과에 영향이 없는 값으로 채움
+        lo = np.pad(lo, (0, pad), constant_values=np.iinfo(np.int16).max)
+        hi = np.pad(hi, (0, pad), constant_values=np.iinfo(np.int16).min)
+        pyramid.append((lo.reshape(-1, factor).min(axis=1), hi.reshape(-1, factor).max(axis=1)))
+    return pyramid
+
+
+def encode_peaks(
+    pyramid: list[tuple[np.ndarray, np.ndarray]],
+    sample_rate: int,
+    frames: int,
+    base_samples: int = PEAKS_BASE_SAMPLES,
+    factor: int = PEAKS_LEVEL_FACTOR,
+) -> bytes:
+    """피크 피라미드를 바이너리 파일 형식으로 인코딩합니다."""
+    header = _HEADER.pack(_MAGIC, _VERSION, len(pyramid), sample_rate, frames)
+    table = b"".join(
+        _LEVEL.pack(base_samples * factor**level, len(lo))
+        for level, (lo, _) in enumerate(pyramid)
+    )
+    data = b"".join(
+        # (최소, 최대) 쌍을 인터리브하고 상위 8비트만 저장
+        (np.stack((lo, hi), axis=1) >> 8).astype(np.int8).tobytes()
+        for lo, hi in pyramid
+    )
+    return header + table + data
+
+
+def _write_peaks(
+    mins: np.ndarray,
+    maxs: np.ndarray,
+    frames: int,
+    sample_rate: int,
+    output: Path,
+) -> Path:
+    """가장 세밀한 피크로 피크 파일을 만듭니다 (임시 파일에 쓴 뒤 rename)."""
+    encoded = encode_peaks(build_pyramid(mins, maxs), sample_rate, frames)
+    tmp = output.with_name(f".{output.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_bytes(encoded)
+        tmp.replace(output)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return output
+
+
+def build_wav_peaks(path: Path, output: Path) -> Path:
+    """16-bit PCM WAV 파일의 피크 파일을 만듭니다.
+
+    Raises:
+        ValueError: 16-bit PCM이 아닐 때.
+    """
+    with wave.open(str(path), "rb") as wav_file:
+        if wav_file.getsampwidth() != 2:
+            raise ValueError(f"Unsupported sample width: {wav_file.getsampwidth() * 8}-bit")
+
+        def chunks() -> Iterator[np.ndarray]:
+            while data := wav_file.readframes(PEAKS_CHUNK_FRAMES):
+                yield np.frombuffer(data, dtype="<i2")
+
+        channels = wav_file.getnchannels()
+        mins, maxs, frames = base_peaks(chunks(), channels)
+        return _write_peaks(mins, maxs, frames, wav_file.getframerate(), output)
+
+
+def build_decoded_peaks(path: Path, output: Path, timeout: float = 120) -> Path:
+    """ffmpeg로 임의 형식의 오디오를 디코딩하며 피크 파일을 만듭니다.
+
+    디코딩한 PCM을 파이프로 받아 청크 단위로 처리하므로 WAV를 디스크에 쓰지 않고,
+    메모리 사용량도 곡 길이와 무관합니다.
+
+    Raises:
+        RuntimeError: ffmpeg가 없거나 디코딩에 실패했을 때.
+    """
+    try:
+        process = subprocess.Popen(
+            [
+                "ffmpeg", "-v", "error", "-i", str(path),
+                "-f", "s16le", "-ac", str(DECODE_CHANNELS),
+                "-ar", str(DECODE_SAMPLE_RATE), "-",
+            ],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+    except FileNotFoundError as e:
+        raise RuntimeError("ffmpeg를 찾을 수 없습니다.") from e
+
+    def chunks() -> Iterator[np.ndarray]:
+        assert process.stdout is not None
+        size = PEAKS_CHUNK_FRAMES * DECODE_CHANNELS * 2
+        while data := process.stdout.read(size):
+            yield np.frombuffer(data[: len(data) - len(data) % 2], dtype="<i2")
+
+    try:
+        mins, maxs, frames = base_peaks(chunks(), DECODE_CHANNELS)
+        returncode = process.wait(timeout=timeout)
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+    if returncode != 0 or frames == 0:
+        raise RuntimeError(f"오디오 디코딩에 실패했습니다: {path.name}")
+
+    return _write_peaks(mins, maxs, frames, DECODE_SAMPLE_RATE, output)
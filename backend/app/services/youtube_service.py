@@ -8,6 +8,7 @@ from __future__ import annotations
 import asyncio
 import logging
 import os
+import time
 import uuid
 from pathlib import Path
 from typing import Any
@@ -15,6 +16,8 @@ from typing import Any
 import yt_dlp
 
 from app.config import get_settings
+from app.services.job_scheduler import FairScheduler
+from app.services.task_store import KIND_YOUTUBE, TaskRecord, TaskStore, get_task_store
 
 logger = logging.getLogger(__name__)
 
@@ -25,15 +28,21 @@ TaskStatus = dict[str, Any]
 class YouTubeService:
     """YouTube 다운로드 및 MP3 변환 서비스.
 
-    동시 다운로드 수를 세마포어로 제한하고,
+    동시 다운로드 수를 스케줄러로 제한하고 (한도는 부하에 따라 조정될 수 있음),
     인메모리 딕셔너리로 태스크 상태를 추적합니다.
+    영속 저장소가 주어지면 상태 변화를 함께 기록합니다.
     """
 
-    def __init__(self, download_dir: str | None = None) -> None:
+    def __init__(
+        self,
+        download_dir: str | None = None,
+        task_store: TaskStore | None = None,
+    ) -> None:
         settings = get_settings()
         self.download_dir = Path(download_dir or settings.download_dir)
-        self._semaphore = asyncio.Semaphore(settings.max_concurrent_downloads)
+        self.scheduler = FairScheduler(settings.max_concurrent_downloads)
         self._tasks: dict[str, TaskStatus] = {}
+        self._store = task_store
 
     @property
     def tasks(self) -> dict[str, TaskStatus]:
@@ -59,9 +68,81 @@ class YouTubeService:
             "filename": None,
             "title": None,
             "error": None,
+            "url": None,
+            "_created_at": time.time(),
         }
+        self._persist(task_id)
         return task_id
 
+    def _persist(self, task_id: str) -> None:
+        """태스크 상태를 영속 저장소에 기록합니다 (저장소가 없으면 무시)."""
+        task = self._tasks.get(task_id)
+        if self._store is None or task is None:
+            return
+        try:
+            self._store.save(
+                TaskRecord(
+                    task_id=task_id,
+                    kind=KIND_YOUTUBE,
+                    status=task["status"],
+                    progress=task.get("progress", 0.0),
+                    source=task.get("url"),
+                    result={"filename": task.get("filename"), "title": task.get("title")},
+                    error=task.get("error"),
+                    created_at=task.get("_created_at", time.time()),
+                )
+            )
+        except Exception:
+            logger.exception("Failed to persist task %s", task_id)
+
+    def restore_tasks(self) -> list[tuple[str, str]]:
+        """영속 저장소에서 태스크를 복원합니다.
+
+        완료된 태스크는 MP3 파일이 남아 있을 때만 복원하고,
+        중단된 태스크는 URL로 다시 변환하도록 반환합니다.
+
+        Returns:
+            다시 실행할 (task_id, URL) 목록 (생성 순서).
+        """
+        if self._store is None:
+            return []
+
+        resumable: list[tuple[str, str]] = []
+        for record in self._store.list_tasks(KIND_YOUTUBE):
+            if record.task_id in self._tasks:
+                continue
+
+            result = record.result or {}
+            filename = result.get("filename")
+            task: TaskStatus = {
+                "status": record.status,
+                "progress": record.progress,
+                "stage": "대기 중",
+                "filename": filename,
+                "title": result.get("title"),
+                "error": record.error,
+                "url": record.source,
+                "_created_at": record.created_at,
+            }
+
+            if record.status == "complete":
+                if not filename or not Path(filename).exists():
+                    self._store.delete(record.task_id)
+                    continue
+                task["stage"] = "완료"
+            elif record.status == "error":
+                task["stage"] = "오류"
+            elif record.source:
+                task.update(status="pending", progress=0.0)
+                resumable.append((record.task_id, record.source))
+            else:
+                task.update(status="error", error="unknown_error", stage="알 수 없는 오류")
+
+            self._tasks[record.task_id] = task
+            self._persist(record.task_id)
+
+        return resumable
+
     async def validate_video(self, url: str) -> dict[str, Any]:
         """동영상 메타데이터를 추출하여 유효성을 검사합니다.
 
@@ -125,19 +206,26 @@ class YouTubeService:
         with yt_dlp.YoutubeDL(ydl_opts) as ydl:
             return ydl.extract_info(url, download=False)
 
-    async def start_conversion(self, url: str, task_id: str) -> None:
+    async def start_conversion(
+        self, url: str, task_id: str, client_id: str = "unknown"
+    ) -> None:
         """YouTube URL을 MP3로 변환합니다.
 
-        세마포어로 동시 다운로드 수를 제한하고,
+        스케줄러로 동시 다운로드 수를 제한하고,
         진행 상태를 태스크 딕셔너리에 업데이트합니다.
 
         Args:
             url: YouTube URL.
             task_id: 태스크 ID.
+            client_id: 공정 큐잉 기준 클라이언트 식별자 (예: IP).
         """
-        async with self._semaphore:
+        self._tasks[task_id]["url"] = url
+        self._persist(task_id)
+
+        async with self.scheduler.slot(task_id, client_id):
             self._tasks[task_id]["status"] = "downloading"
             self._tasks[task_id]["stage"] = "다운로드 중"
+            self._persist(task_id)
 
             # 비디오 ID로 파일명 생성 (보안)
             # [HARD] 비디오 제목이 아닌 ID를 사용
@@ -169,6 +257,7 @@ class YouTubeService:
                     self._tasks[task_id]["progress"] = 70.0
                     self._tasks[task_id]["status"] = "converting"
                     self._tasks[task_id]["stage"] = "변환 중"
+                    self._persist(task_id)
 
             ydl_opts: dict[str, Any] = {
                 "format": "bestaudio/best",
@@ -240,6 +329,8 @@ class YouTubeService:
                 self._tasks[task_id]["stage"] = "알 수 없는 오류"
                 logger.exception("Unexpected error for task %s", task_id)
 
+            self._persist(task_id)
+
     @staticmethod
     def _download(url: str, ydl_opts: dict[str, Any]) -> None:
         """yt-dlp로 다운로드를 실행합니다 (동기 메서드).
@@ -256,6 +347,8 @@ class YouTubeService:
     def remove_task(self, task_id: str) -> None:
         """태스크를 제거합니다."""
         self._tasks.pop(task_id, None)
+        if self._store is not None:
+            self._store.delete(task_id)
 
     def get_download_path(self, task_id: str) -> Path | None:
         """태스크의 다운로드 파일 경로를 반환합니다."""
@@ -269,4 +362,4 @@ class YouTubeService:
 
 
 # 전역 서비스 인스턴스
-youtube_service = YouTubeService()
+youtube_service = YouTubeService(task_store=get_task_store())
@@ -0,0 +1,95 @@
+"""연산 엔드포인트 진입 제어 모듈.
+
+요청을 무조건 받아 대기열에 쌓으면 부하가 몰릴 때 대기열과 메모리가 끝없이 늘어납니다.
+예상 대기 시간(대기열에 쌓인 연산 시간)과 여유 메모리를 기준으로 새 작업을 받을지
+결정하고, 받을 수 없으면 다시 시도할 시점을 담은 503 응답으로 거절합니다.
+"""
+
+from __future__ import annotations
+
+import math
+
+from fastapi import HTTPException, status
+
+from app.config import get_settings
+from app.utils.system_resources import available_memory_bytes
+
+# 메모리 부족으로 거절할 때 기본 재시도 간격 (초)
+DEFAULT_RETRY_AFTER_SECONDS = 30
+
+
+class AdmissionController:
+    """예상 대기 시간과 여유 메모리 기반 진입 제어기.
+
+    - 서버 정책: 예상 대기 시간이 max_queue_seconds를 넘으면 거절
+    - 요청 정책: 호출자가 지정한 최대 대기 시간(max_wait)을 넘으면 거절
+    - 여유 메모리가 min_free_memory_bytes 미만이면 거절
+
+    Retry-After는 대기열이 기준 아래로 줄어들 때까지의 예상 시간입니다.
+    """
+
+    def __init__(
+        self,
+        max_queue_seconds: float = 0.0,
+        min_free_memory_bytes: int = 0,
+    ) -> None:
+        """AdmissionController를 초기화합니다.
+
+        Args:
+            max_queue_seconds: 허용할 최대 예상 대기 시간 (초, 0 = 제한 없음).
+            min_free_memory_bytes: 새 작업을 받기 위한 최소 여유 메모리 (0 = 확인 안 함).
+        """
+        self.max_queue_seconds = max_queue_seconds
+        self.min_free_memory_bytes = min_free_memory_bytes
+
+    def check(
+        self,
+        estimated_wait: float,
+        max_wait: float | None = None,
+        retry_after_memory: float | None = None,
+    ) -> None:
+        """새 작업을 받을 수 있는지 확인합니다.
+
+        Args:
+            estimated_wait: 새 작업이 시작되기까지의 예상 대기 시간 (초).
+            max_wait: 호출자가 허용하는 최대 대기 시간 (초, None = 서버 정책만 적용).
+            retry_after_memory: 메모리 부족 시 다시 시도할 시점 (초, None = 기본값).
+
+        Raises:
+            HTTPException: 받을 수 없을 때 503 에러 (Retry-After 헤더 포함).
+        """
+        if self.min_free_memory_bytes > 0:
+            free = available_memory_bytes()
+            if free is not None and free < self.min_free_memory_bytes:
+                self._reject(
+                    "서버 메모리가 부족합니다. 잠시 후 다시 시도해주세요.",
+                    retry_after_memory or DEFAULT_RETRY_AFTER_SECONDS,
+                )
+
+        if self.max_queue_seconds > 0 and estimated_wait > self.max_queue_seconds:
+            self._reject(
+                "대기 중인 작업이 많습니다. 잠시 후 다시 시도해주세요.",
+                estimated_wait - self.max_queue_seconds,
+            )
+
+        if max_wait is not None and estimated_wait > max_wait:
+            self._reject(
+                f"예상 대기 시간({estimated_wait:.0f}초)이 "
+                f"요청한 최대 대기 시간({max_wait:.0f}초)을 넘습니다.",
+                estimated_wait - max_wait,
+            )
+
+    @staticmethod
+    def _reject(detail: str, retry_after: float) -> None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=detail,
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
+
+
+# 전역 진입 제어기 인스턴스
+admission_controller = AdmissionController(
+    max_queue_seconds=get_settings().separation_max_queue_seconds,
+    min_free_memory_bytes=get_settings().admission_min_free_memory_mb * 1024 * 1024,
+)
@@ -0,0 +1,187 @@
+"""오디오 길이 조회 유틸리티.
+
+스케줄링과 대기 시간 추정에 쓸 오디오 길이(초)를 디코딩 없이 빠르게 얻습니다.
+WAV는 헤더에서 직접 읽고, 그 외 형식은 ffprobe를 사용합니다.
+
+업로드 중에는 파일이 다 저장되기 전에 앞부분 바이트만으로 길이를 계산하여
+(WAV data 청크, FLAC STREAMINFO, MP3 Xing/VBRI 프레임 수 또는 CBR 비트레이트)
+너무 긴 파일을 디코딩 전에 거절할 수 있습니다.
+"""
+
+from __future__ import annotations
+
+import logging
+import struct
+import subprocess
+import wave
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# ffprobe 타임아웃 (초)
+PROBE_TIMEOUT_SECONDS = 10
+
+# 헤더로 길이를 계산하기 위해 모으는 최대 앞부분 크기 (ID3 앨범 아트 포함)
+HEADER_PROBE_BYTES = 256 * 1024
+
+# MPEG 오디오 Layer III 비트레이트(kbps)와 샘플 레이트 표
+_MP3_BITRATES = {
+    1: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),  # MPEG-1
+    2: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),  # MPEG-2/2.5
+}
+_MP3_SAMPLE_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+
+
+def probe_duration(file_path: str | Path) -> float | None:
+    """오디오 파일의 길이(초)를 반환합니다.
+
+    Args:
+        file_path: 오디오 파일 경로.
+
+    Returns:
+        길이(초), 또는 알 수 없으면 None.
+    """
+    path = Path(file_path)
+
+    try:
+        with wave.open(str(path), "rb") as wav_file:
+            return wav_file.getnframes() / float(wav_file.getframerate())
+    except (wave.Error, EOFError, OSError):
+        pass
+
+    try:
+        result = subprocess.run(
+            [
+                "ffprobe", "-v", "error",
+                "-show_entries", "format=duration",
+                "-of", "default=noprint_wrappers=1:nokey=1",
+                str(path),
+            ],
+            capture_output=True,
+            timeout=PROBE_TIMEOUT_SECONDS,
+            check=False,
+        )
+        if result.returncode == 0:
+            return float(result.stdout.decode().strip())
+    except (FileNotFoundError, subprocess.TimeoutExpired, OSError, ValueError) as e:
+        logger.debug("ffprobe failed for %s: %s", path.name, e)
+
+    return None
+
+
+def probe_duration_from_header(head: bytes, total_size: int | None = None) -> float | None:
+    """파일 앞부분 바이트만으로 오디오 길이(초)를 계산합니다.
+
+    Args:
+        head: 파일 앞부분 (업로드 중 지금까지 받은 바이트).
+        total_size: 전체 파일 크기 (CBR MP3와 크기 미기록 WAV 추정용, 모르면 None).
+
+    Returns:
+        길이(초), 또는 앞부분만으로 알 수 없으면 None (ffprobe로 다시 조회).
+    """
+    try:
+        if head[:4] == b"RIFF" and head[8:12] == b"WAVE":
+            return _wav_header_duration(head, total_size)
+        if head[:4] == b"fLaC":
+            return _flac_header_duration(head)
+        return _mp3_header_duration(head, total_size)
+    except (struct.error, IndexError, ZeroDivisionError):
+        return None
+
+
+def _wav_header_duration(head: bytes, total_size: int | None) -> float | None:
+    byte_rate = 0
+    offset = 12
+    while offset + 8 <= len(head):
+        chunk_id = head[offset : offset + 4]
+        (size,) = struct.unpack_from("<I", head, offset + 4)
+        if chunk_id == b"fmt ":
+            (byte_rate,) = struct.unpack_from("<I", head, offset + 16)
+        elif chunk_id == b"data":
+            if not byte_rate:
+                return None
+            if size in (0, 0xFFFFFFFF):
+                # 스트리밍으로 쓴 WAV는 크기가 비어 있으므로 전체 크기로 추정
+                if total_size is None:
+                    return None
+                size = total_size - (offset + 8)
+            return size / byte_rate
+        offset += 8 + size + (size & 1)
+    return None
+
+
+def _flac_header_duration(head: bytes) -> float | None:
+    # 첫 메타데이터 블록은 항상 STREAMINFO (4바이트 블록 헤더 + 34바이트)
+    if head[4] & 0x7F != 0:
+        return None
+    packed = int.from_bytes(head[18:26], "big")
+    sample_rate = packed >> 44
+    total_samples = packed & ((1 << 36) - 1)
+    if not sample_rate or not total_samples:
+        return None
+    return total_samples / sample_rate
+
+
+def _mp3_header_duration(head: bytes, total_size: int | None) -> float | None:
+    offset = 0
+    if head[:3] == b"ID3":
+        # ID3v2 태그 크기는 synchsafe 정수 (바이트당 7비트)
+        size = 0
+        for byte in head[6:10]:
+            size = (size << 7) | (byte & 0x7F)
+        offset = 10 + size + (10 if head[5] & 0x10 else 0)
+
+    frame = find_mp3_frame(head, offset)
+    if frame is None:
+        return None
+    offset, version, bitrate, sample_rate, mono = frame
+    samples_per_frame = 1152 if version == 3 else 576
+
+    # VBR 파일은 첫 프레임의 Xing/Info 또는 VBRI 헤더에 전체 프레임 수가 있음
+    if version == 3:
+        side_info = 17 if mono else 32
+    else:
+        side_info = 9 if mono else 17
+    xing = offset + 4 + side_info
+    if head[xing : xing + 4] in (b"Xing", b"Info"):
+        (flags,) = struct.unpack_from(">I", head, xing + 4)
+        if flags & 1:
+            (frames,) = struct.unpack_from(">I", head, xing + 8)
+            return frames * samples_per_frame / sample_rate
+    vbri = offset + 36
+    if head[vbri : vbri + 4] == b"VBRI":
+        (frames,) = struct.unpack_from(">I", head, vbri + 14)
+        return frames * samples_per_frame / sample_rate
+
+    # CBR: 오디오 데이터 크기 / 비트레이트
+    if total_size is None:
+        return None
+    return (total_size - offset) * 8 / (bitrate * 1000)
+
+
+def find_mp3_frame(head: bytes, offset: int) -> tuple[int, int, int, int, bool] | None:
+    """offset부터 첫 Layer III 프레임 헤더를 찾습니다.
+
+    Returns:
+        (위치, 버전, 비트레이트 kbps, 샘플 레이트, 모노), 또는 없으면 None.
+    """
+    while True:
+        offset = head.find(b"\xff", offset)
+        if offset < 0 or offset + 4 > len(head):
+            return None
+        b1, b2, b3 = head[offset + 1], head[offset + 2], head[offset + 3]
+        version = (b1 >> 3) & 0x03
+        layer = (b1 >> 1) & 0x03
+        bitrate_index = b2 >> 4
+        rate_index = (b2 >> 2) & 0x03
+        if (
+            b1 & 0xE0 == 0xE0
+            and version != 1
+            and layer == 1
+            and bitrate_index not in (0, 15)
+            and rate_index != 3
+        ):
+            bitrate = _MP3_BITRATES[1 if version == 3 else 2][bitrate_index]
+            sample_rate = _MP3_SAMPLE_RATES[version][rate_index]
+            return offset, version, bitrate, sample_rate, (b3 >> 6) == 3
+        offset += 1
@@ -0,0 +1,240 @@
+"""오디오 구간 잘라내기 유틸리티.
+
+A-B 반복 연습에는 몇 초 분량만 필요한데 클라이언트는 스템 전체를 받습니다.
+이 모듈은 디코딩과 재인코딩 없이 요청 구간의 바이트 위치를 계산하고, 그 범위를 mmap으로
+읽어 그 자체로 재생 가능한 파일을 만듭니다.
+
+- WAV: 헤더의 data 청크 위치와 블록 크기로 프레임 단위 범위를 계산하고 새 헤더를 붙입니다.
+- MP3: 프레임 헤더를 훑어 만든 프레임 색인으로 구간을 덮는 프레임만 이어 붙입니다.
+  프레임 경계 단위라 실제 구간은 요청보다 조금 넓으며, 첫 프레임이 비트 저장소로 앞 프레임을
+  참조할 수 있어 한 프레임 앞에서 시작합니다.
+"""
+
+from __future__ import annotations
+
+import functools
+import math
+import mmap
+import struct
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+from app.utils.audio_probe import find_mp3_frame
+
+# mmap에서 한 번에 내보낼 크기
+SLICE_CHUNK_SIZE = 256 * 1024
+
+# 프레임 색인 메모 크기 (파일 수)
+_MP3_INDEX_CACHE_SIZE = 64
+
+
+@dataclass(frozen=True)
+class AudioSlice:
+    """잘라낸 구간 (새 헤더 + 원본 파일의 연속 바이트 범위)."""
+
+    header: bytes
+    offset: int
+    length: int
+    start: float  # 실제 시작 (초, 프레임 경계)
+    end: float  # 실제 끝 (초, 프레임 경계)
+
+    @property
+    def size(self) -> int:
+        """응답 전체 크기 (바이트)."""
+        return len(self.header) + self.length
+
+
+@dataclass(frozen=True)
+class Mp3FrameIndex:
+    """MP3 프레임 색인 (프레임 시작 위치와 마지막 프레임의 끝)."""
+
+    offsets: list[int]  # 프레임별 시작 위치 + 오디오 끝 위치 (프레임 수 + 1개)
+    samples_per_frame: int
+    sample_rate: int
+
+    @property
+    def frame_seconds(self) -> float:
+        """프레임 하나의 길이 (초)."""
+        return self.samples_per_frame / self.sample_rate
+
+    @property
+    def frames(self) -> int:
+        """오디오 프레임 수."""
+        return len(self.offsets) - 1
+
+
+def _check_range(start: float | None, end: float | None) -> None:
+    if start is not None and end is not None and start >= end:
+        raise ValueError("구간 시작은 끝보다 앞이어야 합니다.")
+
+
+def wav_layout(path: Path) -> tuple[bytes, int, int]:
+    """WAV 파일의 (fmt 청크 내용, data 위치, data 크기)를 반환합니다.
+
+    data 크기가 비어 있으면 (스트리밍으로 쓴 WAV) 파일 끝까지로 봅니다.
+
+    Raises:
+        ValueError: RIFF/WAVE 파일이 아니거나 fmt, data 청크가 없을 때.
+    """
+    file_size = path.stat().st_size
+    with path.open("rb") as f:
+        if f.read(12)[8:] != b"WAVE":
+            raise ValueError("WAV 파일이 아닙니다.")
+        fmt = None
+        while header := f.read(8):
+            if len(header) < 8:
+                break
+            chunk_id, size = header[:4], struct.unpack("<I", header[4:])[0]
+            if chunk_id == b"data":
+                if fmt is None:
+                    break
+                offset = f.tell()
+                if size in (0, 0xFFFFFFFF) or offset + size > file_size:
+                    size = file_size - offset
+                return fmt, offset, size
+            if chunk_id == b"fmt ":
+                fmt = f.read(size)
+                f.seek(size & 1, 1)
+            else:
+                f.seek(size + (size & 1), 1)
+    raise ValueError("WAV fmt 또는 data 청크가 없습니다.")
+
+
+def slice_wav(path: Path, start: float | None, end: float | None) -> AudioSlice:
+    """WAV 파일에서 [start, end) 구간을 프레임 단위로 잘라냅니다.
+
+    원본 fmt 청크를 그대로 복사하므로 샘플 형식과 관계없이 재인코딩하지 않습니다.
+    프레임이 없는 WAV (무음 스템 마커)는 어떤 구간이든 헤더만 있는 빈 구간을 반환합니다.
+
+    Args:
+        path: WAV 파일 경로.
+        start: 구간 시작 (초, None이면 처음부터).
+        end: 구간 끝 (초, None이면 끝까지).
+
+    Raises:
+        ValueError: WAV가 아니거나 구간이 비어 있을 때 (마커 제외).
+    """
+    _check_range(start, end)
+    fmt, data_offset, data_size = wav_layout(path)
+    try:
+        _, _, sample_rate, _, block_align = struct.unpack_from("<HHIIH", fmt)
+    except struct.error as e:
+        raise ValueError("WAV 형식 정보가 잘못되었습니다.") from e
+    if not sample_rate or not block_align:
+        raise ValueError("WAV 형식 정보가 잘못되었습니다.")
+
+    total = data_size // block_align
+    first = min(round((start or 0.0) * sample_rate), total)
+    last = total if end is None else min(round(end * sample_rate), total)
+    if first >= last and total > 0:
+        raise ValueError("구간이 오디오 범위를 벗어났습니다.")
+
+    length = (last - first) * block_align
+    header = (
+        b"RIFF" + struct.pack("<I", 4 + 8 + len(fmt) + 8 + length) + b"WAVE"
+        + b"fmt " + struct.pack("<I", len(fmt)) + fmt
+        + b"data" + struct.pack("<I", length)
+    )
+    return AudioSlice(
+        header=header,
+        offset=data_offset + first * block_align,
+        length=length,
+        start=first / sample_rate,
+        end=last / sample_rate,
+    )
+
+
+@functools.lru_cache(maxsize=_MP3_INDEX_CACHE_SIZE)
+def _build_mp3_index(path: str, size: int, mtime_ns: int) -> Mp3FrameIndex:
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        offset = 0
+        if data[:3] == b"ID3":
+            # ID3v2 태그 크기는 synchsafe 정수 (바이트당 7비트)
+            tag_size = 0
+            for byte in data[6:10]:
+                tag_size = (tag_size << 7) | (byte & 0x7F)
+            offset = 10 + tag_size + (10 if data[5] & 0x10 else 0)
+        # 끝의 ID3v1 태그는 오디오가 아님
+        has_id3v1 = size >= 128 and data[size - 128 : size - 125] == b"TAG"
+        audio_end = size - 128 if has_id3v1 else size
+
+        offsets: list[int] = []
+        samples_per_frame = sample_rate = frames_end = 0
+        while (frame := find_mp3_frame(data, offset)) is not None:
+            position, version, bitrate, rate, mono = frame
+            if sample_rate and rate != sample_rate:
+                # 프레임처럼 보이는 잡음 (태그 안 이미지 등): 한 바이트 뒤부터 다시 동기화
+                offset = position + 1
+                continue
+            padding = (data[position + 2] >> 1) & 1
+            frame_size = (144000 if version == 3 else 72000) * bitrate // rate + padding
+            if position + frame_size > audio_end:
+                break
+            if not offsets:
+                samples_per_frame = 1152 if version == 3 else 576
+                sample_rate = rate
+                # 첫 프레임의 Xing/Info/VBRI는 오디오가 없는 메타데이터 프레임
+                side_info = (17 if mono else 32) if version == 3 else (9 if mono else 17)
+                xing = data[position + 4 + side_info : position + 8 + side_info]
+                vbri = data[position + 36 : position + 40]
+                if xing in (b"Xing", b"Info") or vbri == b"VBRI":
+                    offset = position + frame_size
+                    continue
+            offsets.append(position)
+            offset = frames_end = position + frame_size
+        if not offsets:
+            raise ValueError("MP3 프레임을 찾을 수 없습니다.")
+        offsets.append(frames_end)
+    return Mp3FrameIndex(offsets, samples_per_frame, sample_rate)
+
+
+def mp3_frame_index(path: Path) -> Mp3FrameIndex:
+    """MP3 파일의 프레임 색인을 만듭니다 (같은 파일은 메모).
+
+    Raises:
+        ValueError: MPEG Layer III 프레임이 없을 때.
+    """
+    stat = path.stat()
+    return _build_mp3_index(str(path), stat.st_size, stat.st_mtime_ns)
+
+
+def slice_mp3(path: Path, start: float | None, end: float | None) -> AudioSlice:
+    """MP3 파일에서 [start, end) 구간을 덮는 프레임들을 잘라냅니다.
+
+    Args:
+        path: MP3 파일 경로.
+        start: 구간 시작 (초, None이면 처음부터).
+        end: 구간 끝 (초, None이면 끝까지).
+
+    Raises:
+        ValueError: MP3가 아니거나 구간이 비어 있을 때.
+    """
+    _check_range(start, end)
+    index = mp3_frame_index(path)
+    frame_seconds = index.frame_seconds
+
+    # 비트 저장소 참조를 위해 한 프레임 앞에서 시작
+    first = max(0, int((start or 0.0) / frame_seconds) - 1)
+    last = index.frames if end is None else min(math.ceil(end / frame_seconds), index.frames)
+    if first >= last:
+        raise ValueError("구간이 오디오 범위를 벗어났습니다.")
+
+    offset = index.offsets[first]
+    return AudioSlice(
+        header=b"",
+        offset=offset,
+        length=index.offsets[last] - offset,
+        start=first * frame_seconds,
+        end=last * frame_seconds,
+    )
+
+
+def iter_slice(path: Path, audio_slice: AudioSlice) -> Iterator[bytes]:
+    """잘라낸 구간을 헤더부터 청크 단위로 생성합니다 (mmap 읽기)."""
+    if audio_slice.header:
+        yield audio_slice.header
+    end = audio_slice.offset + audio_slice.length
+    with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        for position in range(audio_slice.offset, end, SLICE_CHUNK_SIZE):
+            yield data[position : min(position + SLICE_CHUNK_SIZE, end)]
@@ -0,0 +1,17 @@
+"""클라이언트 식별 유틸리티."""
+
+from __future__ import annotations
+
+from fastapi import Request
+
+
+def get_client_ip(request: Request) -> str:
+    """클라이언트 IP 주소를 가져옵니다."""
+    # X-Forwarded-For 헤더 확인 (프록시 뒤에 있을 경우)
+    forwarded = request.headers.get("X-Forwarded-For")
+    if forwarded:
+        return forwarded.split(",")[0].strip()
+    # 직접 연결인 경우
+    if request.client:
+        return request.client.host
+    return "unknown"
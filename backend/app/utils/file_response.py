@@ -0,0 +1,302 @@
+"""캐시 가능한 파일 응답 유틸리티.
+
+FileResponse는 수정 시각/크기 기반 ETag만 붙이고 If-None-Match를 처리하지 않으며,
+여러 구간 Range 요청도 지원하지 않습니다. 이 모듈은 다운로드 파일에
+
+- 파일 내용 해시 기반 강한 ETag와 If-None-Match -> 304
+- Range (단일 구간 206, 여러 구간 multipart/byteranges, 범위 밖 416)와 If-Range
+- 내용이 바뀌지 않는 파일의 장기 immutable Cache-Control
+- 오디오 시간 구간 (?start=&end=)만 잘라낸 독립 파일 응답
+
+을 적용하여 브라우저 캐시와 리버스 프록시가 같은 곡의 반복 요청을 흡수하게 합니다.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import secrets
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from pathlib import Path
+
+from fastapi import HTTPException, Request, status
+from fastapi.responses import Response, StreamingResponse
+
+from app.utils.audio_slice import AudioSlice, iter_slice
+
+# 파일 읽기 청크 크기
+FILE_CHUNK_SIZE = 256 * 1024
+
+# multipart/byteranges 줄바꿈
+_CRLF = "\r\n"
+
+# 한 요청에서 허용할 최대 Range 구간 수 (넘으면 전체 응답)
+MAX_RANGES = 16
+
+# 내용이 바뀌지 않는 파일과 바뀔 수 있는 파일의 Cache-Control
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+# 내용 해시 메모 (경로, 수정 시각, 크기) -> ETag
+_ETAG_CACHE_SIZE = 1024
+_etag_cache: OrderedDict[tuple[str, int, int], str] = OrderedDict()
+
+
+def file_etag(path: Path) -> str:
+    """파일 내용 해시로 강한 ETag를 만듭니다.
+
+    해시는 (경로, 수정 시각, 크기)별로 메모하여 같은 파일을 다시 읽지 않습니다.
+    """
+    stat = path.stat()
+    key = (str(path), stat.st_mtime_ns, stat.st_size)
+    etag = _etag_cache.get(key)
+    if etag is not None:
+        _etag_cache.move_to_end(key)
+        return etag
+
+    digest = hashlib.blake2b(digest_size=16)
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(FILE_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    etag = f'"{digest.hexdigest()}"'
+
+    _etag_cache[key] = etag
+    if len(_etag_cache) > _ETAG_CACHE_SIZE:
+        _etag_cache.popitem(last=False)
+    return etag
+
+
+def etag_matches(header: str, etag: str) -> bool:
+    """If-None-Match 헤더가 ETag와 일치하는지 확인합니다 (약한 비교)."""
+    if header.strip() == "*":
+        return True
+    candidates = (tag.strip().removeprefix("W/") for tag in header.split(","))
+    return etag.removeprefix("W/") in candidates
+
+
+def parse_range(header: str, size: int) -> list[tuple[int, int]] | None:
+    """Range 헤더를 (시작, 끝) 구간 목록으로 파싱합니다 (끝 포함).
+
+    Args:
+        header: Range 헤더 값 (예: "bytes=0-99, -500").
+        size: 파일 크기.
+
+    Returns:
+        만족 가능한 구간 목록 (비어 있으면 416), 또는 형식이 잘못되었거나
+        구간이 너무 많아 무시할 때 None (전체 응답).
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or not spec:
+        return None
+
+    parts = spec.split(",")
+    if len(parts) > MAX_RANGES:
+        return None
+
+    ranges: list[tuple[int, int]] = []
+    for part in parts:
+        first, sep, last = part.strip().partition("-")
+        if not sep:
+            return None
+        try:
+            if first:
+                start = int(first)
+                if start >= size:
+                    # 파일 밖 구간은 건너뜀 (모두 건너뛰면 416)
+                    continue
+                end = int(last) if last else size - 1
+                if last and end < start:
+                    return None
+            else:
+                # 접미사 구간: 마지막 N바이트
+                suffix = int(last)
+                if suffix == 0:
+                    continue
+                start, end = max(0, size - suffix), size - 1
+        except ValueError:
+            return None
+        ranges.append((start, min(end, size - 1)))
+    return ranges
+
+
+def _iter_file(
+    path: Path,
+    ranges: list[tuple[int, int]],
+    parts: list[bytes] | None = None,
+) -> Iterator[bytes]:
+    """구간들을 청크 단위로 읽습니다 (parts가 있으면 구간마다 앞에 붙임)."""
+    with path.open("rb") as f:
+        for index, (start, end) in enumerate(ranges):
+            if parts is not None:
+                yield parts[index]
+            f.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = f.read(min(FILE_CHUNK_SIZE, remaining))
+                if not chunk:
+                    return
+                remaining -= len(chunk)
+                yield chunk
+        if parts is not None:
+            yield parts[-1]
+
+
+async def cached_file_response(
+    request: Request,
+    path: Path,
+    media_type: str,
+    headers: dict[str, str] | None = None,
+    immutable: bool = False,
+) -> Response:
+    """ETag, 조건부 요청, Range를 처리하는 파일 응답을 만듭니다.
+
+    Args:
+        request: 요청 (If-None-Match, Range, If-Range 확인).
+        path: 보낼 파일 경로.
+        media_type: 파일 MIME 타입.
+        headers: 추가 응답 헤더 (Content-Disposition 등).
+        immutable: 이 URL의 내용이 바뀌지 않으면 True (장기 immutable 캐싱).
+
+    Returns:
+        200 전체 응답, 206 부분 응답, 304 Not Modified, 또는 416 응답.
+    """
+    etag = await asyncio.to_thread(file_etag, path)
+    size = path.stat().st_size
+    base_headers = {
+        **(headers or {}),
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Cache-Control": IMMUTABLE_CACHE_CONTROL if immutable else REVALIDATE_CACHE_CONTROL,
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None and etag_matches(if_none_match, etag):
+        not_modified = {
+            key: value
+            for key, value in base_headers.items()
+            if key in ("ETag", "Cache-Control")
+        }
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=not_modified)
+
+    # If-Range가 현재 ETag와 다르면 (파일이 바뀜) Range를 무시하고 전체 전송
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (if_range is None or if_range.strip() == etag):
+        ranges = parse_range(range_header, size)
+        if ranges is not None:
+            if not ranges:
+                return Response(
+                    status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                    headers={**base_headers, "Content-Range": f"bytes */{size}"},
+                )
+            if len(ranges) == 1:
+                start, end = ranges[0]
+                return StreamingResponse(
+                    _iter_file(path, ranges),
+                    status_code=status.HTTP_206_PARTIAL_CONTENT,
+                    media_type=media_type,
+                    headers={
+                        **base_headers,
+                        "Content-Range": f"bytes {start}-{end}/{size}",
+                        "Content-Length": str(end - start + 1),
+                    },
+                )
+            return _multipart_response(path, ranges, size, media_type, base_headers)
+
+    return StreamingResponse(
+        _iter_file(path, [(0, size - 1)] if size else []),
+        media_type=media_type,
+        headers={**base_headers, "Content-Length": str(size)},
+    )
+
+
+def _multipart_response(
+    path: Path,
+    ranges: list[tuple[int, int]],
+    size: int,
+    media_type: str,
+    headers: dict[str, str],
+) -> Response:
+    """여러 구간을 multipart/byteranges 본문으로 보냅니다."""
+    boundary = secrets.token_hex(16)
+    # 첫 구분자 외에는 앞 구간 데이터 뒤의 CRLF를 포함
+    parts = [
+        (
+            f"{'' if index == 0 else _CRLF}--{boundary}{_CRLF}"
+            f"Content-Type: {media_type}{_CRLF}"
+            f"Content-Range: bytes {start}-{end}/{size}{_CRLF}{_CRLF}"
+        ).encode()
+        for index, (start, end) in enumerate(ranges)
+    ]
+    parts.append(f"{_CRLF}--{boundary}--{_CRLF}".encode())
+    length = sum(len(part) for part in parts) + sum(end - start + 1 for start, end in ranges)
+
+    return StreamingResponse(
+        _iter_file(path, ranges, parts),
+        status_code=status.HTTP_206_PARTIAL_CONTENT,
+        media_type=f"multipart/byteranges; boundary={boundary}",
+        headers={**headers, "Content-Length": str(length)},
+    )
+
+
+async def sliced_file_response(
+    request: Request,
+    path: Path,
+    slicer: Callable[[Path, float | None, float | None], AudioSlice],
+    start: float | None,
+    end: float | None,
+    media_type: str,
+    headers: dict[str, str] | None = None,
+    immutable: bool = False,
+) -> Response:
+    """오디오 파일의 [start, end) 구간만 담은 독립 파일 응답을 만듭니다.
+
+    slicer가 계산한 바이트 범위를 mmap으로 읽어 보내며 디코딩하지 않습니다.
+    실제 구간 (프레임 경계)은 X-Slice-Start, X-Slice-End 헤더(초)로 알립니다.
+    ETag는 원본 내용 해시와 구간으로 만들어 같은 구간 반복 요청은 304로 처리합니다.
+
+    Args:
+        request: 요청 (If-None-Match 확인).
+        path: 원본 오디오 파일 경로.
+        slicer: (경로, 시작, 끝) -> 잘라낼 구간 (audio_slice.slice_wav 등).
+        start: 구간 시작 (초, None이면 처음부터).
+        end: 구간 끝 (초, None이면 끝까지).
+        media_type: 파일 MIME 타입.
+        headers: 추가 응답 헤더 (Content-Disposition 등).
+        immutable: 이 URL의 내용이 바뀌지 않으면 True (장기 immutable 캐싱).
+
+    Returns:
+        200 구간 응답 또는 304 Not Modified.
+
+    Raises:
+        HTTPException: 구간이 비었거나 오디오 범위를 벗어났을 때(400).
+    """
+    try:
+        audio_slice = await asyncio.to_thread(slicer, path, start, end)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+
+    file_tag = await asyncio.to_thread(file_etag, path)
+    etag = f'{file_tag[:-1]}-{audio_slice.offset}-{audio_slice.length}"'
+    cache_control = IMMUTABLE_CACHE_CONTROL if immutable else REVALIDATE_CACHE_CONTROL
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None and etag_matches(if_none_match, etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={"ETag": etag, "Cache-Control": cache_control},
+        )
+
+    return StreamingResponse(
+        iter_slice(path, audio_slice),
+        media_type=media_type,
+        headers={
+            **(headers or {}),
+            "ETag": etag,
+            "Cache-Control": cache_control,
+            "Content-Length": str(audio_slice.size),
+            "X-Slice-Start": f"{audio_slice.start:.6f}",
+            "X-Slice-End": f"{audio_slice.end:.6f}",
+        },
+    )
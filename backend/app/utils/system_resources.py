@@ -0,0 +1,248 @@
+"""호스트 CPU/메모리 자원 조회 및 스레드 분배 모듈.
+
+사용 가능한 CPU(affinity), cgroup CPU 할당량, 동시 처리 수를 기반으로
+torch intra-op/inter-op 스레드 수와 워커별 코어 집합을 계산합니다.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# cgroup v2 / v1 CPU 할당량 파일
+CGROUP_V2_CPU_MAX = Path("/sys/fs/cgroup/cpu.max")
+CGROUP_V1_QUOTA = Path("/sys/fs/cgroup/cpu/cpu.cfs_quota_us")
+CGROUP_V1_PERIOD = Path("/sys/fs/cgroup/cpu/cpu.cfs_period_us")
+
+# 메모리 정보 파일
+PROC_MEMINFO = Path("/proc/meminfo")
+
+# PSI 메모리 압력 파일과 cgroup v2 메모리 한도/사용량 파일
+PROC_PRESSURE_MEMORY = Path("/proc/pressure/memory")
+CGROUP_V2_MEMORY_MAX = Path("/sys/fs/cgroup/memory.max")
+CGROUP_V2_MEMORY_CURRENT = Path("/sys/fs/cgroup/memory.current")
+
+
+@dataclass(frozen=True)
+class ThreadPlan:
+    """추론 스레드 분배 계획."""
+
+    intra_op_threads: int  # 작업(워커)당 intra-op 스레드 수
+    inter_op_threads: int  # inter-op 스레드 수
+    worker_core_sets: list[list[int]] = field(default_factory=list)  # 워커별 코어 집합
+
+    def to_dict(self) -> dict[str, object]:
+        """딕셔너리로 변환합니다."""
+        return {
+            "intra_op_threads": self.intra_op_threads,
+            "inter_op_threads": self.inter_op_threads,
+            "worker_core_sets": self.worker_core_sets,
+        }
+
+
+def available_cpus() -> list[int]:
+    """현재 프로세스가 실행될 수 있는 CPU 번호 목록을 반환합니다."""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def cgroup_cpu_limit() -> float | None:
+    """cgroup CPU 할당량(코어 수 단위)을 반환합니다.
+
+    Returns:
+        할당량이 설정되어 있으면 코어 수 (예: 1.5), 무제한이거나 확인할 수 없으면 None.
+    """
+    try:
+        if CGROUP_V2_CPU_MAX.exists():
+            quota, period = CGROUP_V2_CPU_MAX.read_text().split()[:2]
+            if quota == "max":
+                return None
+            return int(quota) / int(period)
+
+        if CGROUP_V1_QUOTA.exists() and CGROUP_V1_PERIOD.exists():
+            quota_us = int(CGROUP_V1_QUOTA.read_text().strip())
+            period_us = int(CGROUP_V1_PERIOD.read_text().strip())
+            if quota_us <= 0 or period_us <= 0:
+                return None
+            return quota_us / period_us
+    except (OSError, ValueError) as e:
+        logger.debug("Failed to read cgroup CPU quota: %s", e)
+
+    return None
+
+
+def effective_cpu_count() -> int:
+    """affinity와 cgroup 할당량을 모두 고려한 실제 사용 가능 코어 수를 반환합니다."""
+    count = len(available_cpus())
+    limit = cgroup_cpu_limit()
+    if limit is not None:
+        count = min(count, max(1, math.ceil(limit)))
+    return max(1, count)
+
+
+def _read_meminfo() -> dict[str, int]:
+    """/proc/meminfo를 바이트 단위 딕셔너리로 읽습니다."""
+    info: dict[str, int] = {}
+    try:
+        for line in PROC_MEMINFO.read_text().splitlines():
+            key, _, rest = line.partition(":")
+            parts = rest.split()
+            if parts:
+                info[key] = int(parts[0]) * 1024  # kB -> bytes
+    except (OSError, ValueError) as e:
+        logger.debug("Failed to read %s: %s", PROC_MEMINFO, e)
+    return info
+
+
+def total_memory_bytes() -> int | None:
+    """호스트 전체 메모리(바이트)를 반환합니다 (확인할 수 없으면 None)."""
+    total = _read_meminfo().get("MemTotal")
+    if total is not None:
+        return total
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def available_memory_bytes() -> int | None:
+    """새 작업에 사용할 수 있는 메모리(MemAvailable, 바이트)를 반환합니다."""
+    return _read_meminfo().get("MemAvailable")
+
+
+def memory_headroom_bytes() -> int | None:
+    """새 작업에 쓸 수 있는 메모리 여유분(바이트)을 반환합니다.
+
+    MemAvailable과 cgroup v2 메모리 한도까지 남은 양 중 작은 값입니다
+    (컨테이너에서는 호스트에 여유가 있어도 cgroup 한도에 먼저 걸림).
+    """
+    headroom = available_memory_bytes()
+    try:
+        limit = CGROUP_V2_MEMORY_MAX.read_text().strip()
+        if limit != "max":
+            cgroup_free = int(limit) - int(CGROUP_V2_MEMORY_CURRENT.read_text().strip())
+            headroom = cgroup_free if headroom is None else min(headroom, cgroup_free)
+    except (OSError, ValueError):
+        pass
+    return headroom
+
+
+def memory_limit_bytes() -> int | None:
+    """이 프로세스가 쓸 수 있는 전체 메모리(바이트)를 반환합니다.
+
+    호스트 전체 메모리와 cgroup v2 메모리 한도 중 작은 값입니다.
+    """
+    limit = total_memory_bytes()
+    try:
+        cgroup_max = CGROUP_V2_MEMORY_MAX.read_text().strip()
+        if cgroup_max != "max":
+            limit = int(cgroup_max) if limit is None else min(limit, int(cgroup_max))
+    except (OSError, ValueError):
+        pass
+    return limit
+
+
+def memory_pressure() -> float | None:
+    """최근 10초 메모리 PSI(some avg10, %)를 반환합니다 (지원하지 않으면 None).
+
+    메모리를 기다리느라 하나 이상의 작업이 멈춰 있던 시간 비율입니다.
+    """
+    try:
+        for line in PROC_PRESSURE_MEMORY.read_text().splitlines():
+            if line.startswith("some"):
+                fields = dict(item.split("=", 1) for item in line.split()[1:])
+                return float(fields["avg10"])
+    except (OSError, ValueError, KeyError) as e:
+        logger.debug("Failed to read %s: %s", PROC_PRESSURE_MEMORY, e)
+    return None
+
+
+def load_per_cpu() -> float | None:
+    """1분 load average를 사용 가능한 코어 수로 나눈 값을 반환합니다."""
+    try:
+        return os.getloadavg()[0] / effective_cpu_count()
+    except (OSError, AttributeError):
+        return None
+
+
+def plan_threads(
+    concurrency: int,
+    cpus: list[int] | None = None,
+    cpu_count: int | None = None,
+    intra_op_threads: int = 0,
+    inter_op_threads: int = 0,
+) -> ThreadPlan:
+    """동시 처리 수에 맞춰 스레드 수와 워커별 코어 집합을 계산합니다.
+
+    Args:
+        concurrency: 동시에 실행되는 추론 워커 수.
+        cpus: 사용 가능한 CPU 번호 목록 (None이면 현재 affinity).
+        cpu_count: 사용할 코어 수 (None이면 affinity와 cgroup 할당량으로 계산).
+        intra_op_threads: intra-op 스레드 수 강제값 (0 = 자동).
+        inter_op_threads: inter-op 스레드 수 강제값 (0 = 자동).
+
+    Returns:
+        ThreadPlan 인스턴스.
+    """
+    concurrency = max(1, concurrency)
+    if cpus is None:
+        cpus = available_cpus()
+        if cpu_count is None:
+            cpu_count = effective_cpu_count()
+    if cpu_count is None:
+        cpu_count = len(cpus)
+    cpu_count = max(1, min(cpu_count, len(cpus)))
+
+    per_worker = max(1, cpu_count // concurrency)
+    intra = intra_op_threads if intra_op_threads > 0 else per_worker
+    # Demucs 그래프는 대부분 순차적이므로 inter-op 병렬성은 작게 유지
+    inter = inter_op_threads if inter_op_threads > 0 else (2 if per_worker >= 8 else 1)
+
+    # 코어가 충분할 때만 서로 겹치지 않는 코어 집합을 나눔
+    core_sets: list[list[int]] = []
+    if cpu_count >= concurrency:
+        usable = cpus[:cpu_count]
+        core_sets = [
+            usable[i * per_worker:(i + 1) * per_worker] for i in range(concurrency)
+        ]
+
+    return ThreadPlan(
+        intra_op_threads=intra,
+        inter_op_threads=inter,
+        worker_core_sets=core_sets,
+    )
+
+
+def get_thread_affinity() -> set[int] | None:
+    """호출 스레드의 CPU affinity를 반환합니다 (미지원 플랫폼에서는 None)."""
+    if not hasattr(os, "sched_getaffinity"):
+        return None
+    return set(os.sched_getaffinity(0))
+
+
+def pin_current_thread(cores: list[int] | set[int]) -> bool:
+    """호출 스레드를 지정한 코어 집합에 고정합니다.
+
+    Linux에서 pid 0은 호출 스레드를 의미하며, 이후 이 스레드가 생성하는
+    스레드는 같은 affinity를 상속합니다.
+
+    Args:
+        cores: CPU 번호 집합.
+
+    Returns:
+        고정 성공 여부.
+    """
+    if not cores or not hasattr(os, "sched_setaffinity"):
+        return False
+    try:
+        os.sched_setaffinity(0, set(cores))
+        return True
+    except OSError as e:
+        logger.warning("Failed to set CPU affinity %s: %s", sorted(cores), e)
+        return False
@@ -0,0 +1,58 @@
+"""WAV 파일 읽기/쓰기 유틸리티.
+
+16-bit PCM WAV를 NumPy float32 배열 (channels, frames)로 읽고 씁니다.
+"""
+
+from __future__ import annotations
+
+import wave
+from pathlib import Path
+
+import numpy as np
+
+
+def read_wav(path: Path) -> tuple[np.ndarray, int]:
+    """16-bit PCM WAV 파일을 읽습니다.
+
+    Args:
+        path: WAV 파일 경로.
+
+    Returns:
+        (audio, sample_rate) 튜플. audio는 shape (channels, frames), float32, 범위 [-1, 1].
+
+    Raises:
+        ValueError: 16-bit PCM이 아닐 때.
+    """
+    with wave.open(str(path), "rb") as wav_file:
+        if wav_file.getsampwidth() != 2:
+            raise ValueError(f"Unsupported sample width: {wav_file.getsampwidth() * 8}-bit")
+        channels = wav_file.getnchannels()
+        sample_rate = wav_file.getframerate()
+        data = wav_file.readframes(wav_file.getnframes())
+
+    audio = np.frombuffer(data, dtype="<i2").reshape(-1, channels).T
+    return audio.astype(np.float32) / 32768.0, sample_rate
+
+
+def to_pcm16(audio: np.ndarray) -> bytes:
+    """float 오디오 (channels, frames)를 인터리브된 16-bit PCM 바이트로 변환합니다."""
+    clipped = np.clip(audio, -1.0, 1.0 - 1.0 / 32768.0)
+    return (clipped.T * 32768.0).astype("<i2").tobytes()
+
+
+def write_wav(path: Path, audio: np.ndarray, sample_rate: int) -> None:
+    """float 오디오를 16-bit PCM WAV 파일로 저장합니다.
+
+    Args:
+        path: 출력 경로.
+        audio: shape (channels, frames) 또는 (frames,) 배열, 범위 [-1, 1].
+        sample_rate: 샘플 레이트 (Hz).
+    """
+    if audio.ndim == 1:
+        audio = audio[np.newaxis, :]
+
+    with wave.open(str(path), "wb") as wav_file:
+        wav_file.setnchannels(audio.shape[0])
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(to_pcm16(audio))
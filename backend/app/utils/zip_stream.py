@@ -0,0 +1,142 @@
+"""스트리밍 ZIP 생성 유틸리티.
+
+zipfile로 메모리 버퍼에 압축 파일을 만든 뒤 보내면 스템 전체(수백 MB)가 요청마다
+메모리에 올라가고, 거의 압축되지 않는 WAV를 deflate하느라 CPU를 씁니다.
+이 모듈은 파일을 압축하지 않고(STORED) 청크 단위로 읽어 바로 내보내며,
+CRC-32는 데이터를 보내면서 계산해 각 항목 뒤의 data descriptor에 기록합니다.
+
+항목 크기는 파일 크기로 미리 알 수 있으므로 전체 ZIP 크기(Content-Length)를
+데이터를 읽기 전에 계산할 수 있습니다. ZIP64는 지원하지 않습니다 (항목과 전체 크기 4GB 미만).
+"""
+
+from __future__ import annotations
+
+import struct
+import time
+import zlib
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+# 파일 읽기 청크 크기
+ZIP_CHUNK_SIZE = 256 * 1024
+
+# ZIP 구조 크기 (파일 이름 제외)
+_LOCAL_HEADER_SIZE = 30
+_DATA_DESCRIPTOR_SIZE = 16
+_CENTRAL_HEADER_SIZE = 46
+_END_RECORD_SIZE = 22
+
+# 일반 목적 플래그: bit 3 (data descriptor 사용), bit 11 (UTF-8 파일 이름)
+_FLAGS = 0x0008 | 0x0800
+_VERSION = 20  # 2.0: STORED + data descriptor
+_STORED = 0  # 압축 방식: 압축 없음
+_ZIP32_LIMIT = 0xFFFFFFFF
+
+
+@dataclass(frozen=True)
+class ZipEntry:
+    """ZIP에 담을 파일 하나."""
+
+    name: str  # ZIP 안의 파일 이름
+    path: Path
+    size: int
+    mtime: float
+
+    @classmethod
+    def from_path(cls, name: str, path: Path) -> ZipEntry:
+        """파일 크기와 수정 시각을 읽어 항목을 만듭니다."""
+        stat = path.stat()
+        return cls(name=name, path=path, size=stat.st_size, mtime=stat.st_mtime)
+
+
+def _dos_datetime(mtime: float) -> tuple[int, int]:
+    """수정 시각을 ZIP(MS-DOS) 형식의 (시간, 날짜)로 변환합니다."""
+    t = time.localtime(mtime)
+    year = max(1980, t.tm_year)
+    dos_time = (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2)
+    dos_date = ((year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday
+    return dos_time, dos_date
+
+
+def stored_zip_size(entries: list[ZipEntry]) -> int:
+    """STORED ZIP의 전체 크기(바이트)를 데이터를 읽지 않고 계산합니다.
+
+    Raises:
+        ValueError: ZIP64가 필요한 크기일 때.
+    """
+    size = _END_RECORD_SIZE
+    for entry in entries:
+        name_len = len(entry.name.encode())
+        size += _LOCAL_HEADER_SIZE + name_len + entry.size + _DATA_DESCRIPTOR_SIZE
+        size += _CENTRAL_HEADER_SIZE + name_len
+    if size > _ZIP32_LIMIT or any(entry.size > _ZIP32_LIMIT for entry in entries):
+        raise ValueError("ZIP64가 필요한 크기는 지원하지 않습니다.")
+    return size
+
+
+def iter_stored_zip(
+    entries: list[ZipEntry],
+    chunk_size: int = ZIP_CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """항목을 압축 없이 담은 ZIP을 청크 단위로 생성합니다.
+
+    한 번에 청크 하나만 메모리에 올리며, 첫 바이트(첫 로컬 헤더)를 바로 내보냅니다.
+
+    Args:
+        entries: 담을 파일 목록 (크기는 stored_zip_size 계산과 같아야 함).
+        chunk_size: 파일 읽기 청크 크기.
+
+    Yields:
+        ZIP 바이트 청크.
+
+    Raises:
+        OSError: 보내는 중 파일 크기가 바뀌었을 때 (Content-Length가 어긋나므로 중단).
+    """
+    offset = 0
+    central: list[bytes] = []
+
+    for entry in entries:
+        name = entry.name.encode()
+        dos_time, dos_date = _dos_datetime(entry.mtime)
+
+        # CRC와 크기는 data descriptor에 기록하므로 로컬 헤더에는 0
+        local_header = struct.pack(
+            "<IHHHHHIIIHH",
+            0x04034B50, _VERSION, _FLAGS, _STORED, dos_time, dos_date,
+            0, 0, 0, len(name), 0,
+        ) + name
+        yield local_header
+
+        crc = 0
+        remaining = entry.size
+        with entry.path.open("rb") as f:
+            while remaining > 0:
+                chunk = f.read(min(chunk_size, remaining))
+                if not chunk:
+                    break
+                crc = zlib.crc32(chunk, crc)
+                remaining -= len(chunk)
+                yield chunk
+            if remaining != 0 or f.read(1):
+                raise OSError(f"파일 크기가 바뀌었습니다: {entry.path}")
+
+        yield struct.pack("<IIII", 0x08074B50, crc, entry.size, entry.size)
+
+        central.append(
+            struct.pack(
+                "<IHHHHHHIIIHHHHHII",
+                0x02014B50, _VERSION, _VERSION, _FLAGS, _STORED, dos_time, dos_date,
+                crc, entry.size, entry.size, len(name), 0, 0, 0, 0, 0, offset,
+            )
+            + name
+        )
+        offset += len(local_header) + entry.size + _DATA_DESCRIPTOR_SIZE
+
+    central_directory = b"".join(central)
+    yield central_directory
+    yield struct.pack(
+        "<IHHHHIIH",
+        0x06054B50, 0, 0, len(entries), len(entries),
+        len(central_directory), offset, 0,
+    )
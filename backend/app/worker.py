@@ -0,0 +1,229 @@
+"""추론 워커 데몬.
+
+API 프로세스와 분리된 프로세스에서 모델을 소유하고 분리/BPM 작업을 실행합니다.
+API 프로세스(INFERENCE_MODE=worker)는 업로드를 받아 영속 태스크 저장소(SQLite)에
+"queued" 레코드를 넣고 결과만 제공하며, 워커는 저장소에서 작업을 가져가
+진행 상태를 다시 기록합니다. 따라서 가벼운 API 워커 여러 개와 무거운 추론
+워커 하나를 노드마다 독립적으로 띄울 수 있습니다.
+
+사용법:
+    INFERENCE_MODE=worker uvicorn app.main:app --workers 4
+    python -m app.worker
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import signal
+import socket
+
+from app.config import get_settings
+from app.services.bpm_service import BpmService, bpm_service
+from app.services.separation_service import SeparationService, SeparationTask
+from app.services.task_store import (
+    KIND_BPM,
+    KIND_SEPARATION,
+    TaskRecord,
+    TaskStore,
+    get_task_store,
+)
+
+logger = logging.getLogger(__name__)
+
+# 동시에 실행할 BPM 분석 수 (분석당 수 초, CPU 단일 스레드 위주)
+BPM_MAX_CONCURRENT = 2
+
+
+class InferenceWorker:
+    """저장소 대기열에서 작업을 가져가 실행하는 워커."""
+
+    def __init__(
+        self,
+        store: TaskStore,
+        separation: SeparationService,
+        bpm: BpmService,
+        worker_id: str,
+        poll_interval: float = 0.5,
+        max_separations: int | None = None,
+    ) -> None:
+        """InferenceWorker를 초기화합니다.
+
+        Args:
+            store: 영속 태스크 저장소 (API 프로세스와 같은 파일).
+            separation: 로컬 추론 모드의 분리 서비스.
+            bpm: BPM 분석 서비스.
+            worker_id: 워커 식별자 (재시작 시 미완료 작업 회수에 사용).
+            poll_interval: 대기열이 비었을 때 폴링 간격 (초).
+            max_separations: 동시에 가져갈 분리 작업 수 (기본값: 분리 서비스 동시 처리 수).
+        """
+        self.store = store
+        self.separation = separation
+        self.bpm = bpm
+        self.worker_id = worker_id
+        self.poll_interval = poll_interval
+        self.max_separations = max_separations or separation.max_concurrent
+        self._running: dict[str, asyncio.Task[None]] = {}
+        self._kinds: dict[str, str] = {}
+        self._stopping = asyncio.Event()
+
+    def _available_kinds(self) -> tuple[str, ...]:
+        """현재 여유가 있는 작업 종류를 반환합니다."""
+        counts = {KIND_SEPARATION: 0, KIND_BPM: 0}
+        for kind in self._kinds.values():
+            counts[kind] += 1
+        kinds: list[str] = []
+        if counts[KIND_SEPARATION] < self.max_separations:
+            kinds.append(KIND_SEPARATION)
+        if counts[KIND_BPM] < BPM_MAX_CONCURRENT:
+            kinds.append(KIND_BPM)
+        return tuple(kinds)
+
+    async def run(self) -> None:
+        """stop()이 호출될 때까지 작업을 가져가 실행합니다."""
+        requeued = self.store.requeue_claimed(self.worker_id)
+        if requeued:
+            logger.info("Requeued %d jobs left unfinished by %s", requeued, self.worker_id)
+        logger.info(
+            "Inference worker %s started (separations=%d, bpm=%d)",
+            self.worker_id,
+            self.max_separations,
+            BPM_MAX_CONCURRENT,
+        )
+
+        while not self._stopping.is_set():
+            await self._poll_cancellations()
+            record = await asyncio.to_thread(
+                self.store.claim_next, self._available_kinds(), self.worker_id
+            )
+            if record is None:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), self.poll_interval)
+                except TimeoutError:
+                    pass
+                continue
+
+            task = asyncio.create_task(self._run_job(record))
+            self._running[record.task_id] = task
+            self._kinds[record.task_id] = record.kind
+            task.add_done_callback(lambda _, tid=record.task_id: self._forget(tid))
+
+        # 종료: 실행 중 작업은 취소하고 "processing" 상태로 남겨 재시작 시 회수
+        for task in list(self._running.values()):
+            task.cancel()
+        await asyncio.gather(*self._running.values(), return_exceptions=True)
+        logger.info("Inference worker %s stopped", self.worker_id)
+
+    def stop(self) -> None:
+        """새 작업을 가져가지 않고 종료하도록 요청합니다."""
+        self._stopping.set()
+
+    async def _poll_cancellations(self) -> None:
+        """API가 저장소에서 취소한 분리 작업을 이 워커에서 중단합니다."""
+        for task_id, kind in list(self._kinds.items()):
+            if kind != KIND_SEPARATION:
+                continue
+            record = await asyncio.to_thread(self.store.get, task_id)
+            if record is None or record.status == "cancelled":
+                self.separation.cancel_task(task_id)
+
+    def _forget(self, task_id: str) -> None:
+        self._running.pop(task_id, None)
+        self._kinds.pop(task_id, None)
+
+    async def _run_job(self, record: TaskRecord) -> None:
+        """가져간 작업 하나를 실행합니다."""
+        logger.info("Worker %s running %s job %s", self.worker_id, record.kind, record.task_id)
+        if record.kind == KIND_SEPARATION:
+            await self._run_separation(record)
+        elif record.kind == KIND_BPM:
+            await self._run_bpm(record)
+
+    async def _run_separation(self, record: TaskRecord) -> None:
+        """분리 작업을 실행합니다. 진행 상태는 분리 서비스가 저장소에 기록합니다."""
+        task_id = record.task_id
+        task = SeparationTask.from_record(record)
+        task.status = "processing"
+        self.separation.tasks[task_id] = task
+        try:
+            if not record.source:
+                self.separation._update_progress(task_id, -1.0, "failed", "입력 파일이 없습니다.")
+                return
+            await self.separation.run_task(record.source, task_id)
+        finally:
+            # 상태는 저장소에 남아 있으므로 워커 메모리에서는 제거
+            self.separation.tasks.pop(task_id, None)
+
+    async def _run_bpm(self, record: TaskRecord) -> None:
+        """BPM 분석 작업을 실행하고 결과를 저장소에 기록합니다."""
+        try:
+            result = await asyncio.to_thread(self.bpm.analyze, record.source or "")
+            record.status, record.progress = "completed", 100.0
+            record.result = result.to_dict()
+        except Exception as e:
+            logger.exception("BPM analysis failed for job %s", record.task_id)
+            record.status, record.progress, record.error = "failed", -1.0, str(e)
+
+        # API가 기다리다 포기하고 레코드를 지웠으면 결과를 다시 만들지 않음
+        if self.store.get(record.task_id) is not None:
+            self.store.save(record)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """워커 CLI 진입점."""
+    settings = get_settings()
+
+    parser = argparse.ArgumentParser(description="분리/BPM 추론 워커")
+    parser.add_argument(
+        "--worker-id", default=settings.worker_id or socket.gethostname(),
+        help="워커 식별자 (같은 ID로 재시작하면 미완료 작업을 회수)",
+    )
+    parser.add_argument(
+        "--poll-interval", type=float, default=settings.worker_poll_interval,
+        help="대기열 폴링 간격 (초)",
+    )
+    parser.add_argument(
+        "--max-concurrent", type=int, default=None,
+        help="동시 분리 작업 수 (기본값: SEPARATION_MAX_CONCURRENT 또는 호스트 프로파일)",
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+
+    store = get_task_store()
+    if store is None:
+        logger.error("TASK_STORE_PATH must be set to run the inference worker")
+        return 1
+
+    # 워커는 항상 이 프로세스에서 추론 (INFERENCE_MODE=worker가 공유 .env에 있어도)
+    separation = SeparationService(
+        max_concurrent=args.max_concurrent,
+        task_store=store,
+        inference_mode="local",
+    )
+    separation.preload_model()
+
+    worker = InferenceWorker(
+        store,
+        separation,
+        bpm_service,
+        worker_id=args.worker_id,
+        poll_interval=args.poll_interval,
+    )
+
+    async def _serve() -> None:
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, worker.stop)
+        await worker.run()
+
+    asyncio.run(_serve())
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
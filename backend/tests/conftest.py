@@ -81,10 +81,16 @@ async def async_client(mock_settings: Settings, tmp_download_dir: Path, tmp_path
             global_rate_limiter.reset()
             global_rate_limiter.max_requests_per_minute = 10
 
+            # 전역 진입 제어기 초기화 (테스트 호스트의 여유 메모리에 좌우되지 않도록)
+            from app.utils.admission import admission_controller as global_admission
+            global_admission.max_queue_seconds = 3600.0
+            global_admission.min_free_memory_bytes = 0
+
             # 전역 youtube_service 설정 업데이트
             from app.services.youtube_service import youtube_service as global_service
             global_service.download_dir = tmp_download_dir
             global_service._tasks.clear()
+            global_service._store = None
 
             # 전역 separation_service 설정 업데이트
             from app.services.separation_service import separation_service as global_separation_service
@@ -92,6 +98,7 @@ async def async_client(mock_settings: Settings, tmp_download_dir: Path, tmp_path
             test_stems_cache.mkdir(exist_ok=True)
             global_separation_service.cache_dir = test_stems_cache
             global_separation_service._tasks.clear()
+            global_separation_service._store = None
 
             app = create_app()
             transport = ASGITransport(app=app)
@@ -0,0 +1,69 @@
+"""오디오 길이 조회 테스트."""
+
+from __future__ import annotations
+
+import struct
+
+from app.utils.audio_probe import probe_duration_from_header
+
+
+def _wav_header(data_size: int, sample_rate: int = 44100, channels: int = 2) -> bytes:
+    byte_rate = sample_rate * channels * 2
+    fmt = struct.pack("<HHIIHH", 1, channels, sample_rate, byte_rate, channels * 2, 16)
+    return (
+        b"RIFF" + struct.pack("<I", 36 + data_size) + b"WAVE"
+        + b"fmt " + struct.pack("<I", 16) + fmt
+        + b"data" + struct.pack("<I", data_size)
+    )
+
+
+def _flac_header(sample_rate: int, total_samples: int) -> bytes:
+    packed = (sample_rate << 44) | (1 << 41) | (15 << 36) | total_samples
+    streaminfo = b"\x10\x00\x10\x00" + b"\x00" * 6 + packed.to_bytes(8, "big") + b"\x00" * 16
+    return b"fLaC" + b"\x80" + len(streaminfo).to_bytes(3, "big") + streaminfo
+
+
+# MPEG-1 Layer III, 128kbps, 44.1kHz, 스테레오
+_MP3_FRAME_HEADER = b"\xff\xfb\x90\x00"
+
+
+class TestProbeDurationFromHeader:
+    """probe_duration_from_header 테스트."""
+
+    def test_wav_data_chunk(self) -> None:
+        """WAV data 청크 크기와 byte rate로 길이를 계산하는지 확인합니다."""
+        head = _wav_header(data_size=44100 * 4 * 600)
+        assert probe_duration_from_header(head) == 600.0
+
+    def test_streamed_wav_uses_total_size(self) -> None:
+        """data 크기가 비어 있는 WAV는 전체 파일 크기로 추정하는지 확인합니다."""
+        head = _wav_header(data_size=0)
+        total_size = len(head) + 44100 * 4 * 10
+        assert probe_duration_from_header(head, total_size) == 10.0
+        assert probe_duration_from_header(head) is None
+
+    def test_flac_streaminfo(self) -> None:
+        """FLAC STREAMINFO의 총 샘플 수로 길이를 계산하는지 확인합니다."""
+        head = _flac_header(sample_rate=48000, total_samples=48000 * 200)
+        assert probe_duration_from_header(head) == 200.0
+
+    def test_mp3_xing_frame_count(self) -> None:
+        """VBR MP3의 Xing 헤더 프레임 수로 길이를 계산하는지 확인합니다."""
+        id3 = b"ID3\x04\x00\x00" + bytes([0, 0, 0, 20]) + b"\x00" * 20
+        frame = _MP3_FRAME_HEADER + b"\x00" * 32 + b"Xing" + struct.pack(">II", 1, 3828)
+        duration = probe_duration_from_header(id3 + frame)
+        assert duration is not None
+        assert round(duration) == 100  # 3828 * 1152 / 44100
+
+    def test_mp3_cbr_uses_bitrate(self) -> None:
+        """Xing 헤더가 없는 MP3는 비트레이트와 전체 크기로 추정하는지 확인합니다."""
+        head = _MP3_FRAME_HEADER + b"\x00" * 400
+        assert probe_duration_from_header(head, total_size=16000 * 60) == 60.0
+        assert probe_duration_from_header(head) is None
+
+    def test_unknown_or_incomplete_header(self) -> None:
+        """형식을 알 수 없거나 태그가 아직 다 오지 않았으면 None을 반환하는지 확인합니다."""
+        assert probe_duration_from_header(b"not audio at all") is None
+        assert probe_duration_from_header(b"ID3" + b"\x00" * 1000, total_size=1003) is None
+        big_tag = b"ID3\x04\x00\x00" + bytes([0, 1, 0, 0]) + b"\x00" * 100
+        assert probe_duration_from_header(big_tag) is None
@@ -0,0 +1,124 @@
+"""오디오 구간 잘라내기 테스트."""
+
+from __future__ import annotations
+
+import struct
+import wave
+from pathlib import Path
+
+import pytest
+
+from app.utils.audio_slice import iter_slice, mp3_frame_index, slice_mp3, slice_wav
+
+# MPEG-1 Layer III, 128kbps, 44.1kHz, 패딩 없음 -> 프레임 417바이트, 1152샘플
+_MP3_FRAME_HEADER = b"\xff\xfb\x90\x00"
+_MP3_FRAME_SIZE = 417
+
+
+def _write_wav(path: Path, frames: int, sample_rate: int = 1000) -> Path:
+    """프레임 번호가 샘플 값인 16-bit 스테레오 WAV를 만듭니다."""
+    with wave.open(str(path), "wb") as wav_file:
+        wav_file.setnchannels(2)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(b"".join(struct.pack("<hh", i, -i) for i in range(frames)))
+    return path
+
+
+def _write_mp3(path: Path, frames: int, xing: bool = True) -> Path:
+    """ID3v2 태그, Xing 프레임, 오디오 프레임 frames개, ID3v1 태그로 된 MP3를 만듭니다."""
+    data = b"ID3\x04\x00\x00\x00\x00\x00\x0a" + b"\x00" * 10
+    if xing:
+        data += (_MP3_FRAME_HEADER + b"\x00" * 32 + b"Xing").ljust(_MP3_FRAME_SIZE, b"\x00")
+    for i in range(frames):
+        data += (_MP3_FRAME_HEADER + bytes([i + 1])).ljust(_MP3_FRAME_SIZE, b"\x00")
+    data += b"TAG" + b"\x00" * 125
+    path.write_bytes(data)
+    return path
+
+
+class TestSliceWav:
+    """WAV 구간 테스트."""
+
+    def test_slice_is_valid_wav(self, tmp_path: Path) -> None:
+        """잘라낸 구간이 요청한 프레임만 담은 독립 WAV인지 확인합니다."""
+        source = _write_wav(tmp_path / "vocals.wav", 5000)
+
+        audio_slice = slice_wav(source, 1.5, 2.25)
+        output = tmp_path / "slice.wav"
+        output.write_bytes(b"".join(iter_slice(source, audio_slice)))
+
+        assert (audio_slice.start, audio_slice.end) == (1.5, 2.25)
+        assert output.stat().st_size == audio_slice.size
+        with wave.open(str(output), "rb") as wav_file:
+            assert wav_file.getnchannels() == 2
+            assert wav_file.getframerate() == 1000
+            assert wav_file.getnframes() == 750
+            first = struct.unpack("<hh", wav_file.readframes(1))
+        assert first == (1500, -1500)
+
+    def test_open_ended_and_clamped(self, tmp_path: Path) -> None:
+        """끝을 생략하거나 길이를 넘기면 파일 끝까지 자르는지 확인합니다."""
+        source = _write_wav(tmp_path / "bass.wav", 2000)
+
+        assert slice_wav(source, 1.0, None).end == 2.0
+        assert slice_wav(source, None, 99.0).length == 2000 * 4
+
+    def test_invalid_range_raises(self, tmp_path: Path) -> None:
+        """비었거나 범위를 벗어난 구간은 ValueError를 발생시킵니다."""
+        source = _write_wav(tmp_path / "drums.wav", 2000)
+
+        with pytest.raises(ValueError):
+            slice_wav(source, 3.0, 4.0)
+        with pytest.raises(ValueError):
+            slice_wav(source, 1.0, 1.0)
+        with pytest.raises(ValueError):
+            slice_wav(source, 2.5, None)
+
+    def test_silent_marker_slices_to_header(self, tmp_path: Path) -> None:
+        """프레임 없는 무음 스템 마커는 어떤 구간이든 헤더만 있는 WAV가 되는지 확인합니다."""
+        source = _write_wav(tmp_path / "vocals.wav", 0)
+
+        audio_slice = slice_wav(source, 1.5, 2.25)
+        output = tmp_path / "slice.wav"
+        output.write_bytes(b"".join(iter_slice(source, audio_slice)))
+
+        assert audio_slice.length == 0
+        assert output.stat().st_size == audio_slice.size == 44
+        with wave.open(str(output), "rb") as wav_file:
+            assert wav_file.getnchannels() == 2
+            assert wav_file.getnframes() == 0
+
+
+class TestSliceMp3:
+    """MP3 프레임 색인 구간 테스트."""
+
+    def test_frame_index_skips_tags_and_xing(self, tmp_path: Path) -> None:
+        """ID3 태그와 Xing 프레임을 빼고 오디오 프레임만 색인하는지 확인합니다."""
+        index = mp3_frame_index(_write_mp3(tmp_path / "song.mp3", 10))
+
+        assert index.frames == 10
+        assert index.sample_rate == 44100
+        assert index.offsets[0] == 20 + _MP3_FRAME_SIZE
+        assert index.offsets[-1] == index.offsets[0] + 10 * _MP3_FRAME_SIZE
+
+    def test_slice_covers_range_from_previous_frame(self, tmp_path: Path) -> None:
+        """구간을 덮는 프레임과 그 앞 한 프레임을 잘라내는지 확인합니다."""
+        source = _write_mp3(tmp_path / "song.mp3", 100, xing=False)
+        frame_seconds = 1152 / 44100
+
+        audio_slice = slice_mp3(source, 10.5 * frame_seconds, 20.5 * frame_seconds)
+        data = b"".join(iter_slice(source, audio_slice))
+
+        assert audio_slice.start == pytest.approx(9 * frame_seconds)
+        assert audio_slice.end == pytest.approx(21 * frame_seconds)
+        assert len(data) == 12 * _MP3_FRAME_SIZE
+        assert data[:5] == _MP3_FRAME_HEADER + bytes([10])
+
+    def test_not_mp3_raises(self, tmp_path: Path) -> None:
+        """MP3 프레임이 없으면 ValueError를 발생시킵니다."""
+        path = tmp_path / "noise.mp3"
+        path.write_bytes(b"\x00" * 1000)
+
+        with pytest.raises(ValueError):
+            slice_mp3(path, 0.0, 1.0)
@@ -0,0 +1,98 @@
+"""호스트 자동 튜닝 및 프로파일 테스트."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from app.autotune import build_grid, default_concurrency_grid, select_best
+from app.config import Settings
+from app.services.host_profile import HostProfile, host_fingerprint
+
+
+def _result(concurrency: int, throughput: float, rtf: float, rss: float) -> dict:
+    return {
+        "concurrency": concurrency,
+        "parallel_workers": 1,
+        "overlap": 0.25,
+        "segment_seconds": 0.0,
+        "resolved_intra_op_threads": 4,
+        "resolved_inter_op_threads": 1,
+        "throughput": throughput,
+        "real_time_factor": rtf,
+        "peak_rss_mb": rss,
+    }
+
+
+class TestGrid:
+    """튜닝 그리드 테스트."""
+
+    def test_concurrency_grid_scales_with_cores(self) -> None:
+        """코어 수에 따라 동시 처리 수 후보가 늘어나는지 확인합니다."""
+        assert default_concurrency_grid(2) == [1]
+        assert default_concurrency_grid(16) == [1, 2, 4, 8]
+
+    def test_parallel_workers_only_for_single_job(self) -> None:
+        """작업 내 병렬 자동 모드는 동시 처리 수 1에서만 측정하는지 확인합니다."""
+        configs = build_grid([1, 2], [0.25], [0.0], [0])
+        assert {(c.concurrency, c.parallel_workers) for c in configs} == {
+            (1, 1), (1, 0), (2, 1),
+        }
+
+
+class TestSelectBest:
+    """최적 구성 선택 테스트."""
+
+    def test_throughput_objective(self) -> None:
+        """처리량 목표에서는 처리량이 가장 높은 구성을 고릅니다."""
+        results = [_result(1, 2.0, 0.5, 1000), _result(2, 3.0, 0.7, 1500)]
+        assert select_best(results)["concurrency"] == 2
+
+    def test_latency_objective(self) -> None:
+        """지연 목표에서는 RTF가 가장 낮은 구성을 고릅니다."""
+        results = [_result(1, 2.0, 0.5, 1000), _result(2, 3.0, 0.7, 1500)]
+        assert select_best(results, objective="latency")["concurrency"] == 1
+
+    def test_memory_limit_excludes_configs(self) -> None:
+        """메모리 상한을 넘는 구성은 제외합니다."""
+        results = [_result(1, 2.0, 0.5, 1000), _result(2, 3.0, 0.7, 1500)]
+        assert select_best(results, memory_limit_mb=1200)["concurrency"] == 1
+
+    def test_errors_are_skipped(self) -> None:
+        """실패한 구성만 있으면 None을 반환합니다."""
+        assert select_best([{"error": "boom"}]) is None
+
+
+class TestHostProfile:
+    """호스트 프로파일 저장/적용 테스트."""
+
+    def _profile(self) -> HostProfile:
+        return HostProfile(
+            max_concurrent=3,
+            intra_op_threads=5,
+            inter_op_threads=1,
+            parallel_workers=0,
+            overlap=0.1,
+            segment_seconds=5.0,
+        )
+
+    def test_save_and_load_roundtrip(self, tmp_path: Path) -> None:
+        """저장한 프로파일을 그대로 불러오는지 확인합니다."""
+        path = tmp_path / "profile.json"
+        self._profile().save(path)
+        loaded = HostProfile.load(path)
+        assert loaded is not None
+        assert loaded.max_concurrent == 3
+        assert loaded.host == host_fingerprint()
+        assert loaded.matches_host()
+
+    def test_missing_file_returns_none(self, tmp_path: Path) -> None:
+        """파일이 없으면 None을 반환합니다."""
+        assert HostProfile.load(tmp_path / "missing.json") is None
+
+    def test_apply_respects_explicit_settings(self) -> None:
+        """명시된 설정은 프로파일보다 우선하는지 확인합니다."""
+        settings = Settings(separation_max_concurrent=1)
+        applied = self._profile().apply_to(settings)
+        assert applied.separation_max_concurrent == 1
+        assert applied.torch_intra_op_threads == 5
+        assert applied.separation_overlap == 0.1
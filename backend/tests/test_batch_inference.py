@@ -0,0 +1,94 @@
+"""요청 간 배치 추론 테스트."""
+
+from __future__ import annotations
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.services.batch_inference import SegmentBatcher
+
+
+class TestSegmentBatcher:
+    """SegmentBatcher 테스트."""
+
+    def test_results_routed_to_submitters(self) -> None:
+        """각 세그먼트 결과가 제출한 호출자에게 돌아가는지 확인합니다."""
+        batcher = SegmentBatcher(
+            lambda segments: [s * 10 for s in segments],
+            max_batch_size=4,
+            max_wait_ms=50,
+        )
+        try:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                results = list(executor.map(batcher.infer, range(8)))
+        finally:
+            batcher.close()
+
+        assert results == [i * 10 for i in range(8)]
+
+    def test_concurrent_segments_are_batched(self) -> None:
+        """동시에 제출된 세그먼트가 하나의 forward로 묶이는지 확인합니다."""
+        batch_sizes: list[int] = []
+        release = threading.Event()
+
+        def _forward(segments):
+            batch_sizes.append(len(segments))
+            release.wait(1.0)
+            return segments
+
+        batcher = SegmentBatcher(_forward, max_batch_size=4, max_wait_ms=200)
+        try:
+            futures = [batcher.submit(i) for i in range(4)]
+            release.set()
+            assert [f.result(timeout=2) for f in futures] == [0, 1, 2, 3]
+        finally:
+            batcher.close()
+
+        assert batch_sizes == [4]
+        assert batcher.stats["mean_batch_size"] == 4
+
+    def test_batch_size_limit(self) -> None:
+        """배치 크기가 max_batch_size를 넘지 않는지 확인합니다."""
+        batch_sizes: list[int] = []
+
+        def _forward(segments):
+            batch_sizes.append(len(segments))
+            return segments
+
+        batcher = SegmentBatcher(_forward, max_batch_size=3, max_wait_ms=100)
+        try:
+            futures = [batcher.submit(i) for i in range(7)]
+            for f in futures:
+                f.result(timeout=2)
+        finally:
+            batcher.close()
+
+        assert max(batch_sizes) <= 3
+        assert sum(batch_sizes) == 7
+
+    def test_forward_error_propagates(self) -> None:
+        """forward 실패가 배치의 모든 Future로 전달되는지 확인합니다."""
+
+        def _forward(segments):
+            raise RuntimeError("boom")
+
+        batcher = SegmentBatcher(_forward, max_batch_size=2, max_wait_ms=10)
+        try:
+            with pytest.raises(RuntimeError, match="boom"):
+                batcher.infer(1)
+        finally:
+            batcher.close()
+
+    def test_submit_after_close_raises(self) -> None:
+        """종료된 배처에 제출하면 RuntimeError가 발생합니다."""
+        batcher = SegmentBatcher(lambda segments: segments)
+        batcher.close()
+        with pytest.raises(RuntimeError):
+            batcher.submit(1)
+
+    def test_invalid_batch_size(self) -> None:
+        """max_batch_size가 1 미만이면 ValueError가 발생합니다."""
+        with pytest.raises(ValueError):
+            SegmentBatcher(lambda segments: segments, max_batch_size=0)
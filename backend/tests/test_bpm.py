@@ -135,6 +135,17 @@ class TestCaching:
         assert cached.beats == [0.5, 1.0, 1.5]
         assert cached.confidence == 0.9
 
+    def test_public_cache_accessors(self, service: BpmService) -> None:
+        """피어용 공개 메서드로 결과를 저장하고 조회할 수 있는지 확인합니다."""
+        result = BpmResult(bpm=128.0, beats=[0.0, 0.47], confidence=0.8, file_hash="peer_hash")
+
+        assert service.cached_result("peer_hash") is None
+        service.save_result(result)
+
+        cached = service.cached_result("peer_hash")
+        assert cached is not None
+        assert cached.bpm == 128.0
+
     def test_cache_file_format(self, service: BpmService, bpm_cache_dir: Path) -> None:
         """캐시 파일이 올바른 JSON 형식인지 확인합니다."""
         file_hash = "format_test_hash"
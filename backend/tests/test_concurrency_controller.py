@@ -0,0 +1,166 @@
+"""적응형 동시 실행 한도 조정 테스트."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from app.services.concurrency_controller import (
+    AdaptiveLimit,
+    ConcurrencyController,
+    PressureSample,
+    separation_ceiling,
+)
+
+
+@dataclass
+class _FakeTarget:
+    limit: int
+    running: int = 0
+    waiting: int = 0
+
+
+def _sample(
+    memory_pressure: float | None = 0.0,
+    load_per_cpu: float | None = 0.2,
+    memory_headroom_bytes: int | None = 8 * 1024**3,
+) -> PressureSample:
+    return PressureSample(memory_pressure, load_per_cpu, memory_headroom_bytes)
+
+
+class TestAdaptiveLimit:
+    """AdaptiveLimit AIMD 규칙 테스트."""
+
+    def test_increases_when_saturated_and_idle_host(self) -> None:
+        """대기 작업이 있고 호스트에 여유가 있으면 1씩 늘리는지 확인합니다."""
+        target = _FakeTarget(limit=2, running=2, waiting=3)
+        limit = AdaptiveLimit("separation", target, min_limit=1, max_limit=8)
+
+        limit.adjust(_sample())
+
+        assert target.limit == 3
+        assert limit.history[-1].old == 2
+        assert "3 queued" in limit.last_reason
+
+    def test_holds_without_queued_work(self) -> None:
+        """대기 작업이 없으면 한도를 유지하는지 확인합니다."""
+        target = _FakeTarget(limit=2, running=1, waiting=0)
+        limit = AdaptiveLimit("separation", target, min_limit=1, max_limit=8)
+
+        limit.adjust(_sample())
+
+        assert target.limit == 2
+        assert limit.last_reason == "no queued work"
+        assert not limit.history
+
+    def test_respects_max_limit(self) -> None:
+        """최대 한도를 넘지 않는지 확인합니다."""
+        target = _FakeTarget(limit=4, running=4, waiting=5)
+        limit = AdaptiveLimit("youtube", target, min_limit=1, max_limit=4)
+
+        limit.adjust(_sample())
+
+        assert target.limit == 4
+        assert limit.last_reason == "at max limit"
+
+    def test_halves_on_memory_pressure(self) -> None:
+        """메모리 PSI가 높으면 한도를 절반으로 줄이는지 확인합니다."""
+        target = _FakeTarget(limit=6, running=6, waiting=2)
+        limit = AdaptiveLimit("separation", target, min_limit=1, max_limit=8)
+
+        limit.adjust(_sample(memory_pressure=25.0))
+
+        assert target.limit == 3
+        assert "memory pressure" in limit.last_reason
+
+    def test_halves_on_low_headroom_and_high_load(self) -> None:
+        """메모리 여유분 부족과 과부하에서 최소 한도까지 줄이는지 확인합니다."""
+        target = _FakeTarget(limit=2, running=2, waiting=2)
+        limit = AdaptiveLimit(
+            "separation", target, min_limit=1, max_limit=8, min_headroom_bytes=1024**3
+        )
+
+        limit.adjust(_sample(memory_headroom_bytes=256 * 1024**2))
+        assert target.limit == 1
+        assert "memory headroom" in limit.last_reason
+
+        limit.adjust(_sample(load_per_cpu=3.0))
+        assert target.limit == 1  # 최소 한도 유지
+        assert "load" in limit.last_reason
+
+    def test_reverts_increase_without_throughput_gain(self) -> None:
+        """증가 뒤 처리량이 늘지 않으면 한 단계 되돌리는지 확인합니다."""
+        target = _FakeTarget(limit=2, running=2, waiting=3)
+        observed = {"throughput": 2.0, "completed": 0}
+        limit = AdaptiveLimit(
+            "separation",
+            target,
+            min_limit=1,
+            max_limit=8,
+            throughput=lambda: (observed["throughput"], observed["completed"]),
+        )
+
+        limit.adjust(_sample())
+        assert target.limit == 3
+
+        # 작업별 속도가 떨어져 전체 처리량이 그대로
+        target.running = 3
+        observed.update(throughput=2.0, completed=3)
+        limit.adjust(_sample())
+
+        assert target.limit == 2
+        assert "throughput did not improve" in limit.last_reason
+
+
+class TestConcurrencyController:
+    """ConcurrencyController 테스트."""
+
+    def test_disabled_controller_only_samples(self) -> None:
+        """비활성화되면 측정값만 기록하고 한도를 바꾸지 않는지 확인합니다."""
+        target = _FakeTarget(limit=2, running=2, waiting=3)
+        controller = ConcurrencyController(
+            [AdaptiveLimit("separation", target, min_limit=1, max_limit=8)],
+            enabled=False,
+            sampler=_sample,
+        )
+
+        controller.step()
+
+        assert target.limit == 2
+        snapshot = controller.snapshot()
+        assert snapshot["signals"]["load_per_cpu"] == 0.2
+        assert snapshot["limits"][0]["limit"] == 2
+
+    def test_snapshot_reports_changes(self) -> None:
+        """스냅샷에 변경 이력과 이유가 포함되는지 확인합니다."""
+        target = _FakeTarget(limit=2, running=2, waiting=1)
+        controller = ConcurrencyController(
+            [AdaptiveLimit("youtube", target, min_limit=1, max_limit=8)],
+            sampler=_sample,
+        )
+
+        controller.step()
+
+        limits = controller.snapshot()["limits"]
+        assert limits[0]["limit"] == 3
+        assert limits[0]["changes"][0]["new"] == 3
+        assert limits[0]["last_reason"]
+
+
+class TestSeparationCeiling:
+    """분리 한도 상한 계산 테스트."""
+
+    def test_ceiling_grows_with_cores(self) -> None:
+        """코어가 많으면 상한이 시작 한도보다 높은지 확인합니다."""
+        assert separation_ceiling(2, 16, None, 1024**3) == 8
+
+    def test_memory_budget_caps_ceiling(self) -> None:
+        """메모리 예산이 작업 수를 제한하는지 확인합니다."""
+        assert separation_ceiling(2, 64, 6 * 1024**3, 2 * 1024**3) == 3
+
+    def test_never_below_start_limit(self) -> None:
+        """작은 호스트에서도 상한이 시작 한도보다 낮지 않은지 확인합니다."""
+        assert separation_ceiling(3, 2, 1024**3, 2 * 1024**3) == 3
+
+    def test_core_slots_cap_ceiling(self) -> None:
+        """코어 고정을 쓰면 슬롯 수를 넘지 않는지 확인합니다."""
+        assert separation_ceiling(2, 16, None, 1024**3, core_slots=2) == 2
@@ -0,0 +1,206 @@
+"""다중 노드 디스패처 테스트.
+
+서로 다른 포트의 로컬 노드를 httpx.MockTransport로 흉내 냅니다.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import httpx
+import pytest
+
+from app.services.dispatcher import (
+    Dispatcher,
+    NodeState,
+    RemoteSeparationError,
+    rank_nodes,
+)
+
+STEMS = ["vocals", "drums", "bass", "other"]
+
+
+class FakeNode:
+    """노드 API를 흉내 내는 스텁."""
+
+    def __init__(
+        self,
+        queue_depth: int = 0,
+        has_cache: bool = False,
+        fail_upload: bool = False,
+        remote_status: str = "completed",
+        busy_responses: int = 0,
+    ) -> None:
+        self.queue_depth = queue_depth
+        self.has_cache = has_cache
+        self.fail_upload = fail_upload
+        self.remote_status = remote_status
+        self.busy_responses = busy_responses
+        self.jobs: list[str] = []
+        self.forwarded_for: list[str | None] = []
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path == "/api/v1/node/status":
+            return httpx.Response(200, json={
+                "queue_depth": self.queue_depth,
+                "max_concurrent": 2,
+                "free_memory_bytes": 8 * 1024 ** 3,
+                "has_cache": self.has_cache,
+            })
+        if path == "/api/v1/separate" and request.method == "POST":
+            if self.fail_upload:
+                raise httpx.ConnectError("connection refused", request=request)
+            if self.busy_responses:
+                self.busy_responses -= 1
+                return httpx.Response(503, headers={"Retry-After": "1"})
+            self.jobs.append("job-1")
+            self.forwarded_for.append(request.headers.get("X-Forwarded-For"))
+            return httpx.Response(202, json={"task_id": "job-1", "status": "processing"})
+        if path == "/api/v1/node/tasks/job-1":
+            return httpx.Response(200, json={
+                "progress": 100.0 if self.remote_status == "completed" else -1.0,
+                "status": self.remote_status,
+                "error": "boom" if self.remote_status == "failed" else None,
+            })
+        if path.startswith("/api/v1/separate/job-1/stems/"):
+            stem = path.rsplit("/", 1)[-1]
+            return httpx.Response(200, content=f"{request.url.port}:{stem}".encode())
+        return httpx.Response(404)
+
+
+def _dispatcher(nodes: dict[int, FakeNode]) -> Dispatcher:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return nodes[request.url.port].handle(request)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    urls = [f"http://127.0.0.1:{port}" for port in nodes]
+    return Dispatcher(urls, client=client, poll_interval=0.0)
+
+
+@pytest.fixture
+def audio_file(tmp_path: Path) -> Path:
+    """테스트용 입력 파일을 생성합니다."""
+    path = tmp_path / "song.mp3"
+    path.write_bytes(b"audio" * 100)
+    return path
+
+
+class TestRankNodes:
+    """배치 우선순위 테스트."""
+
+    def test_cache_affinity_beats_load(self) -> None:
+        """결과를 가진 노드가 부하가 높아도 우선되는지 확인합니다."""
+        idle = NodeState(url="a", healthy=True, queue_depth=0)
+        cached = NodeState(url="b", healthy=True, queue_depth=4, has_cache=True)
+        assert [n.url for n in rank_nodes([idle, cached])] == ["b", "a"]
+
+    def test_low_memory_node_deprioritized(self) -> None:
+        """여유 메모리가 부족한 노드가 뒤로 밀리는지 확인합니다."""
+        starved = NodeState(url="a", healthy=True, free_memory_bytes=100 * 1024 ** 2)
+        busy = NodeState(url="b", healthy=True, queue_depth=3, free_memory_bytes=8 * 1024 ** 3)
+        assert [n.url for n in rank_nodes([starved, busy])] == ["b", "a"]
+
+    def test_unhealthy_and_excluded_nodes_skipped(self) -> None:
+        """비정상/제외된 노드가 후보에서 빠지는지 확인합니다."""
+        nodes = [
+            NodeState(url="a", healthy=False),
+            NodeState(url="b", healthy=True),
+            NodeState(url="c", healthy=True),
+        ]
+        assert [n.url for n in rank_nodes(nodes, exclude={"b"})] == ["c"]
+
+
+class TestDispatcher:
+    """Dispatcher.run 테스트."""
+
+    @pytest.mark.asyncio
+    async def test_dispatches_to_least_loaded_node(
+        self, audio_file: Path, tmp_path: Path
+    ) -> None:
+        """부하가 낮은 노드에서 실행하고 스템을 캐시로 받는지 확인합니다."""
+        nodes = {8001: FakeNode(queue_depth=3), 8002: FakeNode(queue_depth=0)}
+        dispatcher = _dispatcher(nodes)
+        progress: list[float] = []
+
+        stems = await dispatcher.run(
+            audio_file, "a" * 64, tmp_path, STEMS, on_progress=progress.append
+        )
+
+        assert nodes[8002].jobs and not nodes[8001].jobs
+        assert set(stems) == set(STEMS)
+        assert stems["vocals"].read_bytes() == b"8002:vocals"
+
+    @pytest.mark.asyncio
+    async def test_forwards_client_ip(self, audio_file: Path, tmp_path: Path) -> None:
+        """노드의 공정 큐잉을 위해 원래 요청자 IP를 X-Forwarded-For로 보내는지 확인합니다."""
+        nodes = {8001: FakeNode()}
+        dispatcher = _dispatcher(nodes)
+
+        await dispatcher.run(audio_file, "a" * 64, tmp_path, STEMS, client_id="203.0.113.7")
+
+        assert nodes[8001].forwarded_for == ["203.0.113.7"]
+
+    @pytest.mark.asyncio
+    async def test_fails_over_on_node_loss(self, audio_file: Path, tmp_path: Path) -> None:
+        """노드와 연결이 끊기면 다음 노드로 넘어가는지 확인합니다."""
+        nodes = {8001: FakeNode(queue_depth=0, fail_upload=True), 8002: FakeNode(queue_depth=2)}
+        dispatcher = _dispatcher(nodes)
+
+        stems = await dispatcher.run(audio_file, "a" * 64, tmp_path, STEMS)
+
+        assert stems["drums"].read_bytes() == b"8002:drums"
+        assert not nodes[8001].jobs
+
+    @pytest.mark.asyncio
+    async def test_returns_none_when_no_node_available(
+        self, audio_file: Path, tmp_path: Path
+    ) -> None:
+        """모든 노드를 쓸 수 없으면 None(로컬 처리)을 반환하는지 확인합니다."""
+        nodes = {8001: FakeNode(fail_upload=True)}
+        dispatcher = _dispatcher(nodes)
+
+        assert await dispatcher.run(audio_file, "a" * 64, tmp_path, STEMS) is None
+        assert not list(tmp_path.glob("*.wav"))
+
+    @pytest.mark.asyncio
+    async def test_remote_failure_is_not_retried(self, audio_file: Path, tmp_path: Path) -> None:
+        """노드가 분리 실패를 보고하면 다른 노드로 재시도하지 않는지 확인합니다."""
+        nodes = {8001: FakeNode(remote_status="failed"), 8002: FakeNode(queue_depth=5)}
+        dispatcher = _dispatcher(nodes)
+
+        with pytest.raises(RemoteSeparationError):
+            await dispatcher.run(audio_file, "a" * 64, tmp_path, STEMS)
+        assert not nodes[8002].jobs
+
+    @pytest.mark.asyncio
+    async def test_busy_node_stays_healthy(self, audio_file: Path, tmp_path: Path) -> None:
+        """진입 제어로 거절한 노드를 잃은 것으로 보지 않고 다른 노드로 넘어가는지 확인합니다."""
+        nodes = {8001: FakeNode(queue_depth=0, busy_responses=1), 8002: FakeNode(queue_depth=3)}
+        dispatcher = _dispatcher(nodes)
+
+        stems = await dispatcher.run(audio_file, "a" * 64, tmp_path, STEMS)
+
+        assert stems["vocals"].read_bytes() == b"8002:vocals"
+        node = dispatcher.nodes["http://127.0.0.1:8001"]
+        assert node.healthy and node.busy
+
+    @pytest.mark.asyncio
+    async def test_waits_when_all_nodes_busy(self, audio_file: Path, tmp_path: Path) -> None:
+        """모든 노드가 바쁘면 로컬로 넘기지 않고 Retry-After 뒤에 다시 제출하는지 확인합니다."""
+        nodes = {8001: FakeNode(busy_responses=1)}
+        dispatcher = _dispatcher(nodes)
+
+        stems = await dispatcher.run(audio_file, "a" * 64, tmp_path, STEMS)
+
+        assert stems is not None
+        assert nodes[8001].jobs == ["job-1"]
+
+    @pytest.mark.asyncio
+    async def test_estimated_wait_from_node_queue(self) -> None:
+        """가장 한가한 노드의 대기열 깊이로 예상 대기 시간을 계산하는지 확인합니다."""
+        nodes = {8001: FakeNode(queue_depth=5), 8002: FakeNode(queue_depth=3)}
+        dispatcher = _dispatcher(nodes)
+
+        # 동시 처리 2개: 8002는 2개가 넘쳐 작업당 100초 / 2
+        assert await dispatcher.estimated_wait(100.0) == 100.0
@@ -0,0 +1,60 @@
+"""캐시 가능한 파일 응답 유틸리티 테스트."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from app.utils.file_response import MAX_RANGES, etag_matches, file_etag, parse_range
+
+
+class TestParseRange:
+    """parse_range 테스트."""
+
+    def test_single_and_open_ranges(self) -> None:
+        """시작-끝, 열린 끝, 접미사 구간을 파싱하는지 확인합니다."""
+        assert parse_range("bytes=0-99", 1000) == [(0, 99)]
+        assert parse_range("bytes=900-", 1000) == [(900, 999)]
+        assert parse_range("bytes=-100", 1000) == [(900, 999)]
+        assert parse_range("bytes=990-2000", 1000) == [(990, 999)]
+
+    def test_multiple_ranges(self) -> None:
+        """여러 구간을 순서대로 반환하는지 확인합니다."""
+        assert parse_range("bytes=0-9, 20-29, -5", 100) == [(0, 9), (20, 29), (95, 99)]
+
+    def test_unsatisfiable_returns_empty(self) -> None:
+        """파일 밖 구간만 있으면 빈 목록(416)을 반환하는지 확인합니다."""
+        assert parse_range("bytes=1000-1100", 1000) == []
+        assert parse_range("bytes=-0", 1000) == []
+        assert parse_range("bytes=1000-", 1000) == []
+        assert parse_range("bytes=0-", 0) == []
+
+    def test_invalid_is_ignored(self) -> None:
+        """형식이 잘못되었거나 구간이 너무 많으면 None(전체 응답)을 반환하는지 확인합니다."""
+        assert parse_range("items=0-1", 1000) is None
+        assert parse_range("bytes=abc", 1000) is None
+        assert parse_range("bytes=10-5", 1000) is None
+        many = ",".join(f"{i}-{i}" for i in range(MAX_RANGES + 1))
+        assert parse_range(f"bytes={many}", 1000) is None
+
+
+class TestEtag:
+    """ETag 생성과 비교 테스트."""
+
+    def test_etag_follows_content(self, tmp_path: Path) -> None:
+        """같은 내용은 같은 ETag, 다른 내용은 다른 ETag인지 확인합니다."""
+        first = tmp_path / "a.wav"
+        second = tmp_path / "b.wav"
+        first.write_bytes(b"same content")
+        second.write_bytes(b"same content")
+
+        assert file_etag(first) == file_etag(second)
+        second.write_bytes(b"other content!")
+        assert file_etag(first) != file_etag(second)
+
+    def test_etag_matches(self) -> None:
+        """If-None-Match 목록, 약한 태그, *를 처리하는지 확인합니다."""
+        etag = '"abc"'
+        assert etag_matches('"abc"', etag)
+        assert etag_matches('"x", W/"abc"', etag)
+        assert etag_matches("*", etag)
+        assert not etag_matches('"abd"', etag)
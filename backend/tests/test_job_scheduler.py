@@ -0,0 +1,209 @@
+"""공정 분리 작업 스케줄러 테스트."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.services.job_scheduler import FairScheduler
+
+
+async def _submit(
+    scheduler: FairScheduler,
+    order: list[str],
+    job_id: str,
+    client_id: str,
+    duration: float,
+    release: asyncio.Event,
+    memory_bytes: int = 0,
+) -> None:
+    async with scheduler.slot(job_id, client_id, duration, memory_bytes):
+        order.append(job_id)
+        await release.wait()
+
+
+async def _drain(
+    scheduler: FairScheduler, release: asyncio.Event, tasks: list[asyncio.Task]
+) -> None:
+    release.set()
+    await asyncio.gather(*tasks)
+
+
+class TestFairScheduler:
+    """FairScheduler 테스트."""
+
+    @pytest.mark.asyncio
+    async def test_limit_bounds_running_jobs(self) -> None:
+        """동시 실행 작업 수가 limit을 넘지 않는지 확인합니다."""
+        scheduler = FairScheduler(limit=2)
+        order: list[str] = []
+        release = asyncio.Event()
+        tasks = [
+            asyncio.create_task(_submit(scheduler, order, f"job{i}", "a", 60, release))
+            for i in range(4)
+        ]
+        await asyncio.sleep(0)
+        assert scheduler.running == 2
+        assert scheduler.waiting == 2
+
+        await _drain(scheduler, release, tasks)
+        assert scheduler.running == 0
+        assert len(order) == 4
+
+    @pytest.mark.asyncio
+    async def test_other_client_not_starved(self) -> None:
+        """한 클라이언트가 긴 작업을 많이 넣어도 다른 클라이언트 작업이 먼저 들어가는지
+        확인합니다."""
+        scheduler = FairScheduler(limit=1)
+        order: list[str] = []
+        release = asyncio.Event()
+        tasks = [
+            asyncio.create_task(_submit(scheduler, order, f"a{i}", "a", 1800, release))
+            for i in range(3)
+        ]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(_submit(scheduler, order, "b0", "b", 1800, release)))
+        await asyncio.sleep(0)
+
+        await _drain(scheduler, release, tasks)
+        assert order[:2] == ["a0", "b0"]
+
+    @pytest.mark.asyncio
+    async def test_shortest_job_first_within_client(self) -> None:
+        """같은 클라이언트 안에서는 짧은 곡부터 처리하는지 확인합니다."""
+        scheduler = FairScheduler(limit=1)
+        order: list[str] = []
+        release = asyncio.Event()
+        tasks = [asyncio.create_task(_submit(scheduler, order, "first", "a", 60, release))]
+        await asyncio.sleep(0)
+        for job_id, duration in (("long", 1800), ("short", 30), ("medium", 300)):
+            tasks.append(
+                asyncio.create_task(_submit(scheduler, order, job_id, "a", duration, release))
+            )
+        await asyncio.sleep(0)
+
+        await _drain(scheduler, release, tasks)
+        assert order == ["first", "short", "medium", "long"]
+
+    @pytest.mark.asyncio
+    async def test_queue_position_and_eta(self) -> None:
+        """대기 순번과 예상 시작 시간이 실행 중 작업 길이로 추정되는지 확인합니다."""
+        scheduler = FairScheduler(limit=1, real_time_factor=0.5)
+        order: list[str] = []
+        release = asyncio.Event()
+        tasks = [asyncio.create_task(_submit(scheduler, order, "running", "a", 100, release))]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(_submit(scheduler, order, "next", "b", 40, release)))
+        tasks.append(asyncio.create_task(_submit(scheduler, order, "last", "c", 200, release)))
+        await asyncio.sleep(0)
+
+        assert scheduler.position("running") is None
+        first = scheduler.position("next")
+        second = scheduler.position("last")
+        assert first is not None and second is not None
+        assert first.position == 1
+        assert second.position == 2
+        assert first.estimated_start_seconds == pytest.approx(50, abs=1)
+        assert second.estimated_start_seconds == pytest.approx(70, abs=1)
+
+        await _drain(scheduler, release, tasks)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_leaves_queue(self) -> None:
+        """대기 중 취소된 작업이 대기열에서 빠지고 슬롯을 막지 않는지 확인합니다."""
+        scheduler = FairScheduler(limit=1)
+        order: list[str] = []
+        release = asyncio.Event()
+        tasks = [asyncio.create_task(_submit(scheduler, order, "running", "a", 60, release))]
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(_submit(scheduler, order, "cancelled", "b", 60, release))
+        tasks.append(asyncio.create_task(_submit(scheduler, order, "after", "c", 60, release)))
+        await asyncio.sleep(0)
+
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert scheduler.waiting == 1
+
+        await _drain(scheduler, release, tasks)
+        assert order == ["running", "after"]
+
+    @pytest.mark.asyncio
+    async def test_raising_limit_admits_waiting_jobs(self) -> None:
+        """limit을 늘리면 대기 작업이 바로 들어가는지 확인합니다."""
+        scheduler = FairScheduler(limit=1)
+        order: list[str] = []
+        release = asyncio.Event()
+        tasks = [
+            asyncio.create_task(_submit(scheduler, order, f"job{i}", "a", 60, release))
+            for i in range(3)
+        ]
+        await asyncio.sleep(0)
+        assert scheduler.running == 1
+
+        scheduler.limit = 3
+        await asyncio.sleep(0)
+        assert scheduler.running == 3
+
+        await _drain(scheduler, release, tasks)
+
+    @pytest.mark.asyncio
+    async def test_memory_budget_holds_jobs_that_do_not_fit(self) -> None:
+        """예상 메모리 합계가 예산을 넘으면 슬롯이 비어도 시작하지 않는지 확인합니다."""
+        scheduler = FairScheduler(limit=3, memory_budget=lambda: 10)
+        order: list[str] = []
+        release = asyncio.Event()
+        first_done = asyncio.Event()
+        tasks = [
+            asyncio.create_task(_submit(scheduler, order, "big", "a", 60, first_done, 6)),
+            asyncio.create_task(_submit(scheduler, order, "small", "b", 60, release, 3)),
+        ]
+        await asyncio.sleep(0)
+        assert scheduler.running == 2
+        assert scheduler.reserved_memory == 9
+
+        tasks.append(asyncio.create_task(_submit(scheduler, order, "next", "c", 60, release, 6)))
+        await asyncio.sleep(0)
+        assert scheduler.running == 2
+        assert scheduler.waiting == 1
+
+        # 큰 작업이 끝나면 예산이 생겨 대기 작업이 들어감
+        first_done.set()
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert order == ["big", "small", "next"]
+
+        await _drain(scheduler, release, tasks)
+
+    @pytest.mark.asyncio
+    async def test_oversized_job_runs_alone(self) -> None:
+        """예산보다 큰 작업도 실행 중인 작업이 없으면 시작하는지 확인합니다."""
+        scheduler = FairScheduler(limit=2, memory_budget=lambda: 10)
+        order: list[str] = []
+        release = asyncio.Event()
+        tasks = [asyncio.create_task(_submit(scheduler, order, "huge", "a", 60, release, 20))]
+        await asyncio.sleep(0)
+        assert order == ["huge"]
+
+        await _drain(scheduler, release, tasks)
+
+    @pytest.mark.asyncio
+    async def test_idle_client_queues_dropped(self) -> None:
+        """대기/실행 중 작업이 없는 클라이언트 큐가 남지 않는지 확인합니다."""
+        scheduler = FairScheduler(limit=1)
+        order: list[str] = []
+        release = asyncio.Event()
+        tasks = [
+            asyncio.create_task(_submit(scheduler, order, f"job{i}", f"client{i}", 60, release))
+            for i in range(3)
+        ]
+        await asyncio.sleep(0)
+        assert set(scheduler._clients) == {"client0", "client1", "client2"}
+
+        tasks[2].cancel()
+        await asyncio.sleep(0)
+        assert set(scheduler._clients) == {"client0", "client1"}
+
+        await _drain(scheduler, release, tasks[:2])
+        assert scheduler._clients == {}
@@ -0,0 +1,81 @@
+"""공유 모델 가중치 저장소 테스트."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from app.services.model_store import (
+    export_weights,
+    load_shared_model,
+    map_weights,
+    weights_path,
+)
+
+
+def _build_model():
+    torch = pytest.importorskip("torch")
+    torch.manual_seed(0)
+    return torch.nn.Sequential(torch.nn.Linear(8, 4), torch.nn.ReLU(), torch.nn.Linear(4, 2))
+
+
+class TestModelStore:
+    """가중치 내보내기 및 mmap 매핑 테스트."""
+
+    def test_weights_path(self, tmp_path: Path) -> None:
+        """모델 이름으로 가중치 파일 경로를 만드는지 확인합니다."""
+        assert weights_path(tmp_path, "htdemucs") == tmp_path / "htdemucs.pt"
+
+    def test_export_and_map_roundtrip(self, tmp_path: Path) -> None:
+        """내보낸 가중치를 매핑하면 같은 값이 되는지 확인합니다."""
+        torch = pytest.importorskip("torch")
+        source = _build_model()
+        path = tmp_path / "model.pt"
+        export_weights(source, path)
+
+        target = torch.nn.Sequential(
+            torch.nn.Linear(8, 4), torch.nn.ReLU(), torch.nn.Linear(4, 2)
+        )
+        map_weights(target, path)
+
+        for a, b in zip(source.state_dict().values(), target.state_dict().values()):
+            assert torch.equal(a, b)
+        assert not target.training
+
+    def test_load_shared_model_exports_once(self, tmp_path: Path) -> None:
+        """공유 가중치 파일이 없을 때만 내보내는지 확인합니다."""
+        pytest.importorskip("torch")
+        load_shared_model("tiny", tmp_path, _build_model)
+        path = weights_path(tmp_path, "tiny")
+        mtime = path.stat().st_mtime_ns
+
+        load_shared_model("tiny", tmp_path, _build_model)
+        assert path.stat().st_mtime_ns == mtime
+        assert not list(tmp_path.glob("*.tmp"))
+
+    def test_weights_path_with_signature(self, tmp_path: Path) -> None:
+        """체크포인트 서명이 파일 이름에 들어가는지 확인합니다."""
+        path = weights_path(tmp_path, "htdemucs", "0123456789abcdef0123")
+        assert path == tmp_path / "htdemucs-0123456789abcdef.pt"
+
+    def test_existing_weights_mapped_onto_meta_model(self, tmp_path: Path) -> None:
+        """공유 파일이 있으면 사본 없이 매핑된 텐서만 쓰는지 확인합니다."""
+        torch = pytest.importorskip("torch")
+        source = _build_model()
+        export_weights(source, weights_path(tmp_path, "tiny", "abc"))
+
+        model = load_shared_model("tiny", tmp_path, _build_model, signature="abc")
+
+        for name, tensor in model.state_dict().items():
+            assert not tensor.is_meta
+            assert torch.equal(tensor, source.state_dict()[name])
+
+    def test_new_signature_replaces_stale_export(self, tmp_path: Path) -> None:
+        """서명이 바뀌면 다시 내보내고 예전 파일을 지우는지 확인합니다."""
+        pytest.importorskip("torch")
+        load_shared_model("tiny", tmp_path, _build_model, signature="old")
+        load_shared_model("tiny", tmp_path, _build_model, signature="new")
+
+        assert weights_path(tmp_path, "tiny", "new").exists()
+        assert not weights_path(tmp_path, "tiny", "old").exists()
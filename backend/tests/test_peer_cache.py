@@ -0,0 +1,178 @@
+"""피어 캐시 연합 테스트.
+
+서로 다른 포트의 로컬 인스턴스를 httpx.MockTransport로 흉내 냅니다.
+"""
+
+from __future__ import annotations
+
+import wave
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from app.config import Settings
+from app.main import create_app
+from app.routes.peer import _is_stem_wav, _verify_peer
+from app.services.peer_cache import PEER_TOKEN_HEADER, HashRing, PeerCache
+
+STEMS = ["vocals", "drums", "bass", "other"]
+PEERS = [f"http://127.0.0.1:{port}" for port in (8001, 8002, 8003)]
+
+
+class FakePeer:
+    """피어 캐시 API를 흉내 내는 인메모리 인스턴스."""
+
+    def __init__(self) -> None:
+        self.files: dict[str, bytes] = {}
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        key = request.url.path.removeprefix("/api/v1/peer/")
+        if request.method == "PUT":
+            self.files[key] = request.read()
+            return httpx.Response(204)
+        if key in self.files:
+            return httpx.Response(200, content=self.files[key])
+        return httpx.Response(404)
+
+
+def _cluster(self_url: str = "", replicas: int = 1) -> tuple[PeerCache, dict[int, FakePeer]]:
+    peers = {8001: FakePeer(), 8002: FakePeer(), 8003: FakePeer()}
+    client = httpx.Client(
+        transport=httpx.MockTransport(lambda request: peers[request.url.port].handle(request))
+    )
+    return PeerCache(PEERS, self_url=self_url, replicas=replicas, client=client), peers
+
+
+class TestHashRing:
+    """일관 해싱 링 테스트."""
+
+    def test_owners_are_distinct_and_stable(self) -> None:
+        """소유 노드가 중복 없이 항상 같은 순서로 반환되는지 확인합니다."""
+        ring = HashRing(PEERS)
+        owners = ring.owners("a" * 64)
+        assert sorted(owners) == sorted(PEERS)
+        assert ring.owners("a" * 64) == owners
+        assert ring.owners("a" * 64, 2) == owners[:2]
+
+    def test_removing_node_only_moves_its_keys(self) -> None:
+        """노드를 제거해도 다른 노드가 맡던 키는 그대로인지 확인합니다."""
+        keys = [f"{i:064x}" for i in range(300)]
+        before = HashRing(PEERS)
+        after = HashRing(PEERS[:2])
+        for key in keys:
+            owner = before.owners(key, 1)[0]
+            if owner != PEERS[2]:
+                assert after.owners(key, 1)[0] == owner
+
+    def test_keys_spread_across_nodes(self) -> None:
+        """키가 모든 노드에 분산되는지 확인합니다."""
+        ring = HashRing(PEERS)
+        owners = {ring.owners(f"{i:064x}", 1)[0] for i in range(300)}
+        assert owners == set(PEERS)
+
+
+class TestPeerCache:
+    """PeerCache 테스트."""
+
+    def test_fetch_stems_from_owner(self, tmp_path: Path) -> None:
+        """소유 피어가 가진 스템을 받아오는지 확인합니다."""
+        cache, peers = _cluster()
+        file_hash = "b" * 64
+        owner = cache.lookup_peers(file_hash)[0]
+        port = int(owner.rsplit(":", 1)[1])
+        for stem in STEMS:
+            peers[port].files[f"stems/{file_hash}/{stem}"] = stem.encode()
+
+        stems = cache.fetch_stems(file_hash, tmp_path, STEMS)
+
+        assert stems is not None
+        assert stems["bass"].read_bytes() == b"bass"
+
+    def test_fetch_stems_miss_leaves_no_partial_files(self, tmp_path: Path) -> None:
+        """일부 스템만 가진 피어에서는 받지 않고 정리하는지 확인합니다."""
+        cache, peers = _cluster()
+        file_hash = "c" * 64
+        port = int(cache.lookup_peers(file_hash)[0].rsplit(":", 1)[1])
+        peers[port].files[f"stems/{file_hash}/vocals"] = b"vocals"
+
+        assert cache.fetch_stems(file_hash, tmp_path, STEMS) is None
+        assert list(tmp_path.iterdir()) == []
+
+    def test_replicate_stems_to_ring_owner(self, tmp_path: Path) -> None:
+        """로컬 결과가 링의 소유 피어에 복제되는지 확인합니다."""
+        file_hash = "d" * 64
+        # 자신이 소유자가 아닌 인스턴스를 고름
+        ring_owner = HashRing(PEERS).owners(file_hash, 1)[0]
+        self_url = next(p for p in PEERS if p != ring_owner)
+        cache, peers = _cluster(self_url=self_url)
+
+        stems = {}
+        for stem in STEMS:
+            stems[stem] = tmp_path / f"{stem}.wav"
+            stems[stem].write_bytes(stem.encode())
+        cache.replicate_stems(file_hash, stems)
+        cache._executor.shutdown(wait=True)
+
+        owner_port = int(ring_owner.rsplit(":", 1)[1])
+        assert peers[owner_port].files[f"stems/{file_hash}/drums"] == b"drums"
+
+    def test_owner_does_not_replicate(self) -> None:
+        """자신이 소유자면 복제 대상이 없는지 확인합니다."""
+        file_hash = "e" * 64
+        owner = HashRing(PEERS).owners(file_hash, 1)[0]
+        cache, _ = _cluster(self_url=owner)
+        assert cache.replica_peers(file_hash) == []
+
+    def test_fetch_bpm(self) -> None:
+        """피어의 BPM 결과를 조회하는지 확인합니다."""
+        cache, peers = _cluster(replicas=3)
+        file_hash = "f" * 64
+        peers[8003].files[f"bpm/{file_hash}"] = b'{"bpm": 120.0, "beats": [], "confidence": 1.0}'
+
+        assert cache.fetch_bpm(file_hash)["bpm"] == 120.0
+        assert cache.fetch_bpm("0" * 64) is None
+
+
+
+class TestPeerRoutes:
+    """피어 라우트 인증과 입력 검증 테스트."""
+
+    def test_empty_token_rejects_every_request(self) -> None:
+        """CACHE_PEER_TOKEN이 비어 있으면 토큰 없는 요청도 거절하는지 확인합니다."""
+        request = MagicMock(headers={})
+        with (
+            patch("app.routes.peer.get_settings", return_value=Settings(cache_peer_token="")),
+            pytest.raises(HTTPException) as exc_info,
+        ):
+            _verify_peer(request)
+        assert exc_info.value.status_code == 403
+
+    def test_matching_token_accepted(self) -> None:
+        """공유 토큰이 맞으면 통과하는지 확인합니다."""
+        request = MagicMock(headers={PEER_TOKEN_HEADER: "secret"})
+        settings = Settings(cache_peer_token="secret")
+        with patch("app.routes.peer.get_settings", return_value=settings):
+            _verify_peer(request)
+
+    def test_peers_without_token_refuse_to_start(self) -> None:
+        """피어를 설정하고 토큰을 비워 두면 앱을 만들지 않는지 확인합니다."""
+        settings = Settings(cache_peers=PEERS, cache_peer_token="")
+        with patch("app.main.get_settings", return_value=settings), pytest.raises(RuntimeError):
+            create_app()
+
+    def test_stem_wav_check(self, tmp_path: Path) -> None:
+        """16-bit 스테레오 WAV만 스템으로 받는지 확인합니다."""
+        stem = tmp_path / "vocals.wav"
+        with wave.open(str(stem), "wb") as wav_file:
+            wav_file.setnchannels(2)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(44100)
+            wav_file.writeframes(b"\x00" * 400)
+        garbage = tmp_path / "garbage.wav"
+        garbage.write_bytes(b"not a wav at all")
+
+        assert _is_stem_wav(stem)
+        assert not _is_stem_wav(garbage)
@@ -0,0 +1,97 @@
+"""세그먼트 병렬 추론 테스트."""
+
+from __future__ import annotations
+
+import pytest
+
+from app.services.segment_inference import (
+    plan_segments,
+    plan_shift_offsets,
+    run_segmented,
+)
+
+
+class TestPlanSegments:
+    """세그먼트 계획 테스트."""
+
+    def test_segments_cover_whole_length(self) -> None:
+        """세그먼트가 전체 길이를 빠짐없이 덮는지 확인합니다."""
+        spans = plan_segments(length=1000, segment_length=300, overlap=0.25)
+        assert spans[0][0] == 0
+        assert spans[-1][1] == 1000
+        for (_, prev_end), (next_start, _) in zip(spans, spans[1:]):
+            assert next_start < prev_end  # 겹침 존재
+
+    def test_stride_matches_demucs_rule(self) -> None:
+        """stride가 (1 - overlap) * segment_length인지 확인합니다."""
+        spans = plan_segments(length=1000, segment_length=400, overlap=0.25)
+        assert [start for start, _ in spans] == [0, 300, 600, 900]
+
+    def test_empty_input(self) -> None:
+        """길이 0 입력은 빈 계획을 반환합니다."""
+        assert plan_segments(length=0, segment_length=100, overlap=0.25) == []
+
+    @pytest.mark.parametrize("overlap", [-0.1, 1.0])
+    def test_invalid_overlap_raises(self, overlap: float) -> None:
+        """잘못된 overlap 값은 ValueError를 발생시킵니다."""
+        with pytest.raises(ValueError):
+            plan_segments(length=100, segment_length=10, overlap=overlap)
+
+
+class TestPlanShiftOffsets:
+    """shift 오프셋 계획 테스트."""
+
+    def test_no_shift_single_pass(self) -> None:
+        """shifts=0이면 이동 없는 단일 패스입니다."""
+        assert plan_shift_offsets(0, 100) == [0]
+
+    def test_offsets_within_range(self) -> None:
+        """오프셋이 [0, max_shift] 범위 안에 있는지 확인합니다."""
+        offsets = plan_shift_offsets(5, 100, seed=1)
+        assert len(offsets) == 5
+        assert all(0 <= o <= 100 for o in offsets)
+
+
+class TestRunSegmented:
+    """병렬 overlap-add 테스트."""
+
+    @pytest.mark.parametrize("workers", [1, 4])
+    @pytest.mark.parametrize("shifts", [0, 2])
+    def test_identity_model_reconstructs_input(self, workers: int, shifts: int) -> None:
+        """항등 모델이면 stitch 결과가 입력과 같아야 합니다."""
+        torch = pytest.importorskip("torch")
+        mix = torch.randn(2, 1234)
+
+        def _identity(chunk):
+            return torch.stack([chunk, chunk * 0.5])
+
+        out = run_segmented(
+            _identity,
+            mix,
+            segment_length=200,
+            overlap=0.25,
+            shifts=shifts,
+            max_shift=50,
+            workers=workers,
+            seed=0,
+        )
+
+        assert out.shape == (2, 2, 1234)
+        assert torch.allclose(out[0], mix, atol=1e-5)
+        assert torch.allclose(out[1], mix * 0.5, atol=1e-5)
+
+    def test_progress_callback_reaches_total(self) -> None:
+        """진행률 콜백이 모든 세그먼트 완료를 보고하는지 확인합니다."""
+        torch = pytest.importorskip("torch")
+        calls: list[tuple[int, int]] = []
+
+        run_segmented(
+            lambda chunk: chunk.unsqueeze(0),
+            torch.zeros(2, 1000),
+            segment_length=300,
+            workers=2,
+            on_segment_done=lambda done, total: calls.append((done, total)),
+        )
+
+        assert calls[-1][0] == calls[-1][1]
+        assert len(calls) == calls[-1][1]
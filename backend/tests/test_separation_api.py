@@ -101,6 +101,144 @@ class TestSeparateEndpoint:
         # 여기서는 기본 동작만 확인
         assert response.status_code in (202, 413)
 
+    @pytest.mark.asyncio
+    async def test_separate_queue_full_returns_503(
+        self,
+        async_client: AsyncClient,
+        tmp_path: Path,
+    ) -> None:
+        """예상 대기 시간이 서버 한도를 넘으면 Retry-After와 함께 503을 반환합니다."""
+        audio_file = tmp_path / "test.mp3"
+        audio_file.write_bytes(b"ID3" + b"\x00" * 1000)
+
+        with patch(
+            "app.services.separation_service.SeparationService.estimated_wait_seconds",
+            return_value=3700.0,
+        ):
+            with open(audio_file, "rb") as f:
+                response = await async_client.post(
+                    "/api/v1/separate",
+                    files={"file": ("test.mp3", f, "audio/mpeg")},
+                )
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "100"
+
+    @pytest.mark.asyncio
+    async def test_separate_max_wait_exceeded_returns_503(
+        self,
+        async_client: AsyncClient,
+        tmp_path: Path,
+    ) -> None:
+        """예상 대기 시간이 요청한 max_wait를 넘으면 503을 반환합니다."""
+        audio_file = tmp_path / "test.mp3"
+        audio_file.write_bytes(b"ID3" + b"\x00" * 1000)
+
+        with patch(
+            "app.services.separation_service.SeparationService.estimated_wait_seconds",
+            return_value=300.0,
+        ):
+            with open(audio_file, "rb") as f:
+                response = await async_client.post(
+                    "/api/v1/separate",
+                    params={"max_wait": 60},
+                    files={"file": ("test.mp3", f, "audio/mpeg")},
+                )
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "240"
+        assert "최대 대기 시간" in response.json()["detail"]
+
+    @pytest.mark.asyncio
+    async def test_separate_low_memory_returns_503(
+        self,
+        async_client: AsyncClient,
+        tmp_path: Path,
+    ) -> None:
+        """여유 메모리가 최소 기준보다 적으면 503을 반환합니다."""
+        from app.utils.admission import admission_controller
+
+        audio_file = tmp_path / "test.mp3"
+        audio_file.write_bytes(b"ID3" + b"\x00" * 1000)
+
+        admission_controller.min_free_memory_bytes = 1024 * 1024 * 1024
+        with patch(
+            "app.utils.admission.available_memory_bytes",
+            return_value=256 * 1024 * 1024,
+        ):
+            with open(audio_file, "rb") as f:
+                response = await async_client.post(
+                    "/api/v1/separate",
+                    files={"file": ("test.mp3", f, "audio/mpeg")},
+                )
+
+        assert response.status_code == 503
+        assert "Retry-After" in response.headers
+
+    @pytest.mark.asyncio
+    async def test_separate_too_long_returns_413(
+        self,
+        async_client: AsyncClient,
+        tmp_path: Path,
+    ) -> None:
+        """헤더의 오디오 길이가 최대 길이를 넘으면 분리 전에 413을 반환합니다."""
+        import struct
+
+        # 헤더만 있는 2시간 길이 WAV (실제 데이터 없이 헤더로 판정)
+        data_size = 44100 * 4 * 7200
+        header = (
+            b"RIFF" + struct.pack("<I", 36 + data_size) + b"WAVE"
+            + b"fmt " + struct.pack("<IHHIIHH", 16, 1, 2, 44100, 44100 * 4, 4, 16)
+            + b"data" + struct.pack("<I", data_size)
+        )
+        audio_file = tmp_path / "long.wav"
+        audio_file.write_bytes(header + b"\x00" * 1000)
+
+        with patch(
+            "app.services.separation_service.SeparationService.run_task",
+            new_callable=AsyncMock,
+        ) as mock_run:
+            with open(audio_file, "rb") as f:
+                response = await async_client.post(
+                    "/api/v1/separate",
+                    files={"file": ("long.wav", f, "audio/wav")},
+                )
+
+        assert response.status_code == 413
+        assert "너무 깁니다" in response.json()["detail"]
+        mock_run.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_separate_over_memory_budget_returns_413(
+        self,
+        async_client: AsyncClient,
+        tmp_path: Path,
+    ) -> None:
+        """예상 최대 메모리가 메모리 예산을 넘으면 413을 반환합니다."""
+        import struct
+
+        data_size = 44100 * 4 * 600
+        header = (
+            b"RIFF" + struct.pack("<I", 36 + data_size) + b"WAVE"
+            + b"fmt " + struct.pack("<IHHIIHH", 16, 1, 2, 44100, 44100 * 4, 4, 16)
+            + b"data" + struct.pack("<I", data_size)
+        )
+        audio_file = tmp_path / "song.wav"
+        audio_file.write_bytes(header + b"\x00" * 1000)
+
+        with patch(
+            "app.services.separation_service.SeparationService.memory_budget_bytes",
+            return_value=512 * 1024 * 1024,
+        ):
+            with open(audio_file, "rb") as f:
+                response = await async_client.post(
+                    "/api/v1/separate",
+                    files={"file": ("song.wav", f, "audio/wav")},
+                )
+
+        assert response.status_code == 413
+        assert "메모리" in response.json()["detail"]
+
 
 class TestProgressEndpoint:
     """GET /api/v1/separate/{task_id}/progress 테스트."""
@@ -130,6 +268,7 @@ class TestProgressEndpoint:
         task_id = separation_service.create_task()
         separation_service._tasks[task_id].status = "completed"
         separation_service._tasks[task_id].progress = 100.0
+        separation_service._tasks[task_id].file_hash = "ab" * 32
         separation_service._tasks[task_id].stems = {
             "vocals": Path("/tmp/vocals.wav"),
         }
@@ -141,6 +280,53 @@ class TestProgressEndpoint:
         assert response.status_code == 200
         body = response.text
         assert "completed" in body
+        assert f"/api/v1/stems/{'ab' * 32}/htdemucs/vocals" in body
+
+
+class TestCancelEndpoint:
+    """DELETE /api/v1/separate/{task_id} 테스트."""
+
+    @pytest.mark.asyncio
+    async def test_cancel_unknown_task_returns_404(
+        self,
+        async_client: AsyncClient,
+    ) -> None:
+        """존재하지 않는 태스크 취소 시 404를 반환합니다."""
+        response = await async_client.delete("/api/v1/separate/nonexistent-task-id")
+        assert response.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_cancel_processing_task(
+        self,
+        async_client: AsyncClient,
+    ) -> None:
+        """진행 중인 태스크를 취소하면 cancelled 상태가 됩니다."""
+        from app.services.separation_service import separation_service
+
+        task_id = separation_service.create_task()
+        separation_service._tasks[task_id].status = "processing"
+
+        response = await async_client.delete(f"/api/v1/separate/{task_id}")
+        assert response.status_code == 200
+        assert response.json()["status"] == "cancelled"
+        assert separation_service.get_task(task_id).status == "cancelled"
+
+        progress = await async_client.get(f"/api/v1/separate/{task_id}/progress")
+        assert "cancelled" in progress.text
+
+    @pytest.mark.asyncio
+    async def test_cancel_completed_task_returns_409(
+        self,
+        async_client: AsyncClient,
+    ) -> None:
+        """이미 완료된 태스크 취소 시 409를 반환합니다."""
+        from app.services.separation_service import separation_service
+
+        task_id = separation_service.create_task()
+        separation_service._tasks[task_id].status = "completed"
+
+        response = await async_client.delete(f"/api/v1/separate/{task_id}")
+        assert response.status_code == 409
 
 
 class TestStemDownloadEndpoint:
@@ -215,3 +401,82 @@ class TestStemDownloadEndpoint:
         )
         assert response.status_code == 200
         assert "audio/wav" in response.headers.get("content-type", "")
+
+    @pytest.mark.asyncio
+    async def test_download_stem_conditional_and_range(
+        self,
+        async_client: AsyncClient,
+        tmp_path: Path,
+    ) -> None:
+        """ETag 재검증(304), 단일/여러 구간 Range, 장기 캐싱 헤더를 확인합니다."""
+        from app.services.separation_service import separation_service
+
+        stem_file = tmp_path / "drums.wav"
+        content = bytes(range(256)) * 40
+        stem_file.write_bytes(content)
+
+        task_id = separation_service.create_task()
+        separation_service._tasks[task_id].status = "completed"
+        separation_service._tasks[task_id].quality = "full"
+        separation_service._tasks[task_id].stems = {"drums": stem_file}
+        url = f"/api/v1/separate/{task_id}/stems/drums"
+
+        response = await async_client.get(url)
+        etag = response.headers["etag"]
+        assert "immutable" in response.headers["cache-control"]
+        assert response.headers["accept-ranges"] == "bytes"
+
+        response = await async_client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+
+        response = await async_client.get(url, headers={"Range": "bytes=100-199"})
+        assert response.status_code == 206
+        assert response.headers["content-range"] == f"bytes 100-199/{len(content)}"
+        assert response.content == content[100:200]
+
+        response = await async_client.get(url, headers={"Range": "bytes=0-9,-10"})
+        assert response.status_code == 206
+        assert response.headers["content-type"].startswith("multipart/byteranges")
+        assert int(response.headers["content-length"]) == len(response.content)
+        assert content[:10] in response.content
+        assert content[-10:] in response.content
+
+        response = await async_client.get(url, headers={"Range": f"bytes={len(content)}-"})
+        assert response.status_code == 416
+
+
+class TestDownloadAllStemsEndpoint:
+    """GET /api/v1/separate/{task_id}/stems 테스트."""
+
+    @pytest.mark.asyncio
+    async def test_download_all_returns_stored_zip(
+        self,
+        async_client: AsyncClient,
+        tmp_path: Path,
+    ) -> None:
+        """모든 스템을 압축 없는 ZIP으로 Content-Length와 함께 반환합니다."""
+        import io
+        import zipfile
+
+        from app.services.separation_service import separation_service
+
+        stems = {}
+        for i, name in enumerate(("vocals", "drums")):
+            stem_file = tmp_path / f"{name}.wav"
+            stem_file.write_bytes(b"RIFF" + bytes([i]) * 5000)
+            stems[name] = stem_file
+
+        task_id = separation_service.create_task()
+        separation_service._tasks[task_id].status = "completed"
+        separation_service._tasks[task_id].stems = stems
+
+        response = await async_client.get(f"/api/v1/separate/{task_id}/stems")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/zip"
+        assert int(response.headers["content-length"]) == len(response.content)
+        with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+            assert archive.testzip() is None
+            assert archive.read("drums.wav") == stems["drums"].read_bytes()
+            assert all(info.compress_type == zipfile.ZIP_STORED for info in archive.infolist())
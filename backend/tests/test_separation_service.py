@@ -5,13 +5,21 @@ from __future__ import annotations
 import asyncio
 import hashlib
 import tempfile
+import wave
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 import pytest_asyncio
 
-from app.services.separation_service import SeparationService, SeparationTask
+from app.services.separation_service import (
+    STEMS_COMPLETE_NAME,
+    SeparationService,
+    SeparationTask,
+    estimate_peak_memory_bytes,
+)
+from app.services.stem_mixdown import render_mixdown
+from app.services.stem_pack import build_stem_pack
 
 
 @pytest.fixture
@@ -51,14 +59,14 @@ class TestSeparationServiceInit:
         service = SeparationService(cache_dir=str(stems_cache_dir))
         assert service.cache_dir == stems_cache_dir
 
-    def test_default_semaphore_limit(self, service: SeparationService) -> None:
-        """기본 세마포어 제한이 2인지 확인합니다."""
-        assert service._semaphore._value == 2
+    def test_default_concurrency_limit(self, service: SeparationService) -> None:
+        """기본 동시 처리 제한이 2인지 확인합니다."""
+        assert service.scheduler.limit == 2
 
-    def test_custom_semaphore_limit(self, stems_cache_dir: Path) -> None:
-        """사용자 정의 세마포어 제한을 설정할 수 있는지 확인합니다."""
+    def test_custom_concurrency_limit(self, stems_cache_dir: Path) -> None:
+        """사용자 정의 동시 처리 제한을 설정할 수 있는지 확인합니다."""
         service = SeparationService(cache_dir=str(stems_cache_dir), max_concurrent=1)
-        assert service._semaphore._value == 1
+        assert service.scheduler.limit == 1
 
 
 class TestCreateTask:
@@ -85,6 +93,41 @@ class TestCreateTask:
         assert task_id_1 != task_id_2
         assert len(service._tasks) == 2
 
+    def test_create_task_keeps_probed_duration(self, service: SeparationService) -> None:
+        """업로드 중 조회한 길이가 태스크에 기록되는지 확인합니다."""
+        task_id = service.create_task(client_id="1.2.3.4", duration_seconds=180.0)
+        task = service.get_task(task_id)
+        assert task is not None
+        assert task.duration_seconds == 180.0
+
+
+class TestMemoryEstimate:
+    """작업별 예상 최대 메모리와 메모리 예산 테스트."""
+
+    def test_estimate_grows_with_duration_and_workers(self) -> None:
+        """길이와 세그먼트 워커 수가 늘면 추정치도 늘어나는지 확인합니다."""
+        short = estimate_peak_memory_bytes(60.0)
+        long = estimate_peak_memory_bytes(600.0)
+        parallel = estimate_peak_memory_bytes(60.0, workers=4)
+        assert short < long
+        assert short < parallel
+        assert estimate_peak_memory_bytes(None) == estimate_peak_memory_bytes(240.0)
+
+    def test_configured_budget(self, service: SeparationService) -> None:
+        """SEPARATION_MEMORY_BUDGET_MB가 설정되면 그 값을 예산으로 쓰는지 확인합니다."""
+        service.memory_budget_mb = 2048
+        assert service.memory_budget_bytes() == 2048 * 1024 * 1024
+
+    def test_auto_budget_keeps_reserve(self, service: SeparationService) -> None:
+        """자동 예산은 메모리 한도에서 최소 여유 메모리를 뺀 값인지 확인합니다."""
+        service.memory_budget_mb = 0
+        service.memory_reserve_bytes = 1024
+        with patch(
+            "app.services.separation_service.memory_limit_bytes",
+            return_value=8192,
+        ):
+            assert service.memory_budget_bytes() == 7168
+
 
 class TestFileHash:
     """파일 해시 테스트."""
@@ -118,6 +161,17 @@ class TestGetCachedStems:
         result = service._get_cached_stems("nonexistent_hash")
         assert result is None
 
+    def test_unpublished_stems_return_none(
+        self, service: SeparationService, stems_cache_dir: Path
+    ) -> None:
+        """완료 표시가 없는 스템은 캐시로 보지 않는지 확인합니다."""
+        _write_wav_stems(stems_cache_dir / "abc123")
+        (stems_cache_dir / "abc123" / STEMS_COMPLETE_NAME).unlink()
+
+        assert service._get_cached_stems("abc123") is None
+        assert service.complete_cached_stems("abc123") is True
+        assert service._get_cached_stems("abc123") is not None
+
     def test_existing_cache_returns_stems(
         self, service: SeparationService, stems_cache_dir: Path
     ) -> None:
@@ -130,6 +184,7 @@ class TestGetCachedStems:
         (hash_dir / "drums.wav").write_bytes(b"drums")
         (hash_dir / "bass.wav").write_bytes(b"bass")
         (hash_dir / "other.wav").write_bytes(b"other")
+        (hash_dir / STEMS_COMPLETE_NAME).touch()
 
         result = service._get_cached_stems(test_hash)
         assert result is not None
@@ -226,3 +281,483 @@ class TestCacheDirectoryCreation:
         # 디렉터리 생성
         cache_path.mkdir(parents=True, exist_ok=True)
         assert cache_path.exists()
+
+
+class TestPreviewSeparation:
+    """미리보기 후 전체 품질 교체 테스트."""
+
+    @pytest.mark.asyncio
+    async def test_preview_replaced_by_full_stems(
+        self, service: SeparationService, sample_audio_file: Path, tmp_path: Path
+    ) -> None:
+        """미리보기 스템이 게시된 뒤 전체 품질 스템으로 교체되는지 확인합니다."""
+        service.preview_enabled = True
+        task_id = service.create_task()
+        published: list[str | None] = []
+
+        preview_file = tmp_path / "preview.wav"
+        preview_file.write_bytes(b"preview")
+
+        def _fake_preview(file_path, cache_path, tid):
+            return {"vocals": preview_file}
+
+        def _fake_full(file_path, cache_path, tid):
+            published.append(service.get_task(tid).quality)
+            stems = {}
+            for name in ("vocals", "drums", "bass", "other"):
+                stem = cache_path / f"{name}.wav"
+                stem.write_bytes(b"full")
+                stems[name] = stem
+            return stems
+
+        with (
+            patch.object(service, "_run_preview_separation", side_effect=_fake_preview),
+            patch.object(service, "_run_mock_separation", side_effect=_fake_full),
+            patch.object(service, "_run_demucs_separation", side_effect=_fake_full),
+        ):
+            await service.separate(sample_audio_file, task_id)
+
+        task = service.get_task(task_id)
+        assert published == ["preview"]  # 전체 분리 중에는 미리보기 품질
+        assert task.quality == "full"
+        assert task.preview_stems is None
+        assert task.stems is not None
+
+
+class TestCancellation:
+    """분리 작업 취소 테스트."""
+
+    @pytest.mark.asyncio
+    async def test_cancel_running_task_frees_slot(
+        self, stems_cache_dir: Path, tmp_path: Path
+    ) -> None:
+        """실행 중 작업을 취소하면 슬롯이 즉시 반납되고 대기 작업이 시작되는지 확인합니다."""
+        import threading
+
+        service = SeparationService(cache_dir=str(stems_cache_dir), max_concurrent=1)
+        release = threading.Event()
+        started: list[str] = []
+
+        def _blocking(file_path, cache_path, task_id):
+            started.append(task_id)
+            release.wait(5)
+            service._check_cancelled(task_id)
+            return {}
+
+        uploads = []
+        for name in ("a.mp3", "b.mp3"):
+            upload = tmp_path / name
+            upload.write_bytes(name.encode() * 100)
+            uploads.append(upload)
+
+        first, second = service.create_task(), service.create_task()
+        with (
+            patch.object(service, "_run_mock_separation", side_effect=_blocking),
+            patch.object(service, "_run_demucs_separation", side_effect=_blocking),
+        ):
+            # 첫 작업이 슬롯을 잡은 뒤 두 번째 작업을 넣어 순서를 고정
+            runners = [asyncio.create_task(service.run_task(str(uploads[0]), first))]
+            for _ in range(100):
+                if started:
+                    break
+                await asyncio.sleep(0.01)
+            runners.append(asyncio.create_task(service.run_task(str(uploads[1]), second)))
+            for _ in range(100):
+                if service.get_task(second).status == "queued":
+                    break
+                await asyncio.sleep(0.01)
+            assert started == [first]
+
+            assert service.cancel_task(first) is True
+            for _ in range(100):
+                if len(started) == 2:
+                    break
+                await asyncio.sleep(0.01)
+
+            assert started == [first, second]  # 첫 작업 스레드가 끝나기 전에 슬롯 반납
+            assert service.get_task(first).status == "cancelled"
+            release.set()
+            await asyncio.gather(*runners)
+
+        assert service.get_task(first).status == "cancelled"
+        assert not uploads[0].exists()
+
+    def test_cancel_keeps_cache_shared_with_live_task(
+        self, service: SeparationService, stems_cache_dir: Path
+    ) -> None:
+        """같은 해시로 진행 중인 태스크가 있으면 취소해도 캐시를 지우지 않는지 확인합니다."""
+        cache_path = stems_cache_dir / "shared_hash"
+        cache_path.mkdir()
+        (cache_path / "vocals_preview.wav").write_bytes(b"RIFF")
+        cancelled, live = service.create_task(), service.create_task()
+        for task_id, status in ((cancelled, "cancelled"), (live, "processing")):
+            service._tasks[task_id].file_hash = "shared_hash"
+            service._tasks[task_id].status = status
+
+        service._cleanup_partial(cancelled)
+        assert (cache_path / "vocals_preview.wav").exists()
+
+        service._tasks[live].status = "cancelled"
+        service._cleanup_partial(live)
+        assert not cache_path.exists()
+
+    @pytest.mark.asyncio
+    async def test_cancel_queued_task_leaves_queue(
+        self, stems_cache_dir: Path, tmp_path: Path
+    ) -> None:
+        """대기 중 작업을 취소하면 대기열에서 빠지는지 확인합니다."""
+        import threading
+
+        service = SeparationService(cache_dir=str(stems_cache_dir), max_concurrent=1)
+        release = threading.Event()
+
+        def _blocking(file_path, cache_path, task_id):
+            release.wait(5)
+            return {}
+
+        uploads = []
+        for name in ("a.mp3", "b.mp3"):
+            upload = tmp_path / name
+            upload.write_bytes(name.encode() * 100)
+            uploads.append(upload)
+
+        first, second = service.create_task(), service.create_task()
+        with patch.object(service, "_run_mock_separation", side_effect=_blocking), patch.object(
+            service, "_run_demucs_separation", side_effect=_blocking
+        ):
+            runners = [
+                asyncio.create_task(service.run_task(str(uploads[0]), first)),
+                asyncio.create_task(service.run_task(str(uploads[1]), second)),
+            ]
+            for _ in range(100):
+                if service.scheduler.waiting == 1:
+                    break
+                await asyncio.sleep(0.01)
+
+            assert service.cancel_task(second) is True
+            await asyncio.sleep(0.01)
+            assert service.scheduler.waiting == 0
+            release.set()
+            await asyncio.gather(*runners)
+
+        assert service.get_task(second).status == "cancelled"
+        assert service.get_task(first).status != "cancelled"
+
+    def test_cancel_finished_task_returns_false(self, service: SeparationService) -> None:
+        """이미 끝난 태스크는 취소되지 않는지 확인합니다."""
+        task_id = service.create_task()
+        service._update_progress(task_id, 100.0, "completed")
+        assert service.cancel_task(task_id) is False
+        assert service.cancel_task("missing") is False
+
+    def test_progress_does_not_revive_cancelled_task(self, service: SeparationService) -> None:
+        """취소 뒤 추론 스레드의 진행률 보고가 상태를 되돌리지 않는지 확인합니다."""
+        task_id = service.create_task()
+        service._update_progress(task_id, 40.0, "processing")
+        service._tasks[task_id].status = "cancelled"
+        service._update_progress(task_id, 60.0, "processing")
+        assert service.get_task(task_id).status == "cancelled"
+
+
+class TestTaskRestore:
+    """영속 저장소 기반 재시작 복구 테스트."""
+
+    def _write_stems(self, cache_dir: Path, file_hash: str) -> None:
+        stem_dir = cache_dir / file_hash
+        stem_dir.mkdir(parents=True)
+        for name in ("vocals", "drums", "bass", "other"):
+            (stem_dir / f"{name}.wav").write_bytes(b"stem")
+        (stem_dir / STEMS_COMPLETE_NAME).touch()
+
+    def test_restore_resolves_completed_from_cache(
+        self, stems_cache_dir: Path, tmp_path: Path
+    ) -> None:
+        """재시작 후 완료 태스크가 캐시에서 복원되는지 확인합니다."""
+        from app.services.task_store import TaskStore
+
+        store = TaskStore(tmp_path / "tasks.db")
+        before = SeparationService(cache_dir=str(stems_cache_dir), task_store=store)
+        task_id = before.create_task()
+        before.get_task(task_id).file_hash = "abc"
+        before._update_progress(task_id, 100.0, "completed")
+        self._write_stems(stems_cache_dir, "abc")
+
+        after = SeparationService(cache_dir=str(stems_cache_dir), task_store=store)
+        assert after.restore_tasks() == []
+        task = after.get_task(task_id)
+        assert task.status == "completed"
+        assert set(task.stems) == {"vocals", "drums", "bass", "other"}
+
+    def test_restore_requeues_interrupted_task(
+        self, stems_cache_dir: Path, sample_audio_file: Path, tmp_path: Path
+    ) -> None:
+        """중단된 태스크가 입력 파일과 함께 재실행 대상으로 반환되는지 확인합니다."""
+        from app.services.task_store import TaskStore
+
+        store = TaskStore(tmp_path / "tasks.db")
+        before = SeparationService(cache_dir=str(stems_cache_dir), task_store=store)
+        task_id = before.create_task()
+        before.get_task(task_id).input_path = str(sample_audio_file)
+        before._update_progress(task_id, 40.0, "processing")
+
+        after = SeparationService(cache_dir=str(stems_cache_dir), task_store=store)
+        assert after.restore_tasks() == [(task_id, str(sample_audio_file))]
+        assert after.get_task(task_id).status == "queued"
+
+    def test_restore_fails_task_without_input(
+        self, stems_cache_dir: Path, tmp_path: Path
+    ) -> None:
+        """입력 파일이 없는 중단 태스크는 실패로 복원되는지 확인합니다."""
+        from app.services.task_store import TaskStore
+
+        store = TaskStore(tmp_path / "tasks.db")
+        before = SeparationService(cache_dir=str(stems_cache_dir), task_store=store)
+        task_id = before.create_task()
+        before._update_progress(task_id, 40.0, "processing")
+
+        after = SeparationService(cache_dir=str(stems_cache_dir), task_store=store)
+        assert after.restore_tasks() == []
+        task = after.get_task(task_id)
+        assert task.status == "failed"
+        assert task.error
+
+
+def _write_wav_stems(hash_dir: Path) -> None:
+    """캐시 디렉터리에 스테레오 16-bit 스템 세트를 만듭니다."""
+    hash_dir.mkdir()
+    for stem_name in ("vocals", "drums", "bass", "other"):
+        with wave.open(str(hash_dir / f"{stem_name}.wav"), "wb") as wav_file:
+            wav_file.setnchannels(2)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(44100)
+            wav_file.writeframes(b"\x01\x00" * 2 * 100)
+    (hash_dir / STEMS_COMPLETE_NAME).touch()
+
+
+class TestPackedStems:
+    """스템 묶음 테스트."""
+
+    @pytest.mark.asyncio
+    async def test_no_cache_returns_none(self, service: SeparationService) -> None:
+        """캐시된 스템이 없으면 None을 반환하는지 확인합니다."""
+        assert await service.packed_stems("nonexistent_hash") is None
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_build_once(
+        self, service: SeparationService, stems_cache_dir: Path
+    ) -> None:
+        """동시 요청이 묶음을 한 번만 만들고 캐시에 남기는지 확인합니다."""
+        _write_wav_stems(stems_cache_dir / "abc123")
+
+        with patch(
+            "app.services.separation_service.build_stem_pack",
+            wraps=build_stem_pack,
+        ) as build:
+            results = await asyncio.gather(
+                *(service.packed_stems("abc123") for _ in range(3))
+            )
+            assert await service.packed_stems("abc123") == results[0]
+
+        assert build.call_count == 1
+        assert len(set(results)) == 1
+        assert results[0].read_bytes()[22] == 8  # 채널 수
+        assert service._build_locks == {}
+
+
+class TestWaveformPeaks:
+    """파형 피크 테스트."""
+
+    @pytest.mark.asyncio
+    async def test_stem_peaks_built_next_to_stem(
+        self, service: SeparationService, stems_cache_dir: Path
+    ) -> None:
+        """스템 피크를 처음 요청할 때 스템 옆에 만드는지 확인합니다."""
+        _write_wav_stems(stems_cache_dir / "abc123")
+
+        peaks = await service.stem_peaks("abc123", "drums")
+
+        assert peaks == stems_cache_dir / "abc123" / "drums.peaks"
+        assert peaks.read_bytes().startswith(b"PEAK")
+        assert await service.stem_peaks("abc123", "piano") is None
+        assert await service.stem_peaks("nonexistent_hash", "drums") is None
+
+    @pytest.mark.asyncio
+    async def test_separate_builds_original_peaks(
+        self, service: SeparationService, sample_audio_file: Path
+    ) -> None:
+        """분리 전에 입력 파일의 원본 피크를 만드는지 확인합니다."""
+        task_id = service.create_task()
+
+        def fake_build(path: Path, output: Path) -> Path:
+            output.write_bytes(b"PEAK")
+            return output
+
+        with patch(
+            "app.services.separation_service.build_decoded_peaks",
+            side_effect=fake_build,
+        ) as build:
+            await service.separate(sample_audio_file, task_id)
+
+        build.assert_called_once()
+        assert service.original_peaks(service.get_task(task_id).file_hash) is not None
+
+    @pytest.mark.asyncio
+    async def test_original_peaks_failure_does_not_fail_separation(
+        self, service: SeparationService, sample_audio_file: Path
+    ) -> None:
+        """원본 피크 생성이 실패해도 분리는 완료되는지 확인합니다."""
+        task_id = service.create_task()
+
+        with patch(
+            "app.services.separation_service.build_decoded_peaks",
+            side_effect=RuntimeError("decode failed"),
+        ):
+            await service.separate(sample_audio_file, task_id)
+
+        task = service.get_task(task_id)
+        assert task.status == "completed"
+        assert service.original_peaks(task.file_hash) is None
+
+
+class TestStemAnalysis:
+    """스템 분석 테스트."""
+
+    @pytest.mark.asyncio
+    async def test_separate_analyzes_stems(
+        self, service: SeparationService, sample_audio_file: Path
+    ) -> None:
+        """분리 직후 스템을 분석하고 무음 스템을 알 수 있는지 확인합니다."""
+        task_id = service.create_task()
+
+        await service.separate(sample_audio_file, task_id)
+
+        file_hash = service.get_task(task_id).file_hash
+        # 폴백 분리는 무음 스템을 만듦 (모두 무음이면 마커로 바꾸지 않음)
+        assert service.silent_stems(file_hash) == ["vocals", "drums", "bass", "other"]
+        assert all(path.stat().st_size > 44 for path in service.cached_stems(file_hash).values())
+
+    @pytest.mark.asyncio
+    async def test_separate_publishes_after_analysis(
+        self, service: SeparationService, sample_audio_file: Path, stems_cache_dir: Path
+    ) -> None:
+        """스템과 분석 결과를 작업 디렉터리에서 옮긴 뒤 완료 표시를 남기는지 확인합니다."""
+        task_id = service.create_task()
+
+        await service.separate(sample_audio_file, task_id)
+
+        cache_path = stems_cache_dir / service.get_task(task_id).file_hash
+        assert (cache_path / STEMS_COMPLETE_NAME).exists()
+        assert (cache_path / "analysis.json").exists()
+        assert not list(cache_path.glob(".staging-*"))
+
+    @pytest.mark.asyncio
+    async def test_analysis_built_lazily_for_cached_stems(
+        self, service: SeparationService, stems_cache_dir: Path
+    ) -> None:
+        """분석 없이 받은 스템은 처음 요청될 때 분석하는지 확인합니다."""
+        _write_wav_stems(stems_cache_dir / "abc123")
+        assert service.silent_stems("abc123") == []
+
+        analysis = await service.stem_analysis("abc123")
+
+        assert analysis is not None
+        assert set(analysis["stems"]) == {"vocals", "drums", "bass", "other"}
+        assert await service.stem_analysis("nonexistent_hash") is None
+
+
+class TestMixdown:
+    """프리셋 믹스 캐시 테스트."""
+
+    @pytest.mark.asyncio
+    async def test_preset_mix_cached_once(
+        self, service: SeparationService, stems_cache_dir: Path
+    ) -> None:
+        """프리셋 믹스를 캐시에 한 번 만들고 재사용하는지 확인합니다."""
+        _write_wav_stems(stems_cache_dir / "abc123")
+
+        with patch(
+            "app.services.separation_service.render_mixdown",
+            wraps=render_mixdown,
+        ) as render:
+            first = await service.mixdown("abc123", "instrumental")
+            second = await service.mixdown("abc123", "instrumental")
+
+        assert first == second == stems_cache_dir / "abc123" / "mix_instrumental.wav"
+        assert render.call_count == 1
+        assert await service.mixdown("nonexistent_hash", "instrumental") is None
+
+
+class TestStretch:
+    """템포/피치 변환 캐시 테스트."""
+
+    @pytest.mark.asyncio
+    async def test_stretch_cached_per_parameters(
+        self, service: SeparationService, stems_cache_dir: Path
+    ) -> None:
+        """(원본, 템포, 반음, 구간)별로 한 번만 렌더링하는지 확인합니다."""
+        _write_wav_stems(stems_cache_dir / "abc123")
+
+        def fake_render(source: Path, output: Path, *args: object) -> Path:
+            output.write_bytes(source.read_bytes())
+            return output
+
+        with patch(
+            "app.services.separation_service.render_stretch", side_effect=fake_render
+        ) as render:
+            first = await service.stretch("abc123", "vocals", 0.75, 0.0)
+            second = await service.stretch("abc123", "vocals", 0.75, 0.0)
+            region = await service.stretch("abc123", "vocals", 0.75, 0.0, 1.0, 2.5)
+            mix = await service.stretch("abc123", "mix_instrumental", 1.0, -2.0)
+
+        stretch_dir = stems_cache_dir / "abc123" / "stretch"
+        assert first == second == stretch_dir / "vocals_t0.750_p+0.00.wav"
+        assert region == stretch_dir / "vocals_t0.750_p+0.00_r1000-2500.wav"
+        assert mix == stretch_dir / "mix_instrumental_t1.000_p-2.00.wav"
+        assert render.call_count == 3
+        assert render.call_args.args[0] == stems_cache_dir / "abc123" / "mix_instrumental.wav"
+        assert await service.stretch("nonexistent_hash", "vocals", 0.5, 0.0) is None
+
+
+class TestStemSegments:
+    """분할 스트리밍 매니페스트 캐시 테스트."""
+
+    @pytest.mark.asyncio
+    async def test_segments_built_once(
+        self, service: SeparationService, stems_cache_dir: Path
+    ) -> None:
+        """세그먼트를 한 번만 인코딩하고 만든 세그먼트만 제공하는지 확인합니다."""
+        _write_wav_stems(stems_cache_dir / "abc123")
+
+        def fake_build(source: Path, output_dir: Path) -> Path:
+            output_dir.mkdir()
+            (output_dir / "00000.flac").write_bytes(b"fLaC")
+            manifest = output_dir / "manifest.json"
+            manifest.write_text('{"version": 1, "segments": []}')
+            return manifest
+
+        with patch(
+            "app.services.separation_service.build_segments", side_effect=fake_build
+        ) as build:
+            first = await service.stem_segments("abc123", "vocals")
+            second = await service.stem_segments("abc123", "vocals")
+
+        assert first == second == {"version": 1, "segments": []}
+        assert build.call_count == 1
+        segment = service.stem_segment("abc123", "vocals", "00000.flac")
+        assert segment == stems_cache_dir / "abc123" / "segments" / "vocals" / "00000.flac"
+        assert service.stem_segment("abc123", "vocals", "manifest.json") is None
+        assert service.stem_segment("abc123", "vocals", "../vocals.wav") is None
+        assert await service.stem_segments("nonexistent_hash", "vocals") is None
+
+
+class TestEstimatedWait:
+    """진입 제어용 예상 대기 시간 테스트."""
+
+    @pytest.mark.asyncio
+    async def test_dispatch_mode_uses_node_queue(self, service: SeparationService) -> None:
+        """디스패처가 있으면 노드 대기열로, 정상 노드가 없으면 로컬 기준으로 추정합니다."""
+        service.dispatcher = MagicMock(estimated_wait=AsyncMock(return_value=420.0))
+        assert await service.estimated_wait_seconds() == 420.0
+
+        service.dispatcher.estimated_wait.return_value = None
+        assert await service.estimated_wait_seconds() == service.scheduler.estimated_wait()
@@ -0,0 +1,104 @@
+"""분리 후 스템 분석 테스트."""
+
+from __future__ import annotations
+
+import json
+import wave
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from app.services.stem_analysis import analyze_stem, analyze_stems, load_analysis
+
+SAMPLE_RATE = 44100
+
+
+def _write_stereo(path: Path, audio: np.ndarray) -> Path:
+    """(frames,) float 오디오를 양 채널이 같은 16-bit 스테레오 WAV로 저장합니다."""
+    samples = (np.clip(audio, -1.0, 1.0 - 1.0 / 32768.0) * 32768.0).astype("<i2")
+    with wave.open(str(path), "wb") as wav_file:
+        wav_file.setnchannels(2)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(SAMPLE_RATE)
+        wav_file.writeframes(np.repeat(samples, 2).tobytes())
+    return path
+
+
+def _sine(seconds: float, amplitude: float = 0.1, freq: float = 997.0) -> np.ndarray:
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return amplitude * np.sin(2 * np.pi * freq * t)
+
+
+class TestAnalyzeStem:
+    """analyze_stem 테스트."""
+
+    def test_sine_loudness(self, tmp_path: Path) -> None:
+        """-20 dBFS 997Hz 스테레오 사인파가 약 -20 LUFS로 측정되는지 확인합니다."""
+        result = analyze_stem(_write_stereo(tmp_path / "a.wav", _sine(5.0)))
+
+        assert result["integrated_lufs"] == pytest.approx(-20.0, abs=0.2)
+        assert result["peak_db"] == pytest.approx(-20.0, abs=0.1)
+        assert result["rms_db"] == pytest.approx(-23.0, abs=0.1)
+        assert result["silent"] is False
+        assert len(result["envelope_db"]) == 10  # 0.5초 간격
+        assert result["frames"] == 5 * SAMPLE_RATE
+
+    def test_silent_spans(self, tmp_path: Path) -> None:
+        """1초 이상 이어지는 무음 구간만 보고하는지 확인합니다."""
+        audio = _sine(6.0)
+        audio[SAMPLE_RATE : 3 * SAMPLE_RATE] = 0.0  # 2초 무음
+        audio[4 * SAMPLE_RATE : int(4.5 * SAMPLE_RATE)] = 0.0  # 0.5초 무음 (무시)
+
+        result = analyze_stem(_write_stereo(tmp_path / "a.wav", audio))
+
+        assert result["silent_spans"] == [[1.0, 3.0]]
+
+    def test_silent_stem(self, tmp_path: Path) -> None:
+        """기준보다 조용한 스템을 무음으로 판정하는지 확인합니다."""
+        result = analyze_stem(_write_stereo(tmp_path / "a.wav", _sine(2.0, amplitude=1e-4)))
+
+        assert result["silent"] is True
+        assert result["integrated_lufs"] is None  # 절대 게이트 (-70 LUFS) 미만
+
+
+class TestAnalyzeStems:
+    """analyze_stems 테스트."""
+
+    def test_silent_stem_replaced_with_marker(self, tmp_path: Path) -> None:
+        """무음 스템을 프레임 없는 WAV로 바꾸고 원래 길이를 분석에 남기는지 확인합니다."""
+        stems = {
+            "vocals": _write_stereo(tmp_path / "vocals.wav", np.zeros(SAMPLE_RATE * 2)),
+            "drums": _write_stereo(tmp_path / "drums.wav", _sine(2.0)),
+        }
+
+        analysis = analyze_stems(stems, tmp_path / "analysis.json", silent_markers=True)
+
+        assert analysis["stems"]["vocals"]["silent"] is True
+        assert analysis["stems"]["vocals"]["frames"] == SAMPLE_RATE * 2
+        with wave.open(str(stems["vocals"]), "rb") as wav_file:
+            assert wav_file.getnframes() == 0
+            assert wav_file.getnchannels() == 2
+        with wave.open(str(stems["drums"]), "rb") as wav_file:
+            assert wav_file.getnframes() == SAMPLE_RATE * 2
+        assert load_analysis(tmp_path / "analysis.json") == analysis
+
+    def test_all_silent_stems_are_kept(self, tmp_path: Path) -> None:
+        """모든 스템이 무음이면 길이를 잃지 않도록 마커로 바꾸지 않는지 확인합니다."""
+        stems = {
+            "vocals": _write_stereo(tmp_path / "vocals.wav", np.zeros(SAMPLE_RATE)),
+            "drums": _write_stereo(tmp_path / "drums.wav", np.zeros(SAMPLE_RATE)),
+        }
+
+        analyze_stems(stems, tmp_path / "analysis.json", silent_markers=True)
+
+        with wave.open(str(stems["vocals"]), "rb") as wav_file:
+            assert wav_file.getnframes() == SAMPLE_RATE
+
+    def test_load_analysis_rejects_other_version(self, tmp_path: Path) -> None:
+        """형식 버전이 다르거나 깨진 파일은 None을 반환하는지 확인합니다."""
+        path = tmp_path / "analysis.json"
+        path.write_text(json.dumps({"version": 0, "stems": {}}))
+        assert load_analysis(path) is None
+        path.write_text("{")
+        assert load_analysis(path) is None
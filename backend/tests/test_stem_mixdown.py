@@ -0,0 +1,108 @@
+"""서버 측 스템 믹스다운 테스트."""
+
+from __future__ import annotations
+
+import io
+import wave
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from app.services.stem_mixdown import (
+    MIX_PRESETS,
+    iter_mixdown_opus,
+    iter_mixdown_pcm,
+    iter_mixdown_wav,
+    mixdown_wav_size,
+    preset_for_gains,
+    render_mixdown,
+    resolve_gains,
+)
+
+STEM_NAMES = ["vocals", "drums", "bass", "other"]
+
+
+def _write_stereo(path: Path, value: int, frames: int) -> Path:
+    """모든 샘플이 value인 16-bit 스테레오 WAV를 만듭니다."""
+    with wave.open(str(path), "wb") as wav_file:
+        wav_file.setnchannels(2)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(44100)
+        wav_file.writeframes(np.full(frames * 2, value, dtype="<i2").tobytes())
+    return path
+
+
+@pytest.fixture
+def stems(tmp_path: Path) -> dict[str, Path]:
+    return {
+        "vocals": _write_stereo(tmp_path / "vocals.wav", 1000, 100),
+        "drums": _write_stereo(tmp_path / "drums.wav", 200, 100),
+        "bass": _write_stereo(tmp_path / "bass.wav", 30, 100),
+        "other": _write_stereo(tmp_path / "other.wav", 0, 0),  # 무음 마커
+    }
+
+
+class TestGains:
+    """resolve_gains / preset_for_gains 테스트."""
+
+    def test_unspecified_stems_default_to_unity(self) -> None:
+        """지정하지 않은 스템의 게인은 1.0인지 확인합니다."""
+        gains = resolve_gains(STEM_NAMES, MIX_PRESETS["instrumental"])
+        assert gains == {"vocals": 0.0, "drums": 1.0, "bass": 1.0, "other": 1.0}
+
+    def test_explicit_gains_match_preset(self) -> None:
+        """프리셋과 같은 게인 조합은 프리셋 캐시를 쓰도록 찾는지 확인합니다."""
+        assert preset_for_gains(resolve_gains(STEM_NAMES, {"drums": 0})) == "no_drums"
+        assert preset_for_gains(resolve_gains(STEM_NAMES, {"drums": 0.5})) is None
+
+
+class TestMixdown:
+    """믹스 생성 테스트."""
+
+    def test_applies_gains_and_pads_short_stems(self, stems: dict[str, Path]) -> None:
+        """게인을 적용해 합하고 짧은 스템은 무음으로 보는지 확인합니다."""
+        gains = {"vocals": 0.0, "drums": 1.0, "bass": 2.0, "other": 1.0}
+
+        mixed = np.frombuffer(b"".join(iter_mixdown_pcm(stems, gains, chunk_frames=32)), "<i2")
+
+        assert len(mixed) == 100 * 2
+        assert set(mixed.tolist()) == {260}
+
+    def test_clips_to_16_bit(self, tmp_path: Path) -> None:
+        """합이 16-bit 범위를 넘으면 잘라내는지 확인합니다."""
+        loud = {
+            "a": _write_stereo(tmp_path / "a.wav", 30000, 10),
+            "b": _write_stereo(tmp_path / "b.wav", 30000, 10),
+        }
+
+        mixed = np.frombuffer(b"".join(iter_mixdown_pcm(loud, {"a": 1.0, "b": 1.0})), "<i2")
+
+        assert mixed.max() == 32767
+
+    def test_wav_stream_is_valid_and_size_matches(self, stems: dict[str, Path]) -> None:
+        """WAV 스트림이 wave로 읽히고 미리 계산한 크기와 같은지 확인합니다."""
+        gains = resolve_gains(STEM_NAMES, {})
+        data = b"".join(iter_mixdown_wav(stems, gains))
+
+        assert len(data) == mixdown_wav_size(stems)
+        with wave.open(io.BytesIO(data), "rb") as wav_file:
+            assert wav_file.getnframes() == 100
+            assert wav_file.getnchannels() == 2
+
+    def test_render_wav(self, stems: dict[str, Path], tmp_path: Path) -> None:
+        """믹스를 파일로 저장하는지 확인합니다."""
+        gains = resolve_gains(STEM_NAMES, MIX_PRESETS["instrumental"])
+        output = render_mixdown(stems, gains, tmp_path / "mix_instrumental.wav")
+
+        with wave.open(str(output), "rb") as wav_file:
+            samples = np.frombuffer(wav_file.readframes(100), "<i2")
+        assert set(samples.tolist()) == {230}
+
+    def test_opus_without_ffmpeg_raises(self, stems: dict[str, Path]) -> None:
+        """ffmpeg가 없으면 RuntimeError를 발생시키는지 확인합니다."""
+        with patch("subprocess.Popen", side_effect=FileNotFoundError), pytest.raises(
+            RuntimeError
+        ):
+            b"".join(iter_mixdown_opus(stems, resolve_gains(STEM_NAMES, {})))
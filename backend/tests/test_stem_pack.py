@@ -0,0 +1,75 @@
+"""멀티트랙 스템 묶음 생성 테스트."""
+
+from __future__ import annotations
+
+import struct
+import wave
+from array import array
+from pathlib import Path
+
+import pytest
+
+from app.services.stem_pack import build_stem_pack
+
+
+def _write_stereo(path: Path, frames: list[tuple[int, int]], sample_rate: int = 44100) -> Path:
+    with wave.open(str(path), "wb") as wav_file:
+        wav_file.setnchannels(2)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(b"".join(struct.pack("<hh", left, right) for left, right in frames))
+    return path
+
+
+def _read_samples(path: Path) -> tuple[int, int, array]:
+    """묶음 WAV의 (채널 수, 샘플 레이트, 16-bit 샘플)을 읽습니다."""
+    data = path.read_bytes()
+    assert data[:4] == b"RIFF" and data[8:12] == b"WAVE"
+    channels, sample_rate = struct.unpack_from("<HI", data, 22)
+    data_offset = data.index(b"data") + 8
+    assert struct.unpack_from("<I", data, data_offset - 4)[0] == len(data) - data_offset
+    return channels, sample_rate, array("h", data[data_offset:])
+
+
+class TestBuildStemPack:
+    """build_stem_pack 테스트."""
+
+    def test_interleaves_stems_as_channel_pairs(self, tmp_path: Path) -> None:
+        """k번째 스템의 L, R이 채널 2k, 2k+1에 놓이는지 확인합니다."""
+        stems = [
+            _write_stereo(tmp_path / f"{k}.wav", [(k * 100 + i, -(k * 100 + i)) for i in range(5)])
+            for k in range(4)
+        ]
+
+        channels, sample_rate, samples = _read_samples(
+            build_stem_pack(stems, tmp_path / "packed.wav")
+        )
+
+        assert (channels, sample_rate) == (8, 44100)
+        assert len(samples) == 5 * 8
+        frame = samples[2 * 8 : 3 * 8]
+        assert list(frame) == [2, -2, 102, -102, 202, -202, 302, -302]
+
+    def test_shorter_stem_is_padded_with_silence(self, tmp_path: Path) -> None:
+        """길이가 다른 스템은 뒤를 무음으로 채우는지 확인합니다."""
+        stems = [
+            _write_stereo(tmp_path / "long.wav", [(1, 1)] * 4),
+            _write_stereo(tmp_path / "short.wav", [(2, 2)] * 2),
+        ]
+
+        channels, _, samples = _read_samples(build_stem_pack(stems, tmp_path / "packed.wav"))
+
+        assert channels == 4
+        assert list(samples[-4:]) == [1, 1, 0, 0]
+        assert not list(tmp_path.glob(".*.tmp"))
+
+    def test_mismatched_sample_rate_raises(self, tmp_path: Path) -> None:
+        """샘플 레이트가 다르면 묶지 않는지 확인합니다."""
+        stems = [
+            _write_stereo(tmp_path / "a.wav", [(0, 0)], sample_rate=44100),
+            _write_stereo(tmp_path / "b.wav", [(0, 0)], sample_rate=48000),
+        ]
+
+        with pytest.raises(ValueError):
+            build_stem_pack(stems, tmp_path / "packed.wav")
+        assert not (tmp_path / "packed.wav").exists()
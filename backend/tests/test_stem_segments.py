@@ -0,0 +1,87 @@
+"""스템 분할 스트리밍 테스트."""
+
+from __future__ import annotations
+
+import subprocess
+import wave
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from app.services.stem_segments import (
+    SEGMENT_MANIFEST_NAME,
+    build_segments,
+    load_manifest,
+    parse_segment_list,
+)
+
+
+@pytest.fixture
+def stem(tmp_path: Path) -> Path:
+    """1초 길이 스테레오 16-bit 스템을 만듭니다."""
+    path = tmp_path / "vocals.wav"
+    with wave.open(str(path), "wb") as wav_file:
+        wav_file.setnchannels(2)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(44100)
+        wav_file.writeframes(b"\x00" * 4 * 44100)
+    return path
+
+
+def _fake_ffmpeg(command: list[str], **kwargs: object) -> subprocess.CompletedProcess[bytes]:
+    """segment 먹서처럼 세그먼트 두 개와 CSV 목록을 씁니다."""
+    output_dir = Path(command[-1]).parent
+    (output_dir / "00000.flac").write_bytes(b"fLaC0")
+    (output_dir / "00001.flac").write_bytes(b"fLaC1")
+    segment_list = Path(command[command.index("-segment_list") + 1])
+    segment_list.write_text("00000.flac,0.000000,0.600000\n00001.flac,0.600000,1.000000\n")
+    return subprocess.CompletedProcess(command, returncode=0, stdout=b"", stderr=b"")
+
+
+class TestSegmentList:
+    """ffmpeg 세그먼트 목록 파싱 테스트."""
+
+    def test_parse_segment_list(self) -> None:
+        """CSV 줄을 시작 시각과 길이로 변환합니다."""
+        segments = parse_segment_list("00000.flac,0.000000,6.037333\n\n00001.flac,6.037333,9.5\n")
+
+        assert segments == [
+            {"file": "00000.flac", "start": 0.0, "duration": 6.037333},
+            {"file": "00001.flac", "start": 6.037333, "duration": 3.462667},
+        ]
+
+
+class TestBuildSegments:
+    """세그먼트 인코딩 테스트."""
+
+    def test_writes_manifest_and_segments(self, stem: Path, tmp_path: Path) -> None:
+        """세그먼트와 매니페스트를 한 디렉터리에 만들고 임시 파일을 남기지 않습니다."""
+        output_dir = tmp_path / "segments" / "vocals"
+        output_dir.parent.mkdir()
+        with patch("app.services.stem_segments.subprocess.run", side_effect=_fake_ffmpeg):
+            manifest_path = build_segments(stem, output_dir, segment_seconds=0.6)
+
+        assert manifest_path == output_dir / SEGMENT_MANIFEST_NAME
+        assert sorted(p.name for p in output_dir.iterdir()) == [
+            "00000.flac", "00001.flac", SEGMENT_MANIFEST_NAME
+        ]
+        manifest = load_manifest(manifest_path)
+        assert manifest is not None
+        assert manifest["sample_rate"] == 44100
+        assert manifest["channels"] == 2
+        assert manifest["duration"] == pytest.approx(1.0)
+        assert [s["file"] for s in manifest["segments"]] == ["00000.flac", "00001.flac"]
+        assert not list(output_dir.parent.glob(".*tmp"))
+
+    def test_missing_ffmpeg_raises(self, stem: Path, tmp_path: Path) -> None:
+        """ffmpeg가 없으면 RuntimeError를 발생시키고 디렉터리를 남기지 않습니다."""
+        output_dir = tmp_path / "vocals_segments"
+        with (
+            patch("app.services.stem_segments.subprocess.run", side_effect=FileNotFoundError),
+            pytest.raises(RuntimeError),
+        ):
+            build_segments(stem, output_dir)
+
+        assert not output_dir.exists()
+        assert not list(tmp_path.glob(".*tmp"))
@@ -0,0 +1,88 @@
+"""서버 측 템포/피치 변환 테스트."""
+
+from __future__ import annotations
+
+import subprocess
+import wave
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from app.services.stem_stretch import render_stretch, stretch_cache_name, stretch_filter
+
+
+class TestStretchCacheName:
+    """캐시 파일 이름 테스트."""
+
+    def test_name_is_normalized(self) -> None:
+        """같은 요청은 표기와 무관하게 같은 이름이 되는지 확인합니다."""
+        assert stretch_cache_name("vocals", 0.75, 0) == "vocals_t0.750_p+0.00.wav"
+        assert stretch_cache_name("vocals", 0.7500001, 0.0) == "vocals_t0.750_p+0.00.wav"
+        assert stretch_cache_name("mix_rhythm", 1.0, -3) == "mix_rhythm_t1.000_p-3.00.wav"
+
+    def test_region_is_part_of_name(self) -> None:
+        """A-B 구간이 밀리초 단위로 이름에 들어가는지 확인합니다."""
+        assert stretch_cache_name("bass", 0.5, 0, 1.5, 3.25) == "bass_t0.500_p+0.00_r1500-3250.wav"
+        assert stretch_cache_name("bass", 0.5, 0, 10) == "bass_t0.500_p+0.00_r10000-end.wav"
+        assert stretch_cache_name("bass", 0.5, 0, None, 2) == "bass_t0.500_p+0.00_r0-2000.wav"
+
+
+class TestStretchFilter:
+    """ffmpeg 필터 구성 테스트."""
+
+    def test_rubberband_filter(self) -> None:
+        """rubberband가 있으면 템포와 피치를 한 필터로 처리합니다."""
+        result = stretch_filter(0.75, 12, 44100, rubberband=True)
+        assert result.startswith("rubberband=tempo=0.750000:pitch=2.000000")
+
+    def test_fallback_splits_atempo(self) -> None:
+        """atempo 한 단계 범위(0.5~2.0)를 벗어나는 배율은 여러 단계로 나눕니다."""
+        assert stretch_filter(0.3, 0, 44100, rubberband=False) == "atempo=0.5,atempo=0.600000"
+        assert stretch_filter(3.0, 0, 44100, rubberband=False) == "atempo=2.0,atempo=1.500000"
+        assert stretch_filter(1.0, 0, 44100, rubberband=False) == "anull"
+
+    def test_fallback_pitch_keeps_tempo(self) -> None:
+        """피치만 바꾸면 샘플 레이트 변경분을 atempo로 되돌리는지 확인합니다."""
+        result = stretch_filter(1.0, 12, 44100, rubberband=False)
+        assert result == "asetrate=88200.000,aresample=44100,atempo=0.500000"
+
+
+class TestRenderStretch:
+    """렌더링 오류 처리 테스트."""
+
+    @pytest.fixture
+    def source(self, tmp_path: Path) -> Path:
+        path = tmp_path / "vocals.wav"
+        with wave.open(str(path), "wb") as wav_file:
+            wav_file.setnchannels(2)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(44100)
+            wav_file.writeframes(b"\x00" * 4 * 100)
+        return path
+
+    def test_missing_ffmpeg_raises(self, source: Path, tmp_path: Path) -> None:
+        """ffmpeg가 없으면 RuntimeError를 발생시키고 결과 파일을 남기지 않습니다."""
+        output = tmp_path / "out.wav"
+        with (
+            patch("app.services.stem_stretch.rubberband_available", return_value=False),
+            patch("app.services.stem_stretch.subprocess.run", side_effect=FileNotFoundError),
+            pytest.raises(RuntimeError),
+        ):
+            render_stretch(source, output, 0.5, 0)
+        assert not output.exists()
+
+    def test_failed_render_raises(self, source: Path, tmp_path: Path) -> None:
+        """ffmpeg가 실패하면 RuntimeError를 발생시킵니다."""
+        output = tmp_path / "out.wav"
+        failed = subprocess.CompletedProcess([], returncode=1, stdout=b"", stderr=b"error")
+        with (
+            patch("app.services.stem_stretch.rubberband_available", return_value=False),
+            patch("app.services.stem_stretch.subprocess.run", return_value=failed) as run,
+            pytest.raises(RuntimeError),
+        ):
+            render_stretch(source, output, 0.5, 0, start=1.0, end=2.0)
+        command = run.call_args.args[0]
+        assert command[command.index("-ss") + 1] == "1.000"
+        assert command[command.index("-to") + 1] == "2.000"
+        assert not list(tmp_path.glob(".*tmp"))
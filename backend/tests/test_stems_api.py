@@ -0,0 +1,347 @@
+"""콘텐츠 주소 스템 API 엔드포인트 테스트."""
+
+from __future__ import annotations
+
+import shutil
+import wave
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from httpx import AsyncClient
+
+from app.services.separation_service import (
+    STEM_NAMES,
+    STEMS_COMPLETE_NAME,
+    separation_service,
+)
+
+FILE_HASH = "cd" * 32
+
+
+@pytest.fixture
+def cached_stems() -> Iterator[dict[str, Path]]:
+    """전역 서비스 캐시에 스템 세트를 만듭니다."""
+    cache_path = separation_service.cache_dir / FILE_HASH
+    cache_path.mkdir(parents=True, exist_ok=True)
+    stems = {}
+    for stem_name in STEM_NAMES:
+        stem_file = cache_path / f"{stem_name}.wav"
+        stem_file.write_bytes(b"RIFF" + stem_name.encode() * 100)
+        stems[stem_name] = stem_file
+    (cache_path / STEMS_COMPLETE_NAME).touch()
+    yield stems
+    shutil.rmtree(cache_path)
+
+
+@pytest.fixture
+def wav_stems() -> Iterator[Path]:
+    """전역 서비스 캐시에 스테레오 16-bit 스템 세트를 만듭니다."""
+    cache_path = separation_service.cache_dir / FILE_HASH
+    cache_path.mkdir(parents=True, exist_ok=True)
+    for stem_name in STEM_NAMES:
+        with wave.open(str(cache_path / f"{stem_name}.wav"), "wb") as wav_file:
+            wav_file.setnchannels(2)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(44100)
+            wav_file.writeframes(b"\x00" * 4 * 100)
+    (cache_path / STEMS_COMPLETE_NAME).touch()
+    yield cache_path
+    shutil.rmtree(cache_path)
+
+
+class TestStemSetEndpoint:
+    """GET /api/v1/stems/{file_hash} 테스트."""
+
+    @pytest.mark.asyncio
+    async def test_cached_hash_lists_stem_urls(
+        self,
+        async_client: AsyncClient,
+        cached_stems: dict[str, Path],
+    ) -> None:
+        """캐시된 해시면 태스크 없이 스템 URL 목록을 반환합니다."""
+        response = await async_client.get(f"/api/v1/stems/{FILE_HASH}")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["model"] == "htdemucs"
+        urls = {stem["name"]: stem["url"] for stem in data["stems"]}
+        assert urls["vocals"] == f"/api/v1/stems/{FILE_HASH}/htdemucs/vocals"
+        assert set(urls) == set(STEM_NAMES)
+
+    @pytest.mark.asyncio
+    async def test_unknown_hash_returns_404(self, async_client: AsyncClient) -> None:
+        """캐시에 없는 해시면 404를 반환합니다."""
+        response = await async_client.get(f"/api/v1/stems/{'ef' * 32}")
+        assert response.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_invalid_hash_returns_400(self, async_client: AsyncClient) -> None:
+        """해시 형식이 잘못되면 400을 반환합니다 (경로 조작 방지)."""
+        response = await async_client.get("/api/v1/stems/not-a-hash")
+        assert response.status_code == 400
+
+
+class TestCachedStemDownload:
+    """GET /api/v1/stems/{file_hash}/{model}/{stem_name} 테스트."""
+
+    @pytest.mark.asyncio
+    async def test_download_is_immutable(
+        self,
+        async_client: AsyncClient,
+        cached_stems: dict[str, Path],
+    ) -> None:
+        """캐시된 스템을 장기 immutable 캐싱 헤더와 함께 반환합니다."""
+        response = await async_client.get(f"/api/v1/stems/{FILE_HASH}/htdemucs/drums")
+
+        assert response.status_code == 200
+        assert response.content == cached_stems["drums"].read_bytes()
+        assert "immutable" in response.headers["cache-control"]
+        assert response.headers["x-stem-quality"] == "full"
+
+        response = await async_client.get(
+            f"/api/v1/stems/{FILE_HASH}/htdemucs/drums",
+            headers={"If-None-Match": response.headers["etag"]},
+        )
+        assert response.status_code == 304
+
+    @pytest.mark.asyncio
+    async def test_other_model_returns_404(
+        self,
+        async_client: AsyncClient,
+        cached_stems: dict[str, Path],
+    ) -> None:
+        """다른 모델 이름으로는 찾을 수 없습니다."""
+        response = await async_client.get(f"/api/v1/stems/{FILE_HASH}/mdx_extra/drums")
+        assert response.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_invalid_stem_returns_400(
+        self,
+        async_client: AsyncClient,
+        cached_stems: dict[str, Path],
+    ) -> None:
+        """잘못된 스템 이름이면 400을 반환합니다."""
+        response = await async_client.get(f"/api/v1/stems/{FILE_HASH}/htdemucs/piano")
+        assert response.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_time_range_slice(self, async_client: AsyncClient, wav_stems: Path) -> None:
+        """start, end를 주면 그 구간만 담은 WAV를 반환합니다."""
+        url = f"/api/v1/stems/{FILE_HASH}/htdemucs/vocals"
+        response = await async_client.get(url, params={"start": 0.0005, "end": 0.001})
+
+        assert response.status_code == 200
+        assert response.headers["x-slice-start"] == f"{22 / 44100:.6f}"
+        assert len(response.content) == int(response.headers["content-length"]) == 44 + 22 * 4
+
+        response = await async_client.get(url, params={"start": 1, "end": 2})
+        assert response.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_time_range_of_silent_marker(
+        self, async_client: AsyncClient, wav_stems: Path
+    ) -> None:
+        """무음 스템 마커의 구간 요청은 헤더만 있는 WAV와 X-Stem-Silent를 반환합니다."""
+        await async_client.get(f"/api/v1/stems/{FILE_HASH}/htdemucs/analysis")
+        with wave.open(str(wav_stems / "vocals.wav"), "wb") as wav_file:
+            wav_file.setnchannels(2)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(44100)
+
+        response = await async_client.get(
+            f"/api/v1/stems/{FILE_HASH}/htdemucs/vocals", params={"start": 1, "end": 2}
+        )
+
+        assert response.status_code == 200
+        assert response.headers["x-stem-silent"] == "true"
+        assert len(response.content) == 44
+
+
+class TestPackedStemDownload:
+    """GET /api/v1/stems/{file_hash}/{model}/packed 테스트."""
+
+    @pytest.mark.asyncio
+    async def test_download_packed_stems(
+        self,
+        async_client: AsyncClient,
+        wav_stems: Path,
+    ) -> None:
+        """모든 스템을 8채널 WAV 하나로 반환하고 목록에 URL을 포함합니다."""
+        response = await async_client.get(f"/api/v1/stems/{FILE_HASH}")
+        packed_url = response.json()["packed_url"]
+        assert packed_url == f"/api/v1/stems/{FILE_HASH}/htdemucs/packed"
+
+        response = await async_client.get(packed_url)
+
+        assert response.status_code == 200
+        assert response.headers["x-stem-channels"] == ",".join(STEM_NAMES)
+        assert "immutable" in response.headers["cache-control"]
+        assert response.content[22] == 8  # 채널 수
+        assert len(response.content) > 8 * 2 * 100
+
+
+class TestPeaksDownload:
+    """파형 피크 엔드포인트 테스트."""
+
+    @pytest.mark.asyncio
+    async def test_stem_peaks(self, async_client: AsyncClient, wav_stems: Path) -> None:
+        """스템 목록의 피크 URL로 피크 파일을 받을 수 있습니다."""
+        response = await async_client.get(f"/api/v1/stems/{FILE_HASH}")
+        data = response.json()
+        assert data["peaks_url"] is None  # 원본 피크 없음
+        peaks_url = {stem["name"]: stem["peaks_url"] for stem in data["stems"]}["bass"]
+        assert peaks_url == f"/api/v1/stems/{FILE_HASH}/htdemucs/bass/peaks"
+
+        response = await async_client.get(peaks_url)
+
+        assert response.status_code == 200
+        assert response.content.startswith(b"PEAK")
+        assert "immutable" in response.headers["cache-control"]
+
+    @pytest.mark.asyncio
+    async def test_original_peaks(self, async_client: AsyncClient, wav_stems: Path) -> None:
+        """분리 중 만들어진 원본 피크를 반환하고, 없으면 404를 반환합니다."""
+        response = await async_client.get(f"/api/v1/stems/{FILE_HASH}/peaks")
+        assert response.status_code == 404
+
+        (wav_stems / "original.peaks").write_bytes(b"PEAK")
+        response = await async_client.get(f"/api/v1/stems/{FILE_HASH}/peaks")
+
+        assert response.status_code == 200
+        assert response.content == b"PEAK"
+
+
+class TestStemAnalysisEndpoint:
+    """GET /api/v1/stems/{file_hash}/{model}/analysis 테스트."""
+
+    @pytest.mark.asyncio
+    async def test_analysis_flags_silent_stems(
+        self, async_client: AsyncClient, wav_stems: Path
+    ) -> None:
+        """스템별 분석 결과와 무음 여부를 목록과 다운로드 헤더에 반영합니다."""
+        response = await async_client.get(f"/api/v1/stems/{FILE_HASH}/htdemucs/analysis")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert set(data["stems"]) == set(STEM_NAMES)
+        assert data["stems"]["vocals"]["silent"] is True
+        assert data["stems"]["vocals"]["frames"] == 100
+
+        response = await async_client.get(f"/api/v1/stems/{FILE_HASH}")
+        assert all(stem["silent"] for stem in response.json()["stems"])
+
+        response = await async_client.get(f"/api/v1/stems/{FILE_HASH}/htdemucs/vocals")
+        assert response.headers["x-stem-silent"] == "true"
+
+    @pytest.mark.asyncio
+    async def test_unknown_hash_returns_404(self, async_client: AsyncClient) -> None:
+        """캐시에 없는 해시면 404를 반환합니다."""
+        response = await async_client.get(f"/api/v1/stems/{'ef' * 32}/htdemucs/analysis")
+        assert response.status_code == 404
+
+
+class TestMixdownEndpoint:
+    """GET /api/v1/stems/{file_hash}/{model}/mix 테스트."""
+
+    @pytest.mark.asyncio
+    async def test_preset_mix_is_cached(self, async_client: AsyncClient, wav_stems: Path) -> None:
+        """프리셋 믹스를 캐시 파일로 제공합니다."""
+        response = await async_client.get(
+            f"/api/v1/stems/{FILE_HASH}/htdemucs/mix", params={"preset": "instrumental"}
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "audio/wav"
+        assert "etag" in response.headers
+        assert (wav_stems / "mix_instrumental.wav").exists()
+
+    @pytest.mark.asyncio
+    async def test_custom_gains_are_streamed(
+        self, async_client: AsyncClient, wav_stems: Path
+    ) -> None:
+        """프리셋이 아닌 게인 조합은 캐시하지 않고 스트리밍합니다."""
+        response = await async_client.get(
+            f"/api/v1/stems/{FILE_HASH}/htdemucs/mix", params={"vocals": 0.5, "drums": 0}
+        )
+
+        assert response.status_code == 200
+        assert int(response.headers["content-length"]) == len(response.content) == 44 + 4 * 100
+        assert not list(wav_stems.glob("mix_*"))
+
+    @pytest.mark.asyncio
+    async def test_invalid_preset_returns_400(
+        self, async_client: AsyncClient, wav_stems: Path
+    ) -> None:
+        """알 수 없는 프리셋이면 400을 반환합니다."""
+        response = await async_client.get(
+            f"/api/v1/stems/{FILE_HASH}/htdemucs/mix", params={"preset": "karaoke"}
+        )
+        assert response.status_code == 400
+
+
+class TestStretchEndpoint:
+    """GET /api/v1/stems/{file_hash}/{model}/stretch 테스트."""
+
+    @pytest.mark.asyncio
+    async def test_requires_exactly_one_source(
+        self, async_client: AsyncClient, wav_stems: Path
+    ) -> None:
+        """stem과 preset 중 하나만 지정하지 않으면 400을 반환합니다."""
+        url = f"/api/v1/stems/{FILE_HASH}/htdemucs/stretch"
+        assert (await async_client.get(url, params={"tempo": 0.5})).status_code == 400
+        response = await async_client.get(
+            url, params={"stem": "vocals", "preset": "instrumental"}
+        )
+        assert response.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_invalid_range_returns_400(
+        self, async_client: AsyncClient, wav_stems: Path
+    ) -> None:
+        """구간 시작이 끝보다 뒤면 400을 반환합니다."""
+        response = await async_client.get(
+            f"/api/v1/stems/{FILE_HASH}/htdemucs/stretch",
+            params={"stem": "vocals", "start": 5, "end": 2},
+        )
+        assert response.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_out_of_range_tempo_rejected(
+        self, async_client: AsyncClient, wav_stems: Path
+    ) -> None:
+        """허용 범위를 벗어난 템포 배율은 거부합니다."""
+        response = await async_client.get(
+            f"/api/v1/stems/{FILE_HASH}/htdemucs/stretch", params={"stem": "vocals", "tempo": 8}
+        )
+        assert response.status_code == 422
+
+
+class TestStemSegmentDownload:
+    """GET /api/v1/stems/{file_hash}/{model}/{stem}/segments/{segment} 테스트."""
+
+    @pytest.mark.asyncio
+    async def test_unknown_segment_returns_404(
+        self, async_client: AsyncClient, wav_stems: Path
+    ) -> None:
+        """만들어지지 않았거나 이름이 잘못된 세그먼트는 404를 반환합니다."""
+        base = f"/api/v1/stems/{FILE_HASH}/htdemucs/vocals/segments"
+        assert (await async_client.get(f"{base}/00000.flac")).status_code == 404
+        assert (await async_client.get(f"{base}/manifest.json")).status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_segment_served_immutable(
+        self, async_client: AsyncClient, wav_stems: Path
+    ) -> None:
+        """만든 세그먼트를 장기 캐싱 헤더와 함께 제공합니다."""
+        segments_dir = wav_stems / "segments" / "vocals"
+        segments_dir.mkdir(parents=True)
+        (segments_dir / "00000.flac").write_bytes(b"fLaC" + b"\x00" * 100)
+
+        response = await async_client.get(
+            f"/api/v1/stems/{FILE_HASH}/htdemucs/vocals/segments/00000.flac"
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "audio/flac"
+        assert "immutable" in response.headers["cache-control"]
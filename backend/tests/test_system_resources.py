@@ -0,0 +1,72 @@
+"""호스트 CPU 자원 및 스레드 분배 테스트."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from app.utils import system_resources
+from app.utils.system_resources import plan_threads
+
+
+class TestPlanThreads:
+    """스레드 분배 계획 테스트."""
+
+    def test_splits_cores_by_concurrency(self) -> None:
+        """코어를 동시 처리 수로 나누어 intra-op 스레드를 정하는지 확인합니다."""
+        plan = plan_threads(2, cpus=list(range(16)))
+        assert plan.intra_op_threads == 8
+        assert plan.worker_core_sets == [list(range(8)), list(range(8, 16))]
+
+    def test_small_host_does_not_oversubscribe(self) -> None:
+        """코어가 적으면 워커당 최소 1스레드만 사용하는지 확인합니다."""
+        plan = plan_threads(4, cpus=[0, 1])
+        assert plan.intra_op_threads == 1
+        assert plan.worker_core_sets == []  # 코어 부족 시 고정하지 않음
+
+    def test_core_sets_are_disjoint(self) -> None:
+        """워커별 코어 집합이 서로 겹치지 않는지 확인합니다."""
+        plan = plan_threads(3, cpus=list(range(12)))
+        flat = [c for cores in plan.worker_core_sets for c in cores]
+        assert len(flat) == len(set(flat))
+
+    def test_cpu_count_limits_usable_cores(self) -> None:
+        """cgroup 할당량 등으로 제한된 코어 수를 반영하는지 확인합니다."""
+        plan = plan_threads(2, cpus=list(range(16)), cpu_count=4)
+        assert plan.intra_op_threads == 2
+        assert plan.worker_core_sets == [[0, 1], [2, 3]]
+
+    def test_explicit_overrides(self) -> None:
+        """스레드 수 강제값이 우선하는지 확인합니다."""
+        plan = plan_threads(2, cpus=list(range(8)), intra_op_threads=3, inter_op_threads=2)
+        assert plan.intra_op_threads == 3
+        assert plan.inter_op_threads == 2
+
+
+class TestCgroupCpuLimit:
+    """cgroup CPU 할당량 파싱 테스트."""
+
+    def test_cgroup_v2_quota(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """cgroup v2 cpu.max 할당량을 코어 수로 변환하는지 확인합니다."""
+        cpu_max = tmp_path / "cpu.max"
+        cpu_max.write_text("150000 100000\n")
+        monkeypatch.setattr(system_resources, "CGROUP_V2_CPU_MAX", cpu_max)
+        assert system_resources.cgroup_cpu_limit() == 1.5
+
+    def test_cgroup_v2_unlimited(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """할당량이 max이면 None을 반환하는지 확인합니다."""
+        cpu_max = tmp_path / "cpu.max"
+        cpu_max.write_text("max 100000\n")
+        monkeypatch.setattr(system_resources, "CGROUP_V2_CPU_MAX", cpu_max)
+        assert system_resources.cgroup_cpu_limit() is None
+
+    def test_effective_cpu_count_applies_quota(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """실제 사용 가능 코어 수가 할당량으로 제한되는지 확인합니다."""
+        cpu_max = tmp_path / "cpu.max"
+        cpu_max.write_text("150000 100000\n")
+        monkeypatch.setattr(system_resources, "CGROUP_V2_CPU_MAX", cpu_max)
+        monkeypatch.setattr(system_resources, "available_cpus", lambda: list(range(8)))
+        assert system_resources.effective_cpu_count() == 2
@@ -0,0 +1,139 @@
+"""영속 태스크 저장소 테스트."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from app.services.task_store import KIND_SEPARATION, KIND_YOUTUBE, TaskRecord, TaskStore
+
+
+class TestTaskStore:
+    """TaskStore 테스트."""
+
+    def test_save_and_get(self, tmp_path: Path) -> None:
+        """저장한 레코드를 그대로 조회하는지 확인합니다."""
+        store = TaskStore(tmp_path / "tasks.db")
+        store.save(
+            TaskRecord(
+                task_id="t1",
+                kind=KIND_SEPARATION,
+                status="processing",
+                progress=42.0,
+                file_hash="abc",
+                source="/tmp/input.mp3",
+                result={"stems": {"vocals": "/cache/abc/vocals.wav"}},
+            )
+        )
+
+        record = store.get("t1")
+        assert record is not None
+        assert record.status == "processing"
+        assert record.progress == 42.0
+        assert record.result == {"stems": {"vocals": "/cache/abc/vocals.wav"}}
+
+    def test_save_overwrites(self, tmp_path: Path) -> None:
+        """같은 task_id로 저장하면 덮어쓰는지 확인합니다."""
+        store = TaskStore(tmp_path / "tasks.db")
+        store.save(TaskRecord(task_id="t1", kind=KIND_SEPARATION, status="pending"))
+        store.save(TaskRecord(task_id="t1", kind=KIND_SEPARATION, status="completed"))
+
+        assert store.get("t1").status == "completed"
+        assert len(store.list_tasks(KIND_SEPARATION)) == 1
+
+    def test_persists_across_connections(self, tmp_path: Path) -> None:
+        """다른 연결(재시작)에서도 레코드를 읽을 수 있는지 확인합니다."""
+        path = tmp_path / "tasks.db"
+        store = TaskStore(path)
+        store.save(TaskRecord(task_id="t1", kind=KIND_YOUTUBE, status="downloading"))
+        store.close()
+
+        reopened = TaskStore(path)
+        assert reopened.get("t1").status == "downloading"
+
+    def test_list_filters_by_kind_and_status(self, tmp_path: Path) -> None:
+        """종류와 상태로 필터링하는지 확인합니다."""
+        store = TaskStore(tmp_path / "tasks.db")
+        store.save(TaskRecord(task_id="a", kind=KIND_SEPARATION, status="completed", created_at=1))
+        store.save(TaskRecord(task_id="b", kind=KIND_SEPARATION, status="queued", created_at=2))
+        store.save(TaskRecord(task_id="c", kind=KIND_YOUTUBE, status="queued", created_at=3))
+
+        ids = [r.task_id for r in store.list_tasks(KIND_SEPARATION)]
+        assert ids == ["a", "b"]
+        queued = store.list_tasks(KIND_SEPARATION, ("queued",))
+        assert [r.task_id for r in queued] == ["b"]
+
+    def test_delete(self, tmp_path: Path) -> None:
+        """삭제한 레코드가 조회되지 않는지 확인합니다."""
+        store = TaskStore(tmp_path / "tasks.db")
+        store.save(TaskRecord(task_id="t1", kind=KIND_SEPARATION, status="failed"))
+        store.delete("t1")
+        assert store.get("t1") is None
+
+
+class TestTaskQueue:
+    """워커 대기열(claim/requeue) 테스트."""
+
+    def test_claim_next_takes_oldest_once(self, tmp_path: Path) -> None:
+        """가장 오래된 대기 작업을 한 번만 가져가는지 확인합니다."""
+        store = TaskStore(tmp_path / "tasks.db")
+        store.save(TaskRecord(task_id="old", kind=KIND_SEPARATION, status="queued", created_at=1))
+        store.save(TaskRecord(task_id="new", kind=KIND_SEPARATION, status="queued", created_at=2))
+
+        first = store.claim_next((KIND_SEPARATION,), "w1")
+        second = store.claim_next((KIND_SEPARATION,), "w2")
+        assert (first.task_id, second.task_id) == ("old", "new")
+        assert store.claim_next((KIND_SEPARATION,), "w1") is None
+        assert store.get("old").status == "processing"
+        assert store.get("old").worker_id == "w1"
+
+    def test_claim_next_filters_kind(self, tmp_path: Path) -> None:
+        """요청한 종류의 작업만 가져가는지 확인합니다."""
+        store = TaskStore(tmp_path / "tasks.db")
+        store.save(TaskRecord(task_id="y", kind=KIND_YOUTUBE, status="queued"))
+        assert store.claim_next((KIND_SEPARATION,), "w1") is None
+
+    def test_save_keeps_worker_id(self, tmp_path: Path) -> None:
+        """worker_id 없이 저장해도 가져간 워커가 유지되는지 확인합니다."""
+        store = TaskStore(tmp_path / "tasks.db")
+        store.save(TaskRecord(task_id="t", kind=KIND_SEPARATION, status="queued", created_at=5))
+        store.claim_next((KIND_SEPARATION,), "w1")
+        store.save(TaskRecord(task_id="t", kind=KIND_SEPARATION, status="processing", progress=50))
+
+        record = store.get("t")
+        assert record.worker_id == "w1"
+        assert record.created_at == 5
+        assert record.progress == 50
+
+    def test_save_keeps_cancelled_status(self, tmp_path: Path) -> None:
+        """취소된 작업을 워커의 진행률 기록이 되살리지 않는지 확인합니다."""
+        store = TaskStore(tmp_path / "tasks.db")
+        store.save(TaskRecord(task_id="t", kind=KIND_SEPARATION, status="cancelled"))
+        store.save(TaskRecord(task_id="t", kind=KIND_SEPARATION, status="processing", progress=60))
+
+        record = store.get("t")
+        assert record.status == "cancelled"
+        assert record.progress == 60
+
+    def test_requeue_claimed(self, tmp_path: Path) -> None:
+        """재시작한 워커가 끝내지 못한 작업만 되돌리는지 확인합니다."""
+        store = TaskStore(tmp_path / "tasks.db")
+        for task_id in ("a", "b"):
+            store.save(TaskRecord(task_id=task_id, kind=KIND_SEPARATION, status="queued"))
+            store.claim_next((KIND_SEPARATION,), "w1")
+        store.save(TaskRecord(task_id="b", kind=KIND_SEPARATION, status="completed"))
+
+        assert store.requeue_claimed("w1") == 1
+        assert store.get("a").status == "queued"
+        assert store.get("b").status == "completed"
+
+    def test_delete_expired(self, tmp_path: Path) -> None:
+        """오래된 종료 상태 레코드만 삭제하는지 확인합니다."""
+        store = TaskStore(tmp_path / "tasks.db")
+        store.save(
+            TaskRecord(task_id="done", kind=KIND_SEPARATION, status="completed", created_at=1)
+        )
+        store.save(TaskRecord(task_id="busy", kind=KIND_SEPARATION, status="queued", created_at=1))
+
+        assert store.delete_expired(KIND_SEPARATION, older_than=10) == 1
+        assert store.get("done") is None
+        assert store.get("busy") is not None
@@ -0,0 +1,105 @@
+"""다중 해상도 파형 피크 테스트."""
+
+from __future__ import annotations
+
+import struct
+import wave
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from app.services.waveform_peaks import (
+    base_peaks,
+    build_decoded_peaks,
+    build_pyramid,
+    build_wav_peaks,
+)
+
+
+def _read_peaks(path: Path) -> tuple[int, int, list[tuple[int, np.ndarray]]]:
+    """피크 파일을 (샘플 레이트, 프레임 수, [(피크당 샘플 수, (N, 2) 배열)])로 읽습니다."""
+    data = path.read_bytes()
+    magic, version, count, sample_rate, frames = struct.unpack_from("<4sHHIQ", data)
+    assert (magic, version) == (b"PEAK", 1)
+    offset = struct.calcsize("<4sHHIQ")
+    table = [struct.unpack_from("<II", data, offset + 8 * i) for i in range(count)]
+    offset += 8 * count
+    levels = []
+    for samples_per_peak, peaks in table:
+        values = np.frombuffer(data, dtype=np.int8, count=peaks * 2, offset=offset)
+        levels.append((samples_per_peak, values.reshape(-1, 2)))
+        offset += peaks * 2
+    assert offset == len(data)
+    return sample_rate, frames, levels
+
+
+class TestBasePeaks:
+    """base_peaks / build_pyramid 테스트."""
+
+    def test_chunk_boundaries_do_not_change_peaks(self) -> None:
+        """청크를 어떻게 나누어도 한 번에 계산한 결과와 같은지 확인합니다."""
+        rng = np.random.default_rng(0)
+        samples = rng.integers(-32768, 32767, size=2 * 1000, dtype=np.int16)
+
+        whole = base_peaks([samples], channels=2, samples_per_peak=64)
+        split = base_peaks(np.array_split(samples, [2 * 100 + 2, 2 * 513]), 2, 64)
+
+        assert whole[2] == split[2] == 1000
+        np.testing.assert_array_equal(whole[0], split[0])
+        np.testing.assert_array_equal(whole[1], split[1])
+        # 마지막 부분 피크 포함 (1000 / 64 -> 16개)
+        assert len(whole[0]) == 16
+        assert whole[0][0] == samples[: 2 * 64].min()
+
+    def test_pyramid_levels_cover_finer_levels(self) -> None:
+        """거친 단계의 피크가 세밀한 단계 피크 묶음의 최소/최대인지 확인합니다."""
+        mins = np.arange(-10, 0, dtype=np.int16)
+        maxs = np.arange(0, 10, dtype=np.int16)
+
+        pyramid = build_pyramid(mins, maxs, levels=3, factor=4)
+
+        assert [len(lo) for lo, _ in pyramid] == [10, 3, 1]
+        np.testing.assert_array_equal(pyramid[1][0], [-10, -6, -2])
+        np.testing.assert_array_equal(pyramid[1][1], [3, 7, 9])
+        assert (pyramid[2][0][0], pyramid[2][1][0]) == (-10, 9)
+
+
+class TestBuildPeaks:
+    """피크 파일 생성 테스트."""
+
+    def test_wav_peaks_file(self, tmp_path: Path) -> None:
+        """WAV에서 만든 피크 파일의 단계 표와 값이 맞는지 확인합니다."""
+        frames = 44100
+        wav_path = tmp_path / "vocals.wav"
+        samples = np.zeros((frames, 2), dtype="<i2")
+        samples[1000, 1] = 16384
+        samples[30000, 0] = -32768
+        with wave.open(str(wav_path), "wb") as wav_file:
+            wav_file.setnchannels(2)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(44100)
+            wav_file.writeframes(samples.tobytes())
+
+        sample_rate, total, levels = _read_peaks(
+            build_wav_peaks(wav_path, tmp_path / "vocals.peaks")
+        )
+
+        assert (sample_rate, total) == (44100, frames)
+        assert [samples_per_peak for samples_per_peak, _ in levels] == [
+            256, 1024, 4096, 16384, 65536,
+        ]
+        base = levels[0][1]
+        assert len(base) == -(-frames // 256)
+        assert base[1000 // 256].tolist() == [0, 64]
+        assert base[30000 // 256].tolist() == [-128, 0]
+        assert levels[-1][1].tolist() == [[-128, 64]]
+
+    def test_decoded_peaks_without_ffmpeg_raises(self, tmp_path: Path) -> None:
+        """ffmpeg가 없으면 RuntimeError를 발생시키는지 확인합니다."""
+        with patch("subprocess.Popen", side_effect=FileNotFoundError), pytest.raises(
+            RuntimeError
+        ):
+            build_decoded_peaks(tmp_path / "song.mp3", tmp_path / "original.peaks")
+        assert not (tmp_path / "original.peaks").exists()
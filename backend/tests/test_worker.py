@@ -0,0 +1,139 @@
+"""추론 워커 테스트."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.services.bpm_service import BpmResult
+from app.services.separation_service import SeparationService
+from app.services.task_store import KIND_BPM, TaskRecord, TaskStore
+from app.worker import InferenceWorker
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> TaskStore:
+    """테스트용 태스크 저장소를 반환합니다."""
+    return TaskStore(tmp_path / "tasks.db")
+
+
+def _fake_stems(file_path, cache_path, task_id):
+    stems = {}
+    for name in ("vocals", "drums", "bass", "other"):
+        stem = cache_path / f"{name}.wav"
+        stem.write_bytes(b"stem")
+        stems[name] = stem
+    return stems
+
+
+async def _run_until(worker: InferenceWorker, done) -> None:
+    """조건을 만족할 때까지 워커를 실행한 뒤 종료합니다."""
+    runner = asyncio.create_task(worker.run())
+    for _ in range(100):
+        if done():
+            break
+        await asyncio.sleep(0.05)
+    worker.stop()
+    await runner
+
+
+class TestInferenceWorker:
+    """InferenceWorker 테스트."""
+
+    @pytest.mark.asyncio
+    async def test_worker_runs_enqueued_separation(
+        self, store: TaskStore, tmp_path: Path
+    ) -> None:
+        """API가 넣은 분리 작업을 워커가 처리하고 API가 결과를 읽는지 확인합니다."""
+        api = SeparationService(
+            cache_dir=str(tmp_path / "cache"), task_store=store, inference_mode="worker"
+        )
+        backend = SeparationService(
+            cache_dir=str(tmp_path / "cache"), task_store=store, inference_mode="local"
+        )
+        upload = tmp_path / "upload.mp3"
+        upload.write_bytes(b"audio" * 100)
+
+        task_id = api.create_task()
+        api.enqueue(upload, task_id)
+        assert api.get_task(task_id).status == "queued"
+
+        worker = InferenceWorker(store, backend, MagicMock(), worker_id="w1", poll_interval=0.01)
+        with (
+            patch.object(backend, "_run_mock_separation", side_effect=_fake_stems),
+            patch.object(backend, "_run_demucs_separation", side_effect=_fake_stems),
+        ):
+            await _run_until(worker, lambda: api.get_task(task_id).status == "completed")
+
+        task = api.get_task(task_id)
+        assert task.status == "completed"
+        assert set(task.stems) == {"vocals", "drums", "bass", "other"}
+        assert not upload.exists()  # 완료된 작업의 업로드는 삭제
+
+    @pytest.mark.asyncio
+    async def test_worker_stops_cancelled_separation(
+        self, store: TaskStore, tmp_path: Path
+    ) -> None:
+        """API에서 취소한 작업을 워커가 중단하는지 확인합니다."""
+        import threading
+
+        api = SeparationService(
+            cache_dir=str(tmp_path / "cache"), task_store=store, inference_mode="worker"
+        )
+        backend = SeparationService(
+            cache_dir=str(tmp_path / "cache"), task_store=store, inference_mode="local"
+        )
+        upload = tmp_path / "upload.mp3"
+        upload.write_bytes(b"audio" * 100)
+        release = threading.Event()
+
+        def _blocking(file_path, cache_path, task_id):
+            release.wait(5)
+            backend._check_cancelled(task_id)
+            return _fake_stems(file_path, cache_path, task_id)
+
+        task_id = api.create_task()
+        api.enqueue(upload, task_id)
+
+        worker = InferenceWorker(store, backend, MagicMock(), worker_id="w1", poll_interval=0.01)
+        with (
+            patch.object(backend, "_run_mock_separation", side_effect=_blocking),
+            patch.object(backend, "_run_demucs_separation", side_effect=_blocking),
+        ):
+            runner = asyncio.create_task(worker.run())
+            for _ in range(100):
+                if api.get_task(task_id).status == "processing":
+                    break
+                await asyncio.sleep(0.01)
+
+            assert api.cancel_task(task_id) is True
+            for _ in range(100):
+                if not worker._running:
+                    break
+                await asyncio.sleep(0.01)
+            assert not worker._running
+            release.set()
+            worker.stop()
+            await runner
+
+        assert api.get_task(task_id).status == "cancelled"
+        assert not upload.exists()
+
+    @pytest.mark.asyncio
+    async def test_worker_runs_bpm_job(self, store: TaskStore, tmp_path: Path) -> None:
+        """BPM 작업 결과가 저장소에 기록되는지 확인합니다."""
+        bpm = MagicMock()
+        bpm.analyze.return_value = BpmResult(bpm=120.0, beats=[0.5], confidence=0.9, file_hash="h")
+        store.save(TaskRecord(task_id="b1", kind=KIND_BPM, status="queued", source="/x.mp3"))
+
+        worker = InferenceWorker(
+            store, MagicMock(max_concurrent=1), bpm, worker_id="w1", poll_interval=0.01
+        )
+        await _run_until(worker, lambda: store.get("b1").status == "completed")
+
+        record = store.get("b1")
+        assert record.status == "completed"
+        assert record.result["bpm"] == 120.0
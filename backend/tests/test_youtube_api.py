@@ -239,3 +239,26 @@ class TestDownloadEndpoint:
         assert response.status_code == 200
         assert "audio/mpeg" in response.headers.get("content-type", "")
         assert "attachment" in response.headers.get("content-disposition", "")
+
+    @pytest.mark.asyncio
+    async def test_download_time_range_slice(self, async_client: AsyncClient) -> None:
+        """start, end를 주면 구간을 덮는 MP3 프레임만 반환합니다."""
+        from app.services.youtube_service import youtube_service
+
+        # MPEG-1 Layer III 128kbps 44.1kHz 프레임 (417바이트) 100개
+        task_id = youtube_service.create_task()
+        task_dir = youtube_service.download_dir / task_id
+        task_dir.mkdir(parents=True, exist_ok=True)
+        mp3_file = task_dir / "test.mp3"
+        mp3_file.write_bytes(b"\xff\xfb\x90\x00".ljust(417, b"\x00") * 100)
+
+        youtube_service._tasks[task_id]["status"] = "complete"
+        youtube_service._tasks[task_id]["filename"] = str(mp3_file)
+
+        response = await async_client.get(
+            f"/api/v1/youtube/download/{task_id}", params={"start": 0, "end": 0.5}
+        )
+        assert response.status_code == 200
+        assert len(response.content) % 417 == 0
+        assert 0 < len(response.content) < mp3_file.stat().st_size
+        assert float(response.headers["x-slice-end"]) >= 0.5
@@ -129,6 +129,24 @@ class TestValidateVideo:
 class TestStartConversion:
     """변환 시작 테스트."""
 
+    @pytest.mark.asyncio
+    async def test_start_conversion_queues_per_client(
+        self,
+        service: YouTubeService,
+    ) -> None:
+        """다운로드 슬롯을 URL이 아닌 요청 클라이언트 기준으로 기다리는지 확인합니다."""
+        task_id = service.create_task()
+
+        with (
+            patch.object(YouTubeService, "_download"),
+            patch.object(
+                service.scheduler, "acquire", wraps=service.scheduler.acquire
+            ) as acquire,
+        ):
+            await service.start_conversion("https://youtu.be/test123", task_id, "10.0.0.1")
+
+        assert acquire.call_args.args[:2] == (task_id, "10.0.0.1")
+
     @pytest.mark.asyncio
     async def test_start_conversion_creates_task_directory(
         self,
@@ -270,11 +288,10 @@ class TestConcurrentLimit:
     """동시 다운로드 제한 테스트."""
 
     @pytest.mark.asyncio
-    async def test_semaphore_limits_concurrency(self, service: YouTubeService) -> None:
-        """세마포어가 동시 다운로드 수를 제한하는지 확인합니다."""
-        # 세마포어 카운트 확인 (max_concurrent_downloads)
-        # Semaphore의 _value가 설정값과 일치하는지 확인
-        assert service._semaphore._value == 5
+    async def test_scheduler_limits_concurrency(self, service: YouTubeService) -> None:
+        """스케줄러가 동시 다운로드 수를 제한하는지 확인합니다."""
+        # 초기 한도는 max_concurrent_downloads (이후 부하에 따라 조정될 수 있음)
+        assert service.scheduler.limit == 5
 
 
 class TestGetDownloadPath:
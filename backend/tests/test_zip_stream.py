@@ -0,0 +1,60 @@
+"""스트리밍 ZIP 생성 테스트."""
+
+from __future__ import annotations
+
+import io
+import os
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from app.utils.zip_stream import ZipEntry, iter_stored_zip, stored_zip_size
+
+
+def _entries(tmp_path: Path) -> list[ZipEntry]:
+    files = {
+        "vocals.wav": os.urandom(300_000),
+        "drums.wav": b"",
+        "베이스.wav": b"bass" * 1000,
+    }
+    entries = []
+    for name, data in files.items():
+        path = tmp_path / name
+        path.write_bytes(data)
+        entries.append(ZipEntry.from_path(name, path))
+    return entries
+
+
+class TestStoredZip:
+    """iter_stored_zip / stored_zip_size 테스트."""
+
+    def test_archive_is_readable_and_size_matches(self, tmp_path: Path) -> None:
+        """생성한 ZIP이 zipfile로 읽히고 미리 계산한 크기와 같은지 확인합니다."""
+        entries = _entries(tmp_path)
+        data = b"".join(iter_stored_zip(entries, chunk_size=64 * 1024))
+
+        assert len(data) == stored_zip_size(entries)
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            assert archive.testzip() is None
+            assert archive.namelist() == [entry.name for entry in entries]
+            for entry in entries:
+                info = archive.getinfo(entry.name)
+                assert info.compress_type == zipfile.ZIP_STORED
+                assert archive.read(entry.name) == entry.path.read_bytes()
+
+    def test_streams_in_chunks(self, tmp_path: Path) -> None:
+        """파일 전체가 아니라 청크 크기 단위로 내보내는지 확인합니다."""
+        entries = _entries(tmp_path)
+        chunks = list(iter_stored_zip(entries, chunk_size=64 * 1024))
+
+        assert max(len(chunk) for chunk in chunks) <= 64 * 1024
+        assert chunks[0].startswith(b"PK\x03\x04")
+
+    def test_changed_file_aborts(self, tmp_path: Path) -> None:
+        """보내는 중 파일 크기가 바뀌면 Content-Length가 어긋나지 않도록 중단하는지 확인합니다."""
+        entries = _entries(tmp_path)
+        entries[0].path.write_bytes(b"short")
+
+        with pytest.raises(OSError):
+            b"".join(iter_stored_zip(entries))
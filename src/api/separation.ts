@@ -44,6 +44,11 @@ export interface AllStemsDownloadResponse {
  */
 const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || 'http://localhost:8000'
 
+/**
+ * 표준 PCM WAV 헤더 크기 (이하이면 프레임 없는 무음 마커)
+ */
+const WAV_HEADER_SIZE = 44
+
 /**
  * 엔드포인트 경로
  */
@@ -54,6 +59,8 @@ const ENDPOINTS = {
     `${API_BASE_URL}/api/v1/separate/${taskId}/stems/${stemName}`,
   DOWNLOAD_ALL: (taskId: string) =>
     `${API_BASE_URL}/api/v1/separate/${taskId}/stems`,
+  DOWNLOAD_PACKED: (taskId: string) =>
+    `${API_BASE_URL}/api/v1/separate/${taskId}/stems/packed`,
 } as const
 
 /**
@@ -155,6 +162,37 @@ export async function downloadStem(
   }
 }
 
+/**
+ * Stem의 시간 구간만 담은 WAV를 다운로드합니다 (A-B 반복 구간 로딩).
+ *
+ * @param taskId - 분리 작업 ID
+ * @param stemName - Stem 이름
+ * @param start - 구간 시작 (초)
+ * @param end - 구간 끝 (초)
+ * @returns 구간 오디오 데이터, 실제 구간 시작 (초, 프레임 경계),
+ *   무음 stem 여부 (무음 마커 stem은 헤더만 있는 WAV라 디코딩 대신 무음 버퍼를 만들어야 함)
+ * @throws Error - 다운로드 실패 시
+ */
+export async function downloadStemRange(
+  taskId: string,
+  stemName: StemName,
+  start: number,
+  end: number
+): Promise<{ arrayBuffer: ArrayBuffer; start: number; silent: boolean }> {
+  const params = new URLSearchParams({ start: String(start), end: String(end) })
+  const response = await fetch(`${ENDPOINTS.DOWNLOAD(taskId, stemName)}?${params}`)
+
+  if (!response.ok) {
+    throw new Error(`Failed to download stem range: ${stemName}`)
+  }
+
+  return {
+    arrayBuffer: await response.arrayBuffer(),
+    start: Number(response.headers.get('X-Slice-Start') ?? start),
+    silent: response.headers.get('X-Stem-Silent') === 'true',
+  }
+}
+
 /**
  * 모든 Stem을 다운로드합니다.
  *
@@ -221,9 +259,50 @@ export async function decodeAudioBuffer(
   }
 }
 
+/**
+ * 모든 Stem을 묶은 8채널 WAV를 한 번에 다운로드하고 Stem별 AudioBuffer로 나눕니다.
+ *
+ * 채널 2k, 2k+1이 X-Stem-Channels 헤더의 k번째 Stem(L, R)입니다.
+ *
+ * @param taskId - 분리 작업 ID
+ * @param audioContext - AudioContext 인스턴스
+ * @returns 디코딩된 모든 Stem AudioBuffer
+ * @throws Error - 다운로드 또는 디코딩 실패 시
+ */
+export async function downloadAndDecodePackedStems(
+  taskId: string,
+  audioContext: AudioContext
+): Promise<Record<StemName, AudioBuffer>> {
+  const response = await fetch(ENDPOINTS.DOWNLOAD_PACKED(taskId))
+
+  if (!response.ok) {
+    throw new Error('Failed to download packed stems')
+  }
+
+  const stemNames = (response.headers.get('X-Stem-Channels') ?? '').split(',') as StemName[]
+  const packed = await decodeAudioBuffer(await response.arrayBuffer(), audioContext)
+
+  if (packed.numberOfChannels !== stemNames.length * 2) {
+    throw new Error(`Unexpected packed channel count: ${packed.numberOfChannels}`)
+  }
+
+  const decodedStems: Partial<Record<StemName, AudioBuffer>> = {}
+  stemNames.forEach((stemName, index) => {
+    const stem = audioContext.createBuffer(2, packed.length, packed.sampleRate)
+    stem.copyToChannel(packed.getChannelData(index * 2), 0)
+    stem.copyToChannel(packed.getChannelData(index * 2 + 1), 1)
+    decodedStems[stemName] = stem
+  })
+
+  return decodedStems as Record<StemName, AudioBuffer>
+}
+
 /**
  * 모든 Stem을 다운로드하고 AudioBuffer로 디코딩합니다.
  *
+ * 8채널 묶음을 먼저 시도하고, 실패하면 (멀티채널 WAV 디코딩을 지원하지 않는 브라우저 등)
+ * ZIP 다운로드로 대체합니다.
+ *
  * @param taskId - 분리 작업 ID
  * @param audioContext - AudioContext 인스턴스
  * @returns 디코딩된 모든 Stem AudioBuffer
@@ -232,13 +311,25 @@ export async function downloadAndDecodeAllStems(
   taskId: string,
   audioContext: AudioContext
 ): Promise<Record<StemName, AudioBuffer>> {
+  try {
+    return await downloadAndDecodePackedStems(taskId, audioContext)
+  } catch {
+    // ZIP 다운로드로 대체
+  }
+
   const stemsData = await downloadAllStems(taskId)
 
   const decodedStems: Partial<Record<StemName, AudioBuffer>> = {}
+  const silentStems: StemName[] = []
 
   // 병렬로 모든 stem 디코딩
   await Promise.all(
     (Object.keys(stemsData) as StemName[]).map(async (stemName) => {
+      // 무음 stem은 헤더만 있는 WAV 마커로 저장됨
+      if (stemsData[stemName].byteLength <= WAV_HEADER_SIZE) {
+        silentStems.push(stemName)
+        return
+      }
       decodedStems[stemName] = await decodeAudioBuffer(
         stemsData[stemName],
         audioContext
@@ -246,5 +337,167 @@ export async function downloadAndDecodeAllStems(
     })
   )
 
+  // 무음 stem은 가장 긴 stem 길이의 무음 버퍼로 대체
+  const reference = Object.values(decodedStems).reduce<AudioBuffer | undefined>(
+    (longest, buffer) => (!longest || buffer.length > longest.length ? buffer : longest),
+    undefined
+  )
+  for (const stemName of silentStems) {
+    decodedStems[stemName] = audioContext.createBuffer(
+      2,
+      reference?.length ?? 1,
+      reference?.sampleRate ?? audioContext.sampleRate
+    )
+  }
+
   return decodedStems as Record<StemName, AudioBuffer>
 }
+
+/**
+ * 파형 피크 단계 (피크마다 최소, 최대가 번갈아 저장됨, -128 ~ 127)
+ */
+export interface WaveformPeaksLevel {
+  samplesPerPeak: number
+  peaks: Int8Array
+}
+
+/**
+ * 서버에서 미리 계산한 다중 해상도 파형 피크
+ */
+export interface WaveformPeaks {
+  sampleRate: number
+  frames: number
+  levels: WaveformPeaksLevel[]
+}
+
+/**
+ * 파형 피크 파일을 다운로드하고 파싱합니다.
+ *
+ * 오디오를 디코딩하기 전에 파형을 그릴 수 있도록 서버가 만든 피크 피라미드를 받습니다.
+ *
+ * @param path - 피크 URL 경로 (SSE 이벤트나 스템 목록의 peaks_url)
+ * @returns 단계별 피크 (세밀한 단계부터)
+ * @throws Error - 다운로드 실패 또는 형식이 잘못되었을 때
+ */
+export async function fetchWaveformPeaks(path: string): Promise<WaveformPeaks> {
+  const response = await fetch(`${API_BASE_URL}${path}`)
+
+  if (!response.ok) {
+    throw new Error('Failed to download waveform peaks')
+  }
+
+  const buffer = await response.arrayBuffer()
+  const view = new DataView(buffer)
+  const magic = String.fromCharCode(...new Uint8Array(buffer, 0, 4))
+
+  if (magic !== 'PEAK' || view.getUint16(4, true) !== 1) {
+    throw new Error('Unsupported waveform peaks format')
+  }
+
+  // 헤더: magic, 버전, 단계 수, 샘플 레이트, 프레임 수 (u64)
+  const levelCount = view.getUint16(6, true)
+  const sampleRate = view.getUint32(8, true)
+  const frames = Number(view.getBigUint64(12, true))
+
+  const levels: WaveformPeaksLevel[] = []
+  let offset = 20 + levelCount * 8
+  for (let i = 0; i < levelCount; i++) {
+    const samplesPerPeak = view.getUint32(20 + i * 8, true)
+    const count = view.getUint32(24 + i * 8, true)
+    levels.push({ samplesPerPeak, peaks: new Int8Array(buffer, offset, count * 2) })
+    offset += count * 2
+  }
+
+  return { sampleRate, frames, levels }
+}
+
+/**
+ * 화면 해상도에 맞는 가장 거친 피크 단계를 고릅니다.
+ *
+ * @param peaks - 파형 피크
+ * @param pxPerSec - 초당 픽셀 수
+ * @returns 픽셀당 피크가 하나 이상인 단계
+ */
+export function selectPeaksLevel(peaks: WaveformPeaks, pxPerSec: number): WaveformPeaksLevel {
+  const samplesPerPixel = peaks.sampleRate / pxPerSec
+  const candidates = peaks.levels.filter((level) => level.samplesPerPeak <= samplesPerPixel)
+  return candidates.length > 0 ? candidates[candidates.length - 1] : peaks.levels[0]
+}
+
+/**
+ * 분할 스트리밍 세그먼트 (세그먼트마다 독립적으로 디코딩 가능)
+ */
+export interface StemSegment {
+  url: string
+  start: number
+  duration: number
+}
+
+/**
+ * 스템 분할 스트리밍 매니페스트
+ */
+export interface StemSegmentManifest {
+  stem: StemName
+  mimeType: string
+  sampleRate: number
+  channels: number
+  duration: number
+  segments: StemSegment[]
+}
+
+/**
+ * 스템의 분할 스트리밍 매니페스트를 조회합니다.
+ *
+ * @param path - 매니페스트 URL 경로 (스템 목록의 segments_url)
+ * @returns 세그먼트별 URL, 시작 시각, 길이
+ * @throws Error - 조회 실패 시
+ */
+export async function fetchStemSegmentManifest(path: string): Promise<StemSegmentManifest> {
+  const response = await fetch(`${API_BASE_URL}${path}`)
+
+  if (!response.ok) {
+    throw new Error('Failed to fetch stem segment manifest')
+  }
+
+  const data = await response.json()
+  return {
+    stem: data.stem,
+    mimeType: data.mime_type,
+    sampleRate: data.sample_rate,
+    channels: data.channels,
+    duration: data.duration,
+    segments: data.segments,
+  }
+}
+
+/**
+ * 재생 위치부터 필요한 세그먼트를 순서대로 다운로드하고 디코딩합니다.
+ *
+ * 전체 스템을 받기 전에 첫 세그먼트로 재생을 시작하거나 탐색 위치로 바로 이동할 수 있습니다.
+ *
+ * @param manifest - 분할 스트리밍 매니페스트
+ * @param audioContext - AudioContext 인스턴스
+ * @param fromSeconds - 시작 위치 (초)
+ * @returns 세그먼트 시작 시각과 디코딩된 AudioBuffer
+ * @throws Error - 다운로드 또는 디코딩 실패 시
+ */
+export async function* streamStemSegments(
+  manifest: StemSegmentManifest,
+  audioContext: AudioContext,
+  fromSeconds = 0
+): AsyncGenerator<{ start: number; buffer: AudioBuffer }> {
+  const segments = manifest.segments.filter(
+    (segment) => segment.start + segment.duration > fromSeconds
+  )
+
+  for (const segment of segments) {
+    const response = await fetch(`${API_BASE_URL}${segment.url}`)
+
+    if (!response.ok) {
+      throw new Error(`Failed to download segment: ${segment.url}`)
+    }
+
+    const buffer = await decodeAudioBuffer(await response.arrayBuffer(), audioContext)
+    yield { start: segment.start, buffer }
+  }
+}